@@ -0,0 +1,389 @@
+"""
+Latency, throughput and allocation benchmark of the client hot paths.
+
+Every robot is a `robotComms.utils.simulator` process on loopback, so the client is measured without
+competing with the server for the interpreter lock. The API classes log to a temporary directory, as
+they would in production.
+
+Cases:
+    - "pose" => `slam.get_current_robot_pose()`
+    - "laserscan" => `system.get_laserscan()`
+    - "action" => `motion.get_action()` while an action is running
+    - "pois" => `artifact.get_artifact("poi")`
+    - "map" => `slam.get_composite_map()`
+
+Scenarios:
+    - "single" => One thread, one robot
+    - "threads" => Several threads sharing the connection pool of one robot
+    - "fleet" => One request per robot per round, fanned out to every robot at once
+
+Results are JSON with the environment in "meta". Pass a previous result file with `--baseline` to
+fail on p50 regressions.
+
+Run:
+    python -m benchmarks.client_hot_paths --calls 200 --output bench.json
+"""
+
+# Custom Packages
+from robotComms.utils.decoders import decoder_name
+from robotComms.utils.logger import systemLogger
+from robotComms.utils.rest_adapter import restAdapter
+from robotComms.utils.simulator import simulatorClient
+
+# Imported Packages
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import typing
+
+import requests
+
+CASES: typing.Dict[str, typing.Callable[[simulatorClient], typing.Any]] = {
+    "pose": lambda robot: robot.slam.get_current_robot_pose(),
+    "laserscan": lambda robot: robot.system.get_laserscan(),
+    "action": lambda robot: robot.motion.get_action(),
+    "pois": lambda robot: robot.artifact.get_artifact("poi"),
+    "map": lambda robot: robot.slam.get_composite_map(),
+}
+SCENARIOS: typing.List[str] = ["single", "threads", "fleet"]
+
+
+class _simulatorProcess:
+    def __init__(self, args: typing.List[str], work_dir: str) -> None:
+        # Port picked by the OS, released just before the simulator binds it
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            self.port: int = probe.getsockname()[1]
+        self.url: str = f"http://127.0.0.1:{self.port}"
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "robotComms.utils.simulator", "--port", str(self.port), *args],
+            cwd=work_dir,
+            env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + 15.0
+        while time.monotonic() < deadline:
+            try:
+                requests.get(f"{self.url}/api/platform/v1/timestamp", timeout=0.5)
+                return
+            except requests.ConnectionError:
+                time.sleep(0.05)
+        self.stop()
+        raise RuntimeError(f"Simulator did not start on port {self.port}")
+
+    def stop(self) -> None:
+        self.process.terminate()
+        self.process.wait(timeout=5.0)
+
+
+def _stats(samples: typing.List[float], duration_s: float, calls: int) -> typing.Dict[str, float]:
+    samples = sorted(samples)
+    return {
+        "calls": calls,
+        "p50_ms": statistics.median(samples) * 1e3,
+        "p99_ms": samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1e3,
+        "mean_ms": statistics.fmean(samples) * 1e3,
+        "throughput_rps": calls / duration_s if duration_s > 0 else 0.0,
+    }
+
+
+def _timed(function: typing.Callable[[], typing.Any], count: int) -> typing.List[float]:
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _single(robot: simulatorClient, case: str, calls: int) -> typing.Dict[str, float]:
+    call = CASES[case]
+    start = time.perf_counter()
+    samples = _timed(lambda: call(robot), calls)
+    return _stats(samples, time.perf_counter() - start, calls)
+
+
+def _threads(
+    robot: simulatorClient, case: str, calls: int, threads: int
+) -> typing.Dict[str, float]:
+    call = CASES[case]
+    per_thread = max(1, calls // threads)
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        start = time.perf_counter()
+        futures = [executor.submit(_timed, lambda: call(robot), per_thread) for _ in range(threads)]
+        samples = [sample for future in futures for sample in future.result()]
+        duration = time.perf_counter() - start
+    result = _stats(samples, duration, len(samples))
+    result["threads"] = threads
+    return result
+
+
+def _fleet(robots: typing.List[simulatorClient], case: str, rounds: int) -> typing.Dict[str, float]:
+    call = CASES[case]
+    round_samples = []
+    with ThreadPoolExecutor(max_workers=len(robots)) as executor:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            round_start = time.perf_counter()
+            for future in [executor.submit(call, robot) for robot in robots]:
+                future.result()
+            round_samples.append(time.perf_counter() - round_start)
+        duration = time.perf_counter() - start
+    # Latency of a fan-out round => Time until the whole fleet answered
+    result = _stats(round_samples, duration, rounds * len(robots))
+    result["robots"] = len(robots)
+    return result
+
+
+def _allocations(robot: simulatorClient, case: str, calls: int) -> typing.Dict[str, float]:
+    call = CASES[case]
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(calls):
+            before, _peak = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            call(robot)
+            _current, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+    finally:
+        tracemalloc.stop()
+    return {"peak_kib_per_call": statistics.median(peaks) / 1024}
+
+
+def _prepare(robot: simulatorClient, pois: int) -> None:
+    robot.artifact.add_artifact(
+        "poi",
+        None,
+        [
+            {
+                "id": f"{i:08x}-0000-4000-8000-000000000000",
+                "pose": {"x": (i % 20) * 0.5 - 5.0, "y": (i // 20) * 0.5 - 5.0, "yaw": 0.0},
+                "metadata": {"display_name": f"Room {i}", "type": "", "group": ""},
+            }
+            for i in range(pois)
+        ],
+    )
+    # Long move => "action" measures a running action for the whole benchmark
+    robot.motion.create_new_motion(
+        {
+            "action_name": "slamtec.agent.actions.MoveToAction",
+            "options": {"target": {"x": 9.0, "y": 5.0, "z": 0}, "move_options": {"mode": 0}},
+        }
+    )
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def run(
+    calls: int = 200,
+    threads: int = 8,
+    robots: int = 4,
+    pois: int = 200,
+    latency_s: float = 0.0,
+    map_size: int = 1024 * 1024,
+    laser_points: int = 720,
+    cases: typing.Optional[typing.List[str]] = None,
+    scenarios: typing.Optional[typing.List[str]] = None,
+    allocation_calls: int = 20,
+) -> typing.Dict[str, typing.Any]:
+    """
+    Run every case in every scenario
+
+    Args:
+        calls: Calls per case in the single and threads scenarios
+        threads: Threads of the threads scenario
+        robots: Simulated robots of the fleet scenario
+        pois: POIs on every robot
+        latency_s: Delay added by the simulators to every request
+        map_size: Size of the composite map in bytes
+        laser_points: Laser points per scan
+        cases: Cases to run. Default: All of `CASES`
+        scenarios: Scenarios to run. Default: All of `SCENARIOS`
+        allocation_calls: Calls traced for the allocations of the single scenario
+
+    Returns:
+        {"meta": environment, "results": {scenario: {case: measurement}}}
+    """
+    cases = cases or list(CASES)
+    scenarios = scenarios or list(SCENARIOS)
+    fleet_size = robots if "fleet" in scenarios else 1
+    work_dir = tempfile.mkdtemp(prefix="robotComms-bench-")
+    logger = systemLogger(
+        logger_name="bench_logger",
+        log_file_path=os.path.join(work_dir, "logs"),
+        enable_console_logging=False,
+    )
+    simulator_args = [
+        "--latency",
+        str(latency_s),
+        "--map-size",
+        str(map_size),
+        "--laser-points",
+        str(laser_points),
+        "--seed",
+        "1",
+    ]
+
+    servers: typing.List[_simulatorProcess] = []
+    clients: typing.List[simulatorClient] = []
+    results: typing.Dict[str, typing.Dict[str, typing.Dict[str, float]]] = {}
+    try:
+        for _ in range(fleet_size):
+            server = _simulatorProcess(simulator_args, work_dir)
+            servers.append(server)
+            client = simulatorClient(
+                server.url, logger, restAdapter(logger, pool_maxsize=max(10, threads))
+            )
+            clients.append(client)
+            _prepare(client, pois)
+
+        for case in cases:
+            # Warm the connection pool and the decoders
+            _timed(lambda case=case: CASES[case](clients[0]), 5)
+        for scenario in scenarios:
+            results[scenario] = {}
+            for case in cases:
+                if scenario == "single":
+                    measurement = _single(clients[0], case, calls)
+                    measurement.update(_allocations(clients[0], case, allocation_calls))
+                elif scenario == "threads":
+                    measurement = _threads(clients[0], case, calls, threads)
+                else:
+                    measurement = _fleet(clients, case, max(1, calls // len(clients)))
+                results[scenario][case] = measurement
+    finally:
+        for client in clients:
+            client.close()
+        for server in servers:
+            server.stop()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "decoder": decoder_name("auto"),
+            "calls": calls,
+            "threads": threads,
+            "robots": fleet_size,
+            "pois": pois,
+            "latency_s": latency_s,
+            "map_size": map_size,
+            "laser_points": laser_points,
+        },
+        "results": results,
+    }
+
+
+def compare(
+    results: typing.Dict[str, typing.Any],
+    baseline: typing.Dict[str, typing.Any],
+    tolerance: float = 0.25,
+) -> typing.List[str]:
+    """
+    Compare the p50 latencies against a previous run
+
+    Args:
+        results: Output of `run()`
+        baseline: Output of a previous `run()`
+        tolerance: Allowed slowdown. Example: 0.25 => Up to 25% slower
+
+    Returns:
+        Regressions as "scenario/case: baseline -> current". Empty => No regression
+    """
+    regressions = []
+    for scenario, cases in results["results"].items():
+        for case, measurement in cases.items():
+            previous = baseline.get("results", {}).get(scenario, {}).get(case)
+            if previous is None:
+                continue
+            if measurement["p50_ms"] > previous["p50_ms"] * (1.0 + tolerance):
+                regressions.append(
+                    f"{scenario}/{case}: {previous['p50_ms']:.3f}ms -> {measurement['p50_ms']:.3f}ms"
+                )
+    return regressions
+
+
+def main(argv: typing.Optional[typing.List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--calls", type=int, default=200, help="Calls per case and scenario")
+    parser.add_argument("--threads", type=int, default=8, help="Threads of the threads scenario")
+    parser.add_argument("--robots", type=int, default=4, help="Robots of the fleet scenario")
+    parser.add_argument("--pois", type=int, default=200, help="POIs on every robot")
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated delay per request")
+    parser.add_argument("--map-size", type=int, default=1024 * 1024, help="Map size in bytes")
+    parser.add_argument("--laser-points", type=int, default=720, help="Laser points per scan")
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), help="Cases to run")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, help="Scenarios to run")
+    parser.add_argument("--json", action="store_true", help="Print the raw results as JSON")
+    parser.add_argument("--output", help="Write the raw results to this file")
+    parser.add_argument("--baseline", help="Previous results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p50 slowdown")
+    args = parser.parse_args(argv)
+
+    results = run(
+        calls=args.calls,
+        threads=args.threads,
+        robots=args.robots,
+        pois=args.pois,
+        latency_s=args.latency,
+        map_size=args.map_size,
+        laser_points=args.laser_points,
+        cases=args.cases,
+        scenarios=args.scenarios,
+    )
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        print(f"Commit: {results['meta']['git_commit']} | Decoder: {results['meta']['decoder']}")
+        print(
+            f"{'scenario':<10}{'case':<12}{'p50 ms':>10}{'p99 ms':>10}{'req/s':>10}{'KiB/call':>10}"
+        )
+        for scenario, cases in results["results"].items():
+            for case, stats in cases.items():
+                allocations = stats.get("peak_kib_per_call")
+                print(
+                    f"{scenario:<10}{case:<12}{stats['p50_ms']:>10.3f}{stats['p99_ms']:>10.3f}"
+                    f"{stats['throughput_rps']:>10.0f}"
+                    f"{allocations if allocations is not None else float('nan'):>10.1f}"
+                )
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
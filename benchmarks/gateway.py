@@ -0,0 +1,245 @@
+"""
+Benchmark of many clients reading one robot, directly and through `robotComms.utils.gateway`.
+
+The robot is a `robotComms.utils.simulator` process and the gateway a `robotComms.utils.gateway`
+process, both on loopback. Every client thread owns its own client and connection pool, like separate
+consumer processes would.
+
+Cases:
+    - "pose" => `slam.get_current_robot_pose()`, not cached => Coalesced by the gateway only
+    - "pois" => `artifact.get_artifact("poi")`, cached by the gateway
+    - "map" => `slam.get_composite_map()`, cached by the gateway
+
+Routes:
+    - "direct" => Clients talk to the simulator
+    - "gateway" => Clients talk to the gateway, which talks to the simulator
+
+Each measurement carries "upstream_requests", the requests the simulator received for the case.
+
+Run:
+    python -m benchmarks.gateway --clients 16 --calls 100 --latency 0.02
+"""
+
+# Custom Packages
+from benchmarks.client_hot_paths import _git_commit, _prepare, _simulatorProcess, _stats, _timed
+from robotComms.utils.logger import systemLogger
+from robotComms.utils.rest_adapter import restAdapter
+from robotComms.utils.simulator import simulatorClient
+
+# Imported Packages
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import typing
+
+import requests
+
+CASES: typing.Dict[str, typing.Callable[[simulatorClient], typing.Any]] = {
+    "pose": lambda robot: robot.slam.get_current_robot_pose(),
+    "pois": lambda robot: robot.artifact.get_artifact("poi"),
+    "map": lambda robot: robot.slam.get_composite_map(),
+}
+
+
+class _gatewayProcess:
+    def __init__(self, robot_url: str, work_dir: str) -> None:
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            self.port: int = probe.getsockname()[1]
+        self.url: str = f"http://127.0.0.1:{self.port}"
+        self.process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "robotComms.utils.gateway",
+                "--robot",
+                f"bench={robot_url}",
+                "--port",
+                str(self.port),
+                "--rate",
+                "0",
+            ],
+            cwd=work_dir,
+            env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + 15.0
+        while time.monotonic() < deadline:
+            try:
+                requests.get(f"{self.url}/gateway/stats", timeout=0.5)
+                return
+            except requests.ConnectionError:
+                time.sleep(0.05)
+        self.stop()
+        raise RuntimeError(f"Gateway did not start on port {self.port}")
+
+    def upstream_requests(self) -> int:
+        return int(
+            requests.get(f"{self.url}/gateway/stats", timeout=2.0).json()["upstream_requests"]
+        )
+
+    def stop(self) -> None:
+        self.process.terminate()
+        self.process.wait(timeout=5.0)
+
+
+def _clients(
+    clients: typing.List[simulatorClient], case: str, calls: int
+) -> typing.Dict[str, float]:
+    call = CASES[case]
+    per_client = max(1, calls // len(clients))
+    with ThreadPoolExecutor(max_workers=len(clients)) as executor:
+        start = time.perf_counter()
+        futures = [
+            executor.submit(_timed, lambda client=client: call(client), per_client)
+            for client in clients
+        ]
+        samples = [sample for future in futures for sample in future.result()]
+        duration = time.perf_counter() - start
+    result = _stats(samples, duration, len(samples))
+    result["clients"] = len(clients)
+    return result
+
+
+def run(
+    clients: int = 16,
+    calls: int = 100,
+    pois: int = 200,
+    latency_s: float = 0.02,
+    map_size: int = 1024 * 1024,
+    cases: typing.Optional[typing.List[str]] = None,
+) -> typing.Dict[str, typing.Any]:
+    """
+    Run every case through every route
+
+    Args:
+        clients: Client threads, each with its own connection pool
+        calls: Calls per client and case
+        pois: POIs on the robot
+        latency_s: Delay added by the simulator to every request, the link to a real robot
+        map_size: Size of the composite map in bytes
+        cases: Cases to run. Default: All of `CASES`
+
+    Returns:
+        {"meta": environment, "results": {route: {case: measurement}}}
+    """
+    cases = cases or list(CASES)
+    work_dir = tempfile.mkdtemp(prefix="robotComms-bench-")
+    logger = systemLogger(
+        logger_name="bench_logger",
+        log_file_path=os.path.join(work_dir, "logs"),
+        enable_console_logging=False,
+    )
+
+    simulator: typing.Optional[_simulatorProcess] = None
+    gateway: typing.Optional[_gatewayProcess] = None
+    routes: typing.Dict[str, typing.List[simulatorClient]] = {}
+    results: typing.Dict[str, typing.Dict[str, typing.Dict[str, float]]] = {}
+    try:
+        simulator = _simulatorProcess(
+            ["--latency", str(latency_s), "--map-size", str(map_size), "--seed", "1"], work_dir
+        )
+        gateway = _gatewayProcess(simulator.url, work_dir)
+        routes = {
+            "direct": [
+                simulatorClient(simulator.url, logger, restAdapter(logger)) for _ in range(clients)
+            ],
+            "gateway": [
+                simulatorClient(gateway.url, logger, restAdapter(logger)) for _ in range(clients)
+            ],
+        }
+        _prepare(routes["direct"][0], pois)
+
+        for route, route_clients in routes.items():
+            results[route] = {}
+            for case in cases:
+                # Warm the connection pools, and the gateway cache from an earlier route
+                for client in route_clients:
+                    CASES[case](client)
+                before = gateway.upstream_requests()
+                measurement = _clients(route_clients, case, calls * clients)
+                # Requests of the direct route bypass the gateway => Every call reached the robot
+                measurement["upstream_requests"] = (
+                    gateway.upstream_requests() - before
+                    if route == "gateway"
+                    else measurement["calls"]
+                )
+                results[route][case] = measurement
+    finally:
+        for route_clients in routes.values():
+            for client in route_clients:
+                client.close()
+        if gateway is not None:
+            gateway.stop()
+        if simulator is not None:
+            simulator.stop()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "clients": clients,
+            "calls": calls,
+            "pois": pois,
+            "latency_s": latency_s,
+            "map_size": map_size,
+        },
+        "results": results,
+    }
+
+
+def main(argv: typing.Optional[typing.List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--clients", type=int, default=16, help="Client threads")
+    parser.add_argument("--calls", type=int, default=100, help="Calls per client and case")
+    parser.add_argument("--pois", type=int, default=200, help="POIs on the robot")
+    parser.add_argument("--latency", type=float, default=0.02, help="Simulated delay per request")
+    parser.add_argument("--map-size", type=int, default=1024 * 1024, help="Map size in bytes")
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), help="Cases to run")
+    parser.add_argument("--json", action="store_true", help="Print the raw results as JSON")
+    parser.add_argument("--output", help="Write the raw results to this file")
+    args = parser.parse_args(argv)
+
+    results = run(
+        clients=args.clients,
+        calls=args.calls,
+        pois=args.pois,
+        latency_s=args.latency,
+        map_size=args.map_size,
+        cases=args.cases,
+    )
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        print(f"Commit: {results['meta']['git_commit']} | Clients: {results['meta']['clients']}")
+        print(f"{'route':<10}{'case':<8}{'p50 ms':>10}{'p99 ms':>10}{'req/s':>10}{'upstream':>10}")
+        for route, cases in results["results"].items():
+            for case, stats in cases.items():
+                print(
+                    f"{route:<10}{case:<8}{stats['p50_ms']:>10.3f}{stats['p99_ms']:>10.3f}"
+                    f"{stats['throughput_rps']:>10.0f}{stats['upstream_requests']:>10}"
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
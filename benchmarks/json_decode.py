@@ -0,0 +1,195 @@
+"""
+Decode benchmark of the JSON response bodies.
+
+Payloads follow the shapes returned by the robot for each endpoint, sized like a busy site map:
+    - laserscan => `system.get_laserscan()` with one full revolution of points
+    - path => `motion.get_entity("path")`
+    - pois / rects / lines => `artifact.get_artifact(...)`
+    - pose / health / power => Small status bodies polled every second
+
+Paths:
+    - "requests" => `requests.Response.json()`, the previous decode path
+    - One path per installed decoder of `utils.decoders`, parsing the raw bytes
+    - "<decoder>+model" => Fastest decoder followed by the typed models, where a model exists
+
+Run:
+    python -m benchmarks.json_decode --repeat 50
+"""
+
+# Custom Packages
+from robotComms.utils.decoders import DECODERS, get_decoder, decode_model
+from robotComms.utils.models import area_Model, health_Model, poi_Model, pose_Model
+
+# Imported Packages
+import argparse
+import json
+import math
+import statistics
+import sys
+import time
+import typing
+
+import requests
+
+
+def _payloads() -> typing.Dict[str, typing.Tuple[typing.Any, typing.Optional[type]]]:
+    laserscan = {
+        "pose": {"x": 1.25, "y": -3.5, "z": 0, "yaw": 0.785, "picth": 0, "roll": 0},
+        "laser_points": [
+            {
+                "distance": 2.0 + math.sin(i / 40.0),
+                "angle": -math.pi + i * 2 * math.pi / 1800,
+                "valid": i % 17 != 0,
+            }
+            for i in range(1800)
+        ],
+    }
+    path = {"path_points": [[i * 0.05, math.sin(i / 50.0)] for i in range(800)]}
+    pois = [
+        {
+            "id": f"{i:08x}-4c1f-4a2b-9d3e-5f6a7b8c9d0e",
+            "pose": {"x": (i % 40) * 1.5, "y": (i // 40) * 1.5, "yaw": 0.0},
+            "metadata": {"display_name": f"Room {i}", "type": "", "group": ""},
+        }
+        for i in range(400)
+    ]
+    rects = [
+        {
+            "id": i,
+            "area": {
+                "start": {"x": i * 2.0, "y": 0.0},
+                "end": {"x": i * 2.0 + 1.5, "y": 3.0},
+                "half_width": 0.6,
+            },
+            "metadata": {},
+        }
+        for i in range(120)
+    ]
+    lines = [
+        {
+            "id": i,
+            "start": {"x": i * 1.0, "y": 0.0},
+            "end": {"x": i * 1.0, "y": 10.0},
+            "metadata": {},
+        }
+        for i in range(300)
+    ]
+    pose = {"x": 1.25, "y": -3.5, "z": 0, "yaw": 0.785, "pitch": 0, "roll": 0}
+    health = {
+        "hasWarning": False,
+        "hasError": True,
+        "hasFatal": False,
+        "baseError": [
+            {
+                "id": 0,
+                "component": 1,
+                "errorCode": 33621760,
+                "level": 2,
+                "message": "motor barke released",
+            }
+        ],
+    }
+    power = {
+        "batteryPercentage": 90,
+        "dockingStatus": "on_dock",
+        "isCharging": True,
+        "isDCConnected": False,
+        "powerStage": "running",
+        "sleepMode": "awake",
+    }
+    return {
+        "laserscan": (laserscan, None),
+        "path": (path, None),
+        "pois": (pois, poi_Model),
+        "rects": (rects, area_Model),
+        "lines": (lines, None),
+        "pose": (pose, pose_Model),
+        "health": (health, health_Model),
+        "power": (power, None),
+    }
+
+
+def _response(content: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = content
+    response.headers["Content-Type"] = "application/json"
+    return response
+
+
+def _time(function: typing.Callable[[], typing.Any], repeat: int) -> typing.Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return {
+        "p50_us": statistics.median(samples) * 1e6,
+        "p99_us": samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1e6,
+    }
+
+
+def run(repeat: int) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+    """
+    Run every payload through every decode path
+
+    Args:
+        repeat: Number of decodes per path
+
+    Returns:
+        {payload: {"bytes": size, "paths": {path: {"p50_us", "p99_us"}}}}
+    """
+    fastest = next(iter(DECODERS))
+    results: typing.Dict[str, typing.Dict[str, typing.Any]] = {}
+    for name, (payload, model) in _payloads().items():
+        content = json.dumps(payload).encode("utf-8")
+        paths: typing.Dict[str, typing.Dict[str, float]] = {
+            # A fresh Response per decode, requests caches nothing but the encoding guess
+            "requests": _time(lambda content=content: _response(content).json(), repeat),
+        }
+        for decoder_name in DECODERS:
+            decode = get_decoder(decoder_name)
+            paths[decoder_name] = _time(
+                lambda decode=decode, content=content: decode(content), repeat
+            )
+        if model is not None:
+            decode = get_decoder(fastest)
+            paths[f"{fastest}+model"] = _time(
+                lambda decode=decode, content=content, model=model: decode_model(
+                    decode(content), model
+                ),
+                repeat,
+            )
+        results[name] = {"bytes": len(content), "paths": paths}
+    return results
+
+
+def main(argv: typing.Optional[typing.List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--repeat", type=int, default=50, help="Decodes per path")
+    parser.add_argument("--json", action="store_true", help="Print the raw results as JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat)
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+        return 0
+
+    print(f"Installed Decoders: {list(DECODERS)}")
+    print(f"{'payload':<12}{'bytes':>10}  {'path':<16}{'p50 us':>10}{'p99 us':>10}{'speedup':>9}")
+    for name, result in results.items():
+        baseline = result["paths"]["requests"]["p50_us"]
+        for path, stats in result["paths"].items():
+            print(
+                f"{name:<12}{result['bytes']:>10}  {path:<16}{stats['p50_us']:>10.1f}"
+                f"{stats['p99_us']:>10.1f}{baseline / max(stats['p50_us'], 1e-9):>8.1f}x"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""
+Memory and allocation benchmark of the typed models against the plain dictionary path.
+
+Each case decodes the same JSON payload and keeps the result alive, as a fleet cache would:
+    - "dict" => `json.loads()` output as returned by the API classes today
+    - "model" => Slotted models built from the decoded JSON, dictionaries released
+
+Run:
+    python -m benchmarks.models_memory --count 100000
+"""
+
+# Custom Packages
+from robotComms.utils.models import (
+    action_Model,
+    area_Model,
+    poi_Model,
+    pose_Model,
+    models_from_list,
+)
+from robotComms.utils.results import dict_Result
+
+# Imported Packages
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+import typing
+
+
+class _unslotted_Result:
+    # Result wrapper as it was before __slots__
+    def __init__(self, status_code: int, data: typing.Any = None) -> None:
+        self.status_code = status_code
+        self.data = data
+
+
+def _payloads(
+    count: int,
+) -> typing.Dict[str, typing.Tuple[str, typing.Callable[[typing.Any], typing.Any]]]:
+    poses = [
+        {"x": i * 0.1, "y": i * 0.2, "z": 0, "yaw": 0.5, "pitch": 0, "roll": 0}
+        for i in range(count)
+    ]
+    actions = [
+        {
+            "action_id": i,
+            "action_name": "slamtec.agent.actions.MoveToAction",
+            "stage": "GOING_TO_TARGET",
+            "state": {"status": 1, "result": 0, "reason": ""},
+        }
+        for i in range(count)
+    ]
+    pois = [
+        {
+            "id": f"{i:08x}-0000-0000-0000-000000000000",
+            "pose": {"x": i * 0.1, "y": i * 0.2, "yaw": 0.0},
+            "metadata": {"display_name": f"P{i}", "type": "", "group": ""},
+        }
+        for i in range(count)
+    ]
+    areas = [
+        {
+            "id": i,
+            "area": {
+                "start": {"x": i * 0.1, "y": 0.0},
+                "end": {"x": i * 0.1 + 1.0, "y": 0.0},
+                "half_width": 0.5,
+            },
+            "metadata": {},
+        }
+        for i in range(count)
+    ]
+    return {
+        "pose": (json.dumps(poses), lambda data: models_from_list(pose_Model, data)),
+        "action": (json.dumps(actions), lambda data: models_from_list(action_Model, data)),
+        "poi": (json.dumps(pois), lambda data: models_from_list(poi_Model, data)),
+        "area": (
+            json.dumps(areas),
+            lambda data: models_from_list(area_Model, data, usage="forbidden_area"),
+        ),
+    }
+
+
+def _measure(build: typing.Callable[[], typing.Any]) -> typing.Dict[str, float]:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    kept = build()
+    duration = time.perf_counter() - start
+    gc.collect()
+    snapshot = tracemalloc.take_snapshot()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sum(stat.count for stat in snapshot.statistics("filename"))
+    del kept
+    return {"retained_bytes": current, "peak_bytes": peak, "blocks": blocks, "seconds": duration}
+
+
+def run(count: int) -> typing.Dict[str, typing.Dict[str, typing.Dict[str, float]]]:
+    """
+    Run every case
+
+    Args:
+        count: Number of elements per payload
+
+    Returns:
+        {case: {"dict": measurement, "model": measurement}}
+    """
+    results: typing.Dict[str, typing.Dict[str, typing.Dict[str, float]]] = {}
+    for case, (payload, to_models) in _payloads(count).items():
+        results[case] = {
+            "dict": _measure(lambda payload=payload: json.loads(payload)),
+            "model": _measure(
+                lambda payload=payload, to_models=to_models: to_models(json.loads(payload))
+            ),
+        }
+    results["result_wrapper"] = {
+        "dict": _measure(lambda: [_unslotted_Result(200, {}) for _ in range(count)]),
+        "model": _measure(lambda: [dict_Result(200, {}) for _ in range(count)]),
+    }
+    return results
+
+
+def main(argv: typing.Optional[typing.List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--count", type=int, default=100000, help="Elements per payload")
+    parser.add_argument("--json", action="store_true", help="Print the raw results as JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args.count)
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+        return 0
+
+    print(f"{'case':<16}{'path':<8}{'retained MiB':>14}{'peak MiB':>12}{'blocks':>12}{'ms':>10}")
+    for case, paths in results.items():
+        for path, stats in paths.items():
+            print(
+                f"{case:<16}{path:<8}{stats['retained_bytes'] / 2**20:>14.2f}"
+                f"{stats['peak_bytes'] / 2**20:>12.2f}{stats['blocks']:>12.0f}"
+                f"{stats['seconds'] * 1000:>10.1f}"
+            )
+        ratio = paths["model"]["retained_bytes"] / max(1, paths["dict"]["retained_bytes"])
+        print(f"{'':<16}=> model retains {ratio:.0%} of dict")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,5 +4,22 @@ from .artifact import artifact
 from .motion import motion
 from .statistics import statistics
 from .platform import platform
+from .sensors import sensors
+from .multi_floor import multi_floor
+from .delivery import delivery
+from .firmware import firmware
+from .application import application
 
-__all__ = ["system", "artifact", "slam", "motion", "statistics", "platform"]
+__all__ = [
+    "system",
+    "artifact",
+    "slam",
+    "motion",
+    "statistics",
+    "platform",
+    "sensors",
+    "multi_floor",
+    "delivery",
+    "firmware",
+    "application",
+]
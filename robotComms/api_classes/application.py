@@ -0,0 +1,215 @@
+from robotComms.utils.rest_adapter import restAdapter
+from robotComms.utils.logger import systemLogger
+from robotComms.utils.tracing import traced_api
+from robotComms.utils.cache import ttlCache
+from robotComms.utils.results import (
+    combined_Result,
+    Response_Type,
+    DictType,
+    ListDictType,
+    CombinedType,
+)
+
+import os
+import typing
+
+
+@traced_api(arguments={"package_name": "package_name"})
+class application:
+    ##############################################################################################################
+    # Class Setup
+    ##############################################################################################################
+
+    __IP_ADDR: str = ""
+    __API_VERSION: str = ""
+    __API_TAG: str = "api/core/application"
+    # Installed apps and their configuration only change through this class or a deployment
+    __CACHE_TTL_S: float = 300.0
+
+    def __init__(
+        self,
+        ip_addr: str,
+        api_version: str,
+        logger: systemLogger,
+        rest_adapter: typing.Optional[restAdapter] = None,
+    ):
+        self.__IP_ADDR = ip_addr
+        self.__API_VERSION = api_version
+        self.__LOGGER = logger
+        self.__REST_ADAPTER = rest_adapter or restAdapter(self.__LOGGER)
+        self.__CACHE = ttlCache(ttl_s=self.__CACHE_TTL_S)
+
+    ##############################################################################################################
+    # Getters
+    ##############################################################################################################
+
+    def get_apps(self, refresh: bool = False) -> ListDictType:
+        """Get the Android apps installed on the robot (ARM platform only). The list is cached.
+
+        Args:
+            refresh: Fetch again instead of using the cache
+
+        Returns:
+            Example:
+                [
+                    {
+                        "package_name": "com.slamtec.delivery",
+                        "version_name": "2.1.0",
+                        "version_code": 210,
+                        "state": "RUNNING"
+                    }
+                ]
+        """
+        if refresh:
+            self.__CACHE.invalidate(("apps",))
+        return list(self.__CACHE.get_or_load(("apps",), self.__fetch_apps))
+
+    def get_app(self, package_name: str, refresh: bool = False) -> DictType:
+        """Get one installed app, with its state
+
+        Args:
+            package_name: Example: "com.slamtec.delivery"
+            refresh: Fetch the app list again
+
+        Returns:
+            App, same format as `get_apps()`. Empty when not installed.
+        """
+        for app in self.get_apps(refresh=refresh):
+            if app.get("package_name") == package_name:
+                return app
+        return {}
+
+    def get_config(
+        self,
+        package_name: str,
+        keys: typing.Optional[typing.Iterable[str]] = None,
+        refresh: bool = False,
+    ) -> DictType:
+        """Read configuration keys of an app. The whole configuration is fetched with one request and cached.
+
+        Args:
+            package_name: Example: "com.slamtec.delivery"
+            keys: Only these keys. Missing keys are left out. (Default: None => Every key)
+            refresh: Fetch again instead of using the cache
+
+        Returns:
+            Example:
+                {
+                    "volume": 80,
+                    "language": "en"
+                }
+        """
+        key = ("config", package_name)
+        if refresh:
+            self.__CACHE.invalidate(key)
+        config: DictType = self.__CACHE.get_or_load(key, lambda: self.__fetch_config(package_name))
+        if keys is None:
+            return dict(config)
+        return {name: config[name] for name in keys if name in config}
+
+    ##############################################################################################################
+    # Setters
+    ##############################################################################################################
+
+    def set_config(self, package_name: str, values: DictType) -> bool:
+        """Write configuration keys of an app with one request. Keys not in `values` are kept.
+
+        Args:
+            package_name: Example: "com.slamtec.delivery"
+            values: Keys to write. Example: {"volume": 60, "language": "zh"}
+
+        Returns:
+            - True => Written
+            - False => Request Failed
+        """
+        response: combined_Result = self.__REST_ADAPTER.put(
+            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/apps/{package_name}/config",
+            response_type=Response_Type.EMPTY,
+            body_params=values,
+        )
+        # Dropped even on failure => The next read shows what the robot really kept
+        self.__CACHE.invalidate(("config", package_name))
+        if response.status_code == 200:
+            return True
+        else:
+            self.__LOGGER.ERROR(f"Set Config of {package_name} Failed | {response.status_code}")
+            return False
+
+    def install_app(self, apk_path: str) -> bool:
+        """Install or update an Android app (ARM platform only)
+
+        Args:
+            apk_path: APK File. Example: "delivery-2.1.0.apk"
+
+        Returns:
+            - True => Installed
+            - False => Request Failed
+        """
+        with open(apk_path, "rb") as apk:
+            package = apk.read()
+        response: combined_Result = self.__REST_ADAPTER.post(
+            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/apps",
+            response_type=Response_Type.EMPTY,
+            body_params=package,
+        )
+        self.__CACHE.invalidate(("apps",))
+        if response.status_code == 200:
+            return True
+        else:
+            self.__LOGGER.ERROR(
+                f"Install of {os.path.basename(apk_path)} Failed | {response.status_code}"
+            )
+            return False
+
+    def uninstall_app(self, package_name: str) -> bool:
+        """Uninstall an Android app (ARM platform only)
+
+        Args:
+            package_name: Example: "com.slamtec.delivery"
+
+        Returns:
+            - True => Uninstalled
+            - False => Request Failed
+        """
+        response: combined_Result = self.__REST_ADAPTER.delete(
+            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/apps/{package_name}",
+            response_type=Response_Type.EMPTY,
+        )
+        self.__CACHE.invalidate_where(lambda key: key in (("apps",), ("config", package_name)))
+        if response.status_code == 200:
+            return True
+        else:
+            self.__LOGGER.ERROR(f"Uninstall of {package_name} Failed | {response.status_code}")
+            return False
+
+    def invalidate(self) -> None:
+        """
+        Drop the cached app list and configurations
+        """
+        self.__CACHE.clear()
+
+    ##############################################################################################################
+    # Private Methods
+    ##############################################################################################################
+
+    def __fetch_apps(self) -> ListDictType:
+        response: combined_Result = self.__REST_ADAPTER.get(
+            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/apps",
+            response_type=Response_Type.LIST_JSON,
+        )
+        result: CombinedType = response.data
+        if isinstance(result, list):
+            return result
+        else:
+            return []
+
+    def __fetch_config(self, package_name: str) -> DictType:
+        response: combined_Result = self.__REST_ADAPTER.get(
+            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/apps/{package_name}/config",
+            response_type=Response_Type.JSON,
+        )
+        result: CombinedType = response.data
+        if response.status_code == 200 and isinstance(result, dict):
+            return result
+        else:
+            return {}
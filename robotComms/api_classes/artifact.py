@@ -1,5 +1,6 @@
 from robotComms.utils.rest_adapter import restAdapter
 from robotComms.utils.logger import systemLogger
+from robotComms.utils.tracing import traced_api
 from robotComms.utils.results import (
     combined_Result,
     Response_Type,
@@ -10,6 +11,7 @@ from robotComms.utils.results import (
 import typing
 
 
+@traced_api
 class artifact:
     ##############################################################################################################
     # Class Setup
@@ -19,11 +21,17 @@ class artifact:
     __API_VERSION: str = ""
     __API_TAG: str = "api/core/artifact"
 
-    def __init__(self, ip_addr: str, api_version: str, logger: systemLogger):
+    def __init__(
+        self,
+        ip_addr: str,
+        api_version: str,
+        logger: systemLogger,
+        rest_adapter: typing.Optional[restAdapter] = None,
+    ):
         self.__IP_ADDR = ip_addr
         self.__API_VERSION = api_version
         self.__LOGGER = logger
-        self.__REST_ADAPTER = restAdapter(self.__LOGGER)
+        self.__REST_ADAPTER = rest_adapter or restAdapter(self.__LOGGER)
 
     ##############################################################################################################
     # Getters
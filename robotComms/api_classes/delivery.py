@@ -0,0 +1,322 @@
+from robotComms.utils.rest_adapter import restAdapter
+from robotComms.utils.logger import systemLogger
+from robotComms.utils.tracing import traced_api
+from robotComms.utils.results import (
+    combined_Result,
+    Response_Type,
+    DictType,
+    ListDictType,
+    CombinedType,
+)
+
+import typing
+
+
+@traced_api(arguments={"task_id": "task_id"})
+class delivery:
+    ##############################################################################################################
+    # Class Setup
+    ##############################################################################################################
+
+    __IP_ADDR: str = ""
+    __API_VERSION: str = ""
+    __API_TAG: str = "api/delivery"
+    __TASK_TYPES: typing.List[str] = [
+        "TAKEOUT",
+        "GUIDE",
+        "FOOD_DELIVERY",
+        "RECYCLE",
+        "RETURN",
+        "DISINFECT",
+    ]
+    __CARGO_OPERATIONS: typing.List[str] = ["open", "close"]
+
+    def __init__(
+        self,
+        ip_addr: str,
+        api_version: str,
+        logger: systemLogger,
+        rest_adapter: typing.Optional[restAdapter] = None,
+    ):
+        self.__IP_ADDR = ip_addr
+        self.__API_VERSION = api_version
+        self.__LOGGER = logger
+        self.__REST_ADAPTER = rest_adapter or restAdapter(self.__LOGGER)
+
+    ##############################################################################################################
+    # Getters
+    ##############################################################################################################
+
+    def get_settings(self) -> DictType:
+        """Get the delivery settings: low battery and timeout scenario configuration
+
+        Returns:
+            Example:
+                {
+                    "timeout": {"food_pickup_timeout": 60}
+                }
+        """
+        response: combined_Result = self.__REST_ADAPTER.get(
+            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/settings",
+            response_type=Response_Type.JSON,
+        )
+        result: CombinedType = response.data
+        if isinstance(result, dict):
+            return result
+        else:
+            return {}
+
+    def get_stage(self) -> DictType:
+        """Get the stage of the current delivery. Poll it to switch the screens of the app.
+
+        Returns:
+            Example:
+                {
+                    "stage": "ON_DELIVERING"
+                }
+            Stages:
+                - "DEVICE_ERROR" => Chassis reported an error, the robot can not move
+                - "GOING_TO_TASK_POINT" => On the way to a task point
+                - "ARRIVED_AT_TASK_POINT" => Waiting at a task point for the operation or the timeout
+                - "ON_DELIVERING" => Going to the target point
+                - "ARRIVED_AT_TARGET" => Reached the final target point
+                - "ON_RETURNING" => Going to the default docking point
+                - "GOING_HOME" => Returning to the charging station
+                - "IDLE" => At the docking point or charging station
+        """
+        response: combined_Result = self.__REST_ADAPTER.get(
+            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/stage",
+            response_type=Response_Type.JSON,
+        )
+        result: CombinedType = response.data
+        if isinstance(result, dict):
+            return result
+        else:
+            return {}
+
+    def get_tasks(self) -> ListDictType:
+        """Get the tasks queued on the robot. Finished tasks leave the list.
+
+        Returns:
+            Example:
+                [
+                    {
+                        "id": "12",
+                        "task_type": "FOOD_DELIVERY",
+                        "target": {"poi_name": "A101"},
+                        "state": "RUNNING"
+                    }
+                ]
+        """
+        tasks = self.poll_tasks()
+        return tasks if tasks is not None else []
+
+    def poll_tasks(self) -> typing.Optional[ListDictType]:
+        """Get the tasks queued on the robot, telling a failed request apart from an empty list
+
+        Returns:
+            - Tasks, same format as `get_tasks()` => Robot answered
+            - None => Request failed
+        """
+        response: combined_Result = self.__REST_ADAPTER.get(
+            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/tasks",
+            response_type=Response_Type.LIST_JSON,
+        )
+        result: CombinedType = response.data
+        if response.status_code == 200 and isinstance(result, list):
+            return result
+        else:
+            return None
+
+    def get_task(self, task_id: str) -> DictType:
+        """Get one task
+
+        Args:
+            task_id: ID returned by `create_task()`
+
+        Returns:
+            Task, same format as `get_tasks()`. Empty once the task finished.
+        """
+        response: combined_Result = self.__REST_ADAPTER.get(
+            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/tasks/{task_id}",
+            response_type=Response_Type.JSON,
+        )
+        result: CombinedType = response.data
+        if response.status_code == 200 and isinstance(result, dict):
+            return result
+        else:
+            return {}
+
+    ##############################################################################################################
+    # Setters
+    ##############################################################################################################
+
+    def create_task(self, task: DictType) -> DictType:
+        """Create a delivery task. Call it after the items are loaded and the cabin door is closed.
+
+        Args:
+            task: Example:
+                {
+                    "task_type": "FOOD_DELIVERY",
+                    "target": {"poi_name": "A101"}
+                }
+                task_type: "TAKEOUT", "GUIDE", "FOOD_DELIVERY", "RECYCLE", "RETURN", "DISINFECT"
+
+        Returns:
+            Created Task with its "id". Empty on failure.
+        """
+        if not self.__valid_task(task):
+            return {}
+        response: combined_Result = self.__REST_ADAPTER.post(
+            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/tasks",
+            response_type=Response_Type.JSON,
+            body_params=task,
+        )
+        result: CombinedType = response.data
+        if response.status_code == 200 and isinstance(result, dict):
+            return result
+        else:
+            self.__LOGGER.ERROR(f"Create Task Failed | {response.status_code}")
+            return {}
+
+    def create_tasks(self, tasks: ListDictType) -> ListDictType:
+        """Create several delivery tasks with one request
+
+        Args:
+            tasks: Tasks in the format of `create_task()`
+
+        Returns:
+            Created Tasks with their "id", in the order of `tasks`. Empty on failure.
+        """
+        if not tasks or not all(self.__valid_task(task) for task in tasks):
+            return []
+        response: combined_Result = self.__REST_ADAPTER.post(
+            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/tasks/:batch",
+            response_type=Response_Type.LIST_JSON,
+            body_params=tasks,
+        )
+        result: CombinedType = response.data
+        if response.status_code == 200 and isinstance(result, list):
+            return result
+        else:
+            self.__LOGGER.ERROR(f"Create {len(tasks)} Tasks Failed | {response.status_code}")
+            return []
+
+    def cancel_task(self, task_id: str) -> bool:
+        """Cancel a task
+
+        Args:
+            task_id: ID returned by `create_task()`
+
+        Returns:
+            - True => Canceled
+            - False => Request Failed
+        """
+        response: combined_Result = self.__REST_ADAPTER.delete(
+            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/tasks/{task_id}",
+            response_type=Response_Type.EMPTY,
+        )
+        return self.__check(response, f"Cancel Task {task_id}")
+
+    def set_task_execution(self, enable: bool) -> bool:
+        """Allow or forbid the robot to move. Forbid it while a user operates the robot.
+
+        With execution enabled the robot runs its next task, or returns to the charging station or
+        a PARKING POI when there is none.
+
+        Args:
+            enable:
+                - True => Start / Continue the tasks
+                - False => Pause the tasks
+
+        Returns:
+            - True => Set
+            - False => Request Failed
+        """
+        response: combined_Result = self.__REST_ADAPTER.put(
+            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/tasks/:task_execution",
+            response_type=Response_Type.EMPTY,
+            body_params={"enable_task_execution": enable},
+        )
+        return self.__check(response, "Set Task Execution")
+
+    def set_pickup_timeout(self, timeout_s: int) -> bool:
+        """Set how long the robot waits at the target point for the pickup
+
+        Args:
+            timeout_s: Wait in seconds
+
+        Returns:
+            - True => Set
+            - False => Request Failed
+        """
+        response: combined_Result = self.__REST_ADAPTER.put(
+            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/settings/timeout",
+            response_type=Response_Type.EMPTY,
+            body_params={"food_pickup_timeout": timeout_s},
+        )
+        return self.__check(response, "Set Pickup Timeout")
+
+    def operate_cargo(self, cargo_id: int, box_id: int, op: str) -> bool:
+        """Open or close a cabin door. Only for robots with cargo boxes (H2 hotel delivery).
+
+        Args:
+            cargo_id: Cargo ID
+            box_id: Box ID of the cargo
+            op: "open" or "close"
+
+        Returns:
+            - True => Done
+            - False => Request Failed
+        """
+        if op not in self.__CARGO_OPERATIONS:
+            self.__LOGGER.WARNING(f"Invalid Cargo Operation: {op}")
+            return False
+        response: combined_Result = self.__REST_ADAPTER.put(
+            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/cargos/{cargo_id}/boxes/{box_id}/{op}",
+            response_type=Response_Type.EMPTY,
+        )
+        return self.__check(response, f"Cargo {cargo_id} Box {box_id} {op}")
+
+    def start_pickup(self) -> bool:
+        """Notify the robot that the user starts taking the items. Call it at "ARRIVED_AT_TARGET".
+
+        Returns:
+            - True => Done
+            - False => Request Failed
+        """
+        response: combined_Result = self.__REST_ADAPTER.put(
+            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/tasks/:start_pickup",
+            response_type=Response_Type.EMPTY,
+        )
+        return self.__check(response, "Start Pickup")
+
+    def end_pickup(self) -> bool:
+        """Notify the robot that the user took the items
+
+        Returns:
+            - True => Done
+            - False => Request Failed
+        """
+        response: combined_Result = self.__REST_ADAPTER.put(
+            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/tasks/:end_pickup",
+            response_type=Response_Type.EMPTY,
+        )
+        return self.__check(response, "End Pickup")
+
+    ##############################################################################################################
+    # Private Methods
+    ##############################################################################################################
+
+    def __valid_task(self, task: DictType) -> bool:
+        if task.get("task_type") not in self.__TASK_TYPES:
+            self.__LOGGER.WARNING(f"Invalid Task Type: {task.get('task_type')}")
+            return False
+        return True
+
+    def __check(self, response: combined_Result, operation: str) -> bool:
+        if response.status_code == 200:
+            return True
+        else:
+            self.__LOGGER.ERROR(f"{operation} Failed | {response.status_code}")
+            return False
@@ -0,0 +1,340 @@
+from robotComms.utils.rest_adapter import restAdapter
+from robotComms.utils.logger import systemLogger
+from robotComms.utils.tracing import traced_api
+from robotComms.utils.results import (
+    combined_Result,
+    Response_Type,
+    DictType,
+    CombinedType,
+)
+
+from requests.exceptions import RequestException
+import base64
+import hashlib
+import os
+import time
+import typing
+
+
+@traced_api(arguments={"upload_id": "upload_id"})
+class firmware:
+    ##############################################################################################################
+    # Class Setup
+    ##############################################################################################################
+
+    __IP_ADDR: str = ""
+    __API_VERSION: str = ""
+    __API_TAG: str = "api/core/firmware"
+    # 1 MiB => A dropped link loses at most one chunk, and one chunk is all that is held in memory
+    __CHUNK_SIZE: int = 1024 * 1024
+    __UPGRADE_STAGES_DONE: typing.List[str] = ["DONE", "FAILED"]
+
+    def __init__(
+        self,
+        ip_addr: str,
+        api_version: str,
+        logger: systemLogger,
+        rest_adapter: typing.Optional[restAdapter] = None,
+    ):
+        self.__IP_ADDR = ip_addr
+        self.__API_VERSION = api_version
+        self.__LOGGER = logger
+        self.__REST_ADAPTER = rest_adapter or restAdapter(self.__LOGGER)
+
+    ##############################################################################################################
+    # Getters
+    ##############################################################################################################
+
+    def get_upgrade_status(self) -> DictType:
+        """Get the firmware version and the state of the upgrade
+
+        Returns:
+            Example:
+                {
+                    "version": "4.6.0",
+                    "stage": "IDLE",
+                    "progress": 0
+                }
+            Stages: "IDLE", "VERIFYING", "INSTALLING", "REBOOTING", "DONE", "FAILED"
+        """
+        response: combined_Result = self.__REST_ADAPTER.get(
+            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/status",
+            response_type=Response_Type.JSON,
+        )
+        result: CombinedType = response.data
+        if response.status_code == 200 and isinstance(result, dict):
+            return result
+        else:
+            return {}
+
+    def get_upload(self, upload_id: str) -> DictType:
+        """Get an upload session. The offset is where an interrupted upload resumes.
+
+        Args:
+            upload_id: ID returned by `create_upload()`
+
+        Returns:
+            Example:
+                {
+                    "upload_id": "7",
+                    "file_name": "firmware-4.6.0.bin",
+                    "size": 73400320,
+                    "sha256": "9f86d0...",
+                    "offset": 1048576
+                }
+        """
+        response: combined_Result = self.__REST_ADAPTER.get(
+            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/uploads/{upload_id}",
+            response_type=Response_Type.JSON,
+        )
+        result: CombinedType = response.data
+        if response.status_code == 200 and isinstance(result, dict):
+            return result
+        else:
+            return {}
+
+    ##############################################################################################################
+    # Setters
+    ##############################################################################################################
+
+    def create_upload(self, file_name: str, size: int, sha256: str) -> DictType:
+        """Open an upload session for a firmware image
+
+        Args:
+            file_name: Name of the image. Example: "firmware-4.6.0.bin"
+            size: Image size in bytes
+            sha256: Hex SHA-256 of the whole image, checked by the robot once complete
+
+        Returns:
+            Upload Session, same format as `get_upload()`. Empty on failure.
+        """
+        response: combined_Result = self.__REST_ADAPTER.post(
+            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/uploads",
+            response_type=Response_Type.JSON,
+            body_params={"file_name": file_name, "size": size, "sha256": sha256},
+        )
+        result: CombinedType = response.data
+        if response.status_code == 200 and isinstance(result, dict):
+            return result
+        else:
+            self.__LOGGER.ERROR(f"Create Upload of {file_name} Failed | {response.status_code}")
+            return {}
+
+    def upload_chunk(self, upload_id: str, offset: int, chunk: bytes, size: int) -> int:
+        """Send one chunk of an image. The robot rejects chunks whose SHA-256 digest does not match.
+
+        Args:
+            upload_id: ID returned by `create_upload()`
+            offset: Position of the chunk in the image
+            chunk: Bytes of the chunk
+            size: Image size in bytes
+
+        Returns:
+            Offset after the chunk as stored by the robot. -1 on failure.
+        """
+        digest = base64.b64encode(hashlib.sha256(chunk).digest()).decode("ascii")
+        response: combined_Result = self.__REST_ADAPTER.put(
+            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/uploads/{upload_id}",
+            response_type=Response_Type.JSON,
+            body_params=chunk,
+            header_params={
+                "Content-Range": f"bytes {offset}-{offset + len(chunk) - 1}/{size}",
+                "Digest": f"sha-256={digest}",
+            },
+        )
+        result: CombinedType = response.data
+        if response.status_code == 200 and isinstance(result, dict):
+            return int(result.get("offset", -1))
+        else:
+            self.__LOGGER.ERROR(
+                f"Chunk at {offset} of Upload {upload_id} Failed | {response.status_code}"
+            )
+            return -1
+
+    def cancel_upload(self, upload_id: str) -> bool:
+        """Drop an upload session and its received bytes
+
+        Args:
+            upload_id: ID returned by `create_upload()`
+
+        Returns:
+            - True => Dropped
+            - False => Request Failed
+        """
+        response: combined_Result = self.__REST_ADAPTER.delete(
+            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/uploads/{upload_id}",
+            response_type=Response_Type.EMPTY,
+        )
+        return response.status_code == 200
+
+    def upload_firmware(
+        self,
+        file_path: str,
+        upload_id: typing.Optional[str] = None,
+        chunk_size: typing.Optional[int] = None,
+        max_retries: int = 5,
+        retry_delay_s: float = 2.0,
+        progress: typing.Optional[typing.Callable[[int, int], None]] = None,
+    ) -> DictType:
+        """Stream a firmware image from disk in chunks. Only one chunk is held in memory.
+
+        A dropped link (timeout, VPN reconnect) is retried: the robot is asked for the bytes it already
+        stored and the upload continues from there. Pass the `upload_id` of an earlier result to resume
+        an upload after a restart of the caller.
+
+        Args:
+            file_path: Firmware Image. Example: "firmware-4.6.0.bin"
+            upload_id: Resume this upload session (Default: None => New session)
+            chunk_size: Bytes per request (Default: 1 MiB)
+            max_retries: Failed attempts in a row before giving up
+            retry_delay_s: Wait before the first retry, doubled on every retry in a row
+            progress: Called with (sent bytes, image size) after every chunk
+
+        Returns:
+            Example:
+                {
+                    "upload_id": "7",
+                    "success": true,
+                    "size": 73400320,
+                    "sha256": "9f86d0...",
+                    "resumed_from": 0,
+                    "retries": 1,
+                    "duration_s": 41.2
+                }
+        """
+        start = time.perf_counter()
+        chunk_size = chunk_size or self.__CHUNK_SIZE
+        size = os.path.getsize(file_path)
+        sha256 = self.__file_sha256(file_path, chunk_size)
+        report: DictType = {
+            "upload_id": upload_id,
+            "success": False,
+            "size": size,
+            "sha256": sha256,
+            "resumed_from": 0,
+            "retries": 0,
+            "duration_s": 0.0,
+        }
+
+        offset = 0
+        if upload_id is not None:
+            session = self.get_upload(upload_id)
+            if session.get("sha256") != sha256:
+                self.__LOGGER.ERROR(f"Upload {upload_id} is not for {file_path}")
+                return report
+            offset = report["resumed_from"] = int(session.get("offset", 0))
+        else:
+            session = self.create_upload(os.path.basename(file_path), size, sha256)
+            if not session:
+                return report
+            upload_id = report["upload_id"] = str(session["upload_id"])
+        self.__LOGGER.INFO(f"Upload {upload_id} of {file_path} | {size} bytes from {offset}")
+
+        failures = 0
+        with open(file_path, "rb") as image:
+            while offset < size:
+                image.seek(offset)
+                chunk = image.read(chunk_size)
+                try:
+                    stored = self.upload_chunk(upload_id, offset, chunk, size)
+                except RequestException as e:
+                    self.__LOGGER.WARNING(f"Upload {upload_id} Link Dropped at {offset} | {e}")
+                    stored = -1
+                if stored > offset:
+                    offset = stored
+                    failures = 0
+                    if progress is not None:
+                        progress(offset, size)
+                    continue
+
+                failures += 1
+                report["retries"] += 1
+                if failures > max_retries:
+                    self.__LOGGER.ERROR(f"Upload {upload_id} Gave Up at {offset}/{size}")
+                    report["duration_s"] = round(time.perf_counter() - start, 3)
+                    return report
+                time.sleep(retry_delay_s * 2 ** (failures - 1))
+                # The chunk may have arrived before the link dropped => Ask where to resume
+                try:
+                    offset = int(self.get_upload(upload_id).get("offset", offset))
+                except RequestException:
+                    pass
+
+        report["success"] = offset == size
+        report["duration_s"] = round(time.perf_counter() - start, 3)
+        self.__LOGGER.INFO(
+            f"Upload {upload_id} Done in {report['duration_s']}s | Retries: {report['retries']}"
+        )
+        return report
+
+    def start_upgrade(self, upload_id: str) -> bool:
+        """Verify the uploaded image against its SHA-256 and install it. The robot reboots afterwards.
+
+        Args:
+            upload_id: ID of a complete upload
+
+        Returns:
+            - True => Upgrade Started
+            - False => Request Failed or image rejected
+        """
+        response: combined_Result = self.__REST_ADAPTER.post(
+            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/upgrade",
+            response_type=Response_Type.EMPTY,
+            body_params={"upload_id": upload_id},
+        )
+        if response.status_code == 200:
+            return True
+        else:
+            self.__LOGGER.ERROR(f"Upgrade from Upload {upload_id} Failed | {response.status_code}")
+            return False
+
+    def wait_for_upgrade(
+        self,
+        timeout_s: float = 600.0,
+        poll_interval_s: float = 5.0,
+        version_before: typing.Optional[str] = None,
+    ) -> DictType:
+        """Poll the upgrade started by `start_upgrade()` until it is done. Requests failing while the
+        robot reboots are ignored.
+
+        The robot may still report the "DONE" or "FAILED" of an earlier upgrade right after
+        `start_upgrade()`. Such a stage only ends the wait once the robot reported another stage since,
+        or reports a version other than `version_before`.
+
+        Args:
+            timeout_s: Max wait in seconds
+            poll_interval_s: Time between two polls in seconds
+            version_before: Version before `start_upgrade()`. Example: "4.5.2"
+
+        Returns:
+            Last status of `get_upgrade_status()`. Empty when the robot did not answer before the timeout.
+        """
+        deadline = time.monotonic() + timeout_s
+        status: DictType = {}
+        started = False
+        while time.monotonic() < deadline:
+            try:
+                status = self.get_upgrade_status()
+            except RequestException:
+                status = {}
+            if status.get("stage") in self.__UPGRADE_STAGES_DONE:
+                if started or (
+                    version_before is not None and status.get("version") != version_before
+                ):
+                    return status
+            elif status:
+                started = True
+            time.sleep(poll_interval_s)
+        self.__LOGGER.ERROR(f"Upgrade not done after {timeout_s}s | {status}")
+        return status
+
+    ##############################################################################################################
+    # Private Methods
+    ##############################################################################################################
+
+    def __file_sha256(self, file_path: str, chunk_size: int) -> str:
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as image:
+            for chunk in iter(lambda: image.read(chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
@@ -1,5 +1,6 @@
 from robotComms.utils.rest_adapter import restAdapter
 from robotComms.utils.logger import systemLogger
+from robotComms.utils.tracing import traced_api
 from robotComms.utils.results import (
     combined_Result,
     Response_Type,
@@ -11,6 +12,7 @@ from robotComms.utils.results import (
 import typing
 
 
+@traced_api(arguments={"id": "action_id"})
 class motion:
     ##############################################################################################################
     # Class Setup
@@ -20,11 +22,17 @@ class motion:
     __API_VERSION: str = ""
     __API_TAG: str = "api/core/motion"
 
-    def __init__(self, ip_addr: str, api_version: str, logger: systemLogger):
+    def __init__(
+        self,
+        ip_addr: str,
+        api_version: str,
+        logger: systemLogger,
+        rest_adapter: typing.Optional[restAdapter] = None,
+    ):
         self.__IP_ADDR = ip_addr
         self.__API_VERSION = api_version
         self.__LOGGER = logger
-        self.__REST_ADAPTER = restAdapter(self.__LOGGER)
+        self.__REST_ADAPTER = rest_adapter or restAdapter(self.__LOGGER)
 
     ##############################################################################################################
     # Getters
@@ -74,7 +82,7 @@ class motion:
             endpoint = "actions/:current"
         response: combined_Result = self.__REST_ADAPTER.get(
             full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/{endpoint}",
-            response_type=Response_Type.LIST_JSON,
+            response_type=Response_Type.JSON,
         )
         result: CombinedType = response.data
         return result
@@ -0,0 +1,384 @@
+from robotComms.utils.rest_adapter import restAdapter
+from robotComms.utils.logger import systemLogger
+from robotComms.utils.tracing import traced_api
+from robotComms.utils.cache import ttlCache
+from robotComms.utils.results import (
+    combined_Result,
+    Response_Type,
+    DictType,
+    ListDictType,
+    CombinedType,
+)
+
+from concurrent.futures import Future, ThreadPoolExecutor
+import contextvars
+import threading
+import typing
+
+
+@traced_api
+class multi_floor:
+    ##############################################################################################################
+    # Class Setup
+    ##############################################################################################################
+
+    __IP_ADDR: str = ""
+    __API_VERSION: str = ""
+    __API_TAG: str = "api/multi-floor"
+    # POI type of the elevator entrances
+    __ELEVATOR_POI_TYPE: str = "ELEVATOR"
+    # POIs and maps only change through a deployment => Long lived cache
+    __CACHE_TTL_S: float = 600.0
+    # Maps are a few MB each => Only the last floors are kept
+    __CACHE_MAX_ENTRIES: int = 64
+
+    def __init__(
+        self,
+        ip_addr: str,
+        api_version: str,
+        logger: systemLogger,
+        rest_adapter: typing.Optional[restAdapter] = None,
+    ):
+        self.__IP_ADDR = ip_addr
+        self.__API_VERSION = api_version
+        self.__LOGGER = logger
+        self.__REST_ADAPTER = rest_adapter or restAdapter(self.__LOGGER)
+        self.__CACHE = ttlCache(ttl_s=self.__CACHE_TTL_S, max_entries=self.__CACHE_MAX_ENTRIES)
+        self.__CURRENT: typing.Tuple[typing.Optional[str], typing.Optional[str]] = (None, None)
+        self.__PREFETCH: typing.Dict[typing.Tuple[typing.Optional[str], str], Future] = {}
+        self.__POOL: typing.Optional[ThreadPoolExecutor] = None
+        self.__POOL_LOCK = threading.Lock()
+
+    ##############################################################################################################
+    # Getters
+    ##############################################################################################################
+
+    def get_pois(
+        self,
+        floor: typing.Optional[str] = None,
+        building: typing.Optional[str] = None,
+        poi_type: typing.Optional[str] = None,
+        group: typing.Optional[str] = None,
+        refresh: bool = False,
+    ) -> ListDictType:
+        """Get the POIs of the multi-floor map with building and floor information. Results are cached per query.
+
+        Args:
+            floor: Floor Name. Example: "2F" (Default: None => All floors)
+            building: Building Name. Example: "E" (Default: None => All buildings)
+            poi_type: POI Type. Example: "PARKING" (Default: None => All types)
+            group: POI Group (Default: None => All groups)
+            refresh: Fetch again instead of using the cache
+
+        Returns:
+            Example:
+                [
+                    {
+                        "id": "3fa85f64-5717-4562-b3fc-2c963f66afa6",
+                        "poi_name": "Room 201",
+                        "building": "E",
+                        "floor": "2F",
+                        "type": "",
+                        "group": "",
+                        "pose": {"x": 0, "y": 0, "yaw": 0}
+                    }
+                ]
+        """
+        key = ("pois", building, floor, poi_type, group)
+        if refresh:
+            self.__CACHE.invalidate(key)
+        params = {
+            name: value
+            for name, value in (
+                ("floor", floor),
+                ("building", building),
+                ("type", poi_type),
+                ("group", group),
+            )
+            if value is not None
+        }
+        return self.__CACHE.get_or_load(key, lambda: self.__fetch_pois(params))
+
+    def get_buildings(self, refresh: bool = False) -> typing.Dict[str, typing.List[str]]:
+        """Get the buildings and their floors, derived from the POIs of the map
+
+        Args:
+            refresh: Fetch the POIs again
+
+        Returns:
+            Example:
+                {
+                    "E": ["1F", "2F"]
+                }
+        """
+        buildings: typing.Dict[str, typing.List[str]] = {}
+        for poi in self.get_pois(refresh=refresh):
+            floors = buildings.setdefault(str(poi.get("building", "")), [])
+            floor = str(poi.get("floor", ""))
+            if floor not in floors:
+                floors.append(floor)
+        for floors in buildings.values():
+            floors.sort()
+        return buildings
+
+    def get_elevators(
+        self,
+        floor: typing.Optional[str] = None,
+        building: typing.Optional[str] = None,
+        refresh: bool = False,
+    ) -> ListDictType:
+        """Get the elevator POIs of a floor. Filtered from the cached POIs of the floor, no extra request.
+
+        Args:
+            floor: Floor Name (Default: None => All floors)
+            building: Building Name (Default: None => All buildings)
+            refresh: Fetch the POIs again
+
+        Returns:
+            POIs of type "ELEVATOR", same format as `get_pois()`
+        """
+        return [
+            poi
+            for poi in self.get_pois(floor=floor, building=building, refresh=refresh)
+            if poi.get("type") == self.__ELEVATOR_POI_TYPE
+        ]
+
+    def get_floor_map(
+        self,
+        floor: typing.Optional[str] = None,
+        building: typing.Optional[str] = None,
+        refresh: bool = False,
+    ) -> bytes:
+        """Get the stcm map of a floor. Maps are cached per floor.
+
+        Args:
+            floor: Floor Name (Default: None => Map loaded on the robot)
+            building: Building Name (Default: None => Map loaded on the robot)
+            refresh: Download again instead of using the cache
+
+        Returns:
+            stcm bytes. Empty bytes on failure.
+        """
+        key = ("map", building, floor)
+        if refresh:
+            self.__CACHE.invalidate(key)
+        params = {
+            name: value
+            for name, value in (("floor", floor), ("building", building))
+            if value is not None
+        }
+        return self.__CACHE.get_or_load(key, lambda: self.__fetch_map(params))
+
+    def get_current_floor(self) -> typing.Tuple[typing.Optional[str], typing.Optional[str]]:
+        """
+        Returns:
+            (building, floor) of the last `switch_floor()`. (None, None) before the first switch.
+        """
+        return self.__CURRENT
+
+    ##############################################################################################################
+    # Setters
+    ##############################################################################################################
+
+    def upload_map(self, stcm: bytes) -> bool:
+        """Upload a map. The map is saved on the robot but not loaded, call `reload_map()` afterwards.
+
+        Args:
+            stcm: Map File. Example: open("building.stcm", "rb").read()
+
+        Returns:
+            - True => Uploaded
+            - False => Request Failed
+        """
+        return self.__map_operation("stcm", stcm)
+
+    def reload_map(self) -> bool:
+        """Load the uploaded map into Slamware
+
+        Returns:
+            - True => Reloaded
+            - False => Request Failed
+        """
+        return self.__map_operation("stcm/:reload")
+
+    def save_map(self) -> bool:
+        """Persistently save the current map
+
+        Returns:
+            - True => Saved
+            - False => Request Failed
+        """
+        return self.__map_operation("stcm/:save", invalidate=False)
+
+    def sync_map(self) -> bool:
+        """Synchronize the map loaded through RoboStudio and save it
+
+        Returns:
+            - True => Synchronized
+            - False => Request Failed
+        """
+        return self.__map_operation("stcm/:sync")
+
+    def set_pose_to_poi(self, poi_name: str) -> bool:
+        """Set the robot pose to a POI. Used to recover the localization, for example after leaving an elevator.
+
+        Args:
+            poi_name: Name of the POI. Example: "Room 201"
+
+        Returns:
+            - True => Pose Set
+            - False => Request Failed
+        """
+        response: combined_Result = self.__REST_ADAPTER.put(
+            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/localization/{self.__API_VERSION}/pose",
+            response_type=Response_Type.EMPTY,
+            body_params={"poi_name": poi_name},
+        )
+        if response.status_code == 200:
+            return True
+        else:
+            self.__LOGGER.ERROR(f"Set Pose to POI {poi_name} Failed | {response.status_code}")
+            return False
+
+    def prepare_floor(self, floor: str, building: typing.Optional[str] = None) -> Future:
+        """Prefetch the POIs and the map of a floor in the background
+
+        Call it when the robot enters the elevator, so `switch_floor()` finds everything cached.
+        A floor which is already being prefetched returns the pending Future.
+
+        Args:
+            floor: Floor Name. Example: "2F"
+            building: Building Name (Default: None => Any building)
+
+        Returns:
+            Future of the prefetch. Result: True when the map and the POIs were fetched.
+        """
+        key = (building, floor)
+        with self.__POOL_LOCK:
+            future = self.__PREFETCH.get(key)
+            if future is not None and not future.done():
+                return future
+            if self.__POOL is None:
+                self.__POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="multi_floor")
+            # Copied context => Tracing spans of the prefetch stay under the calling API span
+            future = self.__POOL.submit(
+                contextvars.copy_context().run, self.__prefetch, floor, building
+            )
+            self.__PREFETCH[key] = future
+        return future
+
+    def switch_floor(
+        self,
+        floor: str,
+        building: typing.Optional[str] = None,
+        poi_name: typing.Optional[str] = None,
+        timeout_s: float = 30.0,
+    ) -> bool:
+        """Make a floor the current one
+
+        Waits for the prefetch of the floor (started here when `prepare_floor()` was not called) and
+        relocalizes the robot to `poi_name` when passed.
+
+        Args:
+            floor: Floor Name. Example: "2F"
+            building: Building Name (Default: None => Any building)
+            poi_name: Relocalize to this POI. Example: Elevator exit on the new floor. (Default: None => Keep the pose)
+            timeout_s: Max wait for the prefetch in seconds
+
+        Returns:
+            - True => Floor ready and current
+            - False => Prefetch or relocalization failed
+        """
+        future = self.prepare_floor(floor, building)
+        try:
+            ready = future.result(timeout=timeout_s)
+        except Exception as e:
+            self.__LOGGER.ERROR(f"Prefetch of {building}/{floor} Failed | {e}")
+            return False
+        if not ready:
+            return False
+        if poi_name is not None and not self.set_pose_to_poi(poi_name):
+            return False
+        self.__CURRENT = (building, floor)
+        self.__LOGGER.INFO(f"Current Floor: {building}/{floor}")
+        return True
+
+    def invalidate(
+        self, floor: typing.Optional[str] = None, building: typing.Optional[str] = None
+    ) -> int:
+        """Drop cached POIs and maps. Queries over all floors or buildings are dropped as well.
+
+        Args:
+            floor: Floor Name (Default: None => All floors)
+            building: Building Name (Default: None => All buildings)
+
+        Returns:
+            Number of dropped entries
+        """
+        return self.__CACHE.invalidate_where(
+            lambda key: (building is None or key[1] in (building, None))
+            and (floor is None or key[2] in (floor, None))
+        )
+
+    def close(self) -> None:
+        """
+        Stop the prefetch threads
+        """
+        with self.__POOL_LOCK:
+            if self.__POOL is not None:
+                self.__POOL.shutdown(wait=True)
+                self.__POOL = None
+            self.__PREFETCH.clear()
+
+    ##############################################################################################################
+    # Private Methods
+    ##############################################################################################################
+
+    def __fetch_pois(self, params: DictType) -> ListDictType:
+        response: combined_Result = self.__REST_ADAPTER.get(
+            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/map/{self.__API_VERSION}/pois",
+            response_type=Response_Type.LIST_JSON,
+            dict_params=params or None,
+        )
+        result: CombinedType = response.data
+        if isinstance(result, list):
+            return result
+        else:
+            return []
+
+    def __fetch_map(self, params: DictType) -> bytes:
+        response: combined_Result = self.__REST_ADAPTER.get(
+            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/map/{self.__API_VERSION}/stcm",
+            response_type=Response_Type.BYTES,
+            dict_params=params or None,
+        )
+        result = response.data
+        if response.status_code == 200 and isinstance(result, bytes):
+            return result
+        else:
+            return b""
+
+    def __prefetch(self, floor: str, building: typing.Optional[str]) -> bool:
+        pois = self.get_pois(floor=floor, building=building)
+        stcm = self.get_floor_map(floor=floor, building=building)
+        self.__LOGGER.INFO(
+            f"Prefetched {building}/{floor} | {len(pois)} POIs | {len(stcm)} bytes map"
+        )
+        return bool(stcm)
+
+    def __map_operation(
+        self, endpoint: str, stcm: typing.Optional[bytes] = None, invalidate: bool = True
+    ) -> bool:
+        response: combined_Result = self.__REST_ADAPTER.post(
+            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/map/{self.__API_VERSION}/{endpoint}",
+            response_type=Response_Type.EMPTY,
+            body_params=stcm,
+        )
+        if invalidate:
+            # The robot side map changed => Every floor may have new POIs
+            self.__CACHE.clear()
+        if response.status_code == 200:
+            return True
+        else:
+            self.__LOGGER.ERROR(f"Map Operation {endpoint} Failed | {response.status_code}")
+            return False
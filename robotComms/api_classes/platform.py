@@ -1,5 +1,6 @@
 from robotComms.utils.rest_adapter import restAdapter
 from robotComms.utils.logger import systemLogger
+from robotComms.utils.tracing import traced_api
 from robotComms.utils.results import (
     combined_Result,
     Response_Type,
@@ -7,7 +8,10 @@ from robotComms.utils.results import (
     CombinedType,
 )
 
+import typing
 
+
+@traced_api
 class platform:
     ##############################################################################################################
     # Class Setup
@@ -17,11 +21,17 @@ class platform:
     __API_VERSION: str = ""
     __API_TAG: str = "api/platform"
 
-    def __init__(self, ip_addr: str, api_version: str, logger: systemLogger):
+    def __init__(
+        self,
+        ip_addr: str,
+        api_version: str,
+        logger: systemLogger,
+        rest_adapter: typing.Optional[restAdapter] = None,
+    ):
         self.__IP_ADDR = ip_addr
         self.__API_VERSION = api_version
         self.__LOGGER = logger
-        self.__REST_ADAPTER = restAdapter(self.__LOGGER)
+        self.__REST_ADAPTER = rest_adapter or restAdapter(self.__LOGGER)
 
     ##############################################################################################################
     # Getters
@@ -0,0 +1,209 @@
+from robotComms.utils.rest_adapter import restAdapter
+from robotComms.utils.logger import systemLogger
+from robotComms.utils.tracing import traced_api
+from robotComms.utils.sensor_readout import sensorReadout, sensorChanges, SENSOR_TYPES
+from robotComms.utils.results import (
+    combined_Result,
+    Response_Type,
+    ListDictType,
+    DictType,
+    CombinedType,
+)
+
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import threading
+import time
+import typing
+
+import numpy as np
+
+
+@traced_api(arguments={"id": "sensor_id"})
+class sensors:
+    ##############################################################################################################
+    # Class Setup
+    ##############################################################################################################
+
+    __IP_ADDR: str = ""
+    __API_VERSION: str = ""
+    __API_TAG: str = "api/core/sensors"
+    # Concurrent requests of one batch. Stays below the connection pool of `restAdapter`
+    __MAX_WORKERS: int = 8
+
+    def __init__(
+        self,
+        ip_addr: str,
+        api_version: str,
+        logger: systemLogger,
+        rest_adapter: typing.Optional[restAdapter] = None,
+    ):
+        self.__IP_ADDR = ip_addr
+        self.__API_VERSION = api_version
+        self.__LOGGER = logger
+        self.__REST_ADAPTER = rest_adapter or restAdapter(self.__LOGGER)
+        self.__SENSORS: typing.Optional[ListDictType] = None
+        self.__TYPES: np.ndarray = np.array([], dtype="<U8")
+        self.__POOL: typing.Optional[ThreadPoolExecutor] = None
+        self.__POOL_LOCK = threading.Lock()
+
+    ##############################################################################################################
+    # Getters
+    ##############################################################################################################
+
+    def get_sensors(
+        self, sensor_type: typing.Optional[str] = None, refresh: bool = False
+    ) -> ListDictType:
+        """Get the sensors mounted on the robot. The list is fetched once and cached.
+
+        Args:
+            sensor_type: Only sensors of this type. One of "bumper", "cliff", "sonar", "depth". (Default: None => All sensors)
+            refresh: Fetch the list again
+
+        Returns:
+            Example:
+                [
+                    {
+                        "id": 0,
+                        "type": "bumper",
+                        "name": "front_left",
+                        "pose": {"x": 0.2, "y": 0.1, "yaw": 0.52}
+                    }
+                ]
+        """
+        if sensor_type is not None and sensor_type not in SENSOR_TYPES:
+            self.__LOGGER.ERROR(f"Invalid Sensor Type: {sensor_type}")
+            return []
+        if self.__SENSORS is None or refresh:
+            response: combined_Result = self.__REST_ADAPTER.get(
+                full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/sensors",
+                response_type=Response_Type.LIST_JSON,
+            )
+            result: CombinedType = response.data
+            if not isinstance(result, list):
+                return []
+            self.__SENSORS = result
+            types = np.full(
+                max((int(sensor["id"]) for sensor in result), default=-1) + 1, "", "<U8"
+            )
+            for sensor in result:
+                types[int(sensor["id"])] = str(sensor.get("type", ""))
+            self.__TYPES = types
+        if sensor_type is None:
+            return list(self.__SENSORS)
+        return [sensor for sensor in self.__SENSORS if sensor.get("type") == sensor_type]
+
+    def get_sensor_value(self, id: int) -> DictType:
+        """Get the current value of one sensor
+
+        Args:
+            id: Sensor ID from `get_sensors()`
+
+        Returns:
+            Example:
+                {
+                    "id": 0,
+                    "value": 0.0,
+                    "is_triggered": false,
+                    "timestamp": 7366277
+                }
+        """
+        response: combined_Result = self.__REST_ADAPTER.get(
+            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/sensors/{id}",
+            response_type=Response_Type.JSON,
+        )
+        result: CombinedType = response.data
+        if isinstance(result, dict):
+            return result
+        else:
+            return {}
+
+    def read_sensors(
+        self,
+        sensor_type: typing.Optional[str] = None,
+        ids: typing.Optional[typing.Iterable[int]] = None,
+    ) -> sensorReadout:
+        """Read many sensors in one concurrent batch over the kept-alive connections
+
+        Args:
+            sensor_type: Only sensors of this type. (Default: None => All sensors)
+            ids: Only these Sensor IDs. Overrides sensor_type.
+
+        Returns:
+            Readout with arrays indexed by sensor id. Example: readout.triggered[3], readout.values[sonar_ids]
+            Sensors which failed to answer are not valid in the readout.
+        """
+        if ids is None:
+            ids = [int(sensor["id"]) for sensor in self.get_sensors(sensor_type)]
+        else:
+            self.get_sensors()
+        taken_at = time.time()
+        pool = self.__pool()
+        futures = [
+            # Copied context => Tracing spans of the batch stay under the calling API span
+            pool.submit(contextvars.copy_context().run, self.get_sensor_value, sensor_id)
+            for sensor_id in ids
+        ]
+        readings = [future.result() for future in futures]
+        return sensorReadout.from_list(readings, taken_at, self.__TYPES.copy())
+
+    def watch(
+        self,
+        rate_hz: float = 5.0,
+        deadband: float = 0.0,
+        sensor_type: typing.Optional[str] = None,
+        stop_event: typing.Optional[threading.Event] = None,
+    ) -> typing.Iterator[sensorChanges]:
+        """Poll the sensors and yield only when something changed (edge triggered)
+
+        Args:
+            rate_hz: Batches per second. (Default: 5Hz)
+            deadband: Value changes up to this amount are ignored. Example: 0.05 => 5 cm for sonars
+            sensor_type: Only sensors of this type. (Default: None => All sensors)
+            stop_event: Ends the iteration once set. (Default: None => Until the loop breaks)
+
+        Returns:
+            Iterator of Changes. The first item reports every sensor.
+        """
+        period_s = 1.0 / rate_hz
+        stop_event = stop_event or threading.Event()
+        previous: typing.Optional[sensorReadout] = None
+        next_tick = time.monotonic()
+        while not stop_event.is_set():
+            readout = self.read_sensors(sensor_type)
+            changes = readout.changes_from(previous, deadband)
+            # Sensors within the deadband keep their last reported value => Slow drifts still show up
+            if previous is not None:
+                unchanged = np.setdiff1d(readout.ids(), changes.changed)
+                readout.values[unchanged] = previous.values[unchanged]
+            previous = readout
+            if changes:
+                yield changes
+            next_tick += period_s
+            stop_event.wait(max(0.0, next_tick - time.monotonic()))
+            next_tick = max(next_tick, time.monotonic())
+
+    ##############################################################################################################
+    # Setters
+    ##############################################################################################################
+
+    def close(self) -> None:
+        """
+        Stop the threads of the batch reads
+        """
+        with self.__POOL_LOCK:
+            if self.__POOL is not None:
+                self.__POOL.shutdown(wait=True)
+                self.__POOL = None
+
+    ##############################################################################################################
+    # Private Methods
+    ##############################################################################################################
+
+    def __pool(self) -> ThreadPoolExecutor:
+        with self.__POOL_LOCK:
+            if self.__POOL is None:
+                self.__POOL = ThreadPoolExecutor(
+                    max_workers=self.__MAX_WORKERS, thread_name_prefix="sensors"
+                )
+            return self.__POOL
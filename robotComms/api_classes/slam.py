@@ -1,14 +1,19 @@
 from robotComms.utils.rest_adapter import restAdapter
 from robotComms.utils.logger import systemLogger
+from robotComms.utils.tracing import traced_api
 from robotComms.utils.results import (
     combined_Result,
     Response_Type,
     DictType,
     ListDictType,
     CombinedType,
+    stream_Result,
 )
 
+import typing
 
+
+@traced_api
 class slam:
     ##############################################################################################################
     # Class Setup
@@ -18,11 +23,17 @@ class slam:
     __API_VERSION: str = ""
     __API_TAG: str = "api/core/slam"
 
-    def __init__(self, ip_addr: str, api_version: str, logger: systemLogger):
+    def __init__(
+        self,
+        ip_addr: str,
+        api_version: str,
+        logger: systemLogger,
+        rest_adapter: typing.Optional[restAdapter] = None,
+    ):
         self.__IP_ADDR = ip_addr
         self.__API_VERSION = api_version
         self.__LOGGER = logger
-        self.__REST_ADAPTER = restAdapter(self.__LOGGER)
+        self.__REST_ADAPTER = rest_adapter or restAdapter(self.__LOGGER)
 
     ##############################################################################################################
     # Getters
@@ -92,9 +103,9 @@ class slam:
             response_type=Response_Type.STR,
         )
         result: CombinedType = response.data
-        if isinstance(result, str):
-            return int(result)
-        else:
+        try:
+            return int(float(result))
+        except (TypeError, ValueError):
             return 0
 
     def check_if_localization_is_enabled(self) -> bool:
@@ -270,14 +281,44 @@ class slam:
         result: CombinedType = response.data
         return result
 
-    def get_composite_map(self) -> str:
-        """A composite map containing all data. The response message is a binary byte stream and can be directly saved as an stcm file."""
+    def get_composite_map(self) -> bytes:
+        """A composite map containing all data. The response message is a binary byte stream and can be directly saved as an stcm file.
+
+        Returns:
+            stcm bytes. Empty bytes on failure.
+        """
         response: combined_Result = self.__REST_ADAPTER.get(
             full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/maps/stcm",
-            response_type=Response_Type.STR,
+            response_type=Response_Type.BYTES,
         )
-        result: CombinedType = response.data
-        return result
+        result = response.data
+        if response.status_code == 200 and isinstance(result, bytes):
+            return result
+        else:
+            return b""
+
+    def save_composite_map(self, file_path: str) -> bool:
+        """Stream the composite map into an stcm file without holding the whole map in memory
+
+        Args:
+            file_path: Target File. Example: "map.stcm"
+
+        Returns:
+            - True => Map Saved
+            - False => Request Failed
+        """
+        response: combined_Result = self.__REST_ADAPTER.get(
+            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/maps/stcm",
+            response_type=Response_Type.STREAM,
+        )
+        if response.status_code != 200:
+            if isinstance(response, stream_Result):
+                response.close()
+            self.__LOGGER.ERROR(f"Composite Map Download Failed | {response.status_code}")
+            return False
+        written = response.save(file_path)
+        self.__LOGGER.INFO(f"Composite Map Saved to {file_path} | {written} bytes")
+        return True
 
     ##############################################################################################################
     # Setters
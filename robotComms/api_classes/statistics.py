@@ -1,13 +1,16 @@
 from robotComms.utils.rest_adapter import restAdapter
 from robotComms.utils.logger import systemLogger
+from robotComms.utils.tracing import traced_api
 from robotComms.utils.results import (
     combined_Result,
     Response_Type,
-    DictType,
     CombinedType,
 )
 
+import typing
 
+
+@traced_api
 class statistics:
     ##############################################################################################################
     # Class Setup
@@ -17,11 +20,17 @@ class statistics:
     __API_VERSION: str = ""
     __API_TAG: str = "api/core/statistics"
 
-    def __init__(self, ip_addr: str, api_version: str, logger: systemLogger):
+    def __init__(
+        self,
+        ip_addr: str,
+        api_version: str,
+        logger: systemLogger,
+        rest_adapter: typing.Optional[restAdapter] = None,
+    ):
         self.__IP_ADDR = ip_addr
         self.__API_VERSION = api_version
         self.__LOGGER = logger
-        self.__REST_ADAPTER = restAdapter(self.__LOGGER)
+        self.__REST_ADAPTER = rest_adapter or restAdapter(self.__LOGGER)
 
     ##############################################################################################################
     # Getters
@@ -29,30 +38,36 @@ class statistics:
 
     def get_odometry(
         self,
-    ) -> DictType:
+    ) -> float:
         """The total running distance of the robot, in meters
 
         Returns:
-            0
+            0.0 on failure
         """
         response: combined_Result = self.__REST_ADAPTER.get(
             full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/odometry",
-            response_type=Response_Type.JSON,
+            response_type=Response_Type.STR,
         )
         result: CombinedType = response.data
-        return result
+        try:
+            return float(result)
+        except (TypeError, ValueError):
+            return 0.0
 
     def get_runtime(
         self,
-    ) -> DictType:
+    ) -> float:
         """The total running time of the robot, in seconds
 
         Returns:
-            0
+            0.0 on failure
         """
         response: combined_Result = self.__REST_ADAPTER.get(
             full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/runtime",
-            response_type=Response_Type.JSON,
+            response_type=Response_Type.STR,
         )
         result: CombinedType = response.data
-        return result
+        try:
+            return float(result)
+        except (TypeError, ValueError):
+            return 0.0
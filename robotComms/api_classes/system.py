@@ -1,5 +1,7 @@
 from robotComms.utils.rest_adapter import restAdapter
 from robotComms.utils.logger import systemLogger
+from robotComms.utils.tracing import traced_api
+from robotComms.utils.cache import ttlCache
 from robotComms.utils.results import (
     combined_Result,
     Response_Type,
@@ -8,9 +10,13 @@ from robotComms.utils.results import (
     CombinedType,
 )
 
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import threading
 import typing
 
 
+@traced_api(arguments={"key": "parameter"})
 class system:
     ##############################################################################################################
     # Class Setup
@@ -19,12 +25,31 @@ class system:
     __IP_ADDR: str = ""
     __API_VERSION: str = ""
     __API_TAG: str = "api/core/system"
-
-    def __init__(self, ip_addr: str, api_version: str, logger: systemLogger):
+    __PARAMETER_KEYS: typing.Dict[str, str] = {
+        "max_s": "base.max_moving_speed",
+        "max_w": "base.max_angular_speed",
+        "dock": "docking.docked_register_strategy",
+    }
+    # Parameters only change through a setter or the robot configuration tools
+    __PARAMETER_TTL_S: float = 30.0
+    __PARAMETER_WORKERS: int = 4
+    # Threads of the shared pool => Upper bound of `max_workers`
+    __PARAMETER_POOL_SIZE: int = 16
+
+    def __init__(
+        self,
+        ip_addr: str,
+        api_version: str,
+        logger: systemLogger,
+        rest_adapter: typing.Optional[restAdapter] = None,
+    ):
         self.__IP_ADDR = ip_addr
         self.__API_VERSION = api_version
         self.__LOGGER = logger
-        self.__REST_ADAPTER = restAdapter(self.__LOGGER)
+        self.__REST_ADAPTER = rest_adapter or restAdapter(self.__LOGGER)
+        self.__PARAMETERS = ttlCache(ttl_s=self.__PARAMETER_TTL_S)
+        self.__POOL: typing.Optional[ThreadPoolExecutor] = None
+        self.__POOL_LOCK = threading.Lock()
 
     ##############################################################################################################
     # Getters
@@ -192,38 +217,66 @@ class system:
                 - `-2` for Incorrect Input
 
         """
-        if param == "max_s":
-            self.__LOGGER.INFO("Fetch Max Moving Speed")
-            request_param: str = "base.max_moving_speed"
-        elif param == "max_w":
-            self.__LOGGER.INFO("Fetch Max Angular Velocity")
-            request_param: str = "base.max_angular_speed"
-        elif param == "dock":
-            self.__LOGGER.INFO("Fetch Docking Strategy")
-            request_param: str = "docking.docked_register_strategy"
-        else:
+        if param not in self.__PARAMETER_KEYS:
             self.__LOGGER.WARNING("Incorrect System Param Requested!")
             return -2
 
-        response: combined_Result = self.__REST_ADAPTER.get(
-            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/parameter",
-            response_type=Response_Type.STR,
-            str_params=request_param,
-        )
-
-        if response.status_code != 200:  # Response was empty
+        self.__LOGGER.INFO(f"Fetch System Parameter {self.__PARAMETER_KEYS[param]}")
+        value = self.get_parameter(self.__PARAMETER_KEYS[param])
+        if not value:
             return -1
+        if param == "max_s" or param == "max_w":
+            return float(value)
+        elif value == "always":
+            return 1
+        else:
+            return 2
 
-        value: CombinedType = response.data
-        if isinstance(value, str):
-            if param == "max_s" or param == "max_w":
-                return float(value)
-            else:
-                if value == "always":
-                    return 1
-                else:
-                    return 2
-        return -1
+    def get_parameter(self, key: str, refresh: bool = False) -> str:
+        """Get one system parameter. Values are cached until written through this class or expired.
+
+        Args:
+            key: Parameter Key. Example: "base.max_moving_speed"
+            refresh: Fetch again instead of using the cache
+
+        Returns:
+            Value as text. Example: "0.7". Empty on failure.
+        """
+        if refresh:
+            self.__PARAMETERS.invalidate(key)
+        return self.__PARAMETERS.get_or_load(key, lambda: self.__fetch_parameter(key))
+
+    def get_parameters(
+        self,
+        keys: typing.Iterable[str],
+        refresh: bool = False,
+        max_workers: typing.Optional[int] = None,
+    ) -> typing.Dict[str, str]:
+        """Get several system parameters. Keys missing from the cache are fetched concurrently.
+
+        Args:
+            keys: Parameter Keys. Example: ["base.max_moving_speed", "docking.docked_register_strategy"]
+            refresh: Fetch every key again instead of using the cache
+            max_workers: Max number of concurrent requests (Default: 4, at most 16)
+
+        Returns:
+            Example:
+                {
+                    "base.max_moving_speed": "0.7",
+                    "docking.docked_register_strategy": "always"
+                }
+            Keys which failed are left out.
+        """
+        keys = list(dict.fromkeys(keys))
+        cached = {} if refresh else {key: self.__PARAMETERS.get(key) for key in keys}
+        missing = [key for key in keys if not cached.get(key)]
+        values = {
+            **cached,
+            **self.__parallel(
+                lambda key: self.get_parameter(key, refresh=refresh), missing, max_workers
+            ),
+        }
+        return {key: values[key] for key in keys if values.get(key)}
 
     def get_network_status(self) -> DictType:
         """Get the robot's current network status
@@ -414,21 +467,7 @@ class system:
             return False
 
         self.__LOGGER.INFO("Changing Robot Max Speed")
-        request_param: typing.Dict[str, typing.Any] = {
-            "param": "base.max_moving_speed",
-            "value": str(max_speed),
-        }
-
-        response: combined_Result = self.__REST_ADAPTER.put(
-            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/parameter",
-            response_type=Response_Type.JSON,
-            body_params=request_param,
-        )
-
-        if response.status_code == 200:
-            return True
-        else:
-            return False
+        return self.set_parameter("base.max_moving_speed", str(max_speed))
 
     def set_robot_max_angular_velocity(self, max_angular_velocity: float) -> bool:
         """Set Max Angular Velocity for Robot
@@ -445,22 +484,69 @@ class system:
             return False
 
         self.__LOGGER.INFO("Changing Robot Max Angular Velocity")
-        request_param: typing.Dict[str, typing.Any] = {
-            "param": "base.max_angular_speed",
-            "value": str(max_angular_velocity),
-        }
+        return self.set_parameter("base.max_angular_speed", str(max_angular_velocity))
+
+    def set_parameter(self, key: str, value: str) -> bool:
+        """Set one system parameter. The cached value of the key is dropped.
+
+        Args:
+            key: Parameter Key. Example: "base.max_moving_speed"
+            value: Value as text. Example: "0.5"
 
+        Returns:
+            - True => Parameter Set
+            - False => Request Failed
+        """
         response: combined_Result = self.__REST_ADAPTER.put(
             full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/parameter",
             response_type=Response_Type.JSON,
-            body_params=request_param,
+            body_params={"param": key, "value": value},
         )
-
+        # Dropped even on failure => The next read shows what the robot really kept
+        self.__PARAMETERS.invalidate(key)
         if response.status_code == 200:
             return True
         else:
+            self.__LOGGER.ERROR(f"Set Parameter {key} Failed | {response.status_code}")
             return False
 
+    def set_parameters(
+        self,
+        values: typing.Dict[str, str],
+        verify: bool = False,
+        max_workers: typing.Optional[int] = None,
+    ) -> typing.Dict[str, bool]:
+        """Set several system parameters concurrently
+
+        Args:
+            values: Values as text keyed by Parameter Key. Example: {"base.max_moving_speed": "0.5"}
+            verify: Read every key back once written and compare it with the written value
+            max_workers: Max number of concurrent requests (Default: 4, at most 16)
+
+        Returns:
+            Example:
+                {
+                    "base.max_moving_speed": true
+                }
+            True => Written (and read back equal when `verify` is set)
+        """
+        written = self.__parallel(
+            lambda key: self.set_parameter(key, values[key]), list(values), max_workers
+        )
+        if not verify:
+            return written
+        current = self.get_parameters([key for key, ok in written.items() if ok], refresh=True)
+        return {
+            key: ok and key in current and self.__same_value(current[key], values[key])
+            for key, ok in written.items()
+        }
+
+    def invalidate_parameters(self) -> None:
+        """
+        Drop the cached parameter values
+        """
+        self.__PARAMETERS.clear()
+
     def set_robot_emergency_brake(self, engage_brake: bool) -> bool:
         """Engage/Disengage Emergency Brake for Robot
 
@@ -480,21 +566,7 @@ class system:
             self.__LOGGER.INFO("Disengage Emergency Brake")
             value: str = "off"
 
-        request_param: typing.Dict[str, typing.Any] = {
-            "param": "base.emergency_stop",
-            "value": value,
-        }
-
-        response: combined_Result = self.__REST_ADAPTER.put(
-            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/parameter",
-            response_type=Response_Type.JSON,
-            body_params=request_param,
-        )
-
-        if response.status_code == 200:
-            return True
-        else:
-            return False
+        return self.set_parameter("base.emergency_stop", value)
 
     def set_robot_brake_release(self, engage_brake: bool) -> bool:
         """Brake Release / Brake Recovery for Robot
@@ -514,21 +586,7 @@ class system:
         else:
             self.__LOGGER.INFO("Engage Parking Brake")
             value: str = "off"
-        request_param: typing.Dict[str, typing.Any] = {
-            "param": "base.brake_release",
-            "value": value,
-        }
-
-        response: combined_Result = self.__REST_ADAPTER.put(
-            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/parameter",
-            response_type=Response_Type.JSON,
-            body_params=request_param,
-        )
-
-        if response.status_code == 200:
-            return True
-        else:
-            return False
+        return self.set_parameter("base.brake_release", value)
 
     def set_robot_lights(
         self,
@@ -615,3 +673,74 @@ class system:
             return True
         else:
             return False
+
+    def close(self) -> None:
+        """
+        Stop the threads of the batch parameter requests
+        """
+        with self.__POOL_LOCK:
+            if self.__POOL is not None:
+                self.__POOL.shutdown(wait=True)
+                self.__POOL = None
+
+    ##############################################################################################################
+    # Private Methods
+    ##############################################################################################################
+
+    def __fetch_parameter(self, key: str) -> str:
+        response: combined_Result = self.__REST_ADAPTER.get(
+            full_endpoint=f"{self.__IP_ADDR}/{self.__API_TAG}/{self.__API_VERSION}/parameter",
+            response_type=Response_Type.STR,
+            str_params=key,
+        )
+        value: CombinedType = response.data
+        if response.status_code == 200 and isinstance(value, str):
+            return value
+        else:
+            return ""
+
+    def __parallel(
+        self,
+        call: typing.Callable[[str], typing.Any],
+        keys: typing.List[str],
+        max_workers: typing.Optional[int],
+    ) -> typing.Dict[str, typing.Any]:
+        if len(keys) <= 1:
+            return {key: call(key) for key in keys}
+        workers = min(
+            len(keys), max_workers or self.__PARAMETER_WORKERS, self.__PARAMETER_POOL_SIZE
+        )
+        pending = iter(keys)
+        pending_lock = threading.Lock()
+        results: typing.Dict[str, typing.Any] = {}
+
+        def drain() -> None:
+            # One loop per worker => At most `workers` requests of this call share the pool at a time
+            while True:
+                with pending_lock:
+                    key = next(pending, None)
+                if key is None:
+                    return
+                results[key] = call(key)
+
+        pool = self.__pool()
+        # Contexts copied here => Tracing spans of the calls stay under the calling API span
+        futures = [pool.submit(contextvars.copy_context().run, drain) for _ in range(workers)]
+        for future in futures:
+            future.result()
+        return {key: results[key] for key in keys}
+
+    def __pool(self) -> ThreadPoolExecutor:
+        with self.__POOL_LOCK:
+            if self.__POOL is None:
+                self.__POOL = ThreadPoolExecutor(
+                    max_workers=self.__PARAMETER_POOL_SIZE, thread_name_prefix="parameters"
+                )
+            return self.__POOL
+
+    def __same_value(self, read: str, written: str) -> bool:
+        # Numbers compare by value => "0.50" read back equals "0.5" written
+        try:
+            return float(read) == float(written)
+        except ValueError:
+            return read.strip().lower() == written.strip().lower()
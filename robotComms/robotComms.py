@@ -1,7 +1,21 @@
 # Utils Dependencies
 from .utils.logger import systemLogger
 from .utils.connection import robotConnection
-from .api_classes import system, artifact, slam, motion, statistics, platform
+from .utils.rest_adapter import restAdapter
+from .utils.snapshot import snapshotReader
+from .api_classes import (
+    system,
+    artifact,
+    slam,
+    motion,
+    statistics,
+    platform,
+    sensors,
+    multi_floor,
+    delivery,
+    firmware,
+    application,
+)
 
 import json
 from pathlib import Path
@@ -39,6 +53,13 @@ class robotComms:
         motion: Motion Control API for Robot
         statistics: Robot Statistics
         platform: Base API for Robot
+        sensors: Bumper, Cliff, Sonar and Depth Sensors of the Robot
+        multi_floor: Buildings, Floors, Elevators and Maps with a local cache
+        delivery: Delivery Tasks, Cargo and Settings
+        firmware: Resumable Firmware Upload and Upgrade
+        application: Android Apps and their cached Configuration
+        snapshot: Parallel Reader of power, health, network, localization and action
+        metrics: Request latency, byte and error metrics per endpoint
     """
 
     # Constructors
@@ -95,16 +116,53 @@ class robotComms:
             else:
                 self.set_remote_url()
 
-        self.system = system(self.__CURRENT_URL, self.__API_VERSION_NUM, self.__LOGGER)
-        self.artifact = artifact(self.__CURRENT_URL, self.__API_VERSION_NUM, self.__LOGGER)
-        self.slam = slam(self.__CURRENT_URL, self.__API_VERSION_NUM, self.__LOGGER)
-        self.motion = motion(self.__CURRENT_URL, self.__API_VERSION_NUM, self.__LOGGER)
-        self.statistics = statistics(self.__CURRENT_URL, self.__API_VERSION_NUM, self.__LOGGER)
-        self.platform = platform(self.__CURRENT_URL, self.__API_VERSION_NUM, self.__LOGGER)
+        # One adapter => One kept-alive connection pool shared by every API
+        self.__REST_ADAPTER: restAdapter = restAdapter(self.__LOGGER)
+        self.system = system(
+            self.__CURRENT_URL, self.__API_VERSION_NUM, self.__LOGGER, self.__REST_ADAPTER
+        )
+        self.artifact = artifact(
+            self.__CURRENT_URL, self.__API_VERSION_NUM, self.__LOGGER, self.__REST_ADAPTER
+        )
+        self.slam = slam(
+            self.__CURRENT_URL, self.__API_VERSION_NUM, self.__LOGGER, self.__REST_ADAPTER
+        )
+        self.motion = motion(
+            self.__CURRENT_URL, self.__API_VERSION_NUM, self.__LOGGER, self.__REST_ADAPTER
+        )
+        self.statistics = statistics(
+            self.__CURRENT_URL, self.__API_VERSION_NUM, self.__LOGGER, self.__REST_ADAPTER
+        )
+        self.platform = platform(
+            self.__CURRENT_URL, self.__API_VERSION_NUM, self.__LOGGER, self.__REST_ADAPTER
+        )
+        self.sensors = sensors(
+            self.__CURRENT_URL, self.__API_VERSION_NUM, self.__LOGGER, self.__REST_ADAPTER
+        )
+        self.multi_floor = multi_floor(
+            self.__CURRENT_URL, self.__API_VERSION_NUM, self.__LOGGER, self.__REST_ADAPTER
+        )
+        self.delivery = delivery(
+            self.__CURRENT_URL, self.__API_VERSION_NUM, self.__LOGGER, self.__REST_ADAPTER
+        )
+        self.firmware = firmware(
+            self.__CURRENT_URL, self.__API_VERSION_NUM, self.__LOGGER, self.__REST_ADAPTER
+        )
+        self.application = application(
+            self.__CURRENT_URL, self.__API_VERSION_NUM, self.__LOGGER, self.__REST_ADAPTER
+        )
+        self.snapshot = snapshotReader(self, logger=self.__LOGGER)
+        self.metrics = self.__REST_ADAPTER.metrics
 
     def __del__(self):
         self.__save_ip_addresses()
 
+    def __enter__(self) -> "robotComms":
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        self.close()
+
     ##############################################################################################################
     # Public Methods
     ##############################################################################################################
@@ -125,6 +183,16 @@ class robotComms:
             self.__LOGGER.INFO(f"URL Confirmed: {new_url}")
         return new_url
 
+    def close(self) -> None:
+        """
+        Stop the snapshot, sensor, parameter and prefetch pools and close the kept-alive connections
+        """
+        self.snapshot.close()
+        self.sensors.close()
+        self.system.close()
+        self.multi_floor.close()
+        self.__REST_ADAPTER.close()
+
     def get_local_url(self) -> str:
         return self.__LOCAL_URL
 
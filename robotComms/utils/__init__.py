@@ -2,6 +2,35 @@ from .logger import systemLogger
 from .results import combined_Result, CombinedType
 from .connection import robotConnection
 from .rest_adapter import restAdapter
+from .artifact_store import artifactStore, artifactDiff
+from .spatial_index import artifactSpatialIndex
+from .layout import layoutManager, load_layout, save_layout
+from .rate_limit import rateLimiter
+from .fleet import layoutReconciler, firmwareRollout, parameterProfile
+from .event_stream import eventStream, eventSubscription
+from .clock_sync import robotClock
+from .imu_sampler import imuSampler
+from .snapshot import snapshotReader, robotSnapshot
+from .models import (
+    pose_Model,
+    action_Model,
+    health_Model,
+    network_Model,
+    poi_Model,
+    area_Model,
+    models_from_list,
+)
+from .decoders import available_decoders, get_decoder
+from .simulator import robotSimulator, simulatedRobot
+from .metrics import requestMetrics
+from .tracing import get_tracer, trace_context, chromeTraceExporter
+from .recording import recordingTransport, replayTransport, read_recording, replay_client
+from .telemetry import telemetryRecorder, read_telemetry
+from .telemetry_bus import telemetryBus, telemetryBusReader
+from .sensor_readout import sensorReadout, sensorChanges
+from .cache import ttlCache
+from .dispatcher import deliveryDispatcher, deliveryOrder
+from .gateway import robotGateway
 
 __title__ = "utils"
 __all__ = [
@@ -10,4 +39,49 @@ __all__ = [
     "CombinedType",
     "robotConnection",
     "restAdapter",
+    "artifactStore",
+    "artifactDiff",
+    "artifactSpatialIndex",
+    "layoutManager",
+    "load_layout",
+    "save_layout",
+    "rateLimiter",
+    "layoutReconciler",
+    "firmwareRollout",
+    "parameterProfile",
+    "eventStream",
+    "eventSubscription",
+    "robotClock",
+    "imuSampler",
+    "snapshotReader",
+    "robotSnapshot",
+    "pose_Model",
+    "action_Model",
+    "health_Model",
+    "network_Model",
+    "poi_Model",
+    "area_Model",
+    "models_from_list",
+    "available_decoders",
+    "get_decoder",
+    "robotSimulator",
+    "simulatedRobot",
+    "requestMetrics",
+    "get_tracer",
+    "trace_context",
+    "chromeTraceExporter",
+    "recordingTransport",
+    "replayTransport",
+    "read_recording",
+    "replay_client",
+    "telemetryRecorder",
+    "read_telemetry",
+    "telemetryBus",
+    "telemetryBusReader",
+    "sensorReadout",
+    "sensorChanges",
+    "ttlCache",
+    "deliveryDispatcher",
+    "deliveryOrder",
+    "robotGateway",
 ]
@@ -0,0 +1,610 @@
+"""
+Module to keep a local mirror of the Map Artifacts.
+
+Every call to `artifact.get_artifact()` fetches a complete collection from the robot. The mirror
+fetches the collections once, keeps them in memory and refreshes them either on demand or on a
+schedule. Each refresh is compared against the previous snapshot and only the changes are handed
+to the subscribers.
+
+Mirrored Collections:
+    -> Virtual Lines: "lines/tracks", "lines/walls"
+    -> Rectangular Areas: "rect/{usage}"
+    -> Point of Interests: "poi"
+    -> Laser Landmarks: "laser"
+
+Subscribers get the diffs in the order the mirror changed. One thread delivers at a time without
+holding the mirror lock; diffs committed meanwhile, also from inside a callback, queue up behind.
+"""
+
+# Custom Packages
+from .logger import systemLogger
+from .results import DictType, ListDictType
+
+# Imported Packages
+from collections import deque
+import itertools
+import json
+import threading
+import typing
+
+if typing.TYPE_CHECKING:
+    from robotComms.api_classes.artifact import artifact
+
+LINE_USAGES: typing.List[str] = ["tracks", "walls"]
+RECT_USAGES: typing.List[str] = [
+    "forbidden_area",
+    "elevator_area",
+    "dangerous_area",
+    "coverage_area",
+    "maintenance_area",
+    "sensor_disable_area",
+    "restricted_area",
+]
+
+# Every Collection as (a_type, a_usage) pair accepted by `artifact.get_artifact()`
+ARTIFACT_COLLECTIONS: typing.List[typing.Tuple[str, typing.Optional[str]]] = (
+    [("lines", usage) for usage in LINE_USAGES]
+    + [("rect", usage) for usage in RECT_USAGES]
+    + [("poi", None), ("laser", None)]
+)
+# Marks an element absent from a collection
+_MISSING = object()
+# ID prefix of added Lines and Rectangular Areas until the robot assigned their ID
+PROVISIONAL_ID_PREFIX: str = "local:"
+
+
+def collection_key(a_type: str, a_usage: typing.Optional[str] = None) -> str:
+    """
+    Build the Collection Key used by the Mirror
+
+    Args:
+        a_type: Artifact Type. "lines", "rect", "poi" or "laser"
+        a_usage: Artifact Usage. Only used for "lines" and "rect"
+
+    Returns:
+        key: "lines/walls", "rect/forbidden_area", "poi", "laser"
+    """
+    if a_type in ["lines", "rect"]:
+        return f"{a_type}/{a_usage}"
+    return a_type
+
+
+def element_key(element: DictType) -> str:
+    """
+    Identity of an Artifact inside its collection.
+
+    Args:
+        element: Artifact as returned by the robot
+
+    Returns:
+        key: String form of the "id" field. Falls back to the serialized element when id is missing.
+            Elements added through the mirror carry a provisional id "local:{n}" until the next refresh.
+    """
+    if "id" in element:
+        return str(element["id"])
+    return json.dumps(element, sort_keys=True)
+
+
+class artifactDiff:
+    def __init__(
+        self,
+        collection: str,
+        added: typing.Optional[ListDictType] = None,
+        removed: typing.Optional[ListDictType] = None,
+        changed: typing.Optional[ListDictType] = None,
+        source: str = "refresh",
+    ) -> None:
+        """
+        Holds the changes of one collection between two snapshots
+
+        Args:
+            collection: Collection Key. Example: "rect/forbidden_area"
+            added: Artifacts which did not exist in the previous snapshot
+            removed: Artifacts which do not exist anymore
+            changed: New version of the Artifacts whose content changed
+            source: Origin of the change
+                - "refresh" => Fetched from the robot
+                - "local" => Optimistic update from a local write
+                - "rollback" => Local write failed and was reverted
+        """
+        self.collection: str = collection
+        self.added: ListDictType = added if added else []
+        self.removed: ListDictType = removed if removed else []
+        self.changed: ListDictType = changed if changed else []
+        self.source: str = source
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+    def __repr__(self) -> str:
+        return (
+            f"artifactDiff({self.collection}, source={self.source}, added={len(self.added)}, "
+            f"removed={len(self.removed)}, changed={len(self.changed)})"
+        )
+
+
+def diff_collections(
+    collection: str,
+    previous: typing.Dict[str, DictType],
+    current: typing.Dict[str, DictType],
+    source: str = "refresh",
+) -> artifactDiff:
+    """
+    Compare two snapshots of a collection
+
+    Args:
+        collection: Collection Key
+        previous: Old snapshot keyed by `element_key()`
+        current: New snapshot keyed by `element_key()`
+        source: Origin of the change
+
+    Returns:
+        diff: Added, Removed and Changed artifacts
+    """
+    added = [element for key, element in current.items() if key not in previous]
+    removed = [element for key, element in previous.items() if key not in current]
+    changed = [
+        element for key, element in current.items() if key in previous and previous[key] != element
+    ]
+    return artifactDiff(collection, added, removed, changed, source)
+
+
+class artifactStore:
+    def __init__(
+        self,
+        artifact_api: "artifact",
+        collections: typing.Optional[typing.List[typing.Tuple[str, typing.Optional[str]]]] = None,
+        logger: typing.Optional[systemLogger] = None,
+    ) -> None:
+        """
+        Local Mirror of the Map Artifacts
+
+        Args:
+            artifact_api: Artifact API of the robot. Example: `robotComms().artifact`
+            collections: (a_type, a_usage) pairs to mirror. Default: All of `ARTIFACT_COLLECTIONS`
+            logger: Instance of systemLogger. If not provided, initiates with log name 'artifactStore_logger'
+        """
+        self.__ARTIFACT = artifact_api
+        self.__LOGGER: systemLogger = logger or systemLogger(
+            logger_name="artifactStore_logger",
+            log_file_path="logs",
+            enable_console_logging=True,
+        )
+        self.__COLLECTIONS: typing.Dict[str, typing.Tuple[str, typing.Optional[str]]] = {
+            collection_key(a_type, a_usage): (a_type, a_usage)
+            for a_type, a_usage in (collections or ARTIFACT_COLLECTIONS)
+        }
+        self.__MIRROR: typing.Dict[str, typing.Dict[str, DictType]] = {
+            key: {} for key in self.__COLLECTIONS
+        }
+        self.__LOADED: typing.Set[str] = set()
+        self.__LOCK = threading.RLock()
+        self.__SUBSCRIBERS: typing.Dict[
+            int,
+            typing.Tuple[typing.Callable[[artifactDiff], None], typing.Optional[typing.Set[str]]],
+        ] = {}
+        self.__NEXT_TOKEN: int = 0
+        self.__PROVISIONAL_IDS = itertools.count()
+        # Diffs not yet delivered, in commit order, each with the subscribers at commit time
+        self.__PENDING: typing.Deque[
+            typing.Tuple[
+                artifactDiff,
+                typing.List[
+                    typing.Tuple[
+                        typing.Callable[[artifactDiff], None], typing.Optional[typing.Set[str]]
+                    ]
+                ],
+            ]
+        ] = deque()
+        self.__DELIVERING: bool = False
+        self.__STOP_EVENT = threading.Event()
+        self.__WORKER: typing.Optional[threading.Thread] = None
+
+    ##############################################################################################################
+    # Reading the Mirror
+    ##############################################################################################################
+
+    def get(self, a_type: str, a_usage: typing.Optional[str] = None) -> ListDictType:
+        """
+        Read a collection from the mirror. Fetches it from the robot on first use.
+
+        Args:
+            a_type: Artifact Type. "lines", "rect", "poi" or "laser"
+            a_usage: Artifact Usage for "lines" and "rect"
+
+        Returns:
+            List of Artifacts. The artifacts are shared with the mirror and should not be mutated.
+        """
+        key = self.__check_key(a_type, a_usage)
+        if key not in self.__LOADED:
+            self.refresh([(a_type, a_usage)])
+        with self.__LOCK:
+            return list(self.__MIRROR[key].values())
+
+    def get_by_id(
+        self,
+        a_type: str,
+        a_usage: typing.Optional[str] = None,
+        id: typing.Optional[str | int] = None,
+    ) -> typing.Optional[DictType]:
+        """
+        Read one artifact from the mirror
+
+        Args:
+            a_type: Artifact Type. "lines", "rect", "poi" or "laser"
+            a_usage: Artifact Usage for "lines" and "rect"
+            id: ID of the Artifact
+
+        Returns:
+            Artifact or None if it does not exist
+        """
+        key = self.__check_key(a_type, a_usage)
+        if key not in self.__LOADED:
+            self.refresh([(a_type, a_usage)])
+        with self.__LOCK:
+            return self.__MIRROR[key].get(str(id))
+
+    def snapshot(self) -> typing.Dict[str, ListDictType]:
+        """
+        Returns:
+            All mirrored collections keyed by collection key. Example: {"rect/forbidden_area": [...]}
+        """
+        with self.__LOCK:
+            return {key: list(elements.values()) for key, elements in self.__MIRROR.items()}
+
+    ##############################################################################################################
+    # Refreshing the Mirror
+    ##############################################################################################################
+
+    def refresh(
+        self,
+        collections: typing.Optional[typing.List[typing.Tuple[str, typing.Optional[str]]]] = None,
+    ) -> typing.List[artifactDiff]:
+        """
+        Fetch collections from the robot and notify subscribers about the changes
+
+        Args:
+            collections: (a_type, a_usage) pairs to refresh. Default: All mirrored collections
+
+        Returns:
+            Non-empty diffs of the refreshed collections
+        """
+        targets = (
+            [self.__check_key(a_type, a_usage) for a_type, a_usage in collections]
+            if collections
+            else list(self.__COLLECTIONS)
+        )
+        diffs: typing.List[artifactDiff] = []
+        for key in targets:
+            a_type, a_usage = self.__COLLECTIONS[key]
+            result = self.__ARTIFACT.get_artifact(a_type, a_usage)
+            if not isinstance(result, list):
+                # Failed requests come back as False or an empty dictionary. Keep the old snapshot.
+                self.__LOGGER.WARNING(f"Artifact Refresh Failed for {key}. Keeping old snapshot")
+                continue
+            current = {element_key(element): element for element in result}
+            diff = self.__replace(key, lambda _, current=current: current, "refresh")
+            self.__LOADED.add(key)
+            if not diff.is_empty():
+                diffs.append(diff)
+        return diffs
+
+    def start(self, interval_s: float = 1.0) -> None:
+        """
+        Refresh all collections in a background thread
+
+        Args:
+            interval_s: Time between two refreshes in seconds. Default: 1s
+        """
+        if self.__WORKER is not None and self.__WORKER.is_alive():
+            self.__LOGGER.WARNING("Artifact Store Refresh already running")
+            return
+        self.__STOP_EVENT.clear()
+        self.__WORKER = threading.Thread(
+            target=self.__refresh_loop, args=(interval_s,), name="artifactStore", daemon=True
+        )
+        self.__WORKER.start()
+        self.__LOGGER.INFO(f"Artifact Store Refresh started every {interval_s}s")
+
+    def stop(self) -> None:
+        """
+        Stop the background refresh
+        """
+        self.__STOP_EVENT.set()
+        if self.__WORKER is not None:
+            self.__WORKER.join()
+            self.__WORKER = None
+        self.__LOGGER.INFO("Artifact Store Refresh stopped")
+
+    ##############################################################################################################
+    # Subscriptions
+    ##############################################################################################################
+
+    def subscribe(
+        self,
+        callback: typing.Callable[[artifactDiff], None],
+        collections: typing.Optional[typing.List[typing.Tuple[str, typing.Optional[str]]]] = None,
+    ) -> int:
+        """
+        Register a callback for changes
+
+        Args:
+            callback: Called with one `artifactDiff` per changed collection
+            collections: (a_type, a_usage) pairs to listen to. Default: All collections
+
+        Returns:
+            token: Pass to `unsubscribe()` to remove the callback
+        """
+        keys = (
+            {self.__check_key(a_type, a_usage) for a_type, a_usage in collections}
+            if collections
+            else None
+        )
+        with self.__LOCK:
+            token = self.__NEXT_TOKEN
+            self.__NEXT_TOKEN += 1
+            self.__SUBSCRIBERS[token] = (callback, keys)
+        return token
+
+    def unsubscribe(self, token: int) -> None:
+        with self.__LOCK:
+            self.__SUBSCRIBERS.pop(token, None)
+
+    ##############################################################################################################
+    # Optimistic Writes
+    ##############################################################################################################
+
+    def add_artifact(
+        self,
+        a_type: str,
+        a_usage: typing.Optional[str] = None,
+        dict_value: typing.Optional[ListDictType | DictType] = None,
+    ) -> bool:
+        """
+        Add artifacts via `artifact.add_artifact()` and update the mirror before the robot answers.
+
+        Lines and Rectangular Areas get their ID from the robot, so the collection is fetched again
+        after a successful add to replace the provisional entries. Until then each one carries the
+        provisional ID "local:{n}" in the mirror and in the diffs.
+
+        Args:
+            a_type: Same as `artifact.add_artifact()`
+            a_usage: Same as `artifact.add_artifact()`
+            dict_value: Same as `artifact.add_artifact()`
+
+        Returns:
+            - True => Add Success
+            - False => Add Failure. The mirror is rolled back.
+        """
+        if a_type == "poi" and a_usage == "adjust":
+            success = self.__ARTIFACT.add_artifact(a_type, a_usage, dict_value)
+            if success is True:
+                self.refresh([("poi", None)])
+            return success is True
+
+        if a_type == "laser":
+            key = self.__check_key("laser")
+            removed_ids = {str(id) for id in (dict_value or [])}
+            return self.__write(
+                key,
+                lambda elements: {k: v for k, v in elements.items() if k not in removed_ids},
+                lambda: self.__ARTIFACT.add_artifact(a_type, a_usage, dict_value),
+            )
+
+        key = self.__check_key(a_type, a_usage)
+        new_elements = self.__as_list(dict_value)
+        if a_type != "poi":
+            # Robot assigns the ID. Keep a provisional entry until the next refresh.
+            new_elements = [
+                {**element, "id": f"{PROVISIONAL_ID_PREFIX}{next(self.__PROVISIONAL_IDS)}"}
+                for element in new_elements
+            ]
+
+        def update(elements: typing.Dict[str, DictType]) -> typing.Dict[str, DictType]:
+            elements = dict(elements)
+            for element in new_elements:
+                elements[element_key(element)] = element
+            return elements
+
+        success = self.__write(
+            key, update, lambda: self.__ARTIFACT.add_artifact(a_type, a_usage, dict_value)
+        )
+        if success and a_type != "poi":
+            self.refresh([(a_type, a_usage)])
+        return success
+
+    def modify_artifact(
+        self,
+        a_type: str,
+        a_usage: typing.Optional[str] = None,
+        id: typing.Optional[str] = None,
+        dict_value: typing.Optional[ListDictType | DictType] = None,
+    ) -> bool:
+        """
+        Modify artifacts via `artifact.modify_artifact()` and update the mirror before the robot answers.
+
+        Args:
+            a_type: Same as `artifact.modify_artifact()`
+            a_usage: Same as `artifact.modify_artifact()`
+            id: Same as `artifact.modify_artifact()`
+            dict_value: Same as `artifact.modify_artifact()`
+
+        Returns:
+            - True => Modify Success
+            - False => Modify Failure. The mirror is rolled back.
+        """
+
+        def send() -> typing.Any:
+            return self.__ARTIFACT.modify_artifact(a_type, a_usage, id, dict_value)
+
+        if a_type == "laser" and a_usage == "update":
+            return send() is True
+
+        key = self.__check_key(a_type, a_usage)
+        if a_type == "laser":
+            # Laser Landmarks are replaced as a whole
+            return self.__write(
+                key,
+                lambda _: {element_key(e): e for e in self.__as_list(dict_value)},
+                send,
+            )
+        if a_type == "poi":
+
+            def update_poi(elements: typing.Dict[str, DictType]) -> typing.Dict[str, DictType]:
+                elements = dict(elements)
+                if str(id) in elements and isinstance(dict_value, dict):
+                    elements[str(id)] = {**elements[str(id)], **dict_value}
+                return elements
+
+            return self.__write(key, update_poi, send)
+
+        def update_lines(elements: typing.Dict[str, DictType]) -> typing.Dict[str, DictType]:
+            elements = dict(elements)
+            for element in self.__as_list(dict_value):
+                elements[element_key(element)] = element
+            return elements
+
+        return self.__write(key, update_lines, send)
+
+    def delete_artifact(
+        self,
+        a_type: str,
+        a_usage: typing.Optional[str] = None,
+        id: typing.Optional[int | str] = None,
+    ) -> bool:
+        """
+        Delete artifacts via `artifact.delete_artifact()` and update the mirror before the robot answers.
+
+        Args:
+            a_type: Same as `artifact.delete_artifact()`
+            a_usage: Same as `artifact.delete_artifact()`
+            id: Same as `artifact.delete_artifact()`. None clears the whole collection.
+
+        Returns:
+            - True => Delete Success
+            - False => Delete Failure. The mirror is rolled back.
+        """
+        key = self.__check_key(a_type, a_usage)
+
+        def update(elements: typing.Dict[str, DictType]) -> typing.Dict[str, DictType]:
+            if id is None or a_type == "laser":
+                return {}
+            return {k: v for k, v in elements.items() if k != str(id)}
+
+        return self.__write(
+            key, update, lambda: self.__ARTIFACT.delete_artifact(a_type, a_usage, id)
+        )
+
+    ##############################################################################################################
+    # Private Methods
+    ##############################################################################################################
+
+    def __check_key(self, a_type: str, a_usage: typing.Optional[str] = None) -> str:
+        key = collection_key(a_type, a_usage)
+        if key not in self.__COLLECTIONS:
+            raise KeyError(f"Collection {key} is not mirrored")
+        return key
+
+    def __as_list(self, value: typing.Optional[ListDictType | DictType]) -> ListDictType:
+        if value is None:
+            return []
+        if isinstance(value, dict):
+            return [value]
+        return list(value)
+
+    def __write(
+        self,
+        key: str,
+        update: typing.Callable[[typing.Dict[str, DictType]], typing.Dict[str, DictType]],
+        send: typing.Callable[[], typing.Any],
+    ) -> bool:
+        """
+        Apply a local change, send it to the robot and revert it if the robot refuses.
+
+        Only the elements changed by this write are reverted, and only while they still hold the
+        optimistic value. Elements refreshed or written in the meantime keep their newer data.
+        """
+        # element key => (value before, optimistic value). _MISSING => Element absent
+        changes: typing.Dict[str, typing.Tuple[typing.Any, typing.Any]] = {}
+
+        def apply(elements: typing.Dict[str, DictType]) -> typing.Dict[str, DictType]:
+            optimistic = update(dict(elements))
+            for element in set(elements) | set(optimistic):
+                before = elements.get(element, _MISSING)
+                after = optimistic.get(element, _MISSING)
+                if before != after:
+                    changes[element] = (before, after)
+            return optimistic
+
+        def rollback(elements: typing.Dict[str, DictType]) -> typing.Dict[str, DictType]:
+            elements = dict(elements)
+            for element, (before, after) in changes.items():
+                if elements.get(element, _MISSING) != after:
+                    continue
+                if before is _MISSING:
+                    del elements[element]
+                else:
+                    elements[element] = before
+            return elements
+
+        self.__replace(key, apply, "local")
+
+        success = send()
+        if success is not True:
+            self.__LOGGER.WARNING(f"Artifact Write Failed for {key}. Rolling back mirror")
+            self.__replace(key, rollback, "rollback")
+            return False
+        return True
+
+    def __replace(
+        self,
+        key: str,
+        update: typing.Callable[[typing.Dict[str, DictType]], typing.Dict[str, DictType]],
+        source: str,
+    ) -> artifactDiff:
+        # Computed under the lock => No refresh lands between reading and replacing the collection
+        with self.__LOCK:
+            current = update(self.__MIRROR[key])
+            diff = diff_collections(key, self.__MIRROR[key], current, source)
+            self.__MIRROR[key] = current
+            if not diff.is_empty():
+                self.__PENDING.append((diff, list(self.__SUBSCRIBERS.values())))
+        self.__deliver()
+        return diff
+
+    def __deliver(self) -> None:
+        # One deliverer at a time => Diffs reach the subscribers in commit order
+        with self.__LOCK:
+            if self.__DELIVERING:
+                return
+            self.__DELIVERING = True
+        while True:
+            with self.__LOCK:
+                if not self.__PENDING:
+                    self.__DELIVERING = False
+                    return
+                diff, subscribers = self.__PENDING.popleft()
+            self.__notify(diff, subscribers)
+
+    def __notify(
+        self,
+        diff: artifactDiff,
+        subscribers: typing.List[
+            typing.Tuple[typing.Callable[[artifactDiff], None], typing.Optional[typing.Set[str]]]
+        ],
+    ) -> None:
+        for callback, keys in subscribers:
+            if keys is not None and diff.collection not in keys:
+                continue
+            try:
+                callback(diff)
+            except Exception as e:
+                self.__LOGGER.ERROR(f"Artifact Store Subscriber Failed | {e}")
+
+    def __refresh_loop(self, interval_s: float) -> None:
+        while not self.__STOP_EVENT.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                self.__LOGGER.ERROR(f"Artifact Store Refresh Failed | {e}")
+            self.__STOP_EVENT.wait(interval_s)
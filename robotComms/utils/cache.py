@@ -0,0 +1,197 @@
+"""
+Module with a thread-safe cache of API results with expiry.
+
+Entries expire `ttl_s` seconds after they were stored and the least recently used entry is evicted
+once `max_entries` is reached. `get_or_load()` loads a missing key once even when many threads ask
+for it at the same time: the first caller runs the loader, the others wait for its result.
+
+Keys are tuples so a group of entries can be dropped together with `invalidate_where()`.
+Example: every key of building "E" after its map was replaced.
+
+Invalidating a key also invalidates a load of it in flight: the load still answers the callers
+waiting for it but is not stored, and the next caller starts a new load. A value fetched before a
+write therefore never lands in the cache after the write invalidated the key.
+"""
+
+# Imported Packages
+import collections
+import threading
+import time
+import typing
+
+KeyType = typing.Tuple[typing.Any, ...]
+ValueType = typing.TypeVar("ValueType")
+
+
+class _loading:
+    __slots__ = ("done", "value", "error", "stale")
+
+    def __init__(self) -> None:
+        self.done: threading.Event = threading.Event()
+        self.value: typing.Any = None
+        self.error: typing.Optional[BaseException] = None
+        # Key invalidated while loading => Result is not stored
+        self.stale: bool = False
+
+
+class ttlCache:
+    def __init__(self, ttl_s: float = 60.0, max_entries: int = 256) -> None:
+        """
+        Cache with expiry and LRU eviction
+
+        Args:
+            ttl_s: Lifetime of an entry in seconds. Default: 60s
+            max_entries: Max number of entries. Default: 256
+        """
+        self.__TTL_S: float = ttl_s
+        self.__MAX_ENTRIES: int = max(1, max_entries)
+        self.__ENTRIES: "collections.OrderedDict[KeyType, typing.Tuple[float, typing.Any]]" = (
+            collections.OrderedDict()
+        )
+        self.__LOADING: typing.Dict[KeyType, _loading] = {}
+        self.__LOCK = threading.Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    ##############################################################################################################
+    # Getters
+    ##############################################################################################################
+
+    def get(self, key: KeyType, default: typing.Any = None) -> typing.Any:
+        """
+        Returns:
+            Cached value or `default` if missing or expired
+        """
+        with self.__LOCK:
+            return self.__lookup(key, default)
+
+    def __contains__(self, key: KeyType) -> bool:
+        sentinel = object()
+        return self.get(key, sentinel) is not sentinel
+
+    def __len__(self) -> int:
+        with self.__LOCK:
+            return len(self.__ENTRIES)
+
+    def get_or_load(
+        self,
+        key: KeyType,
+        loader: typing.Callable[[], ValueType],
+        ttl_s: typing.Optional[float] = None,
+        cache_if: typing.Callable[[ValueType], bool] = bool,
+    ) -> ValueType:
+        """
+        Cached value, or the result of `loader` stored under `key`
+
+        Args:
+            key: Cache Key
+            loader: Fetches the value. Runs once per key for all concurrent callers.
+            ttl_s: Lifetime of this entry. Default: Lifetime of the cache
+            cache_if: Only results passing this check are stored. Default: Non-empty results, so
+                failed requests (empty dict, list or bytes) are retried by the next caller.
+
+        Returns:
+            Value
+        """
+        sentinel = object()
+        with self.__LOCK:
+            value = self.__lookup(key, sentinel)
+            if value is not sentinel:
+                return value  # type: ignore[return-value]
+            loading = self.__LOADING.get(key)
+            owner = loading is None
+            if loading is None:
+                loading = self.__LOADING[key] = _loading()
+        if not owner:
+            loading.done.wait()
+            if loading.error is not None:
+                raise loading.error
+            return loading.value  # type: ignore[no-any-return]
+
+        try:
+            loading.value = loader()
+        except BaseException as e:
+            loading.error = e
+            raise
+        finally:
+            with self.__LOCK:
+                # A stale load was already replaced by the invalidation => Leave its successor
+                if self.__LOADING.get(key) is loading:
+                    del self.__LOADING[key]
+                if not loading.stale and loading.error is None and cache_if(loading.value):
+                    self.__store(key, loading.value, ttl_s)
+            loading.done.set()
+        return loading.value  # type: ignore[no-any-return]
+
+    ##############################################################################################################
+    # Setters
+    ##############################################################################################################
+
+    def put(self, key: KeyType, value: typing.Any, ttl_s: typing.Optional[float] = None) -> None:
+        with self.__LOCK:
+            self.__drop_loading(key)
+            self.__store(key, value, ttl_s)
+
+    def invalidate(self, key: KeyType) -> bool:
+        """
+        Returns:
+            - True => Entry dropped
+            - False => Key was not cached
+        """
+        with self.__LOCK:
+            self.__drop_loading(key)
+            return self.__ENTRIES.pop(key, None) is not None
+
+    def invalidate_where(self, predicate: typing.Callable[[KeyType], bool]) -> int:
+        """
+        Drop every entry whose key passes `predicate`
+
+        Args:
+            predicate: Check on the key. Example: lambda key: key[0] == "pois"
+
+        Returns:
+            Number of entries dropped
+        """
+        with self.__LOCK:
+            for key in [key for key in self.__LOADING if predicate(key)]:
+                self.__drop_loading(key)
+            keys = [key for key in self.__ENTRIES if predicate(key)]
+            for key in keys:
+                del self.__ENTRIES[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        with self.__LOCK:
+            for key in list(self.__LOADING):
+                self.__drop_loading(key)
+            self.__ENTRIES.clear()
+
+    ##############################################################################################################
+    # Private Methods
+    ##############################################################################################################
+
+    def __lookup(self, key: KeyType, default: typing.Any) -> typing.Any:
+        # Caller holds the lock
+        entry = self.__ENTRIES.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self.__ENTRIES[key]
+            self.misses += 1
+            return default
+        self.__ENTRIES.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def __drop_loading(self, key: KeyType) -> None:
+        # Caller holds the lock. Waiting callers still get the result, the next caller loads again.
+        loading = self.__LOADING.pop(key, None)
+        if loading is not None:
+            loading.stale = True
+
+    def __store(self, key: KeyType, value: typing.Any, ttl_s: typing.Optional[float]) -> None:
+        # Caller holds the lock
+        expires_at = time.monotonic() + (ttl_s if ttl_s is not None else self.__TTL_S)
+        self.__ENTRIES[key] = (expires_at, value)
+        self.__ENTRIES.move_to_end(key)
+        while len(self.__ENTRIES) > self.__MAX_ENTRIES:
+            self.__ENTRIES.popitem(last=False)
@@ -0,0 +1,231 @@
+"""
+Module to relate the robot uptime clock to host time.
+
+The robot stamps its samples with the milliseconds since it was started (`platform.get_timestamp()`).
+Instead of asking for the timestamp next to every data poll, `robotClock` samples it once in a while
+and converts robot timestamps to host time locally.
+
+Estimation (NTP-style):
+    1. A sync takes a burst of samples and keeps the one with the smallest round-trip time
+    2. The robot timestamp is placed at the midpoint of that round trip => Error <= RTT / 2
+    3. A least-squares fit over the recent syncs gives the offset and the drift of the robot clock
+"""
+
+# Custom Packages
+from .logger import systemLogger
+
+# Imported Packages
+import collections
+import threading
+import time
+import typing
+
+if typing.TYPE_CHECKING:
+    from robotComms.api_classes.platform import platform
+
+
+class clockSample:
+    def __init__(self, host_s: float, robot_s: float, rtt_s: float) -> None:
+        """
+        One filtered clock sample
+
+        Args:
+            host_s: Host time at the midpoint of the round trip in seconds
+            robot_s: Robot uptime in seconds
+            rtt_s: Round-trip time in seconds
+        """
+        self.host_s: float = host_s
+        self.robot_s: float = robot_s
+        self.rtt_s: float = rtt_s
+
+
+class robotClock:
+    def __init__(
+        self,
+        platform_api: "platform",
+        samples_per_sync: int = 8,
+        window: int = 32,
+        logger: typing.Optional[systemLogger] = None,
+    ) -> None:
+        """
+        Clock Estimator of one robot
+
+        Args:
+            platform_api: Platform API of the robot. Example: `robotComms().platform`
+            samples_per_sync: Number of timestamp requests per sync. The fastest one is kept. Default: 8
+            window: Number of syncs used for the offset and drift fit. Default: 32
+            logger: Instance of systemLogger. If not provided, initiates with log name 'robotClock_logger'
+        """
+        self.__PLATFORM = platform_api
+        self.__SAMPLES_PER_SYNC: int = max(1, samples_per_sync)
+        self.__LOGGER: systemLogger = logger or systemLogger(
+            logger_name="robotClock_logger",
+            log_file_path="logs",
+            enable_console_logging=True,
+        )
+        # Host time is measured on the monotonic clock and anchored to the wall clock once
+        self.__WALL_BASE: float = time.time()
+        self.__MONOTONIC_BASE: float = time.monotonic()
+        self.__SAMPLES: typing.Deque[clockSample] = collections.deque(maxlen=max(1, window))
+        self.__OFFSET_S: float = 0.0
+        self.__RATE: float = 1.0
+        self.__LOCK = threading.Lock()
+        self.__STOP_EVENT = threading.Event()
+        self.__WORKER: typing.Optional[threading.Thread] = None
+
+    ##############################################################################################################
+    # Synchronization
+    ##############################################################################################################
+
+    def sync(self) -> bool:
+        """
+        Take a burst of timestamp samples and update the estimate
+
+        Returns:
+            - True => Estimate updated
+            - False => No valid sample
+        """
+        best: typing.Optional[clockSample] = None
+        for _ in range(self.__SAMPLES_PER_SYNC):
+            sample = self.__measure()
+            if sample is not None and (best is None or sample.rtt_s < best.rtt_s):
+                best = sample
+        if best is None:
+            self.__LOGGER.ERROR("Clock Sync Failed | No valid timestamp")
+            return False
+
+        with self.__LOCK:
+            if self.__SAMPLES and best.robot_s < self.__SAMPLES[-1].robot_s:
+                # Robot uptime went backwards => Robot restarted
+                self.__LOGGER.WARNING("Robot Clock went backwards. Discarding previous syncs")
+                self.__SAMPLES.clear()
+            self.__SAMPLES.append(best)
+            self.__fit()
+            self.__LOGGER.INFO(
+                f"Clock Synced | Offset: {self.__OFFSET_S:.6f}s | Drift: {self.drift_ppm():.2f}ppm | "
+                f"RTT: {best.rtt_s * 1000:.2f}ms"
+            )
+        return True
+
+    def start(self, interval_s: float = 60.0) -> None:
+        """
+        Sync in a background thread
+
+        Args:
+            interval_s: Time between two syncs in seconds. Default: 60s
+        """
+        if self.__WORKER is not None and self.__WORKER.is_alive():
+            return
+        self.__STOP_EVENT.clear()
+        self.__WORKER = threading.Thread(
+            target=self.__sync_loop, args=(interval_s,), name="robotClock", daemon=True
+        )
+        self.__WORKER.start()
+
+    def stop(self) -> None:
+        """
+        Stop the background sync
+        """
+        self.__STOP_EVENT.set()
+        if self.__WORKER is not None:
+            self.__WORKER.join()
+            self.__WORKER = None
+
+    ##############################################################################################################
+    # Getters
+    ##############################################################################################################
+
+    def is_synced(self) -> bool:
+        return len(self.__SAMPLES) > 0
+
+    def to_host_time(self, robot_timestamp_ms: typing.Union[int, float, str]) -> float:
+        """
+        Convert a robot timestamp to host time
+
+        Args:
+            robot_timestamp_ms: Robot uptime in milliseconds. Strings as returned by the API are accepted.
+
+        Returns:
+            Host time in seconds since the epoch
+        """
+        robot_s = float(robot_timestamp_ms) / 1000.0
+        with self.__LOCK:
+            return self.__WALL_BASE + self.__OFFSET_S + self.__RATE * robot_s
+
+    def to_robot_time(self, host_time_s: typing.Optional[float] = None) -> float:
+        """
+        Convert host time to a robot timestamp
+
+        Args:
+            host_time_s: Host time in seconds since the epoch. Default: Now
+
+        Returns:
+            Robot uptime in milliseconds
+        """
+        if host_time_s is None:
+            host_time_s = self.__host_now()
+        with self.__LOCK:
+            return (host_time_s - self.__WALL_BASE - self.__OFFSET_S) / self.__RATE * 1000.0
+
+    def drift_ppm(self) -> float:
+        """
+        Returns:
+            Robot clock drift against the host clock in parts per million
+        """
+        return (self.__RATE - 1.0) * 1e6
+
+    def uncertainty_s(self) -> float:
+        """
+        Returns:
+            Half of the smallest round-trip time of the window in seconds. inf before the first sync.
+        """
+        with self.__LOCK:
+            if not self.__SAMPLES:
+                return float("inf")
+            return min(sample.rtt_s for sample in self.__SAMPLES) / 2.0
+
+    ##############################################################################################################
+    # Private Methods
+    ##############################################################################################################
+
+    def __host_now(self) -> float:
+        return self.__WALL_BASE + (time.monotonic() - self.__MONOTONIC_BASE)
+
+    def __measure(self) -> typing.Optional[clockSample]:
+        start = time.monotonic()
+        try:
+            robot_ms = float(self.__PLATFORM.get_timestamp())
+        except (TypeError, ValueError) as e:
+            self.__LOGGER.WARNING(f"Invalid Robot Timestamp | {e}")
+            return None
+        end = time.monotonic()
+        host_s = (start + end) / 2.0 - self.__MONOTONIC_BASE
+        return clockSample(host_s=host_s, robot_s=robot_ms / 1000.0, rtt_s=end - start)
+
+    def __fit(self) -> None:
+        # Weighted least squares of host time against robot time. Fast round trips weigh more.
+        samples = list(self.__SAMPLES)
+        if len(samples) == 1 or samples[-1].robot_s - samples[0].robot_s < 1.0:
+            # Too short to see drift => Offset of the fastest sample only
+            best = min(samples, key=lambda sample: sample.rtt_s)
+            self.__RATE = 1.0
+            self.__OFFSET_S = best.host_s - best.robot_s
+            return
+        weights = [1.0 / max(sample.rtt_s, 1e-4) ** 2 for sample in samples]
+        total = sum(weights)
+        mean_robot = sum(w * s.robot_s for w, s in zip(weights, samples)) / total
+        mean_host = sum(w * s.host_s for w, s in zip(weights, samples)) / total
+        covariance = sum(
+            w * (s.robot_s - mean_robot) * (s.host_s - mean_host) for w, s in zip(weights, samples)
+        )
+        variance = sum(w * (s.robot_s - mean_robot) ** 2 for w, s in zip(weights, samples))
+        self.__RATE = covariance / variance if variance > 0 else 1.0
+        self.__OFFSET_S = mean_host - self.__RATE * mean_robot
+
+    def __sync_loop(self, interval_s: float) -> None:
+        while not self.__STOP_EVENT.is_set():
+            try:
+                self.sync()
+            except Exception as e:
+                self.__LOGGER.ERROR(f"Clock Sync Failed | {e}")
+            self.__STOP_EVENT.wait(interval_s)
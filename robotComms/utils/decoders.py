@@ -0,0 +1,161 @@
+"""
+Module to decode JSON response bodies.
+
+`requests.Response.json()` guesses the encoding, decodes the body to text and parses the text with
+the stdlib decoder. The decoders here parse the raw body bytes directly and can use a faster decoder
+when one is installed.
+
+Decoders:
+    - "orjson" => https://github.com/ijl/orjson (optional)
+    - "ujson" => https://github.com/ultrajson/ultrajson (optional)
+    - "json" => Standard Library. Always available.
+    - "auto" => First available of the list above
+"""
+
+# Custom Packages
+from .results import DictType, ListDictType
+
+# Imported Packages
+import json
+import typing
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover - optional dependency
+    ujson = None
+
+DecoderType = typing.Callable[[bytes], typing.Any]
+ModelType = typing.TypeVar("ModelType")
+
+
+def _decode_stdlib(content: bytes) -> typing.Any:
+    # json.loads detects UTF-8/16/32 from the bytes, no intermediate text copy is needed
+    return json.loads(content)
+
+
+def _available() -> typing.Dict[str, DecoderType]:
+    decoders: typing.Dict[str, DecoderType] = {}
+    if orjson is not None:
+        decoders["orjson"] = orjson.loads
+    if ujson is not None:
+        decoders["ujson"] = ujson.loads
+    decoders["json"] = _decode_stdlib
+    return decoders
+
+
+DECODERS: typing.Dict[str, DecoderType] = _available()
+
+
+def available_decoders() -> typing.List[str]:
+    """
+    Returns:
+        Names of the installed decoders, fastest first
+    """
+    return list(DECODERS)
+
+
+def get_decoder(decoder: typing.Union[str, DecoderType] = "auto") -> DecoderType:
+    """
+    Resolve a decoder setting
+
+    Args:
+        decoder: Decoder Name or a callable taking the body bytes
+            - "auto" => Fastest installed decoder
+            - "orjson" / "ujson" => Falls back to "json" when not installed
+            - "json" => Standard Library
+
+    Returns:
+        Callable decoding the raw body bytes. Raises ValueError on invalid JSON.
+    """
+    if callable(decoder):
+        return decoder
+    if decoder == "auto":
+        return next(iter(DECODERS.values()))
+    if decoder not in ("orjson", "ujson", "json"):
+        raise ValueError(f"Invalid JSON Decoder: {decoder}")
+    return DECODERS.get(decoder, _decode_stdlib)
+
+
+def decoder_name(decoder: typing.Union[str, DecoderType] = "auto") -> str:
+    """
+    Returns:
+        Name of the decoder a setting resolves to. "custom" for callables.
+    """
+    resolved = get_decoder(decoder)
+    for name, candidate in DECODERS.items():
+        if candidate is resolved:
+            return name
+    return "custom"
+
+
+def scalar_text(value: typing.Any) -> str:
+    """
+    Text of a decoded JSON scalar, as returned by `Response_Type.STR`
+
+    Args:
+        value: Decoded Scalar
+
+    Returns:
+        - bool => "True" / "False"
+        - None => ""
+        - Anything else => str(value)
+    """
+    if value is None:
+        return ""
+    return str(value)
+
+
+def decode_scalar(content: bytes) -> str:
+    """
+    Read a scalar body without the JSON decoder. Endpoints such as `platform/timestamp` and
+    `localization/quality` return a bare number, boolean or string.
+
+    Args:
+        content: Body Bytes. Example: b"1234", b"true", b'"always"'
+
+    Returns:
+        - Numbers => Text of the number. Example: "1234"
+        - Booleans => "True" / "False"
+        - Strings => Unquoted text. Escaped strings go through the stdlib decoder.
+        - null or empty body => ""
+    """
+    text = content.strip()
+    if not text or text == b"null":
+        return ""
+    if text == b"true":
+        return "True"
+    if text == b"false":
+        return "False"
+    if text[:1] == b'"' and text[-1:] == b'"':
+        if b"\\" in text:
+            return scalar_text(json.loads(text))
+        return text[1:-1].decode("utf-8", errors="replace")
+    return text.decode("utf-8", errors="replace")
+
+
+def decode_model(
+    data: typing.Union[DictType, ListDictType, typing.Any],
+    model: typing.Type[ModelType],
+) -> typing.Union[ModelType, typing.List[ModelType], None]:
+    """
+    Build typed models out of decoded JSON
+
+    Args:
+        data: Decoded JSON
+        model: Model Class with `from_dict`. Example: poi_Model
+
+    Returns:
+        - Model for a Dictionary
+        - List of Models for a List of Dictionaries
+        - None for anything else
+    """
+    if isinstance(data, dict):
+        return model.from_dict(data)  # type: ignore[attr-defined]
+    if isinstance(data, list):
+        return [model.from_dict(element) for element in data]  # type: ignore[attr-defined]
+    return None
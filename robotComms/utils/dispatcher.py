@@ -0,0 +1,460 @@
+"""
+Module to dispatch delivery orders to a fleet of robots.
+
+`deliveryDispatcher.submit()` only queues the order and returns at once. One dispatcher thread does
+the network work for every robot:
+    -> Batching: Queued orders of a robot are sent with one `delivery.create_tasks()` request once
+       `batch_size` orders are waiting or the oldest one waited `batch_window_s`
+    -> Bounded Concurrency: At most `max_in_flight` batch requests at a time, one per robot so the
+       tasks reach each robot in submission order
+    -> Shared Poller: One `delivery.poll_tasks()` request per robot and poll, whatever the number of
+       tracked orders, sent to the robots in parallel. A task leaving the list of its robot is
+       finished. A failed request leaves every order of the robot as it was.
+
+`on_change` is called from the dispatcher threads without holding the dispatcher lock, so it may
+call back into the dispatcher. Example: `submit()` a follow-up order.
+
+Order States:
+    - "QUEUED" => Waiting for its batch
+    - "SUBMITTED" => Created on the robot, no state reported yet
+    - State reported by the robot. Example: "PENDING", "RUNNING"
+    - "FINISHED" => Left the task list of the robot
+    - "FAILED" => Batch request failed. Orders are not resent: the robot may have created them.
+    - "CANCELED" => Canceled with `cancel()`
+"""
+
+# Custom Packages
+from .logger import systemLogger
+from .results import DictType
+
+# Imported Packages
+from concurrent.futures import Future, ThreadPoolExecutor
+import collections
+import itertools
+import threading
+import time
+import typing
+
+if typing.TYPE_CHECKING:
+    from robotComms.api_classes.delivery import delivery
+    from robotComms.robotComms import robotComms
+
+FINAL_STATES: typing.Set[str] = {"FINISHED", "FAILED", "CANCELED"}
+
+
+class deliveryOrder:
+    __slots__ = (
+        "order_id",
+        "robot_id",
+        "task",
+        "task_id",
+        "state",
+        "message",
+        "queued_at",
+        "submitted_at",
+        "finished_at",
+        "_done",
+    )
+
+    def __init__(self, order_id: int, robot_id: str, task: DictType) -> None:
+        """
+        Handle of one order. Created by `deliveryDispatcher.submit()`.
+
+        Args:
+            order_id: Local ID, unique per dispatcher
+            robot_id: Robot the order goes to
+            task: Task Body of `delivery.create_task()`
+        """
+        self.order_id: int = order_id
+        self.robot_id: str = robot_id
+        self.task: DictType = task
+        self.task_id: typing.Optional[str] = None
+        self.state: str = "QUEUED"
+        self.message: str = ""
+        self.queued_at: float = time.monotonic()
+        self.submitted_at: float = 0.0
+        self.finished_at: float = 0.0
+        self._done: threading.Event = threading.Event()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: typing.Optional[float] = None) -> bool:
+        """
+        Wait until the order reached a final state
+
+        Args:
+            timeout: Max wait in seconds. Default: None => Until done
+
+        Returns:
+            - True => Done
+            - False => Timeout reached
+        """
+        return self._done.wait(timeout)
+
+    def summary(self) -> DictType:
+        """
+        Returns:
+            Order as Dictionary
+        """
+        return {
+            "order_id": self.order_id,
+            "robot_id": self.robot_id,
+            "task_id": self.task_id,
+            "state": self.state,
+            "message": self.message,
+        }
+
+    def __repr__(self) -> str:
+        return f"deliveryOrder(order_id={self.order_id}, robot_id={self.robot_id!r}, task_id={self.task_id!r}, state={self.state!r})"
+
+
+class deliveryDispatcher:
+    def __init__(
+        self,
+        robots: typing.Dict[str, typing.Union["robotComms", "delivery"]],
+        batch_size: int = 20,
+        batch_window_s: float = 0.5,
+        max_in_flight: int = 4,
+        poll_interval_s: float = 2.0,
+        on_change: typing.Optional[typing.Callable[[deliveryOrder], None]] = None,
+        logger: typing.Optional[systemLogger] = None,
+    ) -> None:
+        """
+        Batch delivery orders per robot and track their tasks
+
+        Args:
+            robots: Robots keyed by name. Values are `robotComms` instances or their delivery API.
+            batch_size: Max number of tasks per create request. Default: 20
+            batch_window_s: Max wait of a queued order for its batch to fill. Default: 0.5s
+            max_in_flight: Max number of concurrent create requests over the fleet. Default: 4
+            poll_interval_s: Time between two task polls of a robot. Default: 2s
+            on_change: Called with the order after every state change, from the dispatcher threads
+            logger: Instance of systemLogger. If not provided, initiates with log name 'dispatcher_logger'
+        """
+        self.__APIS: typing.Dict[str, "delivery"] = {
+            robot_id: getattr(robot, "delivery", robot) for robot_id, robot in robots.items()
+        }
+        self.__BATCH_SIZE: int = max(1, batch_size)
+        self.__BATCH_WINDOW_S: float = batch_window_s
+        self.__MAX_IN_FLIGHT: int = max(1, max_in_flight)
+        self.__POLL_INTERVAL_S: float = poll_interval_s
+        self.__ON_CHANGE = on_change
+        self.__LOGGER: systemLogger = logger or systemLogger(
+            logger_name="dispatcher_logger",
+            log_file_path="logs",
+            enable_console_logging=True,
+        )
+        self.__QUEUES: typing.Dict[str, typing.Deque[deliveryOrder]] = {
+            robot_id: collections.deque() for robot_id in self.__APIS
+        }
+        # Submitted orders still running, keyed by task id per robot
+        self.__ACTIVE: typing.Dict[str, typing.Dict[str, deliveryOrder]] = {
+            robot_id: {} for robot_id in self.__APIS
+        }
+        self.__IN_FLIGHT: typing.Set[str] = set()
+        self.__ORDER_IDS = itertools.count(1)
+        self.__CONDITION = threading.Condition()
+        self.__STOP_EVENT = threading.Event()
+        self.__WORKER: typing.Optional[threading.Thread] = None
+        self.__POOL: typing.Optional[ThreadPoolExecutor] = None
+        self.__POLL_POOL: typing.Optional[ThreadPoolExecutor] = None
+        self.__POLL_POOL_LOCK = threading.Lock()
+        self.__NEXT_POLL: float = 0.0
+        self.__COUNTS: typing.Dict[str, int] = collections.Counter()
+
+    ##############################################################################################################
+    # Dispatching
+    ##############################################################################################################
+
+    def start(self) -> None:
+        """
+        Start the dispatcher thread
+        """
+        if self.__WORKER is not None and self.__WORKER.is_alive():
+            return
+        self.__STOP_EVENT.clear()
+        self.__POOL = ThreadPoolExecutor(
+            max_workers=self.__MAX_IN_FLIGHT, thread_name_prefix="dispatcher"
+        )
+        self.__WORKER = threading.Thread(target=self.__run, name="deliveryDispatcher", daemon=True)
+        self.__WORKER.start()
+        self.__LOGGER.INFO(
+            f"Delivery Dispatcher started | Robots: {len(self.__APIS)} | Batch: {self.__BATCH_SIZE}"
+        )
+
+    def stop(self, drain: bool = True) -> None:
+        """
+        Stop the dispatcher thread
+
+        Args:
+            drain: Send the queued orders before stopping. Tracking of running tasks stops either way.
+        """
+        if drain and self.__WORKER is not None:
+            self.flush()
+        self.__STOP_EVENT.set()
+        with self.__CONDITION:
+            self.__CONDITION.notify_all()
+        if self.__WORKER is not None:
+            self.__WORKER.join()
+            self.__WORKER = None
+        if self.__POOL is not None:
+            self.__POOL.shutdown(wait=True)
+            self.__POOL = None
+        with self.__POLL_POOL_LOCK:
+            if self.__POLL_POOL is not None:
+                self.__POLL_POOL.shutdown(wait=True)
+                self.__POLL_POOL = None
+        self.__LOGGER.INFO("Delivery Dispatcher stopped")
+
+    def submit(self, robot_id: str, task: DictType) -> deliveryOrder:
+        """
+        Queue an order. Returns without waiting for the network.
+
+        Args:
+            robot_id: Robot name of `robots`
+            task: Task Body of `delivery.create_task()`. Example: {"task_type": "FOOD_DELIVERY", "target": {"poi_name": "A101"}}
+
+        Returns:
+            Order Handle. Wait for it with `order.wait()`.
+
+        Raises:
+            KeyError: Unknown Robot
+        """
+        queue = self.__QUEUES[robot_id]
+        order = deliveryOrder(next(self.__ORDER_IDS), robot_id, task)
+        with self.__CONDITION:
+            queue.append(order)
+            self.__COUNTS["submitted"] += 1
+            # Only a full batch needs the dispatcher early, the window wakes it otherwise
+            if len(queue) >= self.__BATCH_SIZE or len(queue) == 1:
+                self.__CONDITION.notify()
+        return order
+
+    def cancel(self, order: deliveryOrder) -> bool:
+        """
+        Cancel an order. Queued orders are dropped, submitted ones are canceled on the robot.
+
+        Returns:
+            - True => Canceled
+            - False => Already done or the cancel request failed
+        """
+        changed: typing.List[deliveryOrder] = []
+        with self.__CONDITION:
+            queue = self.__QUEUES[order.robot_id]
+            if order.state == "QUEUED" and order in queue:
+                queue.remove(order)
+                self.__finish(order, "CANCELED", changed)
+            task_id = order.task_id
+        if changed:
+            self.__notify(changed)
+            return True
+        if order.state in FINAL_STATES or task_id is None:
+            return False
+        if not self.__APIS[order.robot_id].cancel_task(task_id):
+            return False
+        with self.__CONDITION:
+            # A poll may have finished the order meanwhile
+            if self.__ACTIVE[order.robot_id].pop(task_id, None) is not None:
+                self.__finish(order, "CANCELED", changed)
+        self.__notify(changed)
+        return bool(changed)
+
+    def flush(self, timeout: typing.Optional[float] = None) -> bool:
+        """
+        Send every queued order now and wait for the batch requests
+
+        Args:
+            timeout: Max wait in seconds. Default: None => Until sent
+
+        Returns:
+            - True => Nothing queued or in flight
+            - False => Timeout reached
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.__CONDITION:
+            if self.__POOL is None:
+                # Not started => Nothing can be sent
+                return not any(self.__QUEUES.values())
+            while any(self.__QUEUES.values()) or self.__IN_FLIGHT:
+                self.__dispatch_due(force=True)
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.__CONDITION.wait(remaining if remaining is not None else 0.1)
+        return True
+
+    def poll_once(self) -> int:
+        """
+        Fetch the task list of every robot with running orders and update their states
+
+        Returns:
+            Number of orders which finished
+        """
+        with self.__CONDITION:
+            robots = [robot_id for robot_id, active in self.__ACTIVE.items() if active]
+        if len(robots) <= 1:
+            return sum(self.__poll_robot(robot_id) for robot_id in robots)
+        futures = {
+            robot_id: self.__poll_pool().submit(self.__poll_robot, robot_id) for robot_id in robots
+        }
+        finished = 0
+        for robot_id, future in futures.items():
+            try:
+                finished += future.result()
+            except Exception as e:
+                self.__LOGGER.ERROR(f"Delivery Poll of {robot_id} Failed | {e}")
+        return finished
+
+    def stats(self) -> DictType:
+        """
+        Returns:
+            Counters. Example: {"queued": 0, "in_flight": 1, "active": 40, "submitted": 500, "batches": 25, ...}
+        """
+        with self.__CONDITION:
+            counts: DictType = dict(self.__COUNTS)
+            counts["queued"] = sum(len(queue) for queue in self.__QUEUES.values())
+            counts["in_flight"] = len(self.__IN_FLIGHT)
+            counts["active"] = sum(len(active) for active in self.__ACTIVE.values())
+        return counts
+
+    def __enter__(self) -> "deliveryDispatcher":
+        self.start()
+        return self
+
+    def __exit__(self, *_: typing.Any) -> None:
+        self.stop()
+
+    ##############################################################################################################
+    # Private Methods
+    ##############################################################################################################
+
+    def __run(self) -> None:
+        while not self.__STOP_EVENT.is_set():
+            with self.__CONDITION:
+                wait_s = self.__dispatch_due(force=False)
+                if wait_s > 0:
+                    self.__CONDITION.wait(wait_s)
+            if time.monotonic() >= self.__NEXT_POLL:
+                self.__NEXT_POLL = time.monotonic() + self.__POLL_INTERVAL_S
+                try:
+                    self.poll_once()
+                except Exception as e:
+                    self.__LOGGER.ERROR(f"Delivery Poll Failed | {e}")
+
+    def __dispatch_due(self, force: bool) -> float:
+        # Caller holds the condition. Returns the time until the next batch or poll is due.
+        now = time.monotonic()
+        wait_s = max(0.0, self.__NEXT_POLL - now) if any(self.__ACTIVE.values()) else 1.0
+        for robot_id, queue in self.__QUEUES.items():
+            if not queue or robot_id in self.__IN_FLIGHT:
+                continue
+            due_at = queue[0].queued_at + self.__BATCH_WINDOW_S
+            if not force and len(queue) < self.__BATCH_SIZE and due_at > now:
+                wait_s = min(wait_s, due_at - now)
+                continue
+            if len(self.__IN_FLIGHT) >= self.__MAX_IN_FLIGHT or self.__POOL is None:
+                # Woken up again by the batch which frees its slot
+                continue
+            batch = [queue.popleft() for _ in range(min(self.__BATCH_SIZE, len(queue)))]
+            self.__IN_FLIGHT.add(robot_id)
+            future: Future = self.__POOL.submit(self.__send_batch, robot_id, batch)
+            future.add_done_callback(lambda _, robot_id=robot_id: self.__batch_done(robot_id))
+        return wait_s
+
+    def __send_batch(self, robot_id: str, batch: typing.List[deliveryOrder]) -> None:
+        start = time.perf_counter()
+        try:
+            created = self.__APIS[robot_id].create_tasks([order.task for order in batch])
+        except Exception as e:
+            self.__LOGGER.ERROR(f"Batch of {len(batch)} Orders to {robot_id} Failed | {e}")
+            created = []
+        now = time.monotonic()
+        changed: typing.List[deliveryOrder] = []
+        with self.__CONDITION:
+            self.__COUNTS["batches"] += 1
+            if len(created) != len(batch):
+                self.__COUNTS["failed_batches"] += 1
+                for order in batch:
+                    order.message = f"Create request failed with {len(created)}/{len(batch)} tasks"
+                    self.__finish(order, "FAILED", changed)
+            else:
+                active = self.__ACTIVE[robot_id]
+                for order, task in zip(batch, created):
+                    order.task_id = str(task.get("id"))
+                    order.submitted_at = now
+                    active[order.task_id] = order
+                    self.__change(order, str(task.get("state") or "SUBMITTED"), changed)
+        self.__notify(changed)
+        if len(created) != len(batch):
+            return
+        self.__LOGGER.DEBUG(
+            f"Sent {len(batch)} Orders to {robot_id} in {time.perf_counter() - start:.3f}s"
+        )
+
+    def __batch_done(self, robot_id: str) -> None:
+        with self.__CONDITION:
+            self.__IN_FLIGHT.discard(robot_id)
+            self.__CONDITION.notify_all()
+
+    def __poll_robot(self, robot_id: str) -> int:
+        tasks = self.__APIS[robot_id].poll_tasks()
+        if tasks is None:
+            # Failed request => Not a statement about the tasks, keep every order as it is
+            with self.__CONDITION:
+                self.__COUNTS["failed_polls"] += 1
+            return 0
+        states = {str(task.get("id")): str(task.get("state") or "") for task in tasks}
+        changed: typing.List[deliveryOrder] = []
+        finished = 0
+        with self.__CONDITION:
+            self.__COUNTS["polls"] += 1
+            active = self.__ACTIVE[robot_id]
+            for task_id in list(active):
+                order = active[task_id]
+                state = states.get(task_id)
+                if state is None:
+                    del active[task_id]
+                    self.__finish(order, "FINISHED", changed)
+                    finished += 1
+                elif state in FINAL_STATES:
+                    del active[task_id]
+                    self.__finish(order, state, changed)
+                    finished += 1
+                elif state and state != order.state:
+                    self.__change(order, state, changed)
+        self.__notify(changed)
+        return finished
+
+    def __poll_pool(self) -> ThreadPoolExecutor:
+        with self.__POLL_POOL_LOCK:
+            if self.__POLL_POOL is None:
+                self.__POLL_POOL = ThreadPoolExecutor(
+                    max_workers=min(16, len(self.__APIS)), thread_name_prefix="dispatcher-poll"
+                )
+            return self.__POLL_POOL
+
+    def __change(
+        self, order: deliveryOrder, state: str, changed: typing.List[deliveryOrder]
+    ) -> None:
+        # Caller holds the condition. The callbacks run in `__notify()` once it is released.
+        order.state = state
+        changed.append(order)
+
+    def __finish(
+        self, order: deliveryOrder, state: str, changed: typing.List[deliveryOrder]
+    ) -> None:
+        order.finished_at = time.monotonic()
+        self.__COUNTS[state.lower()] += 1
+        self.__change(order, state, changed)
+
+    def __notify(self, changed: typing.List[deliveryOrder]) -> None:
+        for order in changed:
+            if self.__ON_CHANGE is not None:
+                try:
+                    self.__ON_CHANGE(order)
+                except Exception as e:
+                    self.__LOGGER.ERROR(f"Order Callback Failed | {e}")
+            if order.state in FINAL_STATES:
+                order._done.set()
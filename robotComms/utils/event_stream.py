@@ -0,0 +1,357 @@
+"""
+Module to turn `platform.get_events()` into a stream of new events.
+
+`platform.get_events()` returns every event the robot currently holds. The stream polls it from one
+thread per robot, keeps a cursor on the event timestamps, drops the events it has already seen and
+hands each new event to every subscriber.
+
+Subscribers:
+    -> Own a bounded queue. A slow subscriber only loses its own events.
+    -> Read with `get()`, a blocking `for` loop or an `async for` loop.
+    -> Can ask for the last events of the replay window when joining late.
+"""
+
+# Custom Packages
+from .logger import systemLogger
+from .results import DictType, ListDictType
+
+# Imported Packages
+import asyncio
+import collections
+import json
+import threading
+import typing
+
+if typing.TYPE_CHECKING:
+    from robotComms.api_classes.platform import platform
+
+OVERFLOW_POLICIES: typing.List[str] = ["drop_oldest", "drop_newest", "block"]
+
+
+def _event_timestamp(event: DictType) -> int:
+    try:
+        return int(event.get("timestamp", 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _event_key(event: DictType) -> str:
+    return json.dumps(event, sort_keys=True)
+
+
+class eventSubscription:
+    def __init__(
+        self,
+        stream: "eventStream",
+        max_queue: int,
+        overflow: str,
+        event_types: typing.Optional[typing.Set[str]],
+        block_timeout_s: float,
+    ) -> None:
+        """
+        Bounded Queue of events for one subscriber. Created by `eventStream.subscribe()`.
+
+        Args:
+            stream: Owning Event Stream
+            max_queue: Max number of queued events
+            overflow: Policy when the queue is full
+                - "drop_oldest" => Remove the oldest queued event
+                - "drop_newest" => Drop the incoming event
+                - "block" => Stall the poller for up to `block_timeout_s`, then drop the incoming event
+            event_types: Only queue these event types. None => All types
+            block_timeout_s: Max stall of the poller for the "block" policy
+        """
+        self.__STREAM = stream
+        self.__MAX_QUEUE: int = max(1, max_queue)
+        self.__OVERFLOW: str = overflow
+        self.__TYPES: typing.Optional[typing.Set[str]] = event_types
+        self.__BLOCK_TIMEOUT_S: float = block_timeout_s
+        self.__QUEUE: typing.Deque[DictType] = collections.deque()
+        self.__CONDITION = threading.Condition()
+        self.__CLOSED: bool = False
+        self.__WAKEUPS: typing.List[typing.Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = []
+        self.dropped: int = 0
+
+    def accepts(self, event: DictType) -> bool:
+        return self.__TYPES is None or event.get("type") in self.__TYPES
+
+    def put(self, event: DictType) -> None:
+        """
+        Queue an event following the overflow policy. Called by the poller.
+        """
+        with self.__CONDITION:
+            if self.__CLOSED:
+                return
+            if len(self.__QUEUE) >= self.__MAX_QUEUE:
+                if self.__OVERFLOW == "block":
+                    self.__CONDITION.wait_for(
+                        lambda: len(self.__QUEUE) < self.__MAX_QUEUE or self.__CLOSED,
+                        timeout=self.__BLOCK_TIMEOUT_S,
+                    )
+                if len(self.__QUEUE) >= self.__MAX_QUEUE:
+                    self.dropped += 1
+                    if self.__OVERFLOW != "drop_oldest":
+                        return
+                    self.__QUEUE.popleft()
+            self.__QUEUE.append(event)
+            self.__CONDITION.notify_all()
+            wakeups = list(self.__WAKEUPS)
+        for loop, ready in wakeups:
+            loop.call_soon_threadsafe(ready.set)
+
+    def get(self, timeout: typing.Optional[float] = None) -> typing.Optional[DictType]:
+        """
+        Take the next event
+
+        Args:
+            timeout: Max time to wait in seconds. Default: None => Wait until an event or close
+
+        Returns:
+            Event or None on timeout or when the subscription is closed
+        """
+        with self.__CONDITION:
+            if not self.__CONDITION.wait_for(
+                lambda: self.__QUEUE or self.__CLOSED, timeout=timeout
+            ):
+                return None
+            if not self.__QUEUE:
+                return None
+            event = self.__QUEUE.popleft()
+            self.__CONDITION.notify_all()
+            return event
+
+    def pending(self) -> int:
+        """
+        Returns:
+            Number of queued events
+        """
+        with self.__CONDITION:
+            return len(self.__QUEUE)
+
+    def close(self) -> None:
+        """
+        Stop receiving events. Running iterators end once the queue is drained.
+        """
+        self.__STREAM.unsubscribe(self)
+        with self.__CONDITION:
+            self.__CLOSED = True
+            self.__CONDITION.notify_all()
+            wakeups = list(self.__WAKEUPS)
+        for loop, ready in wakeups:
+            loop.call_soon_threadsafe(ready.set)
+
+    def closed(self) -> bool:
+        return self.__CLOSED
+
+    def __iter__(self) -> typing.Iterator[DictType]:
+        while True:
+            event = self.get()
+            if event is None:
+                return
+            yield event
+
+    async def __aiter__(self) -> typing.AsyncIterator[DictType]:
+        loop = asyncio.get_running_loop()
+        ready = asyncio.Event()
+        with self.__CONDITION:
+            self.__WAKEUPS.append((loop, ready))
+        try:
+            while True:
+                ready.clear()
+                event = self.get(timeout=0)
+                if event is not None:
+                    yield event
+                    continue
+                if self.__CLOSED:
+                    return
+                await ready.wait()
+        finally:
+            with self.__CONDITION:
+                self.__WAKEUPS.remove((loop, ready))
+
+    def __enter__(self) -> "eventSubscription":
+        return self
+
+    def __exit__(self, *_: typing.Any) -> None:
+        self.close()
+
+
+class eventStream:
+    def __init__(
+        self,
+        platform_api: "platform",
+        poll_interval_s: float = 0.5,
+        replay_window: int = 100,
+        seen_capacity: int = 4096,
+        logger: typing.Optional[systemLogger] = None,
+    ) -> None:
+        """
+        Deduplicated Event Stream of one robot. Create one stream per robot and share it.
+
+        Args:
+            platform_api: Platform API of the robot. Example: `robotComms().platform`
+            poll_interval_s: Time between two polls in seconds. Default: 0.5s
+            replay_window: Number of recent events kept for late subscribers. Default: 100
+            seen_capacity: Number of event keys remembered for deduplication. Default: 4096
+            logger: Instance of systemLogger. If not provided, initiates with log name 'eventStream_logger'
+        """
+        self.__PLATFORM = platform_api
+        self.__POLL_INTERVAL_S: float = poll_interval_s
+        self.__LOGGER: systemLogger = logger or systemLogger(
+            logger_name="eventStream_logger",
+            log_file_path="logs",
+            enable_console_logging=True,
+        )
+        self.__CURSOR: int = -1
+        self.__SEEN: typing.OrderedDict[str, None] = collections.OrderedDict()
+        self.__SEEN_CAPACITY: int = max(1, seen_capacity)
+        self.__REPLAY: typing.Deque[DictType] = collections.deque(maxlen=max(0, replay_window))
+        self.__SUBSCRIBERS: typing.List[eventSubscription] = []
+        self.__LOCK = threading.Lock()
+        self.__STOP_EVENT = threading.Event()
+        self.__WORKER: typing.Optional[threading.Thread] = None
+
+    ##############################################################################################################
+    # Polling
+    ##############################################################################################################
+
+    def start(self) -> None:
+        """
+        Start the poller thread
+        """
+        if self.__WORKER is not None and self.__WORKER.is_alive():
+            return
+        self.__STOP_EVENT.clear()
+        self.__WORKER = threading.Thread(target=self.__poll_loop, name="eventStream", daemon=True)
+        self.__WORKER.start()
+        self.__LOGGER.INFO(f"Event Stream started every {self.__POLL_INTERVAL_S}s")
+
+    def stop(self) -> None:
+        """
+        Stop the poller thread. Subscriptions stay open.
+        """
+        self.__STOP_EVENT.set()
+        if self.__WORKER is not None:
+            self.__WORKER.join()
+            self.__WORKER = None
+        self.__LOGGER.INFO("Event Stream stopped")
+
+    def poll_once(self) -> ListDictType:
+        """
+        Fetch events once and fan out the new ones
+
+        Returns:
+            New Events sorted by timestamp
+        """
+        events = self.__PLATFORM.get_events()
+        if not isinstance(events, list):
+            return []
+        new_events = self.__filter_new(events)
+        if new_events:
+            with self.__LOCK:
+                self.__REPLAY.extend(new_events)
+                subscribers = list(self.__SUBSCRIBERS)
+            for event in new_events:
+                for subscriber in subscribers:
+                    if subscriber.accepts(event):
+                        subscriber.put(event)
+        return new_events
+
+    def cursor(self) -> int:
+        """
+        Returns:
+            Timestamp of the newest event seen. -1 before the first event.
+        """
+        return self.__CURSOR
+
+    ##############################################################################################################
+    # Subscriptions
+    ##############################################################################################################
+
+    def subscribe(
+        self,
+        max_queue: int = 1000,
+        overflow: str = "drop_oldest",
+        replay: bool = False,
+        event_types: typing.Optional[typing.List[str]] = None,
+        block_timeout_s: float = 1.0,
+    ) -> eventSubscription:
+        """
+        Create a subscription
+
+        Args:
+            max_queue: Max number of queued events. Default: 1000
+            overflow: "drop_oldest", "drop_newest" or "block". Default: "drop_oldest"
+            replay: Queue the events of the replay window first. Default: False
+            event_types: Only receive these event types. Example: ["DEVICE_ERROR"]. Default: All types
+            block_timeout_s: Max stall of the poller for the "block" policy. Default: 1s
+
+        Returns:
+            subscription: Iterate it with `for` or `async for`, or call `get()`
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Invalid Overflow Policy: {overflow}")
+        subscription = eventSubscription(
+            self,
+            max_queue,
+            overflow,
+            set(event_types) if event_types else None,
+            block_timeout_s,
+        )
+        with self.__LOCK:
+            backlog = list(self.__REPLAY) if replay else []
+            self.__SUBSCRIBERS.append(subscription)
+        for event in backlog:
+            if subscription.accepts(event):
+                subscription.put(event)
+        return subscription
+
+    def unsubscribe(self, subscription: eventSubscription) -> None:
+        with self.__LOCK:
+            if subscription in self.__SUBSCRIBERS:
+                self.__SUBSCRIBERS.remove(subscription)
+
+    def replay_window(self) -> ListDictType:
+        """
+        Returns:
+            Most recent events, oldest first
+        """
+        with self.__LOCK:
+            return list(self.__REPLAY)
+
+    ##############################################################################################################
+    # Private Methods
+    ##############################################################################################################
+
+    def __filter_new(self, events: ListDictType) -> ListDictType:
+        keyed = sorted(
+            ((_event_timestamp(event), _event_key(event), event) for event in events),
+            key=lambda item: item[0],
+        )
+        with self.__LOCK:
+            if keyed and self.__CURSOR >= 0:
+                newest = keyed[-1][0]
+                if newest < self.__CURSOR and not any(key in self.__SEEN for _, key, _ in keyed):
+                    # Robot uptime clock went backwards => Robot restarted
+                    self.__LOGGER.WARNING("Event Timestamps went backwards. Resetting cursor")
+                    self.__CURSOR = -1
+                    self.__SEEN.clear()
+
+            new_events: ListDictType = []
+            for timestamp, key, event in keyed:
+                if timestamp < self.__CURSOR or key in self.__SEEN:
+                    continue
+                self.__SEEN[key] = None
+                if len(self.__SEEN) > self.__SEEN_CAPACITY:
+                    self.__SEEN.popitem(last=False)
+                self.__CURSOR = max(self.__CURSOR, timestamp)
+                new_events.append(event)
+            return new_events
+
+    def __poll_loop(self) -> None:
+        while not self.__STOP_EVENT.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:
+                self.__LOGGER.ERROR(f"Event Poll Failed | {e}")
+            self.__STOP_EVENT.wait(self.__POLL_INTERVAL_S)
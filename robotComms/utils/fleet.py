@@ -0,0 +1,555 @@
+"""
+Module to operate on a fleet of robots at once.
+
+Layout Reconciliation:
+    1. Fetch the artifacts of every robot in parallel (bounded number of robots at a time)
+    2. Diff each robot against one declarative layout
+    3. Apply only the deltas and report the drift per robot
+
+All requests of the fleet share one rate limiter so the site network is not flooded.
+
+Firmware Rollout:
+    1. Canary wave, then waves of `wave_size` robots, `max_parallel` robots at a time
+    2. Each robot: health check, resumable upload, install, health check again
+    3. The rollout halts when a wave has more than `max_failures` failed robots
+
+Parameter Profile:
+    1. Read the profile keys of every robot in parallel, with concurrent requests per robot
+    2. Write only the keys which differ
+    3. Read the written keys back and report the ones the robot did not keep
+"""
+
+# Custom Packages
+from .logger import systemLogger
+from .results import DictType
+from .layout import LayoutType, layoutManager, layoutReport
+from .rate_limit import rateLimiter
+
+# Imported Packages
+from concurrent.futures import ThreadPoolExecutor
+import time
+import typing
+
+if typing.TYPE_CHECKING:
+    from robotComms.robotComms import robotComms
+
+
+class driftReport:
+    def __init__(self, robot_id: str) -> None:
+        """
+        Drift of one robot against the desired layout
+
+        Args:
+            robot_id: Name of the robot in the fleet
+        """
+        self.robot_id: str = robot_id
+        self.reachable: bool = True
+        self.in_sync: bool = False
+        self.applied: bool = False
+        self.success: bool = False
+        self.drift: typing.Dict[str, typing.Dict[str, int]] = {}
+        self.duration_s: float = 0.0
+        self.message: str = ""
+        self.layout_report: typing.Optional[layoutReport] = None
+
+    def summary(self) -> DictType:
+        """
+        Returns:
+            Report as Dictionary
+        """
+        return {
+            "robot_id": self.robot_id,
+            "reachable": self.reachable,
+            "in_sync": self.in_sync,
+            "applied": self.applied,
+            "success": self.success,
+            "drift": self.drift,
+            "duration_s": self.duration_s,
+            "message": self.message,
+        }
+
+
+class layoutReconciler:
+    def __init__(
+        self,
+        layout: LayoutType,
+        robots: typing.Dict[str, "robotComms"],
+        max_robots: int = 4,
+        requests_per_second: float = 20.0,
+        max_workers_per_robot: int = 2,
+        logger: typing.Optional[systemLogger] = None,
+    ) -> None:
+        """
+        Keep the artifacts of a fleet in line with one declarative layout
+
+        Args:
+            layout: Desired Layout. Collections missing from it are left untouched on every robot.
+            robots: Robots keyed by name. Values are `robotComms` instances or their artifact API.
+            max_robots: Max number of robots handled at the same time. Default: 4
+            requests_per_second: Request budget shared by the whole fleet. Default: 20
+            max_workers_per_robot: Max number of concurrent requests to one robot. Default: 2
+            logger: Instance of systemLogger. If not provided, initiates with log name 'fleet_logger'
+        """
+        self.__LAYOUT: LayoutType = layout
+        self.__MAX_ROBOTS: int = max(1, max_robots)
+        self.__LOGGER: systemLogger = logger or systemLogger(
+            logger_name="fleet_logger",
+            log_file_path="logs",
+            enable_console_logging=True,
+        )
+        self.__RATE_LIMITER = rateLimiter(requests_per_second)
+        self.__MANAGERS: typing.Dict[str, layoutManager] = {
+            robot_id: layoutManager(
+                getattr(robot, "artifact", robot),
+                max_workers=max_workers_per_robot,
+                rate_limiter=self.__RATE_LIMITER,
+                logger=self.__LOGGER,
+            )
+            for robot_id, robot in robots.items()
+        }
+
+    def check(self) -> typing.Dict[str, driftReport]:
+        """
+        Report the drift of every robot without changing anything
+
+        Returns:
+            Drift Report keyed by robot name
+        """
+        return self.__run(dry_run=True, rollback=False)
+
+    def reconcile(self, rollback: bool = True) -> typing.Dict[str, driftReport]:
+        """
+        Apply the deltas on every robot which drifted
+
+        Args:
+            rollback: Restore the touched collections of a robot if one of its calls fails. Default: True
+
+        Returns:
+            Drift Report keyed by robot name. The drift is the state before reconciliation.
+        """
+        return self.__run(dry_run=False, rollback=rollback)
+
+    def __run(self, dry_run: bool, rollback: bool) -> typing.Dict[str, driftReport]:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.__MAX_ROBOTS) as executor:
+            reports = list(
+                executor.map(
+                    lambda robot_id: self.__reconcile_robot(robot_id, dry_run, rollback),
+                    self.__MANAGERS,
+                )
+            )
+        drifted = [report.robot_id for report in reports if not report.in_sync]
+        self.__LOGGER.INFO(
+            f"Fleet {'Check' if dry_run else 'Reconcile'} done in {time.perf_counter() - start:.3f}s | "
+            f"Robots: {len(reports)} | Drifted: {drifted}"
+        )
+        return {report.robot_id: report for report in reports}
+
+    def __reconcile_robot(self, robot_id: str, dry_run: bool, rollback: bool) -> driftReport:
+        report = driftReport(robot_id)
+        start = time.perf_counter()
+        try:
+            result = self.__MANAGERS[robot_id].apply(
+                self.__LAYOUT, dry_run=dry_run, rollback=rollback
+            )
+        except Exception as e:
+            report.reachable = False
+            report.message = f"Robot Unreachable | {e}"
+            report.duration_s = time.perf_counter() - start
+            self.__LOGGER.ERROR(f"[{robot_id}] {report.message}")
+            return report
+
+        report.layout_report = result
+        report.message = result.message
+        if result.export_failed:
+            # Timeouts and errors come back as missing collections, not as exceptions
+            report.reachable = False
+            report.duration_s = time.perf_counter() - start
+            self.__LOGGER.ERROR(f"[{robot_id}] Robot Unreachable | {result.message}")
+            return report
+        for operation in result.plan.operations:
+            counts = report.drift.setdefault(
+                operation.collection, {"add": 0, "modify": 0, "delete": 0}
+            )
+            counts[operation.kind] += 1
+        report.in_sync = result.plan.is_empty() and result.success
+        report.applied = not dry_run and not result.plan.is_empty()
+        report.success = result.success
+        report.duration_s = time.perf_counter() - start
+        self.__LOGGER.INFO(f"[{robot_id}] Drift: {report.drift or 'None'} | {result.message}")
+        return report
+
+
+class rolloutReport:
+    def __init__(self, robot_id: str, wave: int) -> None:
+        """
+        Firmware Rollout result of one robot
+
+        Args:
+            robot_id: Name of the robot in the fleet
+            wave: Index of the wave the robot belongs to. 0 => Canary wave
+        """
+        self.robot_id: str = robot_id
+        self.wave: int = wave
+        self.healthy_before: bool = False
+        self.uploaded: bool = False
+        self.upgraded: bool = False
+        self.healthy_after: bool = False
+        self.skipped: bool = False
+        self.success: bool = False
+        self.version_before: str = ""
+        self.version_after: str = ""
+        self.upload_retries: int = 0
+        self.duration_s: float = 0.0
+        self.message: str = ""
+
+    def summary(self) -> DictType:
+        """
+        Returns:
+            Report as Dictionary
+        """
+        return {
+            "robot_id": self.robot_id,
+            "wave": self.wave,
+            "healthy_before": self.healthy_before,
+            "uploaded": self.uploaded,
+            "upgraded": self.upgraded,
+            "healthy_after": self.healthy_after,
+            "skipped": self.skipped,
+            "success": self.success,
+            "version_before": self.version_before,
+            "version_after": self.version_after,
+            "upload_retries": self.upload_retries,
+            "duration_s": self.duration_s,
+            "message": self.message,
+        }
+
+
+class firmwareRollout:
+    def __init__(
+        self,
+        file_path: str,
+        robots: typing.Dict[str, "robotComms"],
+        canary: int = 1,
+        wave_size: int = 4,
+        max_parallel: int = 2,
+        max_failures: int = 0,
+        upgrade_timeout_s: float = 900.0,
+        poll_interval_s: float = 5.0,
+        logger: typing.Optional[systemLogger] = None,
+    ) -> None:
+        """
+        Upgrade the firmware of a fleet in waves
+
+        Robots are upgraded wave by wave: first `canary` robots, then `wave_size` robots per wave.
+        Inside a wave at most `max_parallel` robots upload and install at the same time. The next wave
+        only starts when the previous one had at most `max_failures` failed robots.
+
+        Health Gating through `system.get_robot_health()`:
+            -> Before: Robots reporting an error or a fatal issue are skipped, not upgraded
+            -> After: A robot only succeeds when it reports a new firmware version and no error or
+               fatal issue after the upgrade
+
+        Args:
+            file_path: Firmware Image. Example: "firmware-4.6.0.bin"
+            robots: Robots keyed by name. Values are `robotComms` instances.
+            canary: Robots of the first wave. Default: 1
+            wave_size: Robots of every later wave. Default: 4
+            max_parallel: Max number of robots upgrading at the same time. Default: 2
+            max_failures: Failed robots tolerated per wave before the rollout halts. Default: 0
+            upgrade_timeout_s: Max time of the install and reboot of one robot. Default: 900s
+            poll_interval_s: Time between two upgrade status polls. Default: 5s
+            logger: Instance of systemLogger. If not provided, initiates with log name 'fleet_logger'
+        """
+        self.__FILE_PATH: str = file_path
+        self.__ROBOTS: typing.Dict[str, "robotComms"] = robots
+        self.__CANARY: int = max(0, canary)
+        self.__WAVE_SIZE: int = max(1, wave_size)
+        self.__MAX_PARALLEL: int = max(1, max_parallel)
+        self.__MAX_FAILURES: int = max(0, max_failures)
+        self.__UPGRADE_TIMEOUT_S: float = upgrade_timeout_s
+        self.__POLL_INTERVAL_S: float = poll_interval_s
+        self.__LOGGER: systemLogger = logger or systemLogger(
+            logger_name="fleet_logger",
+            log_file_path="logs",
+            enable_console_logging=True,
+        )
+
+    def plan(self) -> typing.List[typing.List[str]]:
+        """
+        Returns:
+            Robot names per wave, in rollout order
+        """
+        robot_ids = list(self.__ROBOTS)
+        waves = [robot_ids[: self.__CANARY]] if self.__CANARY else []
+        rest = robot_ids[self.__CANARY :]
+        waves.extend(
+            rest[index : index + self.__WAVE_SIZE]
+            for index in range(0, len(rest), self.__WAVE_SIZE)
+        )
+        return [wave for wave in waves if wave]
+
+    def run(self) -> typing.Dict[str, rolloutReport]:
+        """
+        Roll the firmware out
+
+        Returns:
+            Rollout Report keyed by robot name. Robots of the waves after a halt are skipped.
+        """
+        start = time.perf_counter()
+        reports: typing.Dict[str, rolloutReport] = {}
+        halted_at: typing.Optional[int] = None
+        with ThreadPoolExecutor(max_workers=self.__MAX_PARALLEL) as executor:
+            for wave, robot_ids in enumerate(self.plan()):
+                if halted_at is not None:
+                    for robot_id in robot_ids:
+                        report = reports[robot_id] = rolloutReport(robot_id, wave)
+                        report.skipped = True
+                        report.message = f"Rollout halted after wave {halted_at}"
+                    continue
+                results = list(
+                    executor.map(self.__upgrade_robot, robot_ids, [wave] * len(robot_ids))
+                )
+                failed = [
+                    report.robot_id
+                    for report in results
+                    if not report.success and not report.skipped
+                ]
+                reports.update((report.robot_id, report) for report in results)
+                self.__LOGGER.INFO(
+                    f"Rollout Wave {wave} done | Robots: {robot_ids} | Failed: {failed}"
+                )
+                if len(failed) > self.__MAX_FAILURES:
+                    halted_at = wave
+                    self.__LOGGER.ERROR(f"Rollout halted after wave {wave} | Failed: {failed}")
+        upgraded = [robot_id for robot_id, report in reports.items() if report.success]
+        self.__LOGGER.INFO(
+            f"Rollout done in {time.perf_counter() - start:.3f}s | Upgraded: {len(upgraded)}/{len(reports)}"
+        )
+        return reports
+
+    def __upgrade_robot(self, robot_id: str, wave: int) -> rolloutReport:
+        report = rolloutReport(robot_id, wave)
+        start = time.perf_counter()
+        robot = self.__ROBOTS[robot_id]
+        try:
+            health = robot.system.get_robot_health()
+            # Failed requests answer {} or the error body of the robot
+            answered = "hasError" in health
+            report.healthy_before = answered and not _health_issue(health)
+            if not report.healthy_before:
+                report.skipped = True
+                report.message = "Unhealthy before upgrade" if answered else "Robot Unreachable"
+                return report
+            report.version_before = str(robot.system.get_robot_info().get("softwareVersion", ""))
+
+            upload = robot.firmware.upload_firmware(self.__FILE_PATH)
+            report.upload_retries = int(upload.get("retries", 0))
+            report.uploaded = bool(upload.get("success"))
+            if not report.uploaded:
+                report.message = "Upload Failed"
+                return report
+            if not robot.firmware.start_upgrade(str(upload["upload_id"])):
+                report.message = "Upgrade Rejected"
+                return report
+            status = robot.firmware.wait_for_upgrade(
+                self.__UPGRADE_TIMEOUT_S, self.__POLL_INTERVAL_S, report.version_before
+            )
+            if status.get("stage") != "DONE":
+                report.message = f"Upgrade {status.get('stage', 'Timeout')}"
+                return report
+            report.version_after = str(status.get("version", ""))
+            # "DONE" with the old version => The image was not installed
+            report.upgraded = (
+                bool(report.version_after) and report.version_after != report.version_before
+            )
+            if not report.upgraded:
+                report.message = "Version unchanged after upgrade"
+                return report
+
+            health = robot.system.get_robot_health()
+            report.healthy_after = "hasError" in health and not _health_issue(health)
+            report.success = report.healthy_after
+            report.message = "Upgraded" if report.success else "Unhealthy after upgrade"
+            return report
+        except Exception as e:
+            report.message = f"Robot Unreachable | {e}"
+            return report
+        finally:
+            report.duration_s = time.perf_counter() - start
+            log = self.__LOGGER.INFO if report.success else self.__LOGGER.ERROR
+            log(
+                f"[{robot_id}] {report.message} | {report.version_before} => {report.version_after}"
+            )
+
+
+class profileReport:
+    def __init__(self, robot_id: str) -> None:
+        """
+        Parameter Profile result of one robot
+
+        Args:
+            robot_id: Name of the robot in the fleet
+        """
+        self.robot_id: str = robot_id
+        self.reachable: bool = True
+        self.in_sync: bool = False
+        self.applied: bool = False
+        self.success: bool = False
+        self.before: typing.Dict[str, str] = {}
+        self.drift: typing.List[str] = []
+        self.rejected: typing.List[str] = []
+        self.duration_s: float = 0.0
+        self.message: str = ""
+
+    def summary(self) -> DictType:
+        """
+        Returns:
+            Report as Dictionary
+        """
+        return {
+            "robot_id": self.robot_id,
+            "reachable": self.reachable,
+            "in_sync": self.in_sync,
+            "applied": self.applied,
+            "success": self.success,
+            "before": self.before,
+            "drift": self.drift,
+            "rejected": self.rejected,
+            "duration_s": self.duration_s,
+            "message": self.message,
+        }
+
+
+class parameterProfile:
+    MAX_LINEAR_SPEED: str = "base.max_moving_speed"
+    MAX_ANGULAR_SPEED: str = "base.max_angular_speed"
+    DOCK_STRATEGY: str = "docking.docked_register_strategy"
+
+    def __init__(
+        self,
+        profile: typing.Dict[str, str],
+        robots: typing.Dict[str, "robotComms"],
+        max_robots: int = 8,
+        max_workers_per_robot: int = 4,
+        logger: typing.Optional[systemLogger] = None,
+    ) -> None:
+        """
+        Keep the system parameters of a robot or a fleet in line with one profile
+
+        Example:
+            parameterProfile(
+                {
+                    parameterProfile.MAX_LINEAR_SPEED: "0.5",
+                    parameterProfile.MAX_ANGULAR_SPEED: "0.8",
+                    parameterProfile.DOCK_STRATEGY: "always",
+                },
+                {"R1": robot_1, "R2": robot_2},
+            ).apply()
+
+        Args:
+            profile: Values as text keyed by Parameter Key. Keys missing from it are left untouched.
+            robots: Robots keyed by name. Values are `robotComms` instances or their system API.
+            max_robots: Max number of robots handled at the same time. Default: 8
+            max_workers_per_robot: Max number of concurrent requests to one robot. Default: 4
+            logger: Instance of systemLogger. If not provided, initiates with log name 'fleet_logger'
+        """
+        self.__PROFILE: typing.Dict[str, str] = {key: str(value) for key, value in profile.items()}
+        self.__ROBOTS: typing.Dict[str, typing.Any] = {
+            robot_id: getattr(robot, "system", robot) for robot_id, robot in robots.items()
+        }
+        self.__MAX_ROBOTS: int = max(1, max_robots)
+        self.__MAX_WORKERS: int = max(1, max_workers_per_robot)
+        self.__LOGGER: systemLogger = logger or systemLogger(
+            logger_name="fleet_logger",
+            log_file_path="logs",
+            enable_console_logging=True,
+        )
+
+    def check(self) -> typing.Dict[str, profileReport]:
+        """
+        Report the keys of every robot which differ from the profile, without changing anything
+
+        Returns:
+            Profile Report keyed by robot name
+        """
+        return self.__run(dry_run=True)
+
+    def apply(self) -> typing.Dict[str, profileReport]:
+        """
+        Write the differing keys on every robot and read them back
+
+        Returns:
+            Profile Report keyed by robot name. `before` and `drift` are the state before the write.
+        """
+        return self.__run(dry_run=False)
+
+    def __run(self, dry_run: bool) -> typing.Dict[str, profileReport]:
+        start = time.perf_counter()
+        robot_ids = list(self.__ROBOTS)
+        with ThreadPoolExecutor(max_workers=self.__MAX_ROBOTS) as executor:
+            reports = list(executor.map(self.__apply_robot, robot_ids, [dry_run] * len(robot_ids)))
+        failed = [report.robot_id for report in reports if not report.success]
+        self.__LOGGER.INFO(
+            f"Profile {'Check' if dry_run else 'Apply'} done in {time.perf_counter() - start:.3f}s | "
+            f"Robots: {len(reports)} | Failed: {failed}"
+        )
+        return {report.robot_id: report for report in reports}
+
+    def __apply_robot(self, robot_id: str, dry_run: bool) -> profileReport:
+        report = profileReport(robot_id)
+        start = time.perf_counter()
+        system = self.__ROBOTS[robot_id]
+        try:
+            # Fresh read => A value changed on the robot since the last read is not missed
+            report.before = system.get_parameters(
+                self.__PROFILE, refresh=True, max_workers=self.__MAX_WORKERS
+            )
+            if not report.before:
+                report.reachable = False
+                report.message = "Robot Unreachable"
+                return report
+            report.drift = [
+                key
+                for key, value in self.__PROFILE.items()
+                if report.before.get(key) != value
+                and not _same_number(report.before.get(key, ""), value)
+            ]
+            report.in_sync = not report.drift
+            if report.in_sync or dry_run:
+                report.success = True
+                report.message = "In Sync" if report.in_sync else "Drifted"
+                return report
+
+            verified = system.set_parameters(
+                {key: self.__PROFILE[key] for key in report.drift},
+                verify=True,
+                max_workers=self.__MAX_WORKERS,
+            )
+            report.applied = True
+            report.rejected = [key for key, ok in verified.items() if not ok]
+            report.success = not report.rejected
+            report.message = "Applied" if report.success else "Not kept by the robot"
+            return report
+        except Exception as e:
+            report.reachable = False
+            report.message = f"Robot Unreachable | {e}"
+            return report
+        finally:
+            report.duration_s = time.perf_counter() - start
+            log = self.__LOGGER.INFO if report.success else self.__LOGGER.ERROR
+            log(
+                f"[{robot_id}] {report.message} | Drift: {report.drift} | Rejected: {report.rejected}"
+            )
+
+
+def _health_issue(health: DictType) -> bool:
+    return bool(health.get("hasError") or health.get("hasFatal"))
+
+
+def _same_number(read: str, written: str) -> bool:
+    # Numbers compare by value => "0.50" on the robot equals "0.5" in the profile
+    try:
+        return float(read) == float(written)
+    except ValueError:
+        return False
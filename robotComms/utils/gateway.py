@@ -0,0 +1,525 @@
+"""
+Module with a local HTTP gateway fronting the Athena REST API of one or more robots.
+
+Any number of HTTP clients (own processes, third-party tools, browsers) talk to the gateway instead
+of the robot. The gateway forwards their requests over one kept-alive connection pool per robot.
+
+Applied to every forwarded request:
+    -> Caching: GET responses are cached for the TTL of the longest matching path prefix, see
+       `CACHE_TTL_S`. Paths without a TTL are never cached.
+    -> Coalescing: Identical GET requests in flight at the same time share one upstream request
+    -> Invalidation: A successful PUT, POST or DELETE drops the cached responses of its API module.
+       Example: PUT "/api/core/system/v1/parameter" drops every cached "/api/core/system/v1/..."
+    -> Rate Limiting: Upstream requests of a robot take a token of its `rateLimiter`. Cache hits and
+       coalesced requests take none. No token within `max_wait_s` => 429 to the client.
+    -> Metrics: Upstream requests are recorded into `requestMetrics`. A method and endpoint template
+       gets its own series once the robot answered it with anything but 404 or 405, every other
+       request is recorded as `OVERFLOW_ENDPOINT`. Clients probing random paths add no series.
+
+Routing:
+    - "/api/..." => First robot
+    - "/robots/<robot_id>/api/..." => Robot `robot_id`
+    - "/gateway/metrics" => Prometheus text of the upstream metrics
+    - "/gateway/stats" => Cache and request counters as JSON
+
+Responses carry "X-Gateway-Cache": "HIT" (cached or coalesced), "MISS" or "BYPASS" (not cacheable).
+
+Run:
+    python -m robotComms.utils.gateway --robot athena-01=http://192.168.11.1:1448 --port 8448
+"""
+
+# Custom Packages
+from .logger import systemLogger
+from .cache import ttlCache
+from .metrics import OVERFLOW_ENDPOINT, endpoint_template, requestMetrics
+from .rate_limit import rateLimiter
+from .results import DictType
+
+# Imported Packages
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+import argparse
+import json
+import re
+import sys
+import threading
+import typing
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Seconds a GET response stays cached, per path prefix. The longest matching prefix wins.
+CACHE_TTL_S: typing.Dict[str, float] = {
+    "/api/core/system/v1/robot/info": 60.0,
+    "/api/core/system/v1/capabilities": 10.0,
+    "/api/core/system/v1/parameter": 5.0,
+    "/api/core/artifact/v1": 5.0,
+    "/api/core/slam/v1/maps": 5.0,
+    "/api/core/statistics/v1": 5.0,
+    "/api/core/application/v1": 30.0,
+    "/api/multi-floor/map/v1": 30.0,
+    "/api/delivery/v1/settings": 5.0,
+}
+# Headers of one connection, never forwarded
+_HOP_BY_HOP: typing.FrozenSet[str] = frozenset(
+    [
+        "connection",
+        "keep-alive",
+        "proxy-authenticate",
+        "proxy-authorization",
+        "te",
+        "trailers",
+        "transfer-encoding",
+        "upgrade",
+        "host",
+        "content-length",
+    ]
+)
+_ROBOT_PATH: typing.Pattern[str] = re.compile(r"/robots/(?P<robot_id>[^/]+)(?P<path>/.*)")
+# API module of a path => Everything up to the version. Example: "/api/core/system/v1"
+_MODULE_PATH: typing.Pattern[str] = re.compile(r"(/api/.*?/v\d+)(/|$)")
+
+ResponseType = typing.Tuple[int, typing.Dict[str, str], bytes]
+
+
+class _upstream:
+    def __init__(
+        self,
+        robot_id: str,
+        url: str,
+        timeout: float,
+        pool_maxsize: int,
+        requests_per_second: float,
+        cache_entries: int,
+    ) -> None:
+        """
+        Connection pool, rate limiter and cache of one robot
+
+        Args:
+            robot_id: Name of the robot
+            url: Base URL of the robot. Example: "http://192.168.11.1:1448"
+            timeout: Upstream Request Timeout
+            pool_maxsize: Max number of kept-alive connections to the robot
+            requests_per_second: Upstream request budget. <= 0 => Unlimited
+            cache_entries: Max number of cached responses
+        """
+        self.robot_id: str = robot_id
+        self.url: str = url.rstrip("/")
+        self.timeout: float = timeout
+        self.session: requests.Session = requests.Session()
+        # pool_block => Clients beyond the pool wait for a connection instead of opening more
+        transport = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, pool_block=True)
+        self.session.mount("http://", transport)
+        self.session.mount("https://", transport)
+        self.limiter: rateLimiter = rateLimiter(requests_per_second)
+        self.cache: ttlCache = ttlCache(ttl_s=0.0, max_entries=cache_entries)
+
+
+class _gatewayHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 => Clients keep their connection to the gateway alive
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: "_gatewayServer"
+
+    def do_GET(self) -> None:
+        self.server.gateway._handle(self, "GET")
+
+    def do_PUT(self) -> None:
+        self.server.gateway._handle(self, "PUT")
+
+    def do_POST(self) -> None:
+        self.server.gateway._handle(self, "POST")
+
+    def do_DELETE(self) -> None:
+        self.server.gateway._handle(self, "DELETE")
+
+    def log_message(self, format: str, *args: typing.Any) -> None:
+        self.server.gateway._log_request(format % args)
+
+
+class _gatewayServer(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    # Listen backlog. The default of 5 => Clients connecting at the same time wait for a SYN retry
+    request_queue_size = 128
+
+    def __init__(self, address: typing.Tuple[str, int], gateway: "robotGateway") -> None:
+        self.gateway: "robotGateway" = gateway
+        super().__init__(address, _gatewayHandler)
+
+
+class robotGateway:
+    def __init__(
+        self,
+        robots: typing.Union[str, typing.Dict[str, str]],
+        host: str = "127.0.0.1",
+        port: int = 8448,
+        cache_ttl_s: typing.Optional[typing.Dict[str, float]] = None,
+        requests_per_second: float = 50.0,
+        max_wait_s: float = 2.0,
+        pool_maxsize: int = 8,
+        timeout: float = 2.0,
+        cache_entries: int = 1024,
+        metrics: typing.Optional[requestMetrics] = None,
+        logger: typing.Optional[systemLogger] = None,
+    ) -> None:
+        """
+        Caching and coalescing HTTP Gateway in front of the robots
+
+        Args:
+            robots: Base URL of one robot, or Base URLs keyed by robot name.
+                Example: {"athena-01": "http://192.168.11.1:1448"}
+            host: Address to bind. Default: Loopback only
+            port: Port to bind. 0 => Free port picked by the OS, see `url`. Default: 8448
+            cache_ttl_s: TTL per path prefix, merged over `CACHE_TTL_S`. 0 => Not cached.
+                Example: {"/api/core/slam/v1/localization/pose": 0.05}
+            requests_per_second: Upstream request budget per robot. <= 0 => Unlimited. Default: 50
+            max_wait_s: Max wait of a request for a token before a 429. Default: 2s
+            pool_maxsize: Max number of kept-alive connections per robot. Default: 8
+            timeout: Upstream Request Timeout. Default: 2s
+            cache_entries: Max number of cached responses per robot. Default: 1024
+            metrics: Request Metrics to record the upstream requests into. If not provided, the
+                gateway keeps its own.
+            logger: Instance of systemLogger. If not provided, initiates with log name 'gateway_logger'
+        """
+        self.__LOGGER: systemLogger = logger or systemLogger(
+            logger_name="gateway_logger",
+            log_file_path="logs",
+            enable_console_logging=True,
+        )
+        if isinstance(robots, str):
+            robots = {"robot": robots}
+        if not robots:
+            raise ValueError("Gateway needs at least one robot")
+        self.__UPSTREAMS: typing.Dict[str, _upstream] = {
+            robot_id: _upstream(
+                robot_id, url, timeout, pool_maxsize, requests_per_second, cache_entries
+            )
+            for robot_id, url in robots.items()
+        }
+        self.__DEFAULT: str = next(iter(self.__UPSTREAMS))
+        self.__CACHE_TTL_S: typing.List[typing.Tuple[str, float]] = sorted(
+            {**CACHE_TTL_S, **(cache_ttl_s or {})}.items(),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+        self.__MAX_WAIT_S: float = max_wait_s
+        self.__HOST: str = host
+        self.__PORT: int = port
+        self.__SERVER: typing.Optional[_gatewayServer] = None
+        self.__THREAD: typing.Optional[threading.Thread] = None
+        self.__COUNTS_LOCK = threading.Lock()
+        self.metrics: requestMetrics = metrics or requestMetrics()
+        # (method, template) the robots answered => Recorded under their own series
+        self.__KNOWN_ENDPOINTS: typing.Set[typing.Tuple[str, str]] = set()
+        self.requests: int = 0
+        self.cache_hits: int = 0
+        self.upstream_requests: int = 0
+        self.rate_limited: int = 0
+        self.upstream_errors: int = 0
+
+    def __enter__(self) -> "robotGateway":
+        self.start()
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        self.stop()
+
+    ##############################################################################################################
+    # Server
+    ##############################################################################################################
+
+    def start(self) -> str:
+        """
+        Serve in a background thread
+
+        Returns:
+            Base URL of the gateway. Example: "http://127.0.0.1:8448"
+        """
+        if self.__SERVER is None:
+            self.__SERVER = _gatewayServer((self.__HOST, self.__PORT), self)
+            self.__PORT = self.__SERVER.server_address[1]
+            self.__THREAD = threading.Thread(
+                target=self.__SERVER.serve_forever, name="robotGateway", daemon=True
+            )
+            self.__THREAD.start()
+            robots = {robot_id: upstream.url for robot_id, upstream in self.__UPSTREAMS.items()}
+            self.__LOGGER.INFO(f"Gateway serving at: {self.url} | Robots: {robots}")
+        return self.url
+
+    def stop(self) -> None:
+        """
+        Stop serving and close the upstream connections
+        """
+        if self.__SERVER is not None:
+            self.__SERVER.shutdown()
+            self.__SERVER.server_close()
+            if self.__THREAD is not None:
+                self.__THREAD.join()
+            self.__SERVER = None
+            self.__THREAD = None
+        for upstream in self.__UPSTREAMS.values():
+            upstream.session.close()
+        self.__LOGGER.INFO(f"Gateway stopped | {self.stats()}")
+
+    def serve_forever(self) -> None:
+        """
+        Serve in the calling thread until interrupted
+        """
+        self.start()
+        try:
+            while self.__THREAD is not None and self.__THREAD.is_alive():
+                self.__THREAD.join(0.5)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.__HOST}:{self.__PORT}"
+
+    ##############################################################################################################
+    # Getters
+    ##############################################################################################################
+
+    def stats(self) -> DictType:
+        """
+        Returns:
+            Example:
+                {
+                    "requests": 1200,
+                    "cache_hits": 1165,
+                    "upstream_requests": 35,
+                    "rate_limited": 0,
+                    "upstream_errors": 0,
+                    "cached": {"athena-01": 4}
+                }
+            "cache_hits" counts cached and coalesced responses.
+        """
+        return {
+            "requests": self.requests,
+            "cache_hits": self.cache_hits,
+            "upstream_requests": self.upstream_requests,
+            "rate_limited": self.rate_limited,
+            "upstream_errors": self.upstream_errors,
+            "cached": {
+                robot_id: len(upstream.cache) for robot_id, upstream in self.__UPSTREAMS.items()
+            },
+        }
+
+    def cache_ttl(self, path: str) -> float:
+        """
+        Args:
+            path: Request Path without the query. Example: "/api/core/artifact/v1/pois"
+
+        Returns:
+            Seconds a GET response of the path stays cached. 0 => Not cached
+        """
+        for prefix, ttl_s in self.__CACHE_TTL_S:
+            if path.startswith(prefix):
+                return ttl_s
+        return 0.0
+
+    def invalidate(self, robot_id: typing.Optional[str] = None) -> None:
+        """
+        Drop the cached responses
+
+        Args:
+            robot_id: Only of this robot (Default: None => Every robot)
+        """
+        for upstream_id, upstream in self.__UPSTREAMS.items():
+            if robot_id is None or upstream_id == robot_id:
+                upstream.cache.clear()
+
+    ##############################################################################################################
+    # Request Handling
+    ##############################################################################################################
+
+    def _log_request(self, message: str) -> None:
+        self.__LOGGER.DEBUG(f"Gateway => {message}")
+
+    def _handle(self, handler: _gatewayHandler, method: str) -> None:
+        with self.__COUNTS_LOCK:
+            self.requests += 1
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = handler.rfile.read(length) if length else b""
+        split = urlsplit(handler.path)
+
+        if split.path.startswith("/gateway/"):
+            self.__send(handler, self.__own_endpoint(split.path), "")
+            return
+        match = _ROBOT_PATH.fullmatch(split.path)
+        robot_id, path = (
+            (match["robot_id"], match["path"]) if match else (self.__DEFAULT, split.path)
+        )
+        upstream = self.__UPSTREAMS.get(robot_id)
+        if upstream is None:
+            self.__send(handler, _json_response(404, {"error": f"Unknown Robot: {robot_id}"}), "")
+            return
+        target = f"{path}?{split.query}" if split.query else path
+        headers = {
+            name: value
+            for name, value in handler.headers.items()
+            if name.lower() not in _HOP_BY_HOP
+        }
+
+        if method != "GET":
+            response = self.__forward(upstream, method, target, headers, body)
+            if response[0] < 400:
+                self.__invalidate_module(upstream, path)
+            self.__send(handler, response, "BYPASS")
+            return
+
+        ttl_s = self.cache_ttl(path)
+        loaded: typing.List[bool] = []
+
+        def load() -> ResponseType:
+            loaded.append(True)
+            return self.__forward(upstream, method, target, headers, body)
+
+        # Key without the client headers => Clients of the same resource share the response
+        response = upstream.cache.get_or_load(
+            (target,),
+            load,
+            ttl_s=ttl_s,
+            cache_if=lambda result: ttl_s > 0 and result[0] == 200,
+        )
+        if not loaded:
+            with self.__COUNTS_LOCK:
+                self.cache_hits += 1
+            cache = "HIT"
+        else:
+            # Paths without a TTL are never cached => Their answers bypass the cache
+            cache = "MISS" if ttl_s > 0 else "BYPASS"
+        self.__send(handler, response, cache)
+
+    ##############################################################################################################
+    # Private Methods
+    ##############################################################################################################
+
+    def __forward(
+        self,
+        upstream: _upstream,
+        method: str,
+        target: str,
+        headers: typing.Dict[str, str],
+        body: bytes,
+    ) -> ResponseType:
+        if not upstream.limiter.acquire(timeout=self.__MAX_WAIT_S):
+            with self.__COUNTS_LOCK:
+                self.rate_limited += 1
+            response = _json_response(429, {"error": "Rate Limit of the robot reached"})
+            response[1]["Retry-After"] = "1"
+            return response
+        with self.__COUNTS_LOCK:
+            self.upstream_requests += 1
+        url = f"{upstream.url}{target}"
+        template = endpoint_template(url)[1]
+        known = (method, template) in self.__KNOWN_ENDPOINTS
+        timer = self.metrics.begin(method, url, None if known else OVERFLOW_ENDPOINT)
+        try:
+            reply = upstream.session.request(
+                method, url, data=body or None, headers=headers, timeout=upstream.timeout
+            )
+        except requests.exceptions.RequestException as e:
+            timeout = isinstance(e, requests.exceptions.Timeout)
+            self.metrics.end(timer, 0, bytes_out=len(body), timeout=timeout)
+            with self.__COUNTS_LOCK:
+                self.upstream_errors += 1
+            self.__LOGGER.ERROR(f"Gateway [{upstream.robot_id}] {method} {target} Failed | {e}")
+            return _json_response(504 if timeout else 502, {"error": str(e)})
+        self.metrics.end(timer, reply.status_code, len(reply.content), len(body))
+        if not known and reply.status_code not in (404, 405):
+            with self.__COUNTS_LOCK:
+                self.__KNOWN_ENDPOINTS.add((method, template))
+        response_headers = {"Content-Type": reply.headers.get("Content-Type", "application/json")}
+        return reply.status_code, response_headers, reply.content
+
+    def __invalidate_module(self, upstream: _upstream, path: str) -> None:
+        module = _MODULE_PATH.match(path)
+        prefix = module.group(1) if module else path
+        dropped = upstream.cache.invalidate_where(lambda key: key[0].startswith(prefix))
+        if dropped:
+            self.__LOGGER.DEBUG(f"Gateway [{upstream.robot_id}] Dropped {dropped} cached {prefix}")
+
+    def __own_endpoint(self, path: str) -> ResponseType:
+        if path == "/gateway/metrics":
+            text = self.metrics.prometheus_text().encode("utf-8")
+            return 200, {"Content-Type": "text/plain; version=0.0.4"}, text
+        if path == "/gateway/stats":
+            return _json_response(200, self.stats())
+        return _json_response(404, {"error": f"No Route: {path}"})
+
+    def __send(self, handler: _gatewayHandler, response: ResponseType, cache: str) -> None:
+        status_code, headers, content = response
+        try:
+            handler.send_response(status_code)
+            for name, value in headers.items():
+                handler.send_header(name, value)
+            if cache:
+                handler.send_header("X-Gateway-Cache", cache)
+            handler.send_header("Content-Length", str(len(content)))
+            handler.end_headers()
+            handler.wfile.write(content)
+        except (BrokenPipeError, ConnectionResetError):
+            # Client gave up before the answer
+            handler.close_connection = True
+
+
+def _json_response(status_code: int, payload: typing.Any) -> ResponseType:
+    return (
+        status_code,
+        {"Content-Type": "application/json"},
+        json.dumps(payload).encode("utf-8"),
+    )
+
+
+def main(argv: typing.Optional[typing.List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument(
+        "--robot",
+        action="append",
+        required=True,
+        help="Robot as <name>=<base url> or <base url>. Repeat for several robots.",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Address to bind")
+    parser.add_argument("--port", type=int, default=8448, help="Port to bind. 0 => Free port")
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=50.0,
+        help="Upstream requests per second per robot. <= 0 => Unlimited",
+    )
+    parser.add_argument("--pool", type=int, default=8, help="Kept-alive connections per robot")
+    parser.add_argument("--timeout", type=float, default=2.0, help="Upstream timeout in seconds")
+    parser.add_argument(
+        "--ttl",
+        action="append",
+        default=[],
+        help="Cache TTL as <path prefix>=<seconds>. Example: /api/core/slam/v1/localization/pose=0.05",
+    )
+    args = parser.parse_args(argv)
+
+    robots = dict(
+        robot.split("=", 1) if "=" in robot else (f"robot{index}", robot)
+        for index, robot in enumerate(args.robot)
+    )
+    ttls = {prefix: float(ttl_s) for prefix, ttl_s in (ttl.split("=", 1) for ttl in args.ttl)}
+    gateway = robotGateway(
+        robots,
+        host=args.host,
+        port=args.port,
+        cache_ttl_s=ttls,
+        requests_per_second=args.rate,
+        pool_maxsize=args.pool,
+        timeout=args.timeout,
+    )
+    gateway.serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,341 @@
+"""
+Module to sample the robot IMU at a fixed rate into NumPy arrays.
+
+Sources:
+    - "robot_frame" => `slam.get_imu_data_in_robot_frame()`
+    - "raw_adc" => `system.get_raw_adc_imu_value()`
+    - "raw_calculated" => `system.get_raw_calculated_imu_value()`
+
+Samples are written into a preallocated structured array used as a ring buffer, so the memory used
+is fixed when the sampler is created (`imuSampler.nbytes`). Mean and variance of every channel are
+updated per sample (Welford) and cover all samples since the last reset, not only the buffered ones.
+"""
+
+# Custom Packages
+from .logger import systemLogger
+from .results import DictType
+
+# Imported Packages
+import numpy as np
+import threading
+import time
+import typing
+
+if typing.TYPE_CHECKING:
+    from robotComms.robotComms import robotComms
+    from .clock_sync import robotClock
+
+# Field => Keys of the vector in the response
+_ROBOT_FRAME_FIELDS: typing.Dict[str, typing.Tuple[str, typing.List[str]]] = {
+    "acc": ("acc", ["x", "y", "z"]),
+    "gyro": ("gyro", ["x", "y", "z"]),
+    "compass": ("compass", ["x", "y", "z"]),
+    "euler_angle": ("euler_angle", ["x", "y", "z"]),
+    "quaternion": ("quaternion", ["w", "x", "y", "z"]),
+    "raw_acc": ("raw_acc", ["x", "y", "z"]),
+    "raw_gyro": ("raw_gyro", ["x", "y", "z"]),
+    "raw_compass": ("raw_compass", ["x", "y", "z"]),
+}
+_RAW_FIELDS: typing.Dict[str, typing.List[str]] = {
+    "acc": ["acc_x", "acc_y", "acc_z"],
+    "gyro": ["gyro_x", "gyro_y", "gyro_z"],
+    "compass": ["comp_x", "comp_y", "comp_z"],
+}
+IMU_SOURCES: typing.List[str] = ["robot_frame", "raw_adc", "raw_calculated"]
+
+
+def imu_dtype(source: str) -> np.dtype:
+    """
+    Structured dtype of one sample
+
+    Args:
+        source: "robot_frame", "raw_adc" or "raw_calculated"
+
+    Returns:
+        dtype with "timestamp" (robot ms), "host_time" (s since epoch) and one float32 column per vector
+    """
+    columns: typing.List[typing.Tuple[typing.Any, ...]] = [
+        ("timestamp", np.float64),
+        ("host_time", np.float64),
+    ]
+    if source == "robot_frame":
+        columns += [
+            (name, np.float32, (len(keys),)) for name, (_, keys) in _ROBOT_FRAME_FIELDS.items()
+        ]
+        columns.append(("availibilityBitMap", np.uint32))
+    else:
+        columns += [(name, np.float32, (len(keys),)) for name, keys in _RAW_FIELDS.items()]
+    return np.dtype(columns)
+
+
+class imuSampler:
+    def __init__(
+        self,
+        robot: "robotComms",
+        source: str = "robot_frame",
+        capacity: int = 65536,
+        rate_hz: float = 50.0,
+        clock: typing.Optional["robotClock"] = None,
+        logger: typing.Optional[systemLogger] = None,
+    ) -> None:
+        """
+        Fixed Rate IMU Sampler
+
+        Args:
+            robot: Robot to sample. Example: `robotComms()`
+            source: "robot_frame", "raw_adc" or "raw_calculated". Default: "robot_frame"
+            capacity: Number of samples kept. The oldest samples are overwritten when full. Default: 65536
+            rate_hz: Sampling rate. Default: 50Hz
+            clock: Clock Estimator of the robot used to fill "host_time". Default: Host time at reception
+            logger: Instance of systemLogger. If not provided, initiates with log name 'imuSampler_logger'
+        """
+        if source not in IMU_SOURCES:
+            raise ValueError(f"Invalid IMU Source: {source}")
+        self.__SOURCE: str = source
+        self.__FETCH: typing.Callable[[], DictType] = {
+            "robot_frame": lambda: robot.slam.get_imu_data_in_robot_frame(),
+            "raw_adc": lambda: robot.system.get_raw_adc_imu_value(),
+            "raw_calculated": lambda: robot.system.get_raw_calculated_imu_value(),
+        }[source]
+        self.__PERIOD_S: float = 1.0 / rate_hz
+        self.__CLOCK = clock
+        self.__LOGGER: systemLogger = logger or systemLogger(
+            logger_name="imuSampler_logger",
+            log_file_path="logs",
+            enable_console_logging=True,
+        )
+        self.__DTYPE: np.dtype = imu_dtype(source)
+        self.__CHANNELS: typing.List[str] = [
+            name for name in self.__DTYPE.names if name not in ("timestamp", "host_time")
+        ]
+        self.__BUFFER: np.ndarray = np.zeros(max(1, capacity), dtype=self.__DTYPE)
+        self.__ROW: np.ndarray = np.zeros(1, dtype=self.__DTYPE)
+        self.__HEAD: int = 0
+        self.__SIZE: int = 0
+        self.__COUNT: int = 0
+        self.__MEAN: typing.Dict[str, np.ndarray] = {}
+        self.__M2: typing.Dict[str, np.ndarray] = {}
+        self.__LOCK = threading.Lock()
+        self.reset_statistics()
+        self.overwritten: int = 0
+        self.failed: int = 0
+        self.late: int = 0
+        self.__STOP_EVENT = threading.Event()
+        self.__WORKER: typing.Optional[threading.Thread] = None
+        self.__LOGGER.INFO(
+            f"IMU Sampler [{source}] | {capacity} samples of {self.__DTYPE.itemsize}B => {self.nbytes}B"
+        )
+
+    ##############################################################################################################
+    # Sampling
+    ##############################################################################################################
+
+    def sample_once(self) -> bool:
+        """
+        Fetch and store one sample
+
+        Returns:
+            - True => Sample stored
+            - False => Invalid Response
+        """
+        response = self.__FETCH()
+        if not isinstance(response, dict) or not response:
+            self.failed += 1
+            return False
+        row = self.__ROW[0]
+        try:
+            self.__fill(row, response)
+        except (KeyError, TypeError, ValueError) as e:
+            self.failed += 1
+            self.__LOGGER.WARNING(f"Invalid IMU Sample | {e}")
+            return False
+        if self.__CLOCK is not None and self.__CLOCK.is_synced():
+            row["host_time"] = self.__CLOCK.to_host_time(row["timestamp"])
+        else:
+            row["host_time"] = time.time()
+
+        with self.__LOCK:
+            if self.__SIZE == len(self.__BUFFER):
+                self.overwritten += 1
+            else:
+                self.__SIZE += 1
+            self.__BUFFER[self.__HEAD] = row
+            self.__HEAD = (self.__HEAD + 1) % len(self.__BUFFER)
+            self.__COUNT += 1
+            for channel in self.__CHANNELS:
+                value = np.asarray(row[channel], dtype=np.float64)
+                delta = value - self.__MEAN[channel]
+                self.__MEAN[channel] += delta / self.__COUNT
+                self.__M2[channel] += delta * (value - self.__MEAN[channel])
+        return True
+
+    def start(self) -> None:
+        """
+        Sample in a background thread at the configured rate
+        """
+        if self.__WORKER is not None and self.__WORKER.is_alive():
+            return
+        self.__STOP_EVENT.clear()
+        self.__WORKER = threading.Thread(target=self.__sample_loop, name="imuSampler", daemon=True)
+        self.__WORKER.start()
+        self.__LOGGER.INFO(f"IMU Sampler started at {1.0 / self.__PERIOD_S:.1f}Hz")
+
+    def stop(self) -> None:
+        """
+        Stop the background sampling
+        """
+        self.__STOP_EVENT.set()
+        if self.__WORKER is not None:
+            self.__WORKER.join()
+            self.__WORKER = None
+        self.__LOGGER.INFO(
+            f"IMU Sampler stopped | Samples: {self.__COUNT} | Failed: {self.failed} | Late: {self.late}"
+        )
+
+    def reset_statistics(self) -> None:
+        """
+        Restart mean and variance from zero samples. Buffered samples are kept.
+        """
+        with self.__LOCK:
+            self.__COUNT = 0
+            for channel in self.__CHANNELS:
+                shape = self.__DTYPE[channel].shape
+                self.__MEAN[channel] = np.zeros(shape, dtype=np.float64)
+                self.__M2[channel] = np.zeros(shape, dtype=np.float64)
+
+    ##############################################################################################################
+    # Getters
+    ##############################################################################################################
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Returns:
+            Size of the sample buffer in bytes
+        """
+        return self.__BUFFER.nbytes
+
+    def __len__(self) -> int:
+        return self.__SIZE
+
+    def data(self) -> np.ndarray:
+        """
+        Returns:
+            Copy of the buffered samples, oldest first
+        """
+        with self.__LOCK:
+            if self.__SIZE < len(self.__BUFFER):
+                return self.__BUFFER[: self.__SIZE].copy()
+            return np.concatenate((self.__BUFFER[self.__HEAD :], self.__BUFFER[: self.__HEAD]))
+
+    def count(self) -> int:
+        """
+        Returns:
+            Number of samples in the statistics
+        """
+        return self.__COUNT
+
+    def mean(self) -> typing.Dict[str, np.ndarray]:
+        """
+        Returns:
+            Mean per channel. Example: {"gyro": array([x, y, z]), ...}
+        """
+        with self.__LOCK:
+            return {channel: mean.copy() for channel, mean in self.__MEAN.items()}
+
+    def variance(self) -> typing.Dict[str, np.ndarray]:
+        """
+        Returns:
+            Sample variance per channel. Zeros below two samples.
+        """
+        with self.__LOCK:
+            if self.__COUNT < 2:
+                return {channel: np.zeros_like(m2) for channel, m2 in self.__M2.items()}
+            return {channel: m2 / (self.__COUNT - 1) for channel, m2 in self.__M2.items()}
+
+    def bias(
+        self, reference: typing.Optional[typing.Dict[str, typing.Sequence[float]]] = None
+    ) -> typing.Dict[str, np.ndarray]:
+        """
+        Bias of a robot at rest
+
+        Args:
+            reference: Expected value per channel at rest. Missing channels are expected at zero.
+                Example: {"acc": [0, 0, 9.80665]}
+
+        Returns:
+            Mean minus reference per channel
+        """
+        reference = reference or {}
+        return {
+            channel: mean - np.asarray(reference.get(channel, 0.0), dtype=np.float64)
+            for channel, mean in self.mean().items()
+        }
+
+    ##############################################################################################################
+    # Export
+    ##############################################################################################################
+
+    def save(self, path: str) -> bool:
+        """
+        Save the buffered samples as a NumPy binary file
+
+        Args:
+            path: Target File. Example: "imu.npy"
+
+        Returns:
+            - True => Saved
+            - False => Failed
+        """
+        try:
+            np.save(path, self.data(), allow_pickle=False)
+        except OSError as e:
+            self.__LOGGER.ERROR(f"IMU Export Failed | {e}")
+            return False
+        self.__LOGGER.INFO(f"Saved {self.__SIZE} IMU Samples to {path}")
+        return True
+
+    @staticmethod
+    def load(path: str) -> np.ndarray:
+        """
+        Load samples saved by `save()`
+
+        Args:
+            path: Source File
+
+        Returns:
+            Structured Array of samples
+        """
+        return np.load(path, allow_pickle=False)
+
+    ##############################################################################################################
+    # Private Methods
+    ##############################################################################################################
+
+    def __fill(self, row: np.void, response: DictType) -> None:
+        row["timestamp"] = float(response["timestamp"])
+        if self.__SOURCE == "robot_frame":
+            for name, (key, axes) in _ROBOT_FRAME_FIELDS.items():
+                vector = response.get(key) or {}
+                row[name] = [float(vector.get(axis, 0.0)) for axis in axes]
+            row["availibilityBitMap"] = int(response.get("availibilityBitMap", 0))
+        else:
+            for name, keys in _RAW_FIELDS.items():
+                row[name] = [float(response[key]) for key in keys]
+
+    def __sample_loop(self) -> None:
+        next_tick = time.monotonic()
+        while not self.__STOP_EVENT.is_set():
+            try:
+                self.sample_once()
+            except Exception as e:
+                self.failed += 1
+                self.__LOGGER.ERROR(f"IMU Sample Failed | {e}")
+            next_tick += self.__PERIOD_S
+            now = time.monotonic()
+            if now > next_tick:
+                # Skip the missed ticks instead of bursting to catch up
+                missed = int((now - next_tick) / self.__PERIOD_S) + 1
+                self.late += missed
+                next_tick += missed * self.__PERIOD_S
+            self.__STOP_EVENT.wait(next_tick - now)
@@ -0,0 +1,530 @@
+"""
+Module to Import, Export and Apply complete Map Layouts.
+
+A layout holds every artifact collection of a map keyed by collection key:
+    {
+        "lines/walls": [...],
+        "rect/forbidden_area": [...],
+        "poi": [...],
+        "laser": [...]
+    }
+
+Layouts can be saved as plain JSON or as a GeoJSON FeatureCollection.
+
+Applying a layout:
+    1. Export the current layout from the robot
+    2. Plan the minimal set of add, modify and delete calls
+    3. Run the calls. Collections are independent and run concurrently, POIs are addressed by ID and
+       run concurrently as well. Lines and Areas of one collection run in order.
+    4. If a call fails, the remaining calls are skipped and the touched collections are restored to
+       the exported state.
+"""
+
+# Custom Packages
+from .logger import systemLogger
+from .results import DictType, ListDictType
+from .artifact_store import ARTIFACT_COLLECTIONS, collection_key
+from .rate_limit import rateLimiter
+
+# Imported Packages
+from concurrent.futures import ThreadPoolExecutor
+import json
+import threading
+import time
+import typing
+
+if typing.TYPE_CHECKING:
+    from robotComms.api_classes.artifact import artifact
+
+LayoutType = typing.Dict[str, ListDictType]
+
+# Decimal places compared when matching artifacts by content
+_SIGNATURE_PRECISION: int = 4
+
+
+##############################################################################################################
+# Layout Files
+##############################################################################################################
+
+
+def load_layout(file_path: str) -> LayoutType:
+    """
+    Load a layout from a JSON or GeoJSON file
+
+    Args:
+        file_path: Path to the layout file
+
+    Returns:
+        layout: Artifacts keyed by collection key
+    """
+    with open(file_path) as file:
+        content = json.load(file)
+    if isinstance(content, dict) and content.get("type") == "FeatureCollection":
+        return layout_from_geojson(content)
+    return content
+
+
+def save_layout(layout: LayoutType, file_path: str, geojson: bool = False) -> None:
+    """
+    Save a layout as JSON or GeoJSON file
+
+    Args:
+        layout: Artifacts keyed by collection key
+        file_path: Path to the layout file
+        geojson: Save as GeoJSON FeatureCollection. Default: False
+    """
+    content = layout_to_geojson(layout) if geojson else layout
+    with open(file_path, "w") as file:
+        json.dump(content, file, indent=2)
+
+
+def layout_to_geojson(layout: LayoutType) -> DictType:
+    """
+    Convert a layout into a GeoJSON FeatureCollection
+
+    Lines and Rectangular Areas become LineStrings (start -> end), POIs and Laser Landmarks become
+    Points. The collection key, id and the remaining fields are kept in the feature properties.
+
+    Args:
+        layout: Artifacts keyed by collection key
+
+    Returns:
+        GeoJSON FeatureCollection
+    """
+    features: ListDictType = []
+    for key, elements in layout.items():
+        for element in elements:
+            properties: DictType = {"collection": key}
+            if key.startswith("lines/") or key.startswith("rect/"):
+                shape = element.get("area", element) if key.startswith("rect/") else element
+                start, end = shape.get("start", {}), shape.get("end", {})
+                geometry = {
+                    "type": "LineString",
+                    "coordinates": [
+                        [start.get("x", 0), start.get("y", 0)],
+                        [end.get("x", 0), end.get("y", 0)],
+                    ],
+                }
+                if key.startswith("rect/"):
+                    properties["half_width"] = shape.get("half_width", 0)
+                skip = {"start", "end", "area"}
+            else:
+                pose = element.get("pose", {})
+                geometry = {"type": "Point", "coordinates": [pose.get("x", 0), pose.get("y", 0)]}
+                properties["pose"] = pose
+                skip = {"pose"}
+            properties.update({k: v for k, v in element.items() if k not in skip})
+            features.append({"type": "Feature", "geometry": geometry, "properties": properties})
+    return {"type": "FeatureCollection", "features": features}
+
+
+def layout_from_geojson(content: DictType) -> LayoutType:
+    """
+    Convert a GeoJSON FeatureCollection created by `layout_to_geojson()` back into a layout
+
+    Args:
+        content: GeoJSON FeatureCollection
+
+    Returns:
+        layout: Artifacts keyed by collection key
+    """
+    layout: LayoutType = {}
+    for feature in content.get("features", []):
+        properties = dict(feature.get("properties", {}))
+        key = properties.pop("collection")
+        coordinates = feature.get("geometry", {}).get("coordinates", [])
+        if key.startswith("lines/") or key.startswith("rect/"):
+            (sx, sy), (ex, ey) = coordinates[0], coordinates[-1]
+            shape: DictType = {"start": {"x": sx, "y": sy}, "end": {"x": ex, "y": ey}}
+            if key.startswith("rect/"):
+                shape["half_width"] = properties.pop("half_width", 0)
+                element = {**properties, "area": shape}
+            else:
+                element = {**properties, **shape}
+        else:
+            pose = properties.pop("pose", {})
+            pose = {**pose, "x": coordinates[0], "y": coordinates[1]}
+            element = {**properties, "pose": pose}
+        layout.setdefault(key, []).append(element)
+    return layout
+
+
+##############################################################################################################
+# Plan
+##############################################################################################################
+
+
+class layoutOperation:
+    def __init__(
+        self,
+        kind: str,
+        collection: str,
+        id: typing.Optional[str | int] = None,
+        body: typing.Optional[ListDictType | DictType] = None,
+    ) -> None:
+        """
+        One artifact call of a layout plan
+
+        Args:
+            kind: "add", "modify" or "delete"
+            collection: Collection Key. Example: "rect/forbidden_area"
+            id: ID of the artifact for "modify" and "delete". None deletes the whole collection.
+            body: Request Body for "add" and "modify"
+        """
+        self.kind: str = kind
+        self.collection: str = collection
+        self.id: typing.Optional[str | int] = id
+        self.body: typing.Optional[ListDictType | DictType] = body
+        self.success: typing.Optional[bool] = None
+        self.duration_s: float = 0.0
+
+    def execute(self, artifact_api: "artifact") -> bool:
+        """
+        Run the call on the robot and record its result and duration
+
+        Args:
+            artifact_api: Artifact API of the robot
+
+        Returns:
+            - True => Call Success
+            - False => Call Failure
+        """
+        a_type, _, a_usage = self.collection.partition("/")
+        usage: typing.Optional[str] = a_usage or None
+        start = time.perf_counter()
+        if self.kind == "add":
+            result = artifact_api.add_artifact(a_type, usage, self.body)
+        elif self.kind == "modify":
+            result = artifact_api.modify_artifact(a_type, usage, self.id, self.body)
+        else:
+            result = artifact_api.delete_artifact(a_type, usage, self.id)
+        self.duration_s = time.perf_counter() - start
+        self.success = result is True
+        return self.success
+
+    def __repr__(self) -> str:
+        return f"layoutOperation({self.kind}, {self.collection}, id={self.id})"
+
+
+class layoutPlan:
+    def __init__(self, operations: typing.Optional[typing.List[layoutOperation]] = None) -> None:
+        """
+        Calls needed to turn the current layout into the desired layout
+
+        Args:
+            operations: Planned calls in execution order
+        """
+        self.operations: typing.List[layoutOperation] = operations if operations else []
+
+    def is_empty(self) -> bool:
+        return not self.operations
+
+    def collections(self) -> typing.List[str]:
+        """
+        Returns:
+            Collection Keys touched by the plan
+        """
+        return sorted({operation.collection for operation in self.operations})
+
+    def count(self) -> typing.Dict[str, int]:
+        """
+        Returns:
+            Number of calls by kind. Example: {"add": 2, "modify": 0, "delete": 1}
+        """
+        counts = {"add": 0, "modify": 0, "delete": 0}
+        for operation in self.operations:
+            counts[operation.kind] += 1
+        return counts
+
+
+def _rounded(value: typing.Any) -> typing.Any:
+    if isinstance(value, float):
+        return round(value, _SIGNATURE_PRECISION)
+    if isinstance(value, dict):
+        return {k: _rounded(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_rounded(v) for v in value]
+    return value
+
+
+def _signature(element: DictType) -> str:
+    """
+    Content of an artifact without its robot assigned ID
+    """
+    return json.dumps(_rounded({k: v for k, v in element.items() if k != "id"}), sort_keys=True)
+
+
+def plan_layout(desired: LayoutType, current: LayoutType) -> layoutPlan:
+    """
+    Compute the minimal calls to turn `current` into `desired`
+
+    Only collections present in `desired` are planned. Lines and Rectangular Areas get their ID
+    from the robot, so they are matched by content. POIs are matched by their UUID.
+
+    Args:
+        desired: Desired Layout
+        current: Layout exported from the robot
+
+    Returns:
+        plan: Deletes first, then modifies, then adds
+    """
+    deletes: typing.List[layoutOperation] = []
+    modifies: typing.List[layoutOperation] = []
+    adds: typing.List[layoutOperation] = []
+
+    for key, wanted in desired.items():
+        existing = current.get(key, [])
+        if key == "poi":
+            existing_by_id = {str(e.get("id")): e for e in existing}
+            wanted_by_id = {str(e.get("id")): e for e in wanted}
+            for id, element in existing_by_id.items():
+                if id not in wanted_by_id:
+                    deletes.append(layoutOperation("delete", key, element.get("id")))
+            for id, element in wanted_by_id.items():
+                if id not in existing_by_id:
+                    adds.append(layoutOperation("add", key, element.get("id"), element))
+                elif _signature(element) != _signature(existing_by_id[id]):
+                    body = {k: v for k, v in element.items() if k in ["pose", "metadata"]}
+                    modifies.append(layoutOperation("modify", key, element.get("id"), body))
+        elif key == "laser":
+            if sorted(map(_signature, wanted)) == sorted(map(_signature, existing)):
+                continue
+            if wanted:
+                modifies.append(layoutOperation("modify", key, body=wanted))
+            else:
+                deletes.append(layoutOperation("delete", key))
+        else:
+            # Match by content. Every unmatched artifact on the robot is deleted.
+            unmatched: typing.Dict[str, ListDictType] = {}
+            for element in wanted:
+                unmatched.setdefault(_signature(element), []).append(element)
+            for element in existing:
+                matches = unmatched.get(_signature(element))
+                if matches:
+                    matches.pop()
+                else:
+                    deletes.append(layoutOperation("delete", key, element.get("id")))
+            missing = [element for elements in unmatched.values() for element in elements]
+            if not missing:
+                continue
+            if key.startswith("lines/"):
+                adds.append(layoutOperation("add", key, body=missing))
+            else:
+                adds.extend(layoutOperation("add", key, body=element) for element in missing)
+
+    return layoutPlan(deletes + modifies + adds)
+
+
+##############################################################################################################
+# Apply
+##############################################################################################################
+
+
+class layoutReport:
+    def __init__(self) -> None:
+        """
+        Result and Timing of a layout apply
+        """
+        self.success: bool = False
+        self.dry_run: bool = False
+        self.plan: layoutPlan = layoutPlan()
+        self.failed: typing.List[layoutOperation] = []
+        # Collections the export before the apply could not fetch
+        self.export_failed: typing.List[str] = []
+        self.rolled_back: bool = False
+        self.rollback_success: typing.Optional[bool] = None
+        self.export_duration_s: float = 0.0
+        self.apply_duration_s: float = 0.0
+        self.rollback_duration_s: float = 0.0
+        self.message: str = ""
+
+    def summary(self) -> DictType:
+        """
+        Returns:
+            Report as Dictionary
+        """
+        return {
+            "success": self.success,
+            "dry_run": self.dry_run,
+            "message": self.message,
+            "operations": self.plan.count(),
+            "collections": self.plan.collections(),
+            "failed": [repr(operation) for operation in self.failed],
+            "export_failed": self.export_failed,
+            "rolled_back": self.rolled_back,
+            "rollback_success": self.rollback_success,
+            "export_duration_s": self.export_duration_s,
+            "apply_duration_s": self.apply_duration_s,
+            "rollback_duration_s": self.rollback_duration_s,
+            "slowest_operation_s": max((op.duration_s for op in self.plan.operations), default=0.0),
+        }
+
+
+class layoutManager:
+    def __init__(
+        self,
+        artifact_api: "artifact",
+        max_workers: int = 4,
+        rate_limiter: typing.Optional[rateLimiter] = None,
+        logger: typing.Optional[systemLogger] = None,
+    ) -> None:
+        """
+        Export and Apply complete layouts on one robot
+
+        Args:
+            artifact_api: Artifact API of the robot. Example: `robotComms().artifact`
+            max_workers: Max number of concurrent requests to the robot. Default: 4
+            rate_limiter: Shared limiter taken before every request. Default: None => No limit
+            logger: Instance of systemLogger. If not provided, initiates with log name 'layout_logger'
+        """
+        self.__ARTIFACT = artifact_api
+        self.__MAX_WORKERS: int = max(1, max_workers)
+        self.__RATE_LIMITER: typing.Optional[rateLimiter] = rate_limiter
+        self.__LOGGER: systemLogger = logger or systemLogger(
+            logger_name="layout_logger",
+            log_file_path="logs",
+            enable_console_logging=True,
+        )
+
+    def export_layout(self, collections: typing.Optional[typing.List[str]] = None) -> LayoutType:
+        """
+        Fetch all collections from the robot concurrently
+
+        Args:
+            collections: Collection Keys to fetch. Default: Every collection
+
+        Returns:
+            layout: Artifacts keyed by collection key. Collections which failed to load are missing.
+        """
+        keys = collections or [collection_key(t, u) for t, u in ARTIFACT_COLLECTIONS]
+
+        def fetch(key: str) -> typing.Any:
+            if self.__RATE_LIMITER is not None:
+                self.__RATE_LIMITER.acquire()
+            a_type, _, a_usage = key.partition("/")
+            return self.__ARTIFACT.get_artifact(a_type, a_usage or None)
+
+        with ThreadPoolExecutor(max_workers=self.__MAX_WORKERS) as executor:
+            results = list(executor.map(fetch, keys))
+
+        layout: LayoutType = {}
+        for key, result in zip(keys, results):
+            if isinstance(result, list):
+                layout[key] = result
+            else:
+                self.__LOGGER.ERROR(f"Layout Export Failed for {key}")
+        return layout
+
+    def plan(self, desired: LayoutType) -> layoutPlan:
+        """
+        Compute the calls needed to apply `desired` without running them
+
+        Args:
+            desired: Desired Layout
+
+        Returns:
+            plan: Planned Calls
+        """
+        return plan_layout(desired, self.export_layout(list(desired)))
+
+    def apply(
+        self, desired: LayoutType, dry_run: bool = False, rollback: bool = True
+    ) -> layoutReport:
+        """
+        Apply a complete layout
+
+        Args:
+            desired: Desired Layout. Collections missing from it are left untouched.
+            dry_run: Only plan the calls. Default: False
+            rollback: Restore the touched collections if a call fails. Default: True
+
+        Returns:
+            report: Plan, failures and timing
+        """
+        report = layoutReport()
+        report.dry_run = dry_run
+
+        start = time.perf_counter()
+        before = self.export_layout(list(desired))
+        report.export_duration_s = time.perf_counter() - start
+        report.export_failed = [key for key in desired if key not in before]
+        if report.export_failed:
+            report.message = f"Export Failed for {report.export_failed}. Nothing applied"
+            self.__LOGGER.ERROR(report.message)
+            return report
+
+        report.plan = plan_layout(desired, before)
+        self.__LOGGER.INFO(f"Layout Plan: {report.plan.count()}")
+        if dry_run or report.plan.is_empty():
+            report.success = True
+            report.message = "Dry Run" if dry_run else "Layout already applied"
+            return report
+
+        start = time.perf_counter()
+        report.failed = self.execute(report.plan)
+        report.apply_duration_s = time.perf_counter() - start
+        if not report.failed:
+            report.success = True
+            report.message = "Layout applied"
+            self.__LOGGER.INFO(f"Layout Applied in {report.apply_duration_s:.3f}s")
+            return report
+
+        report.message = f"{len(report.failed)} operations failed"
+        self.__LOGGER.ERROR(f"Layout Apply Failed: {report.failed}")
+        if rollback:
+            start = time.perf_counter()
+            touched = report.plan.collections()
+            current = self.export_layout(touched)
+            # Unknown state => Restoring would add the elements again next to the existing ones
+            not_restored = [key for key in touched if key not in current]
+            restore = plan_layout({key: before[key] for key in touched if key in current}, current)
+            report.rolled_back = True
+            report.rollback_success = (
+                not self.execute(restore, stop_on_failure=False) and not not_restored
+            )
+            report.rollback_duration_s = time.perf_counter() - start
+            if not_restored:
+                report.message += f". Export Failed for {not_restored}. Not rolled back"
+                self.__LOGGER.ERROR(f"Layout Rollback Skipped for {not_restored}. Export Failed")
+            self.__LOGGER.WARNING(f"Layout Rollback Success: {report.rollback_success}")
+        return report
+
+    def execute(
+        self, plan: layoutPlan, stop_on_failure: bool = True
+    ) -> typing.List[layoutOperation]:
+        """
+        Run the calls of a plan
+
+        Args:
+            plan: Planned Calls
+            stop_on_failure: Skip the calls which have not started after the first failure. Default: True
+
+        Returns:
+            Failed Operations. Skipped operations are not included.
+        """
+        lanes: typing.Dict[str, typing.List[layoutOperation]] = {}
+        for index, operation in enumerate(plan.operations):
+            # POIs are addressed by ID and do not depend on each other
+            lane = f"poi:{index}" if operation.collection == "poi" else operation.collection
+            lanes.setdefault(lane, []).append(operation)
+
+        abort = threading.Event()
+        failed: typing.List[layoutOperation] = []
+        lock = threading.Lock()
+
+        def run_lane(operations: typing.List[layoutOperation]) -> None:
+            for operation in operations:
+                if abort.is_set():
+                    return
+                if self.__RATE_LIMITER is not None:
+                    self.__RATE_LIMITER.acquire()
+                if not operation.execute(self.__ARTIFACT):
+                    with lock:
+                        failed.append(operation)
+                    if stop_on_failure:
+                        abort.set()
+                        return
+
+        with ThreadPoolExecutor(max_workers=self.__MAX_WORKERS) as executor:
+            list(executor.map(run_lane, lanes.values()))
+        return failed
@@ -0,0 +1,522 @@
+"""
+Module with the request metrics of `restAdapter`.
+
+Every request is recorded against its endpoint template, the URL with the host, the API version and
+the element ids stripped:
+    -> "http://192.168.11.1:1448/api/core/slam/v1/localization/pose" => "slam/localization/pose"
+    -> "http://192.168.11.1:1448/api/core/artifact/v1/pois/3fa85f64-..." => "artifact/pois/{id}"
+    -> "http://192.168.11.1:1448/api/core/application/v1/apps/com.slamtec.delivery/config"
+       => "application/apps/{id}/config"
+
+Ids are numbers, UUIDs and the segment after a collection of `_ID_PARENTS`. At most `max_series`
+templates are kept, any further one is recorded as `OVERFLOW_ENDPOINT`.
+
+Recorded per host, method and template:
+    -> Latency Histogram with fixed buckets
+    -> Response and request body bytes
+    -> Status Codes, errors, timeouts and retries
+    -> Requests in flight
+
+Counters are sharded per thread. A thread only writes its own shard, so recording takes no lock;
+readers sum the shards. The shard of a finished thread is folded into one shared total, so the
+number of shards follows the live threads instead of every thread ever started.
+
+Read the values with `requestMetrics.snapshot()` or as Prometheus text with
+`requestMetrics.prometheus_text()` and `requestMetrics.serve()`.
+"""
+
+# Custom Packages
+from .results import DictType
+
+# Imported Packages
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+import bisect
+import functools
+import re
+import threading
+import time
+import typing
+import weakref
+
+# Upper bounds of the latency buckets in seconds. The last bucket is +Inf.
+LATENCY_BUCKETS_S: typing.Tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+_VERSION_SEGMENT = re.compile(r"^v\d+$")
+_ID_SEGMENT = re.compile(
+    r"^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})$"
+)
+# Collection => Position of the element id after it. Example: "lines/walls/12" => 2
+_ID_PARENTS: typing.Dict[str, int] = {
+    "actions": 1,
+    "apps": 1,
+    "boxes": 1,
+    "cargos": 1,
+    "pois": 1,
+    "sensors": 1,
+    "tasks": 1,
+    "uploads": 1,
+    "lines": 2,
+    "rectangle-areas": 2,
+}
+# Endpoint of every template beyond `max_series`
+OVERFLOW_ENDPOINT: str = "{other}"
+
+MetricKey = typing.Tuple[str, str, str]
+
+
+@functools.lru_cache(maxsize=4096)
+def endpoint_template(url: str) -> typing.Tuple[str, str]:
+    """
+    Split a request URL into host and endpoint template
+
+    Args:
+        url: Example: "http://192.168.11.1:1448/api/core/motion/v1/actions/12"
+
+    Returns:
+        (host, template). Example: ("192.168.11.1:1448", "motion/actions/{id}")
+    """
+    split = urlsplit(url)
+    segments = [segment for segment in split.path.split("/") if segment]
+    if segments[:1] == ["api"]:
+        segments = segments[1:]
+    if segments[:1] == ["core"]:
+        segments = segments[1:]
+    template: typing.List[str] = []
+    id_at = -1
+    for segment in segments:
+        if _VERSION_SEGMENT.match(segment):
+            continue
+        # ":current", ":batch", ... are operations of the collection, not ids
+        if len(template) == id_at and not segment.startswith(":"):
+            template.append("{id}")
+            continue
+        template.append("{id}" if _ID_SEGMENT.match(segment) else segment)
+        if segment in _ID_PARENTS:
+            id_at = len(template) - 1 + _ID_PARENTS[segment]
+    return split.netloc, "/".join(template)
+
+
+class _endpointStats:
+    __slots__ = (
+        "count",
+        "errors",
+        "timeouts",
+        "retries",
+        "in_flight",
+        "bytes_in",
+        "bytes_out",
+        "latency_sum_s",
+        "buckets",
+        "status_codes",
+    )
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.errors: int = 0
+        self.timeouts: int = 0
+        self.retries: int = 0
+        self.in_flight: int = 0
+        self.bytes_in: int = 0
+        self.bytes_out: int = 0
+        self.latency_sum_s: float = 0.0
+        self.buckets: typing.List[int] = [0] * (len(LATENCY_BUCKETS_S) + 1)
+        self.status_codes: typing.Dict[int, int] = {}
+
+    def add(self, other: "_endpointStats") -> None:
+        self.count += other.count
+        self.errors += other.errors
+        self.timeouts += other.timeouts
+        self.retries += other.retries
+        self.in_flight += other.in_flight
+        self.bytes_in += other.bytes_in
+        self.bytes_out += other.bytes_out
+        self.latency_sum_s += other.latency_sum_s
+        for index, count in enumerate(list(other.buckets)):
+            self.buckets[index] += count
+        for status_code, count in list(other.status_codes.items()):
+            self.status_codes[status_code] = self.status_codes.get(status_code, 0) + count
+
+
+class requestTimer:
+    __slots__ = ("stats", "start")
+
+    def __init__(self, stats: _endpointStats, start: float) -> None:
+        """
+        Request in flight. Returned by `requestMetrics.begin()` and passed back to `end()`.
+
+        Args:
+            stats: Shard entry of the endpoint, owned by the calling thread
+            start: Start time from `time.perf_counter()`
+        """
+        self.stats: _endpointStats = stats
+        self.start: float = start
+
+
+class requestMetrics:
+    def __init__(self, max_series: int = 1000) -> None:
+        """
+        Thread-safe request metrics. Share one instance between the adapters of a fleet to get one
+        view of all robots, the host is part of every key.
+
+        Args:
+            max_series: Max number of (host, method, endpoint) series. Requests of any further
+                series are recorded under the endpoint `OVERFLOW_ENDPOINT`. Default: 1000
+        """
+        self.__LOCAL = threading.local()
+        # Shards of the live threads, each with a weak reference to its thread
+        self.__SHARDS: typing.List[
+            typing.Tuple[weakref.ref, typing.Dict[MetricKey, _endpointStats]]
+        ] = []
+        # Shards of finished threads, summed
+        self.__RETIRED: typing.Dict[MetricKey, _endpointStats] = {}
+        self.__SERIES: typing.Set[MetricKey] = set()
+        self.__MAX_SERIES: int = max_series
+        self.__SHARDS_LOCK = threading.Lock()
+        self.__SERVER: typing.Optional[ThreadingHTTPServer] = None
+
+    ##############################################################################################################
+    # Recording
+    ##############################################################################################################
+
+    def begin(self, method: str, url: str, endpoint: typing.Optional[str] = None) -> requestTimer:
+        """
+        Record the start of a request
+
+        Args:
+            method: HTTP Method. Example: "GET"
+            url: Full request URL
+            endpoint: Template to record the request under. Default: None => Template of `url`
+
+        Returns:
+            Timer to pass to `end()` from the same thread
+        """
+        host, template = endpoint_template(url)
+        if endpoint is not None:
+            template = endpoint
+        stats = self.__stats((host, method, template))
+        stats.in_flight += 1
+        return requestTimer(stats, time.perf_counter())
+
+    def end(
+        self,
+        timer: requestTimer,
+        status_code: int,
+        bytes_in: int = 0,
+        bytes_out: int = 0,
+        timeout: bool = False,
+    ) -> float:
+        """
+        Record the end of a request
+
+        Args:
+            timer: Timer returned by `begin()`
+            status_code: Response Status Code. 0 => No response
+            bytes_in: Size of the response body
+            bytes_out: Size of the request body
+            timeout: The request timed out
+
+        Returns:
+            Duration of the request in seconds
+        """
+        duration = time.perf_counter() - timer.start
+        stats = timer.stats
+        stats.in_flight -= 1
+        stats.count += 1
+        stats.latency_sum_s += duration
+        stats.buckets[bisect.bisect_left(LATENCY_BUCKETS_S, duration)] += 1
+        stats.bytes_in += bytes_in
+        stats.bytes_out += bytes_out
+        stats.status_codes[status_code] = stats.status_codes.get(status_code, 0) + 1
+        if timeout:
+            stats.timeouts += 1
+        if timeout or status_code == 0 or status_code >= 400:
+            stats.errors += 1
+        return duration
+
+    def retry(self, method: str, url: str) -> None:
+        """
+        Record a retry of a request. For callers retrying a failed request.
+        """
+        host, template = endpoint_template(url)
+        self.__stats((host, method, template)).retries += 1
+
+    ##############################################################################################################
+    # Getters
+    ##############################################################################################################
+
+    def snapshot(self) -> typing.List[DictType]:
+        """
+        Sum the shards of every thread
+
+        Returns:
+            One entry per host, method and endpoint template:
+                {
+                    "host": "192.168.11.1:1448",
+                    "method": "GET",
+                    "endpoint": "slam/localization/pose",
+                    "count": 120,
+                    "errors": 0,
+                    "timeouts": 0,
+                    "retries": 0,
+                    "in_flight": 0,
+                    "bytes_in": 10800,
+                    "bytes_out": 0,
+                    "status_codes": {200: 120},
+                    "latency": {"sum_s", "mean_s", "p50_s", "p99_s", "buckets": [(le, count), ...]}
+                }
+        """
+        merged: typing.Dict[MetricKey, _endpointStats] = {}
+        with self.__SHARDS_LOCK:
+            self.__retire_shards()
+            shards = [shard for _, shard in self.__SHARDS]
+            for key, stats in self.__RETIRED.items():
+                merged.setdefault(key, _endpointStats()).add(stats)
+        for shard in shards:
+            # dict.items() is copied in one step under the interpreter lock
+            for key, stats in list(shard.items()):
+                merged.setdefault(key, _endpointStats()).add(stats)
+
+        return [
+            {
+                "host": host,
+                "method": method,
+                "endpoint": template,
+                "count": stats.count,
+                "errors": stats.errors,
+                "timeouts": stats.timeouts,
+                "retries": stats.retries,
+                "in_flight": stats.in_flight,
+                "bytes_in": stats.bytes_in,
+                "bytes_out": stats.bytes_out,
+                "status_codes": dict(sorted(stats.status_codes.items())),
+                "latency": {
+                    "sum_s": stats.latency_sum_s,
+                    "mean_s": stats.latency_sum_s / stats.count if stats.count else 0.0,
+                    "p50_s": _quantile(stats.buckets, 0.5),
+                    "p99_s": _quantile(stats.buckets, 0.99),
+                    "buckets": list(zip(LATENCY_BUCKETS_S + (float("inf"),), stats.buckets)),
+                },
+            }
+            for (host, method, template), stats in sorted(merged.items())
+        ]
+
+    def shard_count(self) -> int:
+        """
+        Returns:
+            Number of per-thread shards, one per live thread that recorded a request
+        """
+        with self.__SHARDS_LOCK:
+            self.__retire_shards()
+            return len(self.__SHARDS)
+
+    def endpoint(self, template: str, method: typing.Optional[str] = None) -> typing.List[DictType]:
+        """
+        Returns:
+            Entries of `snapshot()` for one endpoint template. Example: "slam/localization/pose"
+        """
+        return [
+            entry
+            for entry in self.snapshot()
+            if entry["endpoint"] == template and (method is None or entry["method"] == method)
+        ]
+
+    def prometheus_text(self, prefix: str = "robotcomms") -> str:
+        """
+        Metrics in the Prometheus text exposition format
+
+        Args:
+            prefix: Prefix of the metric names
+
+        Returns:
+            Text of the metrics. Buckets are cumulative as Prometheus expects.
+        """
+        lines = [
+            f"# HELP {prefix}_request_duration_seconds Request latency per endpoint",
+            f"# TYPE {prefix}_request_duration_seconds histogram",
+        ]
+        counters: typing.Dict[str, typing.List[str]] = {
+            "requests_total": [],
+            "request_errors_total": [],
+            "request_timeouts_total": [],
+            "request_retries_total": [],
+            "response_bytes_total": [],
+            "request_bytes_total": [],
+        }
+        gauges: typing.List[str] = []
+        for entry in self.snapshot():
+            labels = (
+                f'host="{entry["host"]}",method="{entry["method"]}",endpoint="{entry["endpoint"]}"'
+            )
+            cumulative = 0
+            for upper, count in entry["latency"]["buckets"]:
+                cumulative += count
+                le = "+Inf" if upper == float("inf") else repr(upper)
+                lines.append(
+                    f'{prefix}_request_duration_seconds_bucket{{{labels},le="{le}"}} {cumulative}'
+                )
+            lines.append(
+                f"{prefix}_request_duration_seconds_sum{{{labels}}} {entry['latency']['sum_s']}"
+            )
+            lines.append(f"{prefix}_request_duration_seconds_count{{{labels}}} {entry['count']}")
+            for status_code, count in entry["status_codes"].items():
+                counters["requests_total"].append(
+                    f'{prefix}_requests_total{{{labels},status="{status_code}"}} {count}'
+                )
+            counters["request_errors_total"].append(
+                f"{prefix}_request_errors_total{{{labels}}} {entry['errors']}"
+            )
+            counters["request_timeouts_total"].append(
+                f"{prefix}_request_timeouts_total{{{labels}}} {entry['timeouts']}"
+            )
+            counters["request_retries_total"].append(
+                f"{prefix}_request_retries_total{{{labels}}} {entry['retries']}"
+            )
+            counters["response_bytes_total"].append(
+                f"{prefix}_response_bytes_total{{{labels}}} {entry['bytes_in']}"
+            )
+            counters["request_bytes_total"].append(
+                f"{prefix}_request_bytes_total{{{labels}}} {entry['bytes_out']}"
+            )
+            gauges.append(f"{prefix}_requests_in_flight{{{labels}}} {entry['in_flight']}")
+
+        for name, samples in counters.items():
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            lines.extend(samples)
+        lines.append(f"# TYPE {prefix}_requests_in_flight gauge")
+        lines.extend(gauges)
+        return "\n".join(lines) + "\n"
+
+    ##############################################################################################################
+    # Setters
+    ##############################################################################################################
+
+    def reset(self) -> None:
+        """
+        Drop every recorded value. Requests in flight keep writing to the dropped entries.
+        """
+        with self.__SHARDS_LOCK:
+            for _, shard in self.__SHARDS:
+                shard.clear()
+            self.__RETIRED.clear()
+            self.__SERIES.clear()
+
+    def serve(self, port: int = 9464, host: str = "127.0.0.1") -> str:
+        """
+        Serve `prometheus_text()` on `/metrics` in a background thread
+
+        Args:
+            port: Port to bind. 0 => Free port picked by the OS
+            host: Address to bind. Default: Loopback only
+
+        Returns:
+            URL of the metrics endpoint
+        """
+        if self.__SERVER is None:
+            metrics = self
+
+            class _metricsHandler(BaseHTTPRequestHandler):
+                def do_GET(self) -> None:
+                    if self.path.split("?")[0] != "/metrics":
+                        self.send_error(404)
+                        return
+                    body = metrics.prometheus_text().encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format: str, *args: typing.Any) -> None:
+                    pass
+
+            self.__SERVER = ThreadingHTTPServer((host, port), _metricsHandler)
+            self.__SERVER.daemon_threads = True
+            threading.Thread(
+                target=self.__SERVER.serve_forever, name="requestMetrics", daemon=True
+            ).start()
+        address = self.__SERVER.server_address
+        return f"http://{address[0]}:{address[1]}/metrics"
+
+    def stop_serving(self) -> None:
+        if self.__SERVER is not None:
+            self.__SERVER.shutdown()
+            self.__SERVER.server_close()
+            self.__SERVER = None
+
+    ##############################################################################################################
+    # Private Methods
+    ##############################################################################################################
+
+    def __stats(self, key: MetricKey) -> _endpointStats:
+        shard: typing.Optional[typing.Dict[MetricKey, _endpointStats]] = getattr(
+            self.__LOCAL, "shard", None
+        )
+        if shard is None:
+            shard = {}
+            self.__LOCAL.shard = shard
+            with self.__SHARDS_LOCK:
+                # New threads are where shards pile up => Retire the finished ones here as well
+                self.__retire_shards()
+                self.__SHARDS.append((weakref.ref(threading.current_thread()), shard))
+        stats = shard.get(key)
+        if stats is None:
+            key = self.__series(key)
+            stats = shard.get(key)
+            if stats is None:
+                stats = shard[key] = _endpointStats()
+        return stats
+
+    def __series(self, key: MetricKey) -> MetricKey:
+        # First use of a key by this thread => Count it against the series cap.
+        # Overflowed keys come here on every request, they are the rare case.
+        with self.__SHARDS_LOCK:
+            if key in self.__SERIES:
+                return key
+            if len(self.__SERIES) < self.__MAX_SERIES:
+                self.__SERIES.add(key)
+                return key
+        return (key[0], key[1], OVERFLOW_ENDPOINT)
+
+    def __retire_shards(self) -> None:
+        # Caller holds __SHARDS_LOCK. A finished thread never writes again => Its shard is final.
+        live = []
+        for thread_ref, shard in self.__SHARDS:
+            thread = thread_ref()
+            if thread is not None and thread.is_alive():
+                live.append((thread_ref, shard))
+                continue
+            for key, stats in shard.items():
+                self.__RETIRED.setdefault(key, _endpointStats()).add(stats)
+        self.__SHARDS = live
+
+
+def _quantile(buckets: typing.List[int], q: float) -> float:
+    # Linear interpolation inside the bucket holding the quantile, as Prometheus histogram_quantile
+    total = sum(buckets)
+    if total == 0:
+        return 0.0
+    rank = q * total
+    cumulative = 0
+    for index, count in enumerate(buckets):
+        if cumulative + count >= rank and count > 0:
+            lower = LATENCY_BUCKETS_S[index - 1] if index > 0 else 0.0
+            if index >= len(LATENCY_BUCKETS_S):
+                return lower
+            upper = LATENCY_BUCKETS_S[index]
+            return lower + (upper - lower) * (rank - cumulative) / count
+        cumulative += count
+    return LATENCY_BUCKETS_S[-1]
@@ -0,0 +1,444 @@
+"""
+Module with typed models of the common API results.
+
+The API classes return plain dictionaries. At fleet scale millions of small dictionaries dominate the
+heap, so the frequently kept results have slotted models built straight from the decoded JSON:
+    -> No per-instance `__dict__`. Attributes are stored in fixed slots.
+    -> Nested vectors are flattened into the model (`pose_Model.x` instead of `pose["x"]`).
+    -> `to_dict()` gives back the API format when a dictionary is needed.
+
+The API class methods keep returning dictionaries. Models are only returned by
+`restAdapter.get(endpoint, model=...)`, which wraps them in a `model_Result`.
+
+Models:
+    - pose_Model => `slam.get_current_robot_pose()`, POI and laser poses
+    - action_Model => `motion.get_action()`
+    - health_Model, healthError_Model => `system.get_robot_health()`
+    - network_Model => `system.get_network_status()`
+    - poi_Model => `artifact.get_artifact("poi")`
+    - area_Model => `artifact.get_artifact("rect", usage)`
+"""
+
+# Custom Packages
+from .results import DictType, ListDictType
+
+# Imported Packages
+import typing
+
+ModelType = typing.TypeVar("ModelType")
+
+
+def _float(data: DictType, key: str) -> float:
+    value = data.get(key)
+    return float(value) if value is not None else 0.0
+
+
+class pose_Model:
+    __slots__ = ("x", "y", "z", "yaw", "pitch", "roll")
+
+    def __init__(
+        self,
+        x: float = 0.0,
+        y: float = 0.0,
+        z: float = 0.0,
+        yaw: float = 0.0,
+        pitch: float = 0.0,
+        roll: float = 0.0,
+    ) -> None:
+        """
+        Robot or Element Pose
+
+        Args:
+            x: X Coordinate in meters
+            y: Y Coordinate in meters
+            z: Z Coordinate in meters
+            yaw: Yaw in radians
+            pitch: Pitch in radians
+            roll: Roll in radians
+        """
+        self.x: float = x
+        self.y: float = y
+        self.z: float = z
+        self.yaw: float = yaw
+        self.pitch: float = pitch
+        self.roll: float = roll
+
+    @classmethod
+    def from_dict(cls, data: DictType) -> "pose_Model":
+        # The robot spells pitch as "picth" in some responses
+        return cls(
+            _float(data, "x"),
+            _float(data, "y"),
+            _float(data, "z"),
+            _float(data, "yaw"),
+            _float(data, "pitch") or _float(data, "picth"),
+            _float(data, "roll"),
+        )
+
+    def to_dict(self) -> DictType:
+        return {
+            "x": self.x,
+            "y": self.y,
+            "z": self.z,
+            "yaw": self.yaw,
+            "pitch": self.pitch,
+            "roll": self.roll,
+        }
+
+    def __repr__(self) -> str:
+        return f"pose_Model(x={self.x}, y={self.y}, yaw={self.yaw})"
+
+
+class action_Model:
+    __slots__ = ("action_id", "action_name", "stage", "status", "result", "reason")
+
+    def __init__(
+        self,
+        action_id: int = -1,
+        action_name: str = "",
+        stage: str = "",
+        status: int = 0,
+        result: int = 0,
+        reason: str = "",
+    ) -> None:
+        """
+        Motion Action Status
+
+        Args:
+            action_id: Action ID. -1 => No Action
+            action_name: Example: "slamtec.agent.actions.MoveToAction"
+            stage: Example: "GOING_TO_TARGET"
+            status: Action Status. 4 => Action ended
+            result: Action Result once ended
+            reason: Failure Reason
+        """
+        self.action_id: int = action_id
+        self.action_name: str = action_name
+        self.stage: str = stage
+        self.status: int = status
+        self.result: int = result
+        self.reason: str = reason
+
+    @classmethod
+    def from_dict(cls, data: DictType) -> "action_Model":
+        state = data.get("state") or {}
+        return cls(
+            int(data.get("action_id", -1)),
+            str(data.get("action_name", "")),
+            str(data.get("stage", "")),
+            int(state.get("status", 0)),
+            int(state.get("result", 0)),
+            str(state.get("reason", "")),
+        )
+
+    def is_finished(self) -> bool:
+        return self.status == 4
+
+    def to_dict(self) -> DictType:
+        return {
+            "action_id": self.action_id,
+            "action_name": self.action_name,
+            "stage": self.stage,
+            "state": {"status": self.status, "result": self.result, "reason": self.reason},
+        }
+
+    def __repr__(self) -> str:
+        return f"action_Model(action_id={self.action_id}, action_name={self.action_name!r}, stage={self.stage!r})"
+
+
+class healthError_Model:
+    __slots__ = ("id", "component", "error_code", "level", "message")
+
+    def __init__(
+        self,
+        id: int = 0,
+        component: int = 0,
+        error_code: int = 0,
+        level: int = 0,
+        message: str = "",
+    ) -> None:
+        """
+        One Base Error of the robot health
+
+        Args:
+            id: Error ID
+            component: Component raising the error
+            error_code: Error Code. Example: 33621760
+            level: Error Level
+            message: Example: "motor barke released"
+        """
+        self.id: int = id
+        self.component: int = component
+        self.error_code: int = error_code
+        self.level: int = level
+        self.message: str = message
+
+    @classmethod
+    def from_dict(cls, data: DictType) -> "healthError_Model":
+        return cls(
+            int(data.get("id", 0)),
+            int(data.get("component", 0)),
+            int(data.get("errorCode", 0)),
+            int(data.get("level", 0)),
+            str(data.get("message", "")),
+        )
+
+    def to_dict(self) -> DictType:
+        return {
+            "id": self.id,
+            "component": self.component,
+            "errorCode": self.error_code,
+            "level": self.level,
+            "message": self.message,
+        }
+
+    def __repr__(self) -> str:
+        return f"healthError_Model(error_code={self.error_code}, message={self.message!r})"
+
+
+class health_Model:
+    __slots__ = ("has_warning", "has_error", "has_fatal", "base_errors")
+
+    def __init__(
+        self,
+        has_warning: bool = False,
+        has_error: bool = False,
+        has_fatal: bool = False,
+        base_errors: typing.Tuple[healthError_Model, ...] = (),
+    ) -> None:
+        """
+        Robot Health
+
+        Args:
+            has_warning: Robot has a warning
+            has_error: Robot has an error
+            has_fatal: Robot has a fatal error
+            base_errors: Errors reported by the base
+        """
+        self.has_warning: bool = has_warning
+        self.has_error: bool = has_error
+        self.has_fatal: bool = has_fatal
+        self.base_errors: typing.Tuple[healthError_Model, ...] = base_errors
+
+    @classmethod
+    def from_dict(cls, data: DictType) -> "health_Model":
+        return cls(
+            bool(data.get("hasWarning", False)),
+            bool(data.get("hasError", False)),
+            bool(data.get("hasFatal", False)),
+            tuple(healthError_Model.from_dict(error) for error in data.get("baseError") or []),
+        )
+
+    def is_healthy(self) -> bool:
+        return not (self.has_warning or self.has_error or self.has_fatal)
+
+    def to_dict(self) -> DictType:
+        return {
+            "hasWarning": self.has_warning,
+            "hasError": self.has_error,
+            "hasFatal": self.has_fatal,
+            "baseError": [error.to_dict() for error in self.base_errors],
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"health_Model(has_warning={self.has_warning}, has_error={self.has_error}, "
+            f"has_fatal={self.has_fatal}, base_errors={len(self.base_errors)})"
+        )
+
+
+class network_Model:
+    __slots__ = ("ethip1", "ip", "mac", "mode", "quality", "ssid")
+
+    def __init__(
+        self,
+        ethip1: str = "",
+        ip: str = "",
+        mac: str = "",
+        mode: str = "",
+        quality: int = 0,
+        ssid: str = "",
+    ) -> None:
+        """
+        Robot Network Status
+
+        Args:
+            ethip1: Ethernet Address. Example: "192.168.11.1/24"
+            ip: Wireless Address
+            mac: MAC Address
+            mode: "STA" or "AP"
+            quality: Signal Quality 0 - 100
+            ssid: Connected Network
+        """
+        self.ethip1: str = ethip1
+        self.ip: str = ip
+        self.mac: str = mac
+        self.mode: str = mode
+        self.quality: int = quality
+        self.ssid: str = ssid
+
+    @classmethod
+    def from_dict(cls, data: DictType) -> "network_Model":
+        status = data.get("networkstatus", data) or {}
+        return cls(
+            str(status.get("ethip1", "")),
+            str(status.get("ip", "")),
+            str(status.get("mac", "")),
+            str(status.get("mode", "")),
+            int(status.get("quality", 0)),
+            str(status.get("ssid", "")),
+        )
+
+    def to_dict(self) -> DictType:
+        return {
+            "networkstatus": {
+                "ethip1": self.ethip1,
+                "ip": self.ip,
+                "mac": self.mac,
+                "mode": self.mode,
+                "quality": self.quality,
+                "ssid": self.ssid,
+            }
+        }
+
+    def __repr__(self) -> str:
+        return f"network_Model(ip={self.ip!r}, mode={self.mode!r}, quality={self.quality})"
+
+
+class poi_Model:
+    __slots__ = ("id", "x", "y", "yaw", "metadata")
+
+    def __init__(
+        self,
+        id: str = "",
+        x: float = 0.0,
+        y: float = 0.0,
+        yaw: float = 0.0,
+        metadata: typing.Optional[DictType] = None,
+    ) -> None:
+        """
+        Point of Interest
+
+        Args:
+            id: POI UUID
+            x: X Coordinate in meters
+            y: Y Coordinate in meters
+            yaw: Yaw in radians
+            metadata: POI Metadata. Example: {"display_name": "A101", "type": "..."}
+        """
+        self.id: str = id
+        self.x: float = x
+        self.y: float = y
+        self.yaw: float = yaw
+        self.metadata: typing.Optional[DictType] = metadata
+
+    @classmethod
+    def from_dict(cls, data: DictType) -> "poi_Model":
+        pose = data.get("pose") or {}
+        return cls(
+            str(data.get("id", "")),
+            _float(pose, "x"),
+            _float(pose, "y"),
+            _float(pose, "yaw"),
+            data.get("metadata") or None,
+        )
+
+    def name(self) -> str:
+        return str((self.metadata or {}).get("display_name", ""))
+
+    def to_dict(self) -> DictType:
+        return {
+            "id": self.id,
+            "pose": {"x": self.x, "y": self.y, "yaw": self.yaw},
+            "metadata": self.metadata or {},
+        }
+
+    def __repr__(self) -> str:
+        return f"poi_Model(id={self.id!r}, x={self.x}, y={self.y}, yaw={self.yaw})"
+
+
+class area_Model:
+    __slots__ = ("id", "usage", "start_x", "start_y", "end_x", "end_y", "half_width", "metadata")
+
+    def __init__(
+        self,
+        id: int = 0,
+        usage: str = "",
+        start_x: float = 0.0,
+        start_y: float = 0.0,
+        end_x: float = 0.0,
+        end_y: float = 0.0,
+        half_width: float = 0.0,
+        metadata: typing.Optional[DictType] = None,
+    ) -> None:
+        """
+        Rectangular Area. The rectangle is the segment start -> end widened by half_width on both sides.
+
+        Args:
+            id: Area ID
+            usage: Area Usage. Example: "forbidden_area"
+            start_x: X Coordinate of the segment start
+            start_y: Y Coordinate of the segment start
+            end_x: X Coordinate of the segment end
+            end_y: Y Coordinate of the segment end
+            half_width: Half of the rectangle width
+            metadata: Area Metadata
+        """
+        self.id: int = id
+        self.usage: str = usage
+        self.start_x: float = start_x
+        self.start_y: float = start_y
+        self.end_x: float = end_x
+        self.end_y: float = end_y
+        self.half_width: float = half_width
+        self.metadata: typing.Optional[DictType] = metadata
+
+    @classmethod
+    def from_dict(cls, data: DictType, usage: str = "") -> "area_Model":
+        # The geometry is nested under "area" as in the add request body
+        area = data.get("area") or data
+        start = area.get("start") or {}
+        end = area.get("end") or {}
+        return cls(
+            data.get("id", 0),
+            str(data.get("usage", usage)),
+            _float(start, "x"),
+            _float(start, "y"),
+            _float(end, "x"),
+            _float(end, "y"),
+            _float(area, "half_width"),
+            data.get("metadata") or None,
+        )
+
+    def to_dict(self) -> DictType:
+        return {
+            "id": self.id,
+            "area": {
+                "start": {"x": self.start_x, "y": self.start_y},
+                "end": {"x": self.end_x, "y": self.end_y},
+                "half_width": self.half_width,
+            },
+            "metadata": self.metadata or {},
+        }
+
+    def __repr__(self) -> str:
+        return f"area_Model(id={self.id!r}, usage={self.usage!r}, half_width={self.half_width})"
+
+
+def models_from_list(
+    model: typing.Type[ModelType], data: typing.Optional[ListDictType], **kwargs: typing.Any
+) -> typing.List[ModelType]:
+    """
+    Build models out of a list result
+
+    Args:
+        model: Model Class. Example: poi_Model
+        data: List of Dictionaries as returned by the API. False or None => Empty List
+        kwargs: Extra arguments of `from_dict`. Example: usage="forbidden_area" for area_Model
+
+    Returns:
+        List of Models
+    """
+    if not isinstance(data, list):
+        return []
+    return [model.from_dict(element, **kwargs) for element in data]  # type: ignore[attr-defined]
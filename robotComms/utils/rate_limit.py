@@ -0,0 +1,80 @@
+"""
+Module to limit the rate of requests sent to the robots.
+
+Token Bucket:
+    -> Tokens are refilled at `rate` tokens per second up to `burst` tokens
+    -> Every request takes one token and waits while the bucket is empty
+"""
+
+# Imported Packages
+import threading
+import time
+import typing
+
+
+class rateLimiter:
+    def __init__(self, rate: float, burst: typing.Optional[int] = None) -> None:
+        """
+        Thread-safe Token Bucket
+
+        Args:
+            rate: Requests per second. Values <= 0 disable the limit.
+            burst: Max number of requests sent back to back. Default: max(1, rate)
+        """
+        self.__RATE: float = rate
+        self.__BURST: float = float(burst if burst is not None else max(1, int(rate)))
+        self.__TOKENS: float = self.__BURST
+        self.__LAST_REFILL: float = time.monotonic()
+        self.__LOCK = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0, timeout: typing.Optional[float] = None) -> bool:
+        """
+        Wait for tokens
+
+        Args:
+            tokens: Number of tokens to take. Default: 1
+            timeout: Max time to wait in seconds. Default: None => Wait until available
+
+        Returns:
+            - True => Tokens taken
+            - False => Timeout reached
+
+        Raises:
+            ValueError: More tokens than the bucket holds. They would never be available.
+        """
+        if self.__RATE <= 0:
+            return True
+        if tokens > self.__BURST:
+            raise ValueError(f"Cannot take {tokens} tokens from a bucket of {self.__BURST:g}")
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self.__LOCK:
+                now = time.monotonic()
+                self.__TOKENS = min(
+                    self.__BURST, self.__TOKENS + (now - self.__LAST_REFILL) * self.__RATE
+                )
+                self.__LAST_REFILL = now
+                if self.__TOKENS >= tokens:
+                    self.__TOKENS -= tokens
+                    return True
+                wait = (tokens - self.__TOKENS) / self.__RATE
+            if deadline is not None:
+                if now + wait > deadline:
+                    return False
+            time.sleep(wait)
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """
+        Take tokens without waiting
+
+        Args:
+            tokens: Number of tokens to take. Default: 1
+
+        Returns:
+            - True => Tokens taken
+            - False => Not enough tokens
+
+        Raises:
+            ValueError: More tokens than the bucket holds
+        """
+        return self.acquire(tokens, timeout=0.0)
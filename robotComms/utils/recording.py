@@ -0,0 +1,619 @@
+"""
+Module to record the exchanges of a robot session and replay them without the robot.
+
+Both sides are `requests` transports mounted on a `restAdapter` with `mount_transport()`, so the
+API classes, decoders, metrics and tracing run unchanged on top of them:
+    -> recordingTransport => Sends to the robot and appends every exchange to a file
+    -> replayTransport => Answers from a recording at original or accelerated speed
+
+File Format (append-only, gzip compressed if the path ends with ".gz"):
+    -> One JSON header line per session: {"format": "robotComms-recording", "version": 2, ...}
+    -> Per exchange one JSON header line followed by exactly "size" bytes of response body
+    -> Header keys: "t", "method", "url", "body", "body_encoding", "status", "reason", "headers",
+       "elapsed_s", "size", "error"
+    -> Request bodies that are not UTF-8 text (maps, firmware chunks) are stored base64 encoded
+       with "body_encoding": "base64"
+    -> Every exchange is flushed => A file cut short by a crash reads up to the last whole exchange
+
+Replay Matching:
+    -> Exchanges are matched on method, path with query and request body. The host is ignored.
+    -> A response is held until its recorded start, then for its recorded duration, both divided
+       by the replay speed. The gaps between the requests of the session are kept.
+    -> Repeated requests of the same key get the recorded responses in order
+    -> Once a key is exhausted its last response is repeated, or 404 with `loop=False`
+
+Run:
+    python -m robotComms.utils.recording logs/session.rec
+"""
+
+# Custom Packages
+from .logger import systemLogger
+from .metrics import endpoint_template
+from .results import DictType
+
+# Imported Packages
+from collections import deque
+import argparse
+import base64
+import gzip
+import io
+import json
+import threading
+import time
+import typing
+import zlib
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError, ReadTimeout, Timeout
+from urllib3.response import HTTPResponse
+
+if typing.TYPE_CHECKING:
+    from .simulator import simulatorClient
+
+RECORDING_FORMAT: str = "robotComms-recording"
+RECORDING_VERSION: int = 2
+REPLAY_URL: str = "http://replay.local"
+
+# Bodies are stored decoded => Transfer headers of the original response no longer apply
+_DROPPED_HEADERS: typing.Tuple[str, ...] = ("content-encoding", "transfer-encoding", "connection")
+
+ExchangeKey = typing.Tuple[str, str, str]
+
+
+class recordedExchange:
+    __slots__ = (
+        "t",
+        "method",
+        "url",
+        "body",
+        "body_encoding",
+        "status",
+        "reason",
+        "headers",
+        "elapsed_s",
+        "content",
+        "error",
+    )
+
+    def __init__(
+        self,
+        t: float,
+        method: str,
+        url: str,
+        body: typing.Optional[str],
+        status: int,
+        reason: str,
+        headers: typing.Dict[str, str],
+        elapsed_s: float,
+        content: bytes,
+        error: str = "",
+        body_encoding: str = "",
+    ) -> None:
+        """
+        One request and its response
+
+        Args:
+            t: Start of the request in seconds since the recording started
+            method: Request Method
+            url: Request URL with query
+            body: Request Body. None if empty.
+            status: Response Status Code. 0 if the request failed.
+            reason: Response Reason. Example: "OK"
+            headers: Response Headers
+            elapsed_s: Request Duration in seconds
+            content: Response Body
+            error: "timeout" or "connection" if the request failed. Empty otherwise.
+            body_encoding: "base64" if `body` holds binary data base64 encoded. Empty otherwise.
+        """
+        self.t: float = t
+        self.method: str = method
+        self.url: str = url
+        self.body: typing.Optional[str] = body
+        self.status: int = status
+        self.reason: str = reason
+        self.headers: typing.Dict[str, str] = headers
+        self.elapsed_s: float = elapsed_s
+        self.content: bytes = content
+        self.error: str = error
+        self.body_encoding: str = body_encoding
+
+    @property
+    def request_content(self) -> bytes:
+        """
+        Returns:
+            Request Body as sent
+        """
+        if self.body is None:
+            return b""
+        if self.body_encoding == "base64":
+            return base64.b64decode(self.body)
+        return self.body.encode("utf-8")
+
+    @property
+    def key(self) -> ExchangeKey:
+        return _exchange_key(self.method, self.url, self.body)
+
+    def header(self) -> DictType:
+        return {
+            "t": round(self.t, 6),
+            "method": self.method,
+            "url": self.url,
+            "body": self.body,
+            "body_encoding": self.body_encoding,
+            "status": self.status,
+            "reason": self.reason,
+            "headers": self.headers,
+            "elapsed_s": round(self.elapsed_s, 6),
+            "size": len(self.content),
+            "error": self.error,
+        }
+
+    def __repr__(self) -> str:
+        return f"recordedExchange({self.method} {self.url} => {self.status or self.error})"
+
+
+def _exchange_key(method: str, url: str, body: typing.Optional[str]) -> ExchangeKey:
+    split = urlsplit(url)
+    path = f"{split.path}?{split.query}" if split.query else split.path
+    return (method.upper(), path, body or "")
+
+
+def _request_body(request: requests.PreparedRequest) -> typing.Tuple[typing.Optional[str], str]:
+    """
+    Returns:
+        (body, body_encoding). Binary bodies are base64 encoded => The recording keeps every byte.
+    """
+    body = request.body
+    if not body:
+        return None, ""
+    if isinstance(body, bytes):
+        try:
+            return body.decode("utf-8"), ""
+        except UnicodeDecodeError:
+            return base64.b64encode(body).decode("ascii"), "base64"
+    return str(body), ""
+
+
+def _open(file_path: str, mode: str) -> typing.BinaryIO:
+    if file_path.endswith(".gz"):
+        if "r" in mode:
+            return _gzipReader(file_path)  # type: ignore[return-value]
+        return gzip.open(file_path, mode)  # type: ignore[return-value]
+    return open(file_path, mode)  # type: ignore[return-value]
+
+
+class _gzipReader:
+    """
+    Reader of concatenated gzip members, one per recorded session. Unlike `gzip.GzipFile` it hands
+    out everything decompressed before the end of a member cut short by a crash.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        self.__FILE = open(file_path, "rb")
+        self.__DECOMPRESSOR = zlib.decompressobj(wbits=31)
+        self.__BUFFER = bytearray()
+        self.__EOF: bool = False
+
+    def __enter__(self) -> "_gzipReader":
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        self.__FILE.close()
+
+    def readline(self) -> bytes:
+        start = 0
+        while True:
+            end = self.__BUFFER.find(b"\n", start)
+            if end >= 0:
+                return self.__take(end + 1)
+            start = len(self.__BUFFER)
+            if not self.__fill():
+                return self.__take(len(self.__BUFFER))
+
+    def read(self, size: int) -> bytes:
+        while len(self.__BUFFER) < size and self.__fill():
+            pass
+        return self.__take(min(size, len(self.__BUFFER)))
+
+    def __take(self, size: int) -> bytes:
+        data = bytes(self.__BUFFER[:size])
+        del self.__BUFFER[:size]
+        return data
+
+    def __fill(self) -> bool:
+        # False => End of the file, nothing more to decompress
+        if self.__EOF:
+            return False
+        data = self.__FILE.read(1 << 16)
+        if not data:
+            self.__EOF = True
+            return False
+        while data:
+            self.__BUFFER += self.__DECOMPRESSOR.decompress(data)
+            if not self.__DECOMPRESSOR.eof:
+                break
+            # Next session starts a new gzip member
+            data = self.__DECOMPRESSOR.unused_data
+            self.__DECOMPRESSOR = zlib.decompressobj(wbits=31)
+        return True
+
+
+def read_recording(file_path: str) -> typing.Iterator[recordedExchange]:
+    """
+    Read the exchanges of a recording in order
+
+    Args:
+        file_path: Recording File
+
+    Returns:
+        Iterator of Exchanges. Session headers are skipped. A file cut short by a crash ends with
+        the last whole exchange.
+    """
+    with _open(file_path, "rb") as file:
+        while True:
+            try:
+                line = file.readline()
+                if not line.endswith(b"\n"):
+                    return
+                header = json.loads(line)
+                if "format" in header:
+                    continue
+                content = file.read(header["size"])
+            except (zlib.error, ValueError):
+                # Corrupt gzip data or a damaged header line
+                return
+            if len(content) < header["size"]:
+                return
+            yield recordedExchange(
+                header["t"],
+                header["method"],
+                header["url"],
+                header["body"],
+                header["status"],
+                header["reason"],
+                header["headers"],
+                header["elapsed_s"],
+                content,
+                header.get("error", ""),
+                header.get("body_encoding", ""),
+            )
+
+
+class recordingTransport(HTTPAdapter):
+    def __init__(
+        self,
+        file_path: str,
+        pool_maxsize: int = 10,
+        logger: typing.Optional[systemLogger] = None,
+    ) -> None:
+        """
+        Transport sending to the robot and appending every exchange to a recording. Streamed
+        bodies are read in full to be recorded.
+
+        Args:
+            file_path: Recording File. Appended to if it exists. Example: "logs/session.rec.gz"
+            pool_maxsize: Max number of kept-alive connections
+            logger: Instance of systemLogger. If not provided, initiates with log name 'recording_logger'
+        """
+        super().__init__(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.__LOGGER: systemLogger = logger or systemLogger(
+            logger_name="recording_logger",
+            log_file_path="logs",
+            enable_console_logging=True,
+        )
+        self.file_path: str = file_path
+        self.__LOCK = threading.Lock()
+        self.__START: float = time.perf_counter()
+        self.__FILE: typing.BinaryIO = _open(file_path, "ab")
+        self.__COUNT: int = 0
+        self.__write_line(
+            {
+                "format": RECORDING_FORMAT,
+                "version": RECORDING_VERSION,
+                "started_at": time.time(),
+            }
+        )
+        self.__LOGGER.INFO(f"Recording to: {file_path}")
+
+    @property
+    def count(self) -> int:
+        """
+        Returns:
+            Number of exchanges recorded
+        """
+        return self.__COUNT
+
+    def send(  # type: ignore[override]
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout: typing.Any = None,
+        verify: typing.Any = True,
+        cert: typing.Any = None,
+        proxies: typing.Any = None,
+    ) -> requests.Response:
+        start = time.perf_counter()
+        try:
+            response = super().send(request, stream, timeout, verify, cert, proxies)
+            # Reads a streamed body => `iter_content()` serves it from memory afterwards
+            content = response.content
+        except (Timeout, ConnectionError) as e:
+            error = "timeout" if isinstance(e, Timeout) else "connection"
+            self.__record(request, start, 0, "", {}, b"", error)
+            raise
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name.lower() not in _DROPPED_HEADERS
+        }
+        self.__record(request, start, response.status_code, response.reason, headers, content)
+        return response
+
+    def close(self) -> None:
+        with self.__LOCK:
+            if not self.__FILE.closed:
+                self.__FILE.close()
+                self.__LOGGER.INFO(f"Recorded {self.__COUNT} Exchanges to: {self.file_path}")
+        super().close()
+
+    ##############################################################################################################
+    # Private Methods
+    ##############################################################################################################
+
+    def __record(
+        self,
+        request: requests.PreparedRequest,
+        start: float,
+        status: int,
+        reason: str,
+        headers: typing.Dict[str, str],
+        content: bytes,
+        error: str = "",
+    ) -> None:
+        body, body_encoding = _request_body(request)
+        exchange = recordedExchange(
+            start - self.__START,
+            str(request.method),
+            str(request.url),
+            body,
+            status,
+            reason or "",
+            headers,
+            time.perf_counter() - start,
+            content,
+            error,
+            body_encoding,
+        )
+        line = json.dumps(exchange.header(), separators=(",", ":")).encode() + b"\n"
+        with self.__LOCK:
+            if self.__FILE.closed:
+                return
+            self.__FILE.write(line + content)
+            # One flush per exchange => A crashed session keeps everything up to the crash
+            self.__FILE.flush()
+            self.__COUNT += 1
+
+    def __write_line(self, header: DictType) -> None:
+        with self.__LOCK:
+            self.__FILE.write(json.dumps(header, separators=(",", ":")).encode() + b"\n")
+            self.__FILE.flush()
+
+
+class replayTransport(HTTPAdapter):
+    def __init__(
+        self,
+        recording: typing.Union[str, typing.Iterable[recordedExchange]],
+        speed: float = 1.0,
+        loop: bool = True,
+        logger: typing.Optional[systemLogger] = None,
+    ) -> None:
+        """
+        Transport answering from a recording, without network
+
+        Args:
+            recording: Recording File or Exchanges
+            speed: Replay Speed. 1.0 => Recorded timing, 10.0 => Ten times faster, 0 => No delay
+            loop: Repeat the last response of an exhausted key. False => 404 "Not Recorded"
+            logger: Instance of systemLogger. If not provided, initiates with log name 'recording_logger'
+        """
+        super().__init__(pool_connections=1, pool_maxsize=1)
+        self.__LOGGER: systemLogger = logger or systemLogger(
+            logger_name="recording_logger",
+            log_file_path="logs",
+            enable_console_logging=True,
+        )
+        if isinstance(recording, str):
+            self.__LOGGER.INFO(f"Replaying: {recording}")
+            recording = read_recording(recording)
+        self.__EXCHANGES: typing.List[recordedExchange] = list(recording)
+        self.__LOCK = threading.Lock()
+        self.__QUEUES: typing.Dict[ExchangeKey, typing.Deque[recordedExchange]] = {}
+        self.__LAST: typing.Dict[ExchangeKey, recordedExchange] = {}
+        # Recorded time of the first exchange, and when the replay of it started
+        self.__T0: float = min((exchange.t for exchange in self.__EXCHANGES), default=0.0)
+        self.__CLOCK: typing.Optional[float] = None
+        self.speed: float = speed
+        self.loop: bool = loop
+        self.misses: int = 0
+        self.reset()
+
+    @property
+    def remaining(self) -> int:
+        """
+        Returns:
+            Number of recorded exchanges not served yet
+        """
+        with self.__LOCK:
+            return sum(len(queue) for queue in self.__QUEUES.values())
+
+    def reset(self) -> None:
+        """
+        Rewind the replay to the first exchange
+        """
+        with self.__LOCK:
+            self.__QUEUES = {}
+            self.__LAST = {}
+            self.__CLOCK = None
+            for exchange in self.__EXCHANGES:
+                self.__QUEUES.setdefault(exchange.key, deque()).append(exchange)
+            self.misses = 0
+
+    def send(  # type: ignore[override]
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout: typing.Any = None,
+        verify: typing.Any = True,
+        cert: typing.Any = None,
+        proxies: typing.Any = None,
+    ) -> requests.Response:
+        key = _exchange_key(str(request.method), str(request.url), _request_body(request)[0])
+        with self.__LOCK:
+            if self.__CLOCK is None:
+                self.__CLOCK = time.perf_counter()
+            clock = self.__CLOCK
+            queue = self.__QUEUES.get(key)
+            if queue:
+                exchange: typing.Optional[recordedExchange] = queue.popleft()
+                self.__LAST[key] = exchange  # type: ignore[assignment]
+            else:
+                exchange = self.__LAST.get(key) if self.loop else None
+            if exchange is None:
+                self.misses += 1
+        if exchange is None:
+            self.__LOGGER.WARNING(f"Not Recorded: {key[0]} {key[1]}")
+            return self.__build(request, 404, "Not Recorded", {}, b"")
+
+        if self.speed > 0:
+            # Held until its recorded start, then for its recorded duration
+            started = max(
+                time.perf_counter(), clock + max(0.0, exchange.t - self.__T0) / self.speed
+            )
+            time.sleep(max(0.0, started + exchange.elapsed_s / self.speed - time.perf_counter()))
+        if exchange.error == "timeout":
+            raise ReadTimeout(f"Recorded Timeout: {exchange.url}", request=request)
+        if exchange.error:
+            raise ConnectionError(f"Recorded Connection Error: {exchange.url}", request=request)
+        return self.__build(
+            request, exchange.status, exchange.reason, exchange.headers, exchange.content
+        )
+
+    ##############################################################################################################
+    # Private Methods
+    ##############################################################################################################
+
+    def __build(
+        self,
+        request: requests.PreparedRequest,
+        status: int,
+        reason: str,
+        headers: typing.Dict[str, str],
+        content: bytes,
+    ) -> requests.Response:
+        raw = HTTPResponse(
+            body=io.BytesIO(content),
+            headers={**headers, "Content-Length": str(len(content))},
+            status=status,
+            reason=reason,
+            preload_content=False,
+            decode_content=False,
+        )
+        return self.build_response(request, raw)
+
+
+def replay_client(
+    recording: typing.Union[str, typing.Iterable[recordedExchange]],
+    speed: float = 1.0,
+    loop: bool = True,
+    logger: typing.Optional[systemLogger] = None,
+    decoder: str = "auto",
+) -> "simulatorClient":
+    """
+    API classes answering from a recording, like the attributes of `robotComms`
+
+    Args:
+        recording: Recording File or Exchanges
+        speed: Replay Speed. See `replayTransport`
+        loop: Repeat the last response of an exhausted key
+        logger: Instance of systemLogger. If not provided, initiates with log name 'recording_logger'
+        decoder: JSON Decoder of the REST Adapter
+
+    Returns:
+        Client with `system`, `artifact`, `slam`, `motion`, `statistics`, `platform`, `sensors`,
+        `multi_floor`, `delivery`, `firmware`, `application`, `snapshot` and `metrics`.
+        The transport is `client.rest_adapter.transport`.
+    """
+    from .rest_adapter import restAdapter
+    from .simulator import simulatorClient
+
+    logger = logger or systemLogger(
+        logger_name="recording_logger",
+        log_file_path="logs",
+        enable_console_logging=True,
+    )
+    adapter = restAdapter(logger, decoder=decoder)
+    adapter.mount_transport(replayTransport(recording, speed=speed, loop=loop, logger=logger))
+    return simulatorClient(REPLAY_URL, logger, adapter)
+
+
+def summarize_recording(file_path: str) -> typing.List[DictType]:
+    """
+    Per endpoint summary of a recording
+
+    Args:
+        file_path: Recording File
+
+    Returns:
+        [{"method": "GET", "endpoint": "slam/v1/localization/pose", "count": 120, "bytes": ...,
+          "mean_s": ..., "max_s": ..., "errors": 0}, ...]
+    """
+    summary: typing.Dict[typing.Tuple[str, str], DictType] = {}
+    for exchange in read_recording(file_path):
+        _host, template = endpoint_template(exchange.url)
+        entry = summary.setdefault(
+            (exchange.method, template),
+            {
+                "method": exchange.method,
+                "endpoint": template,
+                "count": 0,
+                "bytes": 0,
+                "total_s": 0.0,
+                "max_s": 0.0,
+                "errors": 0,
+            },
+        )
+        entry["count"] += 1
+        entry["bytes"] += len(exchange.content)
+        entry["total_s"] += exchange.elapsed_s
+        entry["max_s"] = max(entry["max_s"], exchange.elapsed_s)
+        if exchange.error or exchange.status >= 400:
+            entry["errors"] += 1
+    result = []
+    for entry in summary.values():
+        entry["mean_s"] = entry.pop("total_s") / entry["count"]
+        result.append(entry)
+    return sorted(result, key=lambda entry: entry["count"], reverse=True)
+
+
+def main(argv: typing.Optional[typing.List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Summarize a robot session recording")
+    parser.add_argument("file_path", help="Recording File")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    summary = summarize_recording(args.file_path)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+    print(f"{'method':<7} {'endpoint':<48} {'count':>7} {'bytes':>11} {'mean ms':>9} {'errors':>7}")
+    for entry in summary:
+        print(
+            f"{entry['method']:<7} {entry['endpoint']:<48} {entry['count']:>7} "
+            f"{entry['bytes']:>11} {entry['mean_s'] * 1000:>9.2f} {entry['errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
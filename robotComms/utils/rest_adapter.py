@@ -7,6 +7,24 @@ Contains Standard Requests for:
     -> DELETE
     -> PUT
 
+Request metrics are recorded per endpoint template into `utils.metrics.requestMetrics`, see the
+`metrics` property.
+
+Requests are traced by `utils.tracing` hooks when any is registered. The request time is split
+into "prepare", "network", "decode" and "log" phases.
+
+Response Dispatch (`Response_Type`):
+    -> JSON / LIST_JSON => Decoded by the configured JSON decoder
+    -> STR => Scalar body (number, boolean, string) read without the JSON decoder
+    -> TEXT => Plain text body
+    -> BYTES => Raw body, never decoded
+    -> STREAM => Body left unread for chunked iteration
+    -> EMPTY => Status code only
+
+Request Bodies:
+    -> dict / list => Sent as JSON
+    -> bytes => Sent as is with "application/octet-stream". Example: Map Files
+
 Reference: https://www.pretzellogix.net/2021/12/08/step-2-write-a-low-level-rest-adapter/
 """
 
@@ -14,6 +32,16 @@ __name__ = "restAdapter"
 
 # Custom Packages
 from .logger import systemLogger
+from .metrics import requestMetrics
+from .tracing import requestTracer, traceSpan, get_tracer
+from .decoders import (
+    DecoderType,
+    get_decoder,
+    decoder_name,
+    decode_model,
+    decode_scalar,
+    scalar_text,
+)
 from .results import (
     Response_Type,
     DictType,
@@ -23,27 +51,49 @@ from .results import (
     dict_Result,
     str_Result,
     empty_Result,
+    model_Result,
+    bytes_Result,
+    stream_Result,
     combined_Result,
 )
 
 # Imported Packages
 import requests  # https://requests.readthedocs.io/en/latest/user/quickstart/#
-from requests.exceptions import Timeout, HTTPError, JSONDecodeError
+from requests.adapters import HTTPAdapter
+from requests.exceptions import Timeout, HTTPError
 import typing
 import json
 
+# Header of bytes bodies. JSON bodies get theirs from `requests`
+_OCTET_STREAM: typing.Dict[str, str] = {"Content-Type": "application/octet-stream"}
+
 
 class restAdapter:
     def __init__(
         self,
         logger_instance: typing.Optional[systemLogger] = None,
         timeout: float = 2.0,
+        pool_maxsize: int = 10,
+        decoder: typing.Union[str, DecoderType] = "auto",
+        metrics: typing.Optional[requestMetrics] = None,
+        enable_metrics: bool = True,
+        tracer: typing.Optional[requestTracer] = None,
     ) -> None:
         """
 
         Args:
             logger_instance: Instance of systemLogger. If not provided, initiates with log name 'restApi_logger'
             timeout: API Request Timeout. Default = 2s
+            pool_maxsize: Max number of kept-alive connections per host. Share one adapter between
+                the API classes of a robot to reuse its pool. Default = 10
+            decoder: JSON Decoder of the response bytes
+                - "auto" => Fastest installed decoder (orjson, ujson, then the standard library)
+                - "orjson" / "ujson" / "json" => Fixed decoder
+                - Callable taking the body bytes
+            metrics: Request Metrics to record into. Share one instance between the adapters of a
+                fleet. If not provided, the adapter keeps its own.
+            enable_metrics: Record request metrics. Default = True
+            tracer: Tracer whose hooks see every request. Default: Process-wide `get_tracer()`
         """
         self._LOGGER: systemLogger = logger_instance or systemLogger(
             logger_name="restApi_logger",
@@ -51,6 +101,50 @@ class restAdapter:
             enable_console_logging=True,
         )
         self._REQUEST_TIMEOUT: float = timeout
+        self._SESSION: requests.Session = requests.Session()
+        self._TRANSPORT: HTTPAdapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self._SESSION.mount("http://", self._TRANSPORT)
+        self._SESSION.mount("https://", self._TRANSPORT)
+        self._DECODE: DecoderType = get_decoder(decoder)
+        self._LOGGER.INFO(f"JSON Decoder: {decoder_name(decoder)}")
+        self._METRICS: typing.Optional[requestMetrics] = (
+            (metrics or requestMetrics()) if enable_metrics else None
+        )
+        self._TRACER: requestTracer = tracer or get_tracer()
+
+    @property
+    def metrics(self) -> typing.Optional[requestMetrics]:
+        """
+        Returns:
+            Request Metrics of the adapter. None if disabled.
+        """
+        return self._METRICS
+
+    @property
+    def transport(self) -> HTTPAdapter:
+        """
+        Returns:
+            Transport of the session. See `mount_transport()`
+        """
+        return self._TRANSPORT
+
+    def mount_transport(self, transport: HTTPAdapter) -> None:
+        """
+        Send every request through another transport. Example: `utils.recording.recordingTransport`
+
+        Args:
+            transport: `requests` Transport Adapter
+        """
+        self._TRANSPORT.close()
+        self._TRANSPORT = transport
+        self._SESSION.mount("http://", transport)
+        self._SESSION.mount("https://", transport)
+
+    def close(self) -> None:
+        """
+        Close the kept-alive connections
+        """
+        self._SESSION.close()
 
     def get(
         self,
@@ -58,6 +152,7 @@ class restAdapter:
         response_type: Response_Type,
         dict_params: typing.Optional[DictType] = None,
         str_params: typing.Optional[StrType] = None,
+        model: typing.Optional[type] = None,
     ) -> combined_Result:
         """
         Generate GET Request
@@ -65,9 +160,10 @@ class restAdapter:
         Args:
             full_endpoint: Complete endpoint of format: http://{ip}:{port}/{endpoint}
             params: Dictionary of Parameters to Fetch Data or String Parameter
+            model: Model Class from `utils.models` to decode into. Example: poi_Model
 
         Returns:
-            Result: Status Code with message
+            Result: Status Code with message. `model_Result` when a model is passed.
         """
         return self.__do(
             http_method="GET",
@@ -75,6 +171,7 @@ class restAdapter:
             response_type=response_type,
             json_params=dict_params,
             str_param=str_params,
+            model=model,
         )
 
     def put(
@@ -83,7 +180,8 @@ class restAdapter:
         response_type: Response_Type,
         dict_params: typing.Optional[DictType] = None,
         str_params: typing.Optional[StrType] = None,
-        body_params: typing.Optional[DictType | ListDictType] = None,
+        body_params: typing.Optional[DictType | ListDictType | bytes] = None,
+        header_params: typing.Optional[typing.Dict[str, str]] = None,
     ) -> combined_Result:
         """
         Generate PUT Request
@@ -91,6 +189,8 @@ class restAdapter:
         Args:
             full_endpoint: Complete endpoint of format: http://{ip}:{port}/{endpoint}
             params: Dictionary of Parameters to Put Data or String Parameter
+            body_params: JSON Body, or bytes sent as is. Example: Map File
+            header_params: Extra Request Headers. Example: {"Content-Range": "bytes 0-1023/4096"}
 
         Returns:
             Result: Status Code with message
@@ -102,6 +202,7 @@ class restAdapter:
             json_params=dict_params,
             str_param=str_params,
             body=body_params,
+            headers=header_params,
         )
 
     def post(
@@ -110,7 +211,8 @@ class restAdapter:
         response_type: Response_Type,
         dict_params: typing.Optional[DictType] = None,
         str_params: typing.Optional[StrType] = None,
-        body_params: typing.Optional[DictType | ListDictType] = None,
+        body_params: typing.Optional[DictType | ListDictType | bytes] = None,
+        header_params: typing.Optional[typing.Dict[str, str]] = None,
     ) -> combined_Result:
         """
         Generate POST Request
@@ -118,6 +220,8 @@ class restAdapter:
         Args:
             full_endpoint: Complete endpoint of format: http://{ip}:{port}/{endpoint}
             params: Dictionary of Parameters to Post Data
+            body_params: JSON Body, or bytes sent as is. Example: Map File
+            header_params: Extra Request Headers. Example: {"Content-Range": "bytes 0-1023/4096"}
 
         Returns:
             Result: Status Code with message
@@ -129,6 +233,7 @@ class restAdapter:
             json_params=dict_params,
             str_param=str_params,
             body=body_params,
+            headers=header_params,
         )
 
     def delete(
@@ -137,7 +242,7 @@ class restAdapter:
         response_type: Response_Type,
         dict_params: typing.Optional[DictType] = None,
         str_params: typing.Optional[StrType] = None,
-        body_params: typing.Optional[DictType | ListDictType] = None,
+        body_params: typing.Optional[DictType | ListDictType | bytes] = None,
     ) -> combined_Result:
         """
         Generate Delete Request
@@ -165,7 +270,9 @@ class restAdapter:
         response_type: Response_Type,
         json_params: typing.Optional[DictType] = None,
         str_param: typing.Optional[StrType] = None,
-        body: typing.Optional[DictType | ListDictType] = None,
+        body: typing.Optional[DictType | ListDictType | bytes] = None,
+        model: typing.Optional[type] = None,
+        headers: typing.Optional[typing.Dict[str, str]] = None,
     ) -> combined_Result:
         """
 
@@ -176,6 +283,8 @@ class restAdapter:
             endpoint: API Endpoint
             ep_params: Dictionary of Parameters to pass in request
             data:
+            model: Model Class to decode into
+            headers: Extra Request Headers
 
         Raises:
             Exception: Status Code Errors
@@ -184,59 +293,178 @@ class restAdapter:
             Result: Status Code with message
 
         """
+        tracer = self._TRACER
+        if not tracer.active:
+            return self.__request(
+                http_method,
+                endpoint,
+                response_type,
+                json_params,
+                str_param,
+                body,
+                model,
+                headers,
+                None,
+            )
+        span = tracer.request_span(http_method, endpoint)
+        try:
+            return self.__request(
+                http_method,
+                endpoint,
+                response_type,
+                json_params,
+                str_param,
+                body,
+                model,
+                headers,
+                span,
+            )
+        except Exception as e:
+            span.fail(e)
+            raise
+        finally:
+            tracer.end_span(span)
+
+    def __request(
+        self,
+        http_method: str,
+        endpoint: str,
+        response_type: Response_Type,
+        json_params: typing.Optional[DictType],
+        str_param: typing.Optional[StrType],
+        body: typing.Optional[DictType | ListDictType | bytes],
+        model: typing.Optional[type],
+        headers: typing.Optional[typing.Dict[str, str]],
+        span: typing.Optional[traceSpan],
+    ) -> combined_Result:
         if str_param is not None:
             param = f"param={str_param}"
         else:
             param = json_params
+        # Bytes bodies (map or firmware files) are sent as is and only their size is logged
+        raw_body = isinstance(body, bytes)
+        logged_body = f"{len(body)} bytes" if raw_body else body  # type: ignore[arg-type]
+        metrics = self._METRICS
+        timer = metrics.begin(http_method, endpoint) if metrics is not None else None
+        if span is not None:
+            span.before_send()
         try:
-            response: requests.Response = requests.request(
+            response: requests.Response = self._SESSION.request(
                 method=http_method,
                 url=endpoint,
                 params=param,
-                json=body,
+                json=None if raw_body else body,
+                data=body if raw_body else None,
+                headers={**_OCTET_STREAM, **(headers or {})} if raw_body else headers,
                 timeout=self._REQUEST_TIMEOUT,
+                stream=response_type == Response_Type.STREAM,
             )
-            self._LOGGER.INFO(f"{http_method} =>\n\tURL:{response.url}\n\tBody:{body}")
+            if span is not None:
+                span.after_receive(
+                    response.status_code, int(response.headers.get("Content-Length") or 0)
+                )
+            self._LOGGER.INFO(f"{http_method} =>\n\tURL:{response.url}\n\tBody:{logged_body}")
+            if span is not None:
+                span.mark("log")
 
         except (Timeout, HTTPError) as e:
+            if timer is not None:
+                metrics.end(timer, 408, timeout=True)  # type: ignore[union-attr]
+            if span is not None:
+                span.fail(e)
             self._LOGGER.ERROR(f"[ERROR] => 408: Request Timeout | {e}")
             self._LOGGER.INFO(f"Error Request {http_method} => {e.request}")
+            if model is not None:
+                return model_Result(408)
             if response_type == Response_Type.LIST_JSON:
                 return list_Result(408)
             elif response_type == Response_Type.JSON:
                 return dict_Result(408)
-            elif response_type == Response_Type.STR:
+            elif response_type == Response_Type.STR or response_type == Response_Type.TEXT:
                 return str_Result(408)
-            elif response_type == Response_Type.EMPTY:
-                return empty_Result(408)
+            elif response_type == Response_Type.BYTES:
+                return bytes_Result(408)
+            elif response_type == Response_Type.STREAM:
+                return stream_Result(408)
+            return empty_Result(408)
+        except Exception:
+            # Connection errors still propagate, they are only counted here
+            if timer is not None:
+                metrics.end(timer, 0)  # type: ignore[union-attr]
+            raise
 
         status_code: int = response.status_code
-        if (
-            response_type == Response_Type.LIST_JSON
-            or response_type == Response_Type.JSON
-            or response_type == Response_Type.STR
-        ):
+        if timer is not None:
+            metrics.end(  # type: ignore[union-attr]
+                timer,
+                status_code,
+                # Streamed bodies are not read yet => Size from the header
+                bytes_in=(
+                    int(response.headers.get("Content-Length") or 0)
+                    if response_type == Response_Type.STREAM
+                    else len(response.content)
+                ),
+                bytes_out=len(response.request.body or b""),
+            )
+        result: combined_Result
+        # None => Pretty printed JSON of the result
+        message: typing.Optional[str]
+        if response_type == Response_Type.STREAM:
+            # Body is left on the socket until the caller iterates it
+            result = stream_Result(status_code, response)
+            message = "Streaming"
+        elif response_type == Response_Type.BYTES:
+            result = bytes_Result(status_code, response.content)
+            message = f"{len(response.content)} bytes"
+        elif response_type == Response_Type.TEXT:
+            text = response.content.decode(response.encoding or "utf-8", errors="replace")
+            result = str_Result(status_code, text)
+            message = f"{len(text)} characters"
+        elif response_type == Response_Type.STR:
+            value = decode_scalar(response.content)
+            result = str_Result(status_code, value)
+            message = value
+        elif response_type == Response_Type.EMPTY:
+            result = empty_Result(status_code)
+            message = ""
+        else:
             try:
-                data_out = response.json()
-            except JSONDecodeError as e:
+                # Setters answer 200 with an empty body
+                data_out = self._DECODE(response.content) if response.content else {}
+            except ValueError as e:
                 self._LOGGER.ERROR(f"[ERROR] => {status_code}: Decode Error | {e}")
-                self._LOGGER.INFO(f"Error Request {http_method} => {e.request}")
+                self._LOGGER.INFO(f"Error Request {http_method} => {endpoint}")
                 data_out = {}
 
-            if isinstance(data_out, list):
-                self._LOGGER.INFO(f"[OK] => {status_code} : {json.dumps(data_out, indent =2)}")
-                return list_Result(status_code, data_out)
+            if model is not None:
+                # Error bodies are not the modelled result => No model for non-2xx answers
+                decoded = (
+                    decode_model(data_out, model) if data_out and 200 <= status_code < 300 else None
+                )
+                result = model_Result(status_code, decoded)
+                message = model.__name__
+            elif isinstance(data_out, list):
+                result = list_Result(status_code, data_out)
+                message = None
             elif isinstance(data_out, dict):
-                self._LOGGER.INFO(f"[OK] => {status_code} : {json.dumps(data_out, indent =2)}")
-                return dict_Result(status_code, data_out)
-            elif isinstance(data_out, str):
-                self._LOGGER.INFO(f"[OK] => {status_code} : {data_out}")
-                return str_Result(status_code, data_out)
-            elif isinstance(data_out, bool):
-                self._LOGGER.INFO(f"[OK] => {status_code} : {data_out}")
-                return str_Result(status_code, str(data_out))
+                result = dict_Result(status_code, data_out)
+                message = None
+            elif data_out is not None:
+                # JSON scalar where an object was expected => Same text as Response_Type.STR
+                value = scalar_text(data_out)
+                result = str_Result(status_code, value)
+                message = value
+            else:
+                raise Exception(f"{status_code}: {response.reason}")
+        if span is not None:
+            span.after_decode()
 
-        else:
-            self._LOGGER.INFO(f"[OK] => {status_code}")
-            return empty_Result(status_code)
-        raise Exception(f"{status_code}: {response.reason}")
+        # Pretty printed JSON can cost more than the decode => Timed in the "log" phase as well
+        if message is None:
+            message = json.dumps(result.data, indent=2)
+        self._LOGGER.INFO(
+            f"[OK] => {status_code} : {message}" if message else f"[OK] => {status_code}"
+        )
+        if span is not None:
+            span.mark("log")
+        return result
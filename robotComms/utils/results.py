@@ -1,7 +1,6 @@
 import typing
 from enum import Enum
 
-
 ##############################################################################################################
 # Result Formats for Public Use. These are just alias for longer names
 ##############################################################################################################
@@ -15,6 +14,8 @@ CombinedType = ListDictType | DictType | StrType
 # Result Classes for internal Use
 ##############################################################################################################
 class list_Result:
+    __slots__ = ("status_code", "data")
+
     def __init__(
         self,
         status_code: int,
@@ -40,6 +41,8 @@ class list_Result:
 
 
 class dict_Result:
+    __slots__ = ("status_code", "data")
+
     def __init__(
         self,
         status_code: int,
@@ -65,6 +68,8 @@ class dict_Result:
 
 
 class str_Result:
+    __slots__ = ("status_code", "data")
+
     def __init__(
         self,
         status_code: int,
@@ -90,6 +95,8 @@ class str_Result:
 
 
 class empty_Result:
+    __slots__ = ("status_code",)
+
     def __init__(self, status_code: int) -> None:
         """
         Holds the Status Code for an empty response from HTTP Request
@@ -105,14 +112,114 @@ class empty_Result:
         self.status_code: int = int(status_code)
 
 
-combined_Result = list_Result | dict_Result | str_Result | empty_Result
+class model_Result:
+    __slots__ = ("status_code", "data")
+
+    def __init__(self, status_code: int, data: typing.Any = None) -> None:
+        """
+        Holds the typed models decoded from HTTP Request
+
+        Args:
+            status_code: Status Code from the HTTP Request
+            data: Contains the Results from the REST Request.
+            - Returns a Model or a List of Models for 200 Status Code
+            - Returns None in case of 204/4xx/500 status code or an unexpected payload.
+        """
+        self.status_code: int = int(status_code)
+        self.data: typing.Any = data
+
+
+class bytes_Result:
+    __slots__ = ("status_code", "data")
+
+    def __init__(self, status_code: int, data: typing.Optional[bytes] = None) -> None:
+        """
+        Holds the raw body from HTTP Request. Used for binary payloads such as stcm maps.
+
+        Args:
+            status_code: Status Code from the HTTP Request
+            data: Contains the Results from the REST Request.
+            - Returns the body bytes as received for 200 Status Code
+            - Returns empty bytes in case of 204/4xx/500 status code.
+        """
+        self.status_code: int = int(status_code)
+        self.data: bytes = data if data else b""
+
+
+class stream_Result:
+    __slots__ = ("status_code", "data")
+
+    def __init__(self, status_code: int, data: typing.Any = None) -> None:
+        """
+        Holds an unread body from HTTP Request. The connection stays busy until the body is consumed
+        or the result is closed.
+
+        Args:
+            status_code: Status Code from the HTTP Request
+            data: `requests.Response` opened with stream=True. None in case of a timeout.
+        """
+        self.status_code: int = int(status_code)
+        self.data: typing.Any = data
+
+    def iter_chunks(self, chunk_size: int = 65536) -> typing.Iterator[bytes]:
+        """
+        Args:
+            chunk_size: Max bytes per chunk. Default: 64KiB
+
+        Returns:
+            Iterator over the body chunks. Closes the connection at the end.
+        """
+        if self.data is None:
+            return
+        try:
+            for chunk in self.data.iter_content(chunk_size=chunk_size):
+                if chunk:
+                    yield chunk
+        finally:
+            self.close()
+
+    def save(self, file_path: str, chunk_size: int = 65536) -> int:
+        """
+        Write the body to a file chunk by chunk
+
+        Args:
+            file_path: Target File
+            chunk_size: Max bytes per chunk. Default: 64KiB
+
+        Returns:
+            Number of bytes written
+        """
+        written = 0
+        with open(file_path, "wb") as file:
+            for chunk in self.iter_chunks(chunk_size):
+                file.write(chunk)
+                written += len(chunk)
+        return written
+
+    def close(self) -> None:
+        if self.data is not None:
+            self.data.close()
+
+
+combined_Result = (
+    list_Result
+    | dict_Result
+    | str_Result
+    | empty_Result
+    | model_Result
+    | bytes_Result
+    | stream_Result
+)
 
 
 ##############################################################################################################
 # Response Media Type
 ##############################################################################################################
 class Response_Type(Enum):
-    LIST_JSON = 1
-    JSON = 1
-    STR = 2
-    EMPTY = 3
+    JSON = 1  # JSON Object
+    LIST_JSON = 2  # JSON Array
+    STR = 3  # Scalar: number, boolean or string
+    TEXT = 4  # Plain Text
+    BYTES = 5  # Raw Binary Body
+    STREAM = 6  # Binary Body read in chunks
+    EMPTY = 7  # Status Code only
@@ -0,0 +1,201 @@
+"""
+Module with the array form of the robot sensor readings.
+
+`sensors.read_sensors()` returns one `sensorReadout` per batch. Every array is indexed by sensor id,
+so a safety check over all sensors is one vectorized expression instead of a loop over dictionaries:
+    -> readout.triggered[bumper_ids].any()
+    -> readout.values[sonar_ids].min()
+
+`sensorReadout.changes_from()` compares two readouts and keeps the edges only, which is what
+`sensors.watch()` yields.
+
+Sensor Types:
+    - "bumper" => Value 1.0 when pressed
+    - "cliff" => Value 1.0 when no floor is seen
+    - "sonar" => Distance to the nearest obstacle in meters
+    - "depth" => Distance to the nearest obstacle in the camera field of view in meters
+"""
+
+# Custom Packages
+from .results import DictType, ListDictType
+
+# Imported Packages
+import numpy as np
+import typing
+
+SENSOR_TYPES: typing.List[str] = ["bumper", "cliff", "sonar", "depth"]
+
+
+class sensorReadout:
+    __slots__ = ("taken_at", "types", "values", "triggered", "valid", "timestamps")
+
+    def __init__(
+        self, size: int, taken_at: float, types: typing.Optional[np.ndarray] = None
+    ) -> None:
+        """
+        Sensor Values of one batch, indexed by sensor id
+
+        Args:
+            size: Highest sensor id + 1
+            taken_at: Host time when the batch started in seconds since the epoch
+            types: Sensor type per id. Empty string for unknown ids.
+        """
+        self.taken_at: float = taken_at
+        self.types: np.ndarray = types if types is not None else np.full(size, "", dtype="<U8")
+        self.values: np.ndarray = np.full(size, np.nan, dtype=np.float64)
+        self.triggered: np.ndarray = np.zeros(size, dtype=bool)
+        self.valid: np.ndarray = np.zeros(size, dtype=bool)
+        self.timestamps: np.ndarray = np.zeros(size, dtype=np.int64)
+
+    @classmethod
+    def from_list(
+        cls,
+        readings: ListDictType,
+        taken_at: float,
+        types: typing.Optional[np.ndarray] = None,
+    ) -> "sensorReadout":
+        """
+        Build a readout from sensor values in the API format
+
+        Args:
+            readings: [{"id": 0, "value": 0.0, "is_triggered": false, "timestamp": 123}, ...].
+                Readings without an id (failed requests) are skipped.
+            taken_at: Host time when the batch started
+            types: Sensor type per id
+
+        Returns:
+            Readout sized to the highest id of `readings` or of `types`
+        """
+        # Failed requests answer {} or an error body without "id"
+        readings = [reading for reading in readings if "id" in reading]
+        ids = [int(reading["id"]) for reading in readings]
+        size = max(max(ids, default=-1) + 1, len(types) if types is not None else 0)
+        readout = cls(size, taken_at, types)
+        for reading in readings:
+            readout.set(reading)
+        return readout
+
+    def set(self, reading: DictType) -> None:
+        """
+        Store one sensor value
+
+        Args:
+            reading: {"id": 0, "value": 0.0, "is_triggered": false, "timestamp": 123}
+        """
+        sensor_id = int(reading["id"])
+        self.values[sensor_id] = float(reading.get("value", np.nan))
+        self.triggered[sensor_id] = bool(reading.get("is_triggered", False))
+        self.timestamps[sensor_id] = int(reading.get("timestamp", 0))
+        self.valid[sensor_id] = True
+
+    def ids(self, sensor_type: typing.Optional[str] = None) -> np.ndarray:
+        """
+        Returns:
+            Ids with a value, optionally of one sensor type
+        """
+        mask = self.valid if sensor_type is None else self.valid & (self.types == sensor_type)
+        return np.flatnonzero(mask)
+
+    def any_triggered(self, sensor_type: typing.Optional[str] = None) -> bool:
+        return bool(self.triggered[self.ids(sensor_type)].any())
+
+    def changes_from(
+        self, previous: typing.Optional["sensorReadout"], deadband: float = 0.0
+    ) -> "sensorChanges":
+        """
+        Edges between a previous readout and this one
+
+        Args:
+            previous: Earlier Readout. None => Every valid sensor is reported as changed.
+            deadband: Value changes up to this amount are ignored. Example: 0.05 => 5 cm for sonars
+
+        Returns:
+            Changes
+        """
+        if previous is None:
+            return sensorChanges(
+                self,
+                triggered=np.flatnonzero(self.valid & self.triggered),
+                released=np.array([], dtype=np.intp),
+                changed=self.ids(),
+                lost=np.array([], dtype=np.intp),
+            )
+        size = len(self.values)
+        before_valid = _resized(previous.valid, size, False)
+        before_triggered = _resized(previous.triggered, size, False)
+        before_values = _resized(previous.values, size, np.nan)
+        both = self.valid & before_valid
+        with np.errstate(invalid="ignore"):
+            moved = np.abs(self.values - before_values) > deadband
+        return sensorChanges(
+            self,
+            triggered=np.flatnonzero(both & self.triggered & ~before_triggered),
+            released=np.flatnonzero(both & ~self.triggered & before_triggered),
+            changed=np.flatnonzero((both & moved) | (self.valid & ~before_valid)),
+            lost=np.flatnonzero(before_valid & ~self.valid),
+        )
+
+    def to_dict(self) -> DictType:
+        return {
+            int(sensor_id): {
+                "type": str(self.types[sensor_id]),
+                "value": float(self.values[sensor_id]),
+                "is_triggered": bool(self.triggered[sensor_id]),
+                "timestamp": int(self.timestamps[sensor_id]),
+            }
+            for sensor_id in self.ids()
+        }
+
+    def __len__(self) -> int:
+        return int(self.valid.sum())
+
+    def __repr__(self) -> str:
+        return f"sensorReadout(sensors={len(self)}, triggered={self.ids()[self.triggered[self.ids()]].tolist()})"
+
+
+class sensorChanges:
+    __slots__ = ("readout", "triggered", "released", "changed", "lost")
+
+    def __init__(
+        self,
+        readout: sensorReadout,
+        triggered: np.ndarray,
+        released: np.ndarray,
+        changed: np.ndarray,
+        lost: np.ndarray,
+    ) -> None:
+        """
+        Edges between two readouts. Created by `sensorReadout.changes_from()`.
+
+        Args:
+            readout: Current Readout
+            triggered: Ids which became triggered
+            released: Ids which stopped being triggered
+            changed: Ids whose value moved past the deadband or which came back
+            lost: Ids whose value could not be read this time
+        """
+        self.readout: sensorReadout = readout
+        self.triggered: np.ndarray = triggered
+        self.released: np.ndarray = released
+        self.changed: np.ndarray = changed
+        self.lost: np.ndarray = lost
+
+    def __bool__(self) -> bool:
+        return bool(
+            len(self.triggered) or len(self.released) or len(self.changed) or len(self.lost)
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"sensorChanges(triggered={self.triggered.tolist()}, released={self.released.tolist()}, "
+            f"changed={len(self.changed)}, lost={self.lost.tolist()})"
+        )
+
+
+def _resized(array: np.ndarray, size: int, fill: typing.Any) -> np.ndarray:
+    if len(array) == size:
+        return array
+    resized = np.full(size, fill, dtype=array.dtype)
+    count = min(size, len(array))
+    resized[:count] = array[:count]
+    return resized
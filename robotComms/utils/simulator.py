@@ -0,0 +1,1768 @@
+"""
+Module with a local stand-in for the Athena REST server.
+
+The simulator serves the endpoints of the `system`, `slam`, `motion`, `artifact`, `statistics`,
+`platform`, `sensors`, `multi_floor`, `delivery`, `firmware` and `application` API classes from a
+local HTTP server, so the library can be tested and benchmarked on any machine without a robot or
+a network.
+
+Simulated Robot:
+    -> Moves towards the target of `MoveToAction`, `MultiFloorMoveAction` (POI name) and `GoHomeAction`
+    -> Runs the action lifecycle: status 1 while working, 4 once ended (result 0 / -1 / -2)
+    -> Casts laser scans in a rectangular room around the current pose
+    -> Reads bumpers, sonars and a depth camera against the same room. Cliffs only trigger when forced.
+    -> Keeps artifacts, parameters, events and statistics in memory
+    -> Runs delivery tasks one after the other, `DELIVERY_TASK_S` simulated seconds each
+    -> Takes chunked firmware uploads and installs them in `FIRMWARE_INSTALL_S` simulated seconds
+    -> Installs apps under a package name derived from the APK content, each with its own configuration
+
+Network Conditions:
+    -> Latency with uniform jitter on every request
+    -> Bandwidth cap on the response bodies
+    -> Random failures and timeouts, or failures injected on a path prefix
+
+Run:
+    python -m robotComms.utils.simulator --port 1448 --latency 0.02
+"""
+
+# Custom Packages
+from .logger import systemLogger
+from .results import DictType, ListDictType
+
+# Imported Packages
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+import argparse
+import base64
+import collections
+import copy
+import hashlib
+import json
+import math
+import random
+import re
+import sys
+import threading
+import time
+import typing
+
+import numpy as np
+
+if typing.TYPE_CHECKING:
+    from robotComms.api_classes import (
+        system,
+        artifact,
+        slam,
+        motion,
+        statistics,
+        platform,
+        sensors,
+        multi_floor,
+        delivery,
+        firmware,
+        application,
+    )
+    from .metrics import requestMetrics
+    from .rest_adapter import restAdapter
+    from .snapshot import snapshotReader
+
+RouteHandler = typing.Callable[[typing.Dict[str, str], DictType, typing.Any], typing.Any]
+
+ACTION_FACTORIES: typing.List[str] = [
+    "slamtec.agent.actions.MoveToAction",
+    "slamtec.agent.actions.MultiFloorMoveAction",
+    "slamtec.agent.actions.GoHomeAction",
+    "slamtec.agent.actions.RotateToAction",
+    "slamtec.agent.actions.MoveByAction",
+]
+RECT_USAGES: typing.List[str] = [
+    "forbidden_area",
+    "elevator_area",
+    "dangerous_area",
+    "coverage_area",
+    "maintenance_area",
+    "sensor_disable_area",
+    "restricted_area",
+]
+LINE_USAGES: typing.List[str] = ["tracks", "walls"]
+DELIVERY_TASK_TYPES: typing.List[str] = [
+    "TAKEOUT",
+    "GUIDE",
+    "FOOD_DELIVERY",
+    "RECYCLE",
+    "RETURN",
+    "DISINFECT",
+]
+# Simulated seconds the robot spends on one delivery task
+DELIVERY_TASK_S: float = 5.0
+# Simulated seconds from `firmware.start_upgrade()` to the upgraded robot
+FIRMWARE_INSTALL_S: float = 10.0
+
+# Sensor Type, Name, Mounting Yaw
+SIMULATED_SENSORS: typing.List[typing.Tuple[str, str, float]] = [
+    ("bumper", "front_left", 0.5),
+    ("bumper", "front_right", -0.5),
+    ("bumper", "rear_left", math.pi - 0.5),
+    ("bumper", "rear_right", 0.5 - math.pi),
+    ("cliff", "front_left", 0.4),
+    ("cliff", "front_right", -0.4),
+    *[("sonar", f"sonar_{index}", index * math.pi / 4) for index in range(8)],
+    ("depth", "front_camera", 0.0),
+]
+# Wall distances of the room center. Bumpers touch below, sonars report an obstacle below.
+BUMPER_RANGE_M: float = 0.3
+SONAR_STOP_M: float = 0.5
+
+# Action Results once an action ended
+ACTION_SUCCEEDED: int = 0
+ACTION_FAILED: int = -1
+ACTION_CANCELED: int = -2
+
+
+class simulatorError(Exception):
+    def __init__(self, status_code: int, message: str) -> None:
+        """
+        Error answered to the client instead of a result
+
+        Args:
+            status_code: HTTP Status Code. Example: 404
+            message: Error Message sent in the body
+        """
+        super().__init__(message)
+        self.status_code: int = status_code
+
+
+class _rawBody(bytes):
+    """
+    Binary request body with the request headers, for routes which read them. Example: Content-Range
+    """
+
+    headers: typing.Dict[str, str]
+
+    def __new__(cls, content: bytes, headers: typing.Dict[str, str]) -> "_rawBody":
+        body = super().__new__(cls, content)
+        body.headers = headers
+        return body
+
+
+class simulatedRobot:
+    def __init__(
+        self,
+        room_size: typing.Tuple[float, float] = (20.0, 12.0),
+        laser_points: int = 720,
+        laser_noise_m: float = 0.01,
+        map_size_bytes: int = 256 * 1024,
+        time_scale: float = 1.0,
+        clock_drift_ppm: float = 0.0,
+        seed: typing.Optional[int] = None,
+    ) -> None:
+        """
+        State of the simulated robot. Motion is integrated lazily whenever the state is read.
+
+        Args:
+            room_size: Width and height of the room in meters. The room is centered on the origin.
+            laser_points: Number of laser points per scan. Default: 720
+            laser_noise_m: Standard deviation of the laser distance noise in meters
+            map_size_bytes: Size of the composite map served by `maps/stcm`
+            time_scale: Simulated seconds per real second. Example: 10 => Actions finish 10x faster
+            clock_drift_ppm: Drift of the robot clock against the host clock in parts per million
+            seed: Seed of the noise generators. None => Random
+        """
+        self.__LOCK = threading.RLock()
+        self.__HALF_W: float = room_size[0] / 2.0
+        self.__HALF_H: float = room_size[1] / 2.0
+        self.__LASER_POINTS: int = laser_points
+        self.__LASER_NOISE_M: float = laser_noise_m
+        self.__TIME_SCALE: float = time_scale
+        self.__CLOCK_RATE: float = 1.0 + clock_drift_ppm * 1e-6
+        self.__RNG = np.random.default_rng(seed)
+        self.__MAP: bytes = b"STCM" + self.__RNG.bytes(max(0, map_size_bytes - 4))
+        self.__UPLOADED_MAP: typing.Optional[bytes] = None
+        self.__START: float = time.monotonic()
+        self.__LAST_STEP: float = 0.0
+
+        self.pose: DictType = {"x": 0.0, "y": 0.0, "z": 0.0, "yaw": 0.0, "pitch": 0.0, "roll": 0.0}
+        self.home_pose: DictType = {
+            "x": 0.0,
+            "y": 0.0,
+            "z": 0.0,
+            "yaw": 0.0,
+            "pitch": 0.0,
+            "roll": 0.0,
+        }
+        self.speed: DictType = {"vx": 0.0, "vy": 0.0, "omega": 0.0}
+        self.odometry_m: float = 0.0
+        self.localization_quality: int = 85
+        self.parameters: DictType = {
+            "base.max_moving_speed": 0.7,
+            "base.max_angular_speed": 1.0,
+            "base.emergency_stop": False,
+            "base.brake_release": False,
+            "docking.docked_register_strategy": "always",
+        }
+        self.power: DictType = {
+            "batteryPercentage": 90,
+            "dockingStatus": "not_on_dock",
+            "isCharging": False,
+            "isDCConnected": False,
+            "powerStage": "running",
+            "sleepMode": "awake",
+        }
+        self.health: DictType = {
+            "hasWarning": False,
+            "hasError": False,
+            "hasFatal": False,
+            "baseError": [],
+        }
+        self.network: DictType = {
+            "networkstatus": {
+                "ethip1": "192.168.11.1/24",
+                "ip": "127.0.0.1",
+                "mac": "00:00:00:00:00:00",
+                "mode": "STA",
+                "quality": 100,
+                "ssid": "simulator",
+            }
+        }
+        self.info: DictType = {
+            "manufacturerId": 255,
+            "manufacturerName": "Slamtec",
+            "modelId": 43792,
+            "modelName": "Apollo",
+            "deviceID": "SIMULATOR0000000000000000000000",
+            "hardwareVersion": "511",
+            "softwareVersion": "3.6.1-rtm+20210807",
+        }
+        self.strategies: typing.List[str] = ["default", "elevator", "narrow"]
+        self.strategy: str = "default"
+
+        self.lines: typing.Dict[str, ListDictType] = {usage: [] for usage in LINE_USAGES}
+        self.rects: typing.Dict[str, ListDictType] = {usage: [] for usage in RECT_USAGES}
+        self.pois: ListDictType = []
+        self.landmarks: ListDictType = []
+        self.landmark_update: bool = True
+        self.__NEXT_ID: int = 1
+
+        self.action: typing.Optional[DictType] = None
+        self.__TARGET: typing.Optional[typing.Tuple[float, float, typing.Optional[float]]] = None
+        self.__ACTION_END: float = 0.0
+        self.__NEXT_ACTION_ID: int = 1
+        self.__ACTIONS: typing.Deque[DictType] = collections.deque(maxlen=20)
+        self.events: typing.Deque[DictType] = collections.deque(maxlen=50)
+        self.sensors: ListDictType = [
+            {
+                "id": sensor_id,
+                "type": sensor_type,
+                "name": name,
+                "pose": {"x": 0.0, "y": 0.0, "yaw": yaw},
+            }
+            for sensor_id, (sensor_type, name, yaw) in enumerate(SIMULATED_SENSORS)
+        ]
+        self.__FORCED_SENSORS: typing.Dict[int, bool] = {}
+        self.delivery_settings: DictType = {"timeout": {"food_pickup_timeout": 60}}
+        self.task_execution: bool = True
+        self.__DELIVERY_TASKS: ListDictType = []
+        self.__NEXT_TASK_ID: int = 1
+        self.__UPLOADS: typing.Dict[str, DictType] = {}
+        self.__NEXT_UPLOAD_ID: int = 1
+        self.__UPGRADE: DictType = {"stage": "IDLE", "progress": 0}
+        self.apps: typing.Dict[str, DictType] = {
+            "com.slamtec.delivery": {
+                "package_name": "com.slamtec.delivery",
+                "version_name": "2.1.0",
+                "version_code": 210,
+                "state": "RUNNING",
+                "config": {"volume": 80, "language": "en"},
+            }
+        }
+
+    ##############################################################################################################
+    # Getters
+    ##############################################################################################################
+
+    @property
+    def lock(self) -> threading.RLock:
+        return self.__LOCK
+
+    def now(self) -> float:
+        """
+        Returns:
+            Simulated seconds since the robot started
+        """
+        return (time.monotonic() - self.__START) * self.__TIME_SCALE
+
+    def timestamp_ms(self) -> int:
+        """
+        Returns:
+            Robot uptime in milliseconds, drifting by `clock_drift_ppm`
+        """
+        return int((time.monotonic() - self.__START) * self.__CLOCK_RATE * 1000)
+
+    def composite_map(self) -> bytes:
+        return self.__MAP
+
+    def multi_floor_pois(self, query: DictType) -> ListDictType:
+        """
+        POIs in the format of the multi-floor API. Building, floor, type and group come from the
+        POI metadata, "A" / "1F" / "" when missing.
+
+        Args:
+            query: Filters "floor", "building", "type" and "group"
+
+        Returns:
+            Matching POIs
+        """
+        with self.__LOCK:
+            pois = [
+                {
+                    "id": poi["id"],
+                    "poi_name": str(poi["metadata"].get("display_name", poi["id"])),
+                    "building": str(poi["metadata"].get("building", "A")),
+                    "floor": str(poi["metadata"].get("floor", "1F")),
+                    "type": str(poi["metadata"].get("type", "")),
+                    "group": str(poi["metadata"].get("group", "")),
+                    "pose": dict(poi["pose"]),
+                }
+                for poi in self.pois
+            ]
+        return [
+            poi
+            for poi in pois
+            if all(
+                poi[key] == query[key]
+                for key in ("floor", "building", "type", "group")
+                if key in query
+            )
+        ]
+
+    def laserscan(self) -> DictType:
+        """
+        Cast the laser rays from the current pose to the walls of the room
+
+        Returns:
+            Laser Scan in the API format
+        """
+        with self.__LOCK:
+            self.step()
+            pose = dict(self.pose)
+        angles = np.linspace(-math.pi, math.pi, self.__LASER_POINTS, endpoint=False)
+        distance = self.__cast(pose, angles)
+        distance = distance + self.__RNG.normal(0.0, self.__LASER_NOISE_M, distance.shape)
+        valid = np.isfinite(distance) & (distance > 0.05) & (distance < 25.0)
+        return {
+            "pose": {
+                "x": pose["x"],
+                "y": pose["y"],
+                "z": 0,
+                "yaw": pose["yaw"],
+                "picth": 0,
+                "roll": 0,
+            },
+            "laser_points": [
+                {"distance": float(d), "angle": float(a), "valid": bool(v)}
+                for d, a, v in zip(distance.tolist(), angles.tolist(), valid.tolist())
+            ],
+        }
+
+    def sensor_value(self, sensor_id: int) -> DictType:
+        """
+        Read one sensor. Sonars and the depth camera measure the walls of the room, bumpers press
+        against a wall closer than `BUMPER_RANGE_M`. `trigger_sensor()` overrides the value.
+
+        Args:
+            sensor_id: Index in `sensors`
+
+        Returns:
+            Sensor Value in the API format
+        """
+        if not 0 <= sensor_id < len(self.sensors):
+            raise simulatorError(404, f"Sensor {sensor_id} not found")
+        sensor = self.sensors[sensor_id]
+        with self.__LOCK:
+            self.step()
+            pose = dict(self.pose)
+            forced = self.__FORCED_SENSORS.get(sensor_id)
+        if sensor["type"] == "depth":
+            fov = np.linspace(-0.5, 0.5, 16) + sensor["pose"]["yaw"]
+            value = float(self.__cast(pose, fov).min())
+        elif sensor["type"] in ("sonar", "bumper"):
+            value = float(self.__cast(pose, np.array([sensor["pose"]["yaw"]]))[0])
+        else:
+            value = 0.0
+        if sensor["type"] == "bumper":
+            value = 1.0 if value < BUMPER_RANGE_M else 0.0
+        triggered = value > 0.5 if sensor["type"] in ("bumper", "cliff") else value < SONAR_STOP_M
+        if forced is not None:
+            triggered = forced
+            value = float(forced) if sensor["type"] in ("bumper", "cliff") else value
+        return {
+            "id": sensor_id,
+            "value": round(value, 3),
+            "is_triggered": bool(triggered),
+            "timestamp": self.timestamp_ms(),
+        }
+
+    def imu(self) -> DictType:
+        with self.__LOCK:
+            self.step()
+            yaw = self.pose["yaw"]
+            omega = self.speed["omega"]
+        noise = self.__RNG.normal(0.0, 0.002, 3).tolist()
+        acc = {"x": noise[0], "y": noise[1], "z": 9.81 + noise[2]}
+        gyro = {"x": 0.0, "y": 0.0, "z": omega}
+        compass = {"x": math.cos(yaw), "y": -math.sin(yaw), "z": 0.0}
+        return {
+            "acc": acc,
+            "availibilityBitMap": 7,
+            "compass": compass,
+            "euler_angle": {"x": 0.0, "y": 0.0, "z": yaw},
+            "gyro": gyro,
+            "quaternion": {"w": math.cos(yaw / 2), "x": 0.0, "y": 0.0, "z": math.sin(yaw / 2)},
+            "raw_acc": acc,
+            "raw_compass": compass,
+            "raw_gyro": gyro,
+            "timestamp": self.timestamp_ms(),
+        }
+
+    def raw_imu(self, adc: bool = False) -> DictType:
+        imu = self.imu()
+        scale = 1000.0 if adc else 1.0
+        result = {"timestamp": imu["timestamp"]}
+        for prefix, vector in (
+            ("acc", imu["acc"]),
+            ("gyro", imu["gyro"]),
+            ("comp", imu["compass"]),
+        ):
+            for axis in ("x", "y", "z"):
+                result[f"{prefix}_{axis}"] = vector[axis] * scale
+        return result
+
+    def get_action(self, action_id: typing.Optional[int] = None) -> DictType:
+        with self.__LOCK:
+            self.step()
+            if action_id is None:
+                return dict(self.action) if self.action else {}
+            for action in self.__ACTIONS:
+                if action["action_id"] == action_id:
+                    return dict(action)
+        raise simulatorError(404, f"Action {action_id} not found")
+
+    def remaining_path(self) -> typing.List[typing.List[float]]:
+        with self.__LOCK:
+            self.step()
+            if self.__TARGET is None:
+                return []
+            return self.straight_path(self.__TARGET[0], self.__TARGET[1])
+
+    def remaining_time(self) -> float:
+        with self.__LOCK:
+            self.step()
+            if self.__TARGET is None:
+                return 0.0
+            distance = math.hypot(
+                self.__TARGET[0] - self.pose["x"], self.__TARGET[1] - self.pose["y"]
+            )
+            return distance / max(1e-6, float(self.parameters["base.max_moving_speed"]))
+
+    def straight_path(
+        self, x: float, y: float, step_m: float = 0.1
+    ) -> typing.List[typing.List[float]]:
+        start_x, start_y = self.pose["x"], self.pose["y"]
+        count = max(1, int(math.hypot(x - start_x, y - start_y) / step_m))
+        return [
+            [start_x + (x - start_x) * i / count, start_y + (y - start_y) * i / count]
+            for i in range(1, count + 1)
+        ]
+
+    ##############################################################################################################
+    # Setters
+    ##############################################################################################################
+
+    def new_id(self) -> int:
+        with self.__LOCK:
+            element_id = self.__NEXT_ID
+            self.__NEXT_ID += 1
+            return element_id
+
+    def add_event(self, event_type: str, **fields: typing.Any) -> DictType:
+        """
+        Append an event to the list served by `platform/events`
+
+        Args:
+            event_type: Example: "DEVICE_ERROR"
+            fields: Extra fields of the event
+
+        Returns:
+            Event
+        """
+        event = {"type": event_type, "timestamp": str(self.timestamp_ms()), **fields}
+        with self.__LOCK:
+            self.events.append(event)
+        return event
+
+    def inject_device_error(self, message: str, error_code: int = 33621760, level: int = 2) -> None:
+        """
+        Raise an error on the robot health and publish a DEVICE_ERROR event
+
+        Args:
+            message: Example: "motor barke released"
+            error_code: Base Error Code
+            level: Error Level. 3 and above => Fatal
+        """
+        with self.__LOCK:
+            errors = self.health["baseError"]
+            errors.append(
+                {
+                    "id": len(errors),
+                    "component": 1,
+                    "errorCode": error_code,
+                    "level": level,
+                    "message": message,
+                }
+            )
+            self.health["hasError"] = True
+            self.health["hasFatal"] = self.health["hasFatal"] or level >= 3
+        self.add_event("DEVICE_ERROR", message=message)
+
+    def clear_errors(self) -> None:
+        with self.__LOCK:
+            self.health.update(
+                {"hasWarning": False, "hasError": False, "hasFatal": False, "baseError": []}
+            )
+
+    def trigger_sensor(self, sensor_id: int, triggered: typing.Optional[bool] = True) -> None:
+        """
+        Force the trigger state of a sensor
+
+        Args:
+            sensor_id: Index in `sensors`
+            triggered: Forced State. None => Back to the simulated state
+        """
+        with self.__LOCK:
+            if triggered is None:
+                self.__FORCED_SENSORS.pop(sensor_id, None)
+            else:
+                self.__FORCED_SENSORS[sensor_id] = triggered
+
+    def delivery_tasks(self) -> ListDictType:
+        """
+        Run the delivery queue up to now. While task execution is enabled the first task runs for
+        `DELIVERY_TASK_S` simulated seconds, then leaves the queue.
+
+        Returns:
+            Queued Tasks, the running one first
+        """
+        with self.__LOCK:
+            now = self.now()
+            tasks = self.__DELIVERY_TASKS
+            while tasks and self.task_execution:
+                task = tasks[0]
+                if task["state"] == "PENDING":
+                    task["state"] = "RUNNING"
+                    task["started_at"] = now
+                if now - task["started_at"] < DELIVERY_TASK_S:
+                    break
+                tasks.pop(0)
+                self.add_event("DELIVERY_TASK_FINISHED", task_id=task["id"])
+                if tasks:
+                    # Next task starts when the previous one ended
+                    tasks[0]["state"] = "RUNNING"
+                    tasks[0]["started_at"] = task["started_at"] + DELIVERY_TASK_S
+            return [
+                {key: value for key, value in task.items() if key != "started_at"} for task in tasks
+            ]
+
+    def create_delivery_task(self, body: DictType) -> DictType:
+        if body.get("task_type") not in DELIVERY_TASK_TYPES:
+            raise simulatorError(400, f"Invalid Task Type: {body.get('task_type')}")
+        with self.__LOCK:
+            self.delivery_tasks()
+            task = {
+                **body,
+                "id": str(self.__NEXT_TASK_ID),
+                "state": "PENDING",
+                "started_at": 0.0,
+            }
+            self.__NEXT_TASK_ID += 1
+            self.__DELIVERY_TASKS.append(task)
+            return {key: value for key, value in task.items() if key != "started_at"}
+
+    def cancel_delivery_task(self, task_id: str) -> None:
+        with self.__LOCK:
+            self.delivery_tasks()
+            for index, task in enumerate(self.__DELIVERY_TASKS):
+                if task["id"] == task_id:
+                    del self.__DELIVERY_TASKS[index]
+                    return
+        raise simulatorError(404, f"Task {task_id} not found")
+
+    def delivery_stage(self) -> DictType:
+        with self.__LOCK:
+            tasks = self.delivery_tasks()
+        return {"stage": "ON_DELIVERING" if tasks and self.task_execution else "IDLE"}
+
+    def create_firmware_upload(self, body: DictType) -> DictType:
+        with self.__LOCK:
+            upload_id = str(self.__NEXT_UPLOAD_ID)
+            self.__NEXT_UPLOAD_ID += 1
+            self.__UPLOADS[upload_id] = {
+                "upload_id": upload_id,
+                "file_name": str(body["file_name"]),
+                "size": int(body["size"]),
+                "sha256": str(body["sha256"]),
+                "offset": 0,
+                "digest": hashlib.sha256(),
+            }
+            return self.firmware_upload(upload_id)
+
+    def firmware_upload(self, upload_id: str) -> DictType:
+        with self.__LOCK:
+            upload = self.__UPLOADS.get(upload_id)
+            if upload is None:
+                raise simulatorError(404, f"Upload {upload_id} not found")
+            return {key: value for key, value in upload.items() if key != "digest"}
+
+    def write_firmware_chunk(self, upload_id: str, chunk: _rawBody) -> DictType:
+        """
+        Append a chunk to an upload. Only the running SHA-256 of the image is kept.
+
+        Args:
+            upload_id: Upload Session
+            chunk: Body with the "Content-Range" and "Digest" headers
+
+        Returns:
+            {"offset": Bytes stored}
+        """
+        match = re.fullmatch(r"bytes (\d+)-(\d+)/(\d+)", chunk.headers.get("Content-Range", ""))
+        if match is None:
+            raise simulatorError(400, "Missing Content-Range")
+        digest = base64.b64encode(hashlib.sha256(chunk).digest()).decode("ascii")
+        if chunk.headers.get("Digest") != f"sha-256={digest}":
+            raise simulatorError(400, "Chunk Digest Mismatch")
+        with self.__LOCK:
+            upload = self.__UPLOADS.get(upload_id)
+            if upload is None:
+                raise simulatorError(404, f"Upload {upload_id} not found")
+            start = int(match.group(1))
+            if start != upload["offset"] or upload["offset"] + len(chunk) > upload["size"]:
+                raise simulatorError(416, f"Expected offset {upload['offset']}")
+            upload["digest"].update(chunk)
+            upload["offset"] += len(chunk)
+            return {"offset": upload["offset"]}
+
+    def cancel_firmware_upload(self, upload_id: str) -> None:
+        with self.__LOCK:
+            if self.__UPLOADS.pop(upload_id, None) is None:
+                raise simulatorError(404, f"Upload {upload_id} not found")
+
+    def start_firmware_upgrade(self, upload_id: str) -> None:
+        with self.__LOCK:
+            upload = self.__UPLOADS.get(upload_id)
+            if upload is None:
+                raise simulatorError(404, f"Upload {upload_id} not found")
+            if upload["offset"] != upload["size"]:
+                raise simulatorError(409, f"Upload {upload_id} incomplete")
+            if upload["digest"].hexdigest() != upload["sha256"]:
+                raise simulatorError(422, "Image SHA-256 Mismatch")
+            name = upload["file_name"].rsplit(".", 1)[0]
+            self.__UPGRADE = {
+                "stage": "INSTALLING",
+                "progress": 0,
+                "started_at": self.now(),
+                "version": name.split("-", 1)[-1],
+            }
+
+    def firmware_status(self) -> DictType:
+        with self.__LOCK:
+            upgrade = self.__UPGRADE
+            if upgrade["stage"] == "INSTALLING":
+                progress = (self.now() - upgrade["started_at"]) / FIRMWARE_INSTALL_S
+                upgrade["progress"] = min(100, int(progress * 100))
+                if progress >= 1.0:
+                    upgrade["stage"] = "DONE"
+                    self.info["softwareVersion"] = upgrade["version"]
+            return {
+                "version": self.info["softwareVersion"],
+                "stage": upgrade["stage"],
+                "progress": upgrade["progress"],
+            }
+
+    def installed_apps(self) -> ListDictType:
+        with self.__LOCK:
+            return [
+                {key: value for key, value in app.items() if key != "config"}
+                for app in self.apps.values()
+            ]
+
+    def install_app(self, apk: bytes) -> None:
+        # No APK parsing => The package name comes from the content hash
+        package_name = f"com.simulator.app{hashlib.sha256(apk).hexdigest()[:8]}"
+        with self.__LOCK:
+            self.apps[package_name] = {
+                "package_name": package_name,
+                "version_name": "1.0.0",
+                "version_code": 100,
+                "state": "STOPPED",
+                "config": {},
+            }
+
+    def app(self, package_name: str) -> DictType:
+        with self.__LOCK:
+            app = self.apps.get(package_name)
+            if app is None:
+                raise simulatorError(404, f"App {package_name} not installed")
+            return app
+
+    def uninstall_app(self, package_name: str) -> None:
+        with self.__LOCK:
+            self.app(package_name)
+            del self.apps[package_name]
+
+    def upload_map(self, stcm: bytes) -> None:
+        # Saved only, served by `composite_map()` after `reload_map()`
+        with self.__LOCK:
+            self.__UPLOADED_MAP = stcm
+
+    def reload_map(self) -> None:
+        with self.__LOCK:
+            if self.__UPLOADED_MAP is not None:
+                self.__MAP = self.__UPLOADED_MAP
+                self.__UPLOADED_MAP = None
+
+    def set_pose_to_poi(self, name: str) -> None:
+        """
+        Move the robot onto a POI, as the multi-floor relocalization does
+
+        Args:
+            name: Display name or id of the POI
+        """
+        with self.__LOCK:
+            poi = self.__find_poi(name)
+            if poi is None:
+                raise simulatorError(404, f"POI {name} not found")
+            self.set_pose(poi["pose"])
+
+    def set_pose(self, pose: DictType) -> None:
+        with self.__LOCK:
+            self.step()
+            for key in ("x", "y", "z", "yaw", "pitch", "roll"):
+                if key in pose:
+                    self.pose[key] = float(pose[key])
+
+    def start_action(self, body: DictType) -> DictType:
+        """
+        Replace the current action with a new one
+
+        Args:
+            body: Request body of `motion.create_new_motion()`
+
+        Returns:
+            New Action
+        """
+        name = str(body.get("action_name", ""))
+        if name not in ACTION_FACTORIES:
+            raise simulatorError(400, f"Unknown Action: {name}")
+        options = body.get("options") or {}
+        target = options.get("target") or {}
+        move_options = options.get("move_options") or {}
+
+        with self.__LOCK:
+            self.step()
+            if self.action is not None and self.action["state"]["status"] != 4:
+                self.__finish(ACTION_CANCELED, "canceled")
+            yaw = move_options.get("yaw")
+            self.__TARGET = None
+            failure = ""
+            stage = "GOING_TO_TARGET"
+            if name.endswith("MoveToAction"):
+                self.__TARGET = (float(target.get("x", 0)), float(target.get("y", 0)), None)
+            elif name.endswith("MultiFloorMoveAction"):
+                poi = self.__find_poi(str(target.get("poi_name", "")))
+                if poi is None:
+                    # The robot accepts the action and fails it once it looks the target up
+                    failure = f"POI not found: {target.get('poi_name')}"
+                else:
+                    pose = poi.get("pose") or {}
+                    self.__TARGET = (
+                        float(pose.get("x", 0)),
+                        float(pose.get("y", 0)),
+                        pose.get("yaw"),
+                    )
+            elif name.endswith("GoHomeAction"):
+                self.__TARGET = (self.home_pose["x"], self.home_pose["y"], self.home_pose["yaw"])
+                stage = "GOING_HOME"
+            elif name.endswith("RotateToAction"):
+                self.__TARGET = (
+                    self.pose["x"],
+                    self.pose["y"],
+                    float(options.get("orientation", {}).get("yaw", 0)),
+                )
+                stage = "ROTATING"
+            else:
+                stage = "MOVING"
+            if self.__TARGET is not None and yaw is not None:
+                self.__TARGET = (self.__TARGET[0], self.__TARGET[1], float(yaw))
+            self.__ACTION_END = self.now() + 1.0
+            self.action = {
+                "action_id": self.__NEXT_ACTION_ID,
+                "action_name": name,
+                "stage": stage,
+                "state": {"status": 1, "result": 0, "reason": ""},
+            }
+            self.__NEXT_ACTION_ID += 1
+            self.__ACTIONS.append(self.action)
+            response = copy.deepcopy(self.action)
+            if failure:
+                self.__finish(ACTION_FAILED, failure)
+            return response
+
+    def cancel_action(self) -> None:
+        with self.__LOCK:
+            self.step()
+            if self.action is not None and self.action["state"]["status"] != 4:
+                self.__finish(ACTION_CANCELED, "canceled")
+
+    def step(self) -> None:
+        """
+        Integrate the motion of the current action up to now
+        """
+        with self.__LOCK:
+            now = self.now()
+            dt = now - self.__LAST_STEP
+            self.__LAST_STEP = now
+            if self.action is None or self.action["state"]["status"] == 4:
+                return
+            if self.__TARGET is None:
+                if now >= self.__ACTION_END:
+                    self.__finish(ACTION_SUCCEEDED, "")
+                return
+            # The setter sends "on" / "off"
+            if self.parameters.get("base.emergency_stop") in (True, "on"):
+                self.speed = {"vx": 0.0, "vy": 0.0, "omega": 0.0}
+                return
+
+            target_x, target_y, target_yaw = self.__TARGET
+            dx, dy = target_x - self.pose["x"], target_y - self.pose["y"]
+            distance = math.hypot(dx, dy)
+            max_speed = float(self.parameters["base.max_moving_speed"])
+            max_omega = float(self.parameters["base.max_angular_speed"])
+            travel = min(distance, max_speed * dt)
+            if distance > 1e-3:
+                heading = math.atan2(dy, dx)
+                self.pose["x"] += travel * dx / distance
+                self.pose["y"] += travel * dy / distance
+                self.pose["yaw"] = heading
+                self.odometry_m += travel
+                self.speed = {"vx": travel / dt if dt > 0 else 0.0, "vy": 0.0, "omega": 0.0}
+                if travel < distance:
+                    return
+            if target_yaw is not None:
+                error = math.atan2(
+                    math.sin(float(target_yaw) - self.pose["yaw"]),
+                    math.cos(float(target_yaw) - self.pose["yaw"]),
+                )
+                turn = math.copysign(min(abs(error), max_omega * dt), error)
+                self.pose["yaw"] += turn
+                self.speed = {"vx": 0.0, "vy": 0.0, "omega": turn / dt if dt > 0 else 0.0}
+                if abs(error) > abs(turn) + 1e-6:
+                    return
+            self.__finish(ACTION_SUCCEEDED, "")
+
+    ##############################################################################################################
+    # Private Methods
+    ##############################################################################################################
+
+    def __cast(self, pose: DictType, angles: np.ndarray) -> np.ndarray:
+        # Distance from the pose to the room walls along every angle of the robot frame
+        heading = angles + pose["yaw"]
+        dx, dy = np.cos(heading), np.sin(heading)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            tx = np.where(
+                dx > 0, (self.__HALF_W - pose["x"]) / dx, (-self.__HALF_W - pose["x"]) / dx
+            )
+            ty = np.where(
+                dy > 0, (self.__HALF_H - pose["y"]) / dy, (-self.__HALF_H - pose["y"]) / dy
+            )
+        return np.fmin(np.abs(tx), np.abs(ty))
+
+    def __finish(self, result: int, reason: str) -> None:
+        assert self.action is not None
+        self.action["stage"] = ""
+        self.action["state"] = {"status": 4, "result": result, "reason": reason}
+        self.__TARGET = None
+        self.speed = {"vx": 0.0, "vy": 0.0, "omega": 0.0}
+        self.add_event(
+            "ACTION_FINISHED", action_id=self.action["action_id"], result=result, reason=reason
+        )
+
+    def __find_poi(self, name: str) -> typing.Optional[DictType]:
+        for poi in self.pois:
+            if (poi.get("metadata") or {}).get("display_name") == name or poi.get("id") == name:
+                return poi
+        return None
+
+
+class _requestHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 => Kept-alive connections, as on the robot
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately => Nagle would hold the body for a delayed ACK
+    disable_nagle_algorithm = True
+    server: "_simulatorServer"
+
+    def do_GET(self) -> None:
+        self.server.simulator._handle(self, "GET")
+
+    def do_PUT(self) -> None:
+        self.server.simulator._handle(self, "PUT")
+
+    def do_POST(self) -> None:
+        self.server.simulator._handle(self, "POST")
+
+    def do_DELETE(self) -> None:
+        self.server.simulator._handle(self, "DELETE")
+
+    def log_message(self, format: str, *args: typing.Any) -> None:
+        self.server.simulator._log_request(format % args)
+
+
+class _simulatorServer(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: typing.Tuple[str, int], simulator: "robotSimulator") -> None:
+        self.simulator: "robotSimulator" = simulator
+        super().__init__(address, _requestHandler)
+
+
+class failureRule:
+    def __init__(self, path_prefix: str, status_code: int, count: int, hang_s: float) -> None:
+        """
+        Failure injected on the requests of a path prefix
+
+        Args:
+            path_prefix: Example: "/api/core/slam/v1/localization"
+            status_code: Status answered instead of the result. 0 => Hang without answering
+            count: Number of requests to fail. -1 => Until cleared
+            hang_s: Time to hold the request before answering
+        """
+        self.path_prefix: str = path_prefix
+        self.status_code: int = status_code
+        self.count: int = count
+        self.hang_s: float = hang_s
+
+
+class simulatorClient:
+    def __init__(
+        self,
+        url: str,
+        logger: systemLogger,
+        rest_adapter: "restAdapter",
+    ) -> None:
+        """
+        API classes of the simulated robot on one shared connection pool. Created by
+        `robotSimulator.connect()`.
+
+        Args:
+            url: Base URL of the simulator. Example: "http://127.0.0.1:40123"
+            logger: Instance of systemLogger
+            rest_adapter: Shared REST Adapter
+        """
+        from robotComms.api_classes import (
+            system,
+            artifact,
+            slam,
+            motion,
+            statistics,
+            platform,
+            sensors,
+            multi_floor,
+            delivery,
+            firmware,
+            application,
+        )
+        from .snapshot import snapshotReader
+
+        self.url: str = url
+        self.rest_adapter: "restAdapter" = rest_adapter
+        self.metrics: typing.Optional["requestMetrics"] = rest_adapter.metrics
+        self.system: "system" = system(url, "v1", logger, rest_adapter)
+        self.artifact: "artifact" = artifact(url, "v1", logger, rest_adapter)
+        self.slam: "slam" = slam(url, "v1", logger, rest_adapter)
+        self.motion: "motion" = motion(url, "v1", logger, rest_adapter)
+        self.statistics: "statistics" = statistics(url, "v1", logger, rest_adapter)
+        self.platform: "platform" = platform(url, "v1", logger, rest_adapter)
+        self.sensors: "sensors" = sensors(url, "v1", logger, rest_adapter)
+        self.multi_floor: "multi_floor" = multi_floor(url, "v1", logger, rest_adapter)
+        self.delivery: "delivery" = delivery(url, "v1", logger, rest_adapter)
+        self.firmware: "firmware" = firmware(url, "v1", logger, rest_adapter)
+        self.application: "application" = application(url, "v1", logger, rest_adapter)
+        self.snapshot: "snapshotReader" = snapshotReader(self, logger=logger)  # type: ignore[arg-type]
+
+    def close(self) -> None:
+        """
+        Stop the snapshot, sensor, parameter and prefetch pools and close the kept-alive connections
+        """
+        self.snapshot.close()
+        self.sensors.close()
+        self.system.close()
+        self.multi_floor.close()
+        self.rest_adapter.close()
+
+
+class robotSimulator:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_s: float = 0.0,
+        jitter_s: float = 0.0,
+        bandwidth_bytes_s: typing.Optional[float] = None,
+        failure_rate: float = 0.0,
+        failure_status: int = 500,
+        timeout_rate: float = 0.0,
+        hang_s: float = 5.0,
+        robot: typing.Optional[simulatedRobot] = None,
+        seed: typing.Optional[int] = None,
+        logger: typing.Optional[systemLogger] = None,
+    ) -> None:
+        """
+        Local HTTP Server answering like the Athena REST API
+
+        Args:
+            host: Address to bind. Default: Loopback only
+            port: Port to bind. Default: 0 => Free port picked by the OS, see `url`
+            latency_s: Delay added to every request in seconds
+            jitter_s: Max random deviation of the delay in seconds (uniform)
+            bandwidth_bytes_s: Cap of the response body throughput in bytes per second. None => Uncapped
+            failure_rate: Share of requests answered with `failure_status`. 0.0 - 1.0
+            failure_status: Status Code of the random failures. Default: 500
+            timeout_rate: Share of requests held for `hang_s` before answering. 0.0 - 1.0
+            hang_s: Hold time of the timeouts. Above the client timeout => Client sees a timeout
+            robot: Simulated Robot. If not provided, a default `simulatedRobot` is created
+            seed: Seed of the network condition generator. None => Random
+            logger: Instance of systemLogger. If not provided, initiates with log name 'simulator_logger'
+        """
+        self.__LOGGER: systemLogger = logger or systemLogger(
+            logger_name="simulator_logger",
+            log_file_path="logs",
+            enable_console_logging=True,
+        )
+        self.__HOST: str = host
+        self.__PORT: int = port
+        self.latency_s: float = latency_s
+        self.jitter_s: float = jitter_s
+        self.bandwidth_bytes_s: typing.Optional[float] = bandwidth_bytes_s
+        self.failure_rate: float = failure_rate
+        self.failure_status: int = failure_status
+        self.timeout_rate: float = timeout_rate
+        self.hang_s: float = hang_s
+        self.robot: simulatedRobot = robot or simulatedRobot(seed=seed)
+        self.__RANDOM = random.Random(seed)
+        self.__LOCK = threading.Lock()
+        self.__RULES: typing.List[failureRule] = []
+        self.__COUNTS: typing.Counter[str] = collections.Counter()
+        self.__SERVER: typing.Optional[_simulatorServer] = None
+        self.__THREAD: typing.Optional[threading.Thread] = None
+        self.__ROUTES: typing.List[typing.Tuple[str, typing.Pattern[str], RouteHandler]] = []
+        self.__register_routes()
+
+    def __enter__(self) -> "robotSimulator":
+        self.start()
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        self.stop()
+
+    ##############################################################################################################
+    # Server
+    ##############################################################################################################
+
+    def start(self) -> str:
+        """
+        Serve in a background thread
+
+        Returns:
+            Base URL of the simulator. Example: "http://127.0.0.1:40123"
+        """
+        if self.__SERVER is None:
+            self.__SERVER = _simulatorServer((self.__HOST, self.__PORT), self)
+            self.__PORT = self.__SERVER.server_address[1]
+            self.__THREAD = threading.Thread(
+                target=self.__SERVER.serve_forever, name="robotSimulator", daemon=True
+            )
+            self.__THREAD.start()
+            self.__LOGGER.INFO(f"Simulator serving at: {self.url}")
+        return self.url
+
+    def stop(self) -> None:
+        """
+        Stop serving and release the port
+        """
+        if self.__SERVER is None:
+            return
+        self.__SERVER.shutdown()
+        self.__SERVER.server_close()
+        if self.__THREAD is not None:
+            self.__THREAD.join()
+        self.__SERVER = None
+        self.__THREAD = None
+        self.__LOGGER.INFO("Simulator stopped")
+
+    def serve_forever(self) -> None:
+        """
+        Serve in the calling thread until interrupted
+        """
+        self.start()
+        try:
+            while self.__THREAD is not None and self.__THREAD.is_alive():
+                self.__THREAD.join(0.5)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.__HOST}:{self.__PORT}"
+
+    def connect(
+        self,
+        logger: typing.Optional[systemLogger] = None,
+        timeout: float = 2.0,
+        pool_maxsize: int = 10,
+        decoder: str = "auto",
+    ) -> simulatorClient:
+        """
+        API classes pointed at the simulator, like the attributes of `robotComms`
+
+        Args:
+            logger: Instance of systemLogger. Default: Logger of the simulator
+            timeout: Request Timeout of the shared REST Adapter
+            pool_maxsize: Max number of kept-alive connections
+            decoder: JSON Decoder of the REST Adapter
+
+        Returns:
+            Client with `system`, `artifact`, `slam`, `motion`, `statistics`, `platform`, `sensors`,
+            `multi_floor`, `delivery`, `firmware`, `application`, `snapshot` and `metrics`
+        """
+        from .rest_adapter import restAdapter
+
+        logger = logger or self.__LOGGER
+        adapter = restAdapter(logger, timeout=timeout, pool_maxsize=pool_maxsize, decoder=decoder)
+        return simulatorClient(self.start(), logger, adapter)
+
+    ##############################################################################################################
+    # Failure Injection
+    ##############################################################################################################
+
+    def inject_failure(
+        self,
+        path_prefix: str = "/",
+        status_code: int = 500,
+        count: int = 1,
+        hang_s: float = 0.0,
+    ) -> None:
+        """
+        Fail the next requests of a path
+
+        Args:
+            path_prefix: Example: "/api/core/motion/v1/actions"
+            status_code: Status answered instead of the result. 0 => Hold for `hang_s` and close
+                the connection without answering
+            count: Number of requests to fail. -1 => Until `clear_failures()`
+            hang_s: Time to hold each failed request before answering
+        """
+        with self.__LOCK:
+            self.__RULES.append(failureRule(path_prefix, status_code, count, hang_s))
+
+    def clear_failures(self) -> None:
+        with self.__LOCK:
+            self.__RULES.clear()
+
+    def request_counts(self) -> typing.Dict[str, int]:
+        """
+        Returns:
+            Number of requests served per "METHOD path"
+        """
+        with self.__LOCK:
+            return dict(self.__COUNTS)
+
+    def reset_counts(self) -> None:
+        with self.__LOCK:
+            self.__COUNTS.clear()
+
+    ##############################################################################################################
+    # Request Handling
+    ##############################################################################################################
+
+    def _log_request(self, message: str) -> None:
+        self.__LOGGER.DEBUG(f"Simulator => {message}")
+
+    def _handle(self, handler: _requestHandler, method: str) -> None:
+        split = urlsplit(handler.path)
+        path = split.path
+        query = {key: values[-1] for key, values in parse_qs(split.query).items()}
+        length = int(handler.headers.get("Content-Length") or 0)
+        raw_body = handler.rfile.read(length) if length else b""
+
+        with self.__LOCK:
+            self.__COUNTS[f"{method} {path}"] += 1
+            rule = self.__match_rule(path)
+            delay = max(0.0, self.latency_s + self.__RANDOM.uniform(-self.jitter_s, self.jitter_s))
+            random_failure = self.__RANDOM.random() < self.failure_rate
+            random_timeout = self.__RANDOM.random() < self.timeout_rate
+        if delay > 0:
+            time.sleep(delay)
+
+        if rule is not None:
+            if rule.hang_s > 0:
+                time.sleep(rule.hang_s)
+            if rule.status_code == 0:
+                handler.close_connection = True
+                return
+            self.__send(handler, rule.status_code, self.__encode({"error": "Injected Failure"}))
+            return
+        if random_timeout:
+            time.sleep(self.hang_s)
+        if random_failure:
+            self.__send(handler, self.failure_status, self.__encode({"error": "Injected Failure"}))
+            return
+
+        try:
+            # Map uploads are binary, every other body is JSON
+            if handler.headers.get("Content-Type") == "application/octet-stream":
+                body = _rawBody(raw_body, dict(handler.headers.items()))
+            else:
+                body = json.loads(raw_body) if raw_body else None
+        except ValueError:
+            self.__send(handler, 400, self.__encode({"error": "Invalid JSON Body"}))
+            return
+
+        for route_method, pattern, route in self.__ROUTES:
+            if route_method != method:
+                continue
+            match = pattern.fullmatch(path)
+            if match is None:
+                continue
+            try:
+                # The state is encoded under the lock, another request may change it right after
+                with self.robot.lock:
+                    status_code, content = 200, self.__encode(route(match.groupdict(), query, body))
+            except simulatorError as e:
+                status_code, content = e.status_code, self.__encode({"error": str(e)})
+            except (KeyError, TypeError, ValueError, AttributeError) as e:
+                status_code, content = 400, self.__encode({"error": f"Bad Request: {e}"})
+            self.__send(handler, status_code, content)
+            return
+        self.__send(handler, 404, self.__encode({"error": f"No Route: {method} {path}"}))
+
+    def __match_rule(self, path: str) -> typing.Optional[failureRule]:
+        for rule in self.__RULES:
+            if path.startswith(rule.path_prefix):
+                if rule.count > 0:
+                    rule.count -= 1
+                    if rule.count == 0:
+                        self.__RULES.remove(rule)
+                return rule
+        return None
+
+    def __encode(self, payload: typing.Any) -> typing.Tuple[bytes, str]:
+        if isinstance(payload, bytes):
+            return payload, "application/octet-stream"
+        if payload is None:
+            return b"", "application/json"
+        return json.dumps(payload).encode("utf-8"), "application/json"
+
+    def __send(
+        self,
+        handler: _requestHandler,
+        status_code: int,
+        content: typing.Tuple[bytes, str],
+    ) -> None:
+        content, content_type = content
+        try:
+            handler.send_response(status_code)
+            handler.send_header("Content-Type", content_type)
+            handler.send_header("Content-Length", str(len(content)))
+            handler.end_headers()
+            self.__write(handler, content)
+        except (BrokenPipeError, ConnectionResetError):
+            # Client gave up (timeout) before the answer
+            handler.close_connection = True
+
+    def __write(self, handler: _requestHandler, content: bytes) -> None:
+        if not self.bandwidth_bytes_s:
+            handler.wfile.write(content)
+            return
+        chunk = 16 * 1024
+        for offset in range(0, len(content), chunk):
+            block = content[offset : offset + chunk]
+            handler.wfile.write(block)
+            time.sleep(len(block) / self.bandwidth_bytes_s)
+
+    ##############################################################################################################
+    # Routes
+    ##############################################################################################################
+
+    def __route(self, method: str, path: str, handler: RouteHandler) -> None:
+        # "{name}" => Path Segment captured into the handler arguments
+        parts = re.split(r"\{(\w+)\}", path)
+        pattern = "".join(
+            f"(?P<{part}>[^/]+)" if index % 2 else re.escape(part)
+            for index, part in enumerate(parts)
+        )
+        self.__ROUTES.append((method, re.compile(pattern), handler))
+
+    def __register_routes(self) -> None:
+        robot = self.robot
+        system = "/api/core/system/v1"
+        slam = "/api/core/slam/v1"
+        motion = "/api/core/motion/v1"
+        artifact = "/api/core/artifact/v1"
+        statistics = "/api/core/statistics/v1"
+        platform = "/api/platform/v1"
+        sensors = "/api/core/sensors/v1"
+        multi_floor_map = "/api/multi-floor/map/v1"
+        multi_floor_localization = "/api/multi-floor/localization/v1"
+        delivery = "/api/delivery/v1"
+        firmware = "/api/core/firmware/v1"
+        application = "/api/core/application/v1"
+
+        # System
+        self.__route("GET", f"{system}/capabilities", lambda p, q, b: self.__capabilities())
+        self.__route("GET", f"{system}/power/status", lambda p, q, b: dict(robot.power))
+        self.__route("GET", f"{system}/robot/info", lambda p, q, b: dict(robot.info))
+        self.__route("GET", f"{system}/robot/health", lambda p, q, b: copy.deepcopy(robot.health))
+        self.__route("GET", f"{system}/laserscan", lambda p, q, b: robot.laserscan())
+        self.__route("GET", f"{system}/parameter", lambda p, q, b: self.__get_parameter(q))
+        self.__route("PUT", f"{system}/parameter", lambda p, q, b: self.__set_parameter(b))
+        self.__route("GET", f"{system}/network/status", lambda p, q, b: dict(robot.network))
+        self.__route("GET", f"{system}/rawadcimu", lambda p, q, b: robot.raw_imu(adc=True))
+        self.__route("GET", f"{system}/rawimu", lambda p, q, b: robot.raw_imu())
+        self.__route(
+            "POST", f"{system}/power/{{mode}}", lambda p, q, b: self.__set_power(p["mode"])
+        )
+        self.__route("PUT", f"{system}/light/control", lambda p, q, b: None)
+
+        # SLAM
+        self.__route("GET", f"{slam}/localization/pose", lambda p, q, b: self.__pose())
+        self.__route("PUT", f"{slam}/localization/pose", lambda p, q, b: robot.set_pose(b or q))
+        self.__route("GET", f"{slam}/localization/odopose", lambda p, q, b: self.__pose())
+        self.__route(
+            "GET", f"{slam}/localization/quality", lambda p, q, b: robot.localization_quality
+        )
+        self.__route("GET", f"{slam}/localization/:enable", lambda p, q, b: True)
+        self.__route("GET", f"{slam}/mapping/:enable", lambda p, q, b: False)
+        self.__route("GET", f"{slam}/loopclosure/:enable", lambda p, q, b: True)
+        self.__route("GET", f"{slam}/homepose", lambda p, q, b: dict(robot.home_pose))
+        self.__route("GET", f"{slam}/homedocks", lambda p, q, b: [dict(robot.home_pose)])
+        self.__route("GET", f"{slam}/imu", lambda p, q, b: robot.imu())
+        self.__route("GET", f"{slam}/knownarea", lambda p, q, b: self.__known_area())
+        self.__route("GET", f"{slam}/maps/stcm", lambda p, q, b: robot.composite_map())
+
+        # Motion
+        self.__route(
+            "GET",
+            f"{motion}/action-factories",
+            lambda p, q, b: [{"action_name": name} for name in ACTION_FACTORIES],
+        )
+        self.__route("GET", f"{motion}/actions/:current", lambda p, q, b: robot.get_action())
+        self.__route(
+            "POST", f"{motion}/actions/:current", lambda p, q, b: robot.start_action(b or {})
+        )
+        self.__route("DELETE", f"{motion}/actions/:current", lambda p, q, b: robot.cancel_action())
+        self.__route(
+            "POST", f"{motion}/actions/:search_path", lambda p, q, b: self.__search_path(b or {})
+        )
+        self.__route(
+            "GET", f"{motion}/actions/{{id}}", lambda p, q, b: robot.get_action(int(p["id"]))
+        )
+        self.__route(
+            "GET", f"{motion}/path", lambda p, q, b: {"path_points": robot.remaining_path()}
+        )
+        self.__route(
+            "GET",
+            f"{motion}/milestones",
+            lambda p, q, b: {"path_points": robot.remaining_path()[-1:]},
+        )
+        self.__route("GET", f"{motion}/speed", lambda p, q, b: self.__speed())
+        self.__route("GET", f"{motion}/time", lambda p, q, b: robot.remaining_time())
+        self.__route("GET", f"{motion}/strategies", lambda p, q, b: list(robot.strategies))
+        self.__route("GET", f"{motion}/strategies/:current", lambda p, q, b: robot.strategy)
+
+        # Artifacts
+        self.__route("GET", f"{artifact}/lines/{{usage}}", lambda p, q, b: self.__lines(p)[:])
+        self.__route("POST", f"{artifact}/lines/{{usage}}", lambda p, q, b: self.__add_lines(p, b))
+        self.__route(
+            "PUT", f"{artifact}/lines/{{usage}}", lambda p, q, b: self.__modify_lines(p, b)
+        )
+        self.__route(
+            "DELETE", f"{artifact}/lines/{{usage}}", lambda p, q, b: self.__lines(p).clear()
+        )
+        self.__route(
+            "DELETE",
+            f"{artifact}/lines/{{usage}}/{{id}}",
+            lambda p, q, b: self.__remove(self.__lines(p), p["id"]),
+        )
+        self.__route(
+            "GET", f"{artifact}/rectangle-areas/{{usage}}", lambda p, q, b: self.__rects(p)[:]
+        )
+        self.__route(
+            "POST", f"{artifact}/rectangle-areas/{{usage}}", lambda p, q, b: self.__add_rect(p, b)
+        )
+        self.__route(
+            "DELETE",
+            f"{artifact}/rectangle-areas/{{usage}}",
+            lambda p, q, b: self.__rects(p).clear(),
+        )
+        self.__route(
+            "DELETE",
+            f"{artifact}/rectangle-areas/{{usage}}/{{id}}",
+            lambda p, q, b: self.__remove(self.__rects(p), p["id"]),
+        )
+        self.__route("GET", f"{artifact}/pois", lambda p, q, b: robot.pois[:])
+        self.__route("POST", f"{artifact}/pois", lambda p, q, b: self.__add_poi(b))
+        self.__route("DELETE", f"{artifact}/pois", lambda p, q, b: robot.pois.clear())
+        self.__route("POST", f"{artifact}/pois/:adjust", lambda p, q, b: None)
+        self.__route(
+            "GET", f"{artifact}/pois/{{id}}", lambda p, q, b: self.__find(robot.pois, p["id"])
+        )
+        self.__route(
+            "PUT", f"{artifact}/pois/{{id}}", lambda p, q, b: self.__modify_poi(p["id"], b)
+        )
+        self.__route(
+            "DELETE", f"{artifact}/pois/{{id}}", lambda p, q, b: self.__remove(robot.pois, p["id"])
+        )
+        self.__route("GET", f"{artifact}/laser-landmarks", lambda p, q, b: robot.landmarks[:])
+        self.__route("PUT", f"{artifact}/laser-landmarks", lambda p, q, b: self.__set_landmarks(b))
+        self.__route(
+            "DELETE", f"{artifact}/laser-landmarks", lambda p, q, b: robot.landmarks.clear()
+        )
+        self.__route(
+            "GET", f"{artifact}/laser-landmarks/:update", lambda p, q, b: robot.landmark_update
+        )
+        self.__route(
+            "PUT",
+            f"{artifact}/laser-landmarks/:update",
+            lambda p, q, b: self.__set_landmark_update(b),
+        )
+        self.__route(
+            "POST",
+            f"{artifact}/laser-landmarks/:remove",
+            lambda p, q, b: self.__remove_landmarks(b),
+        )
+
+        # Statistics and Platform
+        self.__route("GET", f"{statistics}/odometry", lambda p, q, b: round(robot.odometry_m, 3))
+        self.__route("GET", f"{statistics}/runtime", lambda p, q, b: round(robot.now(), 3))
+        self.__route("GET", f"{platform}/timestamp", lambda p, q, b: str(robot.timestamp_ms()))
+        self.__route("GET", f"{platform}/events", lambda p, q, b: list(robot.events))
+
+        # Sensors
+        self.__route("GET", f"{sensors}/sensors", lambda p, q, b: copy.deepcopy(robot.sensors))
+        self.__route(
+            "GET", f"{sensors}/sensors/{{id}}", lambda p, q, b: robot.sensor_value(int(p["id"]))
+        )
+
+        # Multi-Floor: One simulated map serves every floor
+        self.__route("GET", f"{multi_floor_map}/pois", lambda p, q, b: robot.multi_floor_pois(q))
+        self.__route("GET", f"{multi_floor_map}/stcm", lambda p, q, b: robot.composite_map())
+        self.__route("POST", f"{multi_floor_map}/stcm", lambda p, q, b: robot.upload_map(b))
+        self.__route("POST", f"{multi_floor_map}/stcm/:reload", lambda p, q, b: robot.reload_map())
+        self.__route("POST", f"{multi_floor_map}/stcm/:save", lambda p, q, b: None)
+        self.__route("POST", f"{multi_floor_map}/stcm/:sync", lambda p, q, b: None)
+        self.__route(
+            "PUT",
+            f"{multi_floor_localization}/pose",
+            lambda p, q, b: robot.set_pose_to_poi(str(b["poi_name"])),
+        )
+
+        # Delivery
+        self.__route("GET", f"{delivery}/settings", lambda p, q, b: robot.delivery_settings)
+        self.__route(
+            "PUT",
+            f"{delivery}/settings/timeout",
+            lambda p, q, b: robot.delivery_settings["timeout"].update(
+                food_pickup_timeout=int(b["food_pickup_timeout"])
+            ),
+        )
+        self.__route("GET", f"{delivery}/stage", lambda p, q, b: robot.delivery_stage())
+        self.__route("GET", f"{delivery}/tasks", lambda p, q, b: robot.delivery_tasks())
+        self.__route("POST", f"{delivery}/tasks", lambda p, q, b: robot.create_delivery_task(b))
+        self.__route(
+            "POST",
+            f"{delivery}/tasks/:batch",
+            lambda p, q, b: [robot.create_delivery_task(task) for task in b],
+        )
+        self.__route(
+            "PUT",
+            f"{delivery}/tasks/:task_execution",
+            lambda p, q, b: setattr(robot, "task_execution", bool(b["enable_task_execution"])),
+        )
+        self.__route("PUT", f"{delivery}/tasks/:start_pickup", lambda p, q, b: None)
+        self.__route("PUT", f"{delivery}/tasks/:end_pickup", lambda p, q, b: None)
+        self.__route(
+            "GET",
+            f"{delivery}/tasks/{{id}}",
+            lambda p, q, b: self.__find(robot.delivery_tasks(), p["id"]),
+        )
+        self.__route(
+            "DELETE",
+            f"{delivery}/tasks/{{id}}",
+            lambda p, q, b: robot.cancel_delivery_task(p["id"]),
+        )
+        self.__route(
+            "PUT",
+            f"{delivery}/cargos/{{cargo_id}}/boxes/{{box_id}}/{{op}}",
+            lambda p, q, b: self.__cargo_operation(p["op"]),
+        )
+
+        # Firmware
+        self.__route("GET", f"{firmware}/status", lambda p, q, b: robot.firmware_status())
+        self.__route("POST", f"{firmware}/uploads", lambda p, q, b: robot.create_firmware_upload(b))
+        self.__route(
+            "GET", f"{firmware}/uploads/{{id}}", lambda p, q, b: robot.firmware_upload(p["id"])
+        )
+        self.__route(
+            "PUT",
+            f"{firmware}/uploads/{{id}}",
+            lambda p, q, b: robot.write_firmware_chunk(p["id"], b),
+        )
+        self.__route(
+            "DELETE",
+            f"{firmware}/uploads/{{id}}",
+            lambda p, q, b: robot.cancel_firmware_upload(p["id"]),
+        )
+        self.__route(
+            "POST",
+            f"{firmware}/upgrade",
+            lambda p, q, b: robot.start_firmware_upgrade(str(b["upload_id"])),
+        )
+
+        # Application
+        self.__route("GET", f"{application}/apps", lambda p, q, b: robot.installed_apps())
+        self.__route("POST", f"{application}/apps", lambda p, q, b: robot.install_app(b))
+        self.__route(
+            "DELETE",
+            f"{application}/apps/{{package}}",
+            lambda p, q, b: robot.uninstall_app(p["package"]),
+        )
+        self.__route(
+            "GET",
+            f"{application}/apps/{{package}}/config",
+            lambda p, q, b: dict(robot.app(p["package"])["config"]),
+        )
+        self.__route(
+            "PUT",
+            f"{application}/apps/{{package}}/config",
+            lambda p, q, b: robot.app(p["package"])["config"].update(b),
+        )
+
+    ##############################################################################################################
+    # Route Handlers
+    ##############################################################################################################
+
+    def __capabilities(self) -> ListDictType:
+        return [
+            {"name": name, "version": "1.0.0", "enabled": True}
+            for name in (
+                "system",
+                "slam",
+                "motion",
+                "artifact",
+                "statistics",
+                "platform",
+                "sensors",
+                "multi_floor",
+                "delivery",
+                "firmware",
+                "application",
+            )
+        ]
+
+    def __cargo_operation(self, op: str) -> None:
+        if op not in ("open", "close"):
+            raise simulatorError(400, f"Invalid Cargo Operation: {op}")
+
+    def __pose(self) -> DictType:
+        with self.robot.lock:
+            self.robot.step()
+            return dict(self.robot.pose)
+
+    def __speed(self) -> DictType:
+        with self.robot.lock:
+            self.robot.step()
+            return dict(self.robot.speed)
+
+    def __known_area(self) -> DictType:
+        points = self.robot.laserscan()["laser_points"]
+        width = max(point["distance"] for point in points) * 2
+        return {"x": -width / 2, "y": -width / 2, "width": width, "height": width}
+
+    def __get_parameter(self, query: DictType) -> typing.Any:
+        name = query.get("param", "")
+        if name not in self.robot.parameters:
+            raise simulatorError(404, f"Unknown Parameter: {name}")
+        return self.robot.parameters[name]
+
+    def __set_parameter(self, body: typing.Any) -> None:
+        if not isinstance(body, dict) or "param" not in body:
+            raise simulatorError(400, "Expected {'param', 'value'}")
+        with self.robot.lock:
+            self.robot.step()
+            self.robot.parameters[str(body["param"])] = body.get("value")
+
+    def __set_power(self, mode: str) -> None:
+        stages = {
+            ":shutdown": ("shutting_down", "awake"),
+            ":hibernate": ("running", "asleep"),
+            ":wakeup": ("running", "awake"),
+            ":restartmodule": ("running", "awake"),
+        }
+        if mode not in stages:
+            raise simulatorError(404, f"Unknown Power Mode: {mode}")
+        with self.robot.lock:
+            self.robot.power["powerStage"], self.robot.power["sleepMode"] = stages[mode]
+
+    def __search_path(self, body: DictType) -> typing.Any:
+        if "strategy" in body:
+            # `motion.set_movement_strategy()` posts the strategy on this endpoint
+            if body["strategy"] not in self.robot.strategies:
+                raise simulatorError(400, f"Unknown Strategy: {body['strategy']}")
+            self.robot.strategy = str(body["strategy"])
+            return self.robot.strategy
+        target = body.get("target") or {}
+        with self.robot.lock:
+            self.robot.step()
+            return {"path_points": self.robot.straight_path(float(target["x"]), float(target["y"]))}
+
+    def __lines(self, params: typing.Dict[str, str]) -> ListDictType:
+        if params["usage"] not in self.robot.lines:
+            raise simulatorError(404, f"Unknown Line Usage: {params['usage']}")
+        return self.robot.lines[params["usage"]]
+
+    def __rects(self, params: typing.Dict[str, str]) -> ListDictType:
+        if params["usage"] not in self.robot.rects:
+            raise simulatorError(404, f"Unknown Area Usage: {params['usage']}")
+        return self.robot.rects[params["usage"]]
+
+    def __add_lines(self, params: typing.Dict[str, str], body: typing.Any) -> None:
+        lines = self.__lines(params)
+        for line in body if isinstance(body, list) else [body]:
+            # The robot assigns the id of new lines
+            lines.append({**line, "id": self.robot.new_id()})
+
+    def __modify_lines(self, params: typing.Dict[str, str], body: typing.Any) -> None:
+        lines = self.__lines(params)
+        for line in body if isinstance(body, list) else [body]:
+            current = self.__find(lines, str(line["id"]))
+            current.update(line)
+
+    def __add_rect(self, params: typing.Dict[str, str], body: typing.Any) -> None:
+        rects = self.__rects(params)
+        for rect in body if isinstance(body, list) else [body]:
+            if "area" not in rect:
+                raise simulatorError(400, "Expected {'area', 'metadata'}")
+            rects.append(
+                {
+                    "id": self.robot.new_id(),
+                    "area": rect["area"],
+                    "metadata": rect.get("metadata") or {},
+                }
+            )
+
+    def __add_poi(self, body: typing.Any) -> None:
+        for poi in body if isinstance(body, list) else [body]:
+            if "pose" not in poi:
+                # POIs added without a pose take the current pose of the robot
+                poi = {**poi, "pose": {key: self.__pose()[key] for key in ("x", "y", "yaw")}}
+            self.__remove(self.robot.pois, str(poi.get("id", "")), missing_ok=True)
+            self.robot.pois.append(
+                {
+                    "id": str(poi.get("id", "")),
+                    "pose": poi["pose"],
+                    "metadata": poi.get("metadata") or {},
+                }
+            )
+
+    def __modify_poi(self, poi_id: str, body: typing.Any) -> None:
+        poi = self.__find(self.robot.pois, poi_id)
+        for key in ("pose", "metadata"):
+            if key in body:
+                poi[key] = body[key]
+
+    def __set_landmarks(self, body: typing.Any) -> None:
+        self.robot.landmarks[:] = list(body) if isinstance(body, list) else []
+
+    def __set_landmark_update(self, body: typing.Any) -> None:
+        self.robot.landmark_update = bool((body or {}).get("enable", True))
+
+    def __remove_landmarks(self, body: typing.Any) -> None:
+        ids = {str(landmark_id) for landmark_id in body or []}
+        self.robot.landmarks[:] = [
+            landmark for landmark in self.robot.landmarks if str(landmark.get("id")) not in ids
+        ]
+
+    def __find(self, elements: ListDictType, element_id: str) -> DictType:
+        for element in elements:
+            if str(element.get("id")) == element_id:
+                return element
+        raise simulatorError(404, f"Element {element_id} not found")
+
+    def __remove(self, elements: ListDictType, element_id: str, missing_ok: bool = False) -> None:
+        with self.robot.lock:
+            for index, element in enumerate(elements):
+                if str(element.get("id")) == element_id:
+                    del elements[index]
+                    return
+        if not missing_ok:
+            raise simulatorError(404, f"Element {element_id} not found")
+
+
+def main(argv: typing.Optional[typing.List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Address to bind")
+    parser.add_argument("--port", type=int, default=1448, help="Port to bind. 0 => Free port")
+    parser.add_argument("--latency", type=float, default=0.0, help="Delay per request in seconds")
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="Max deviation of the delay in seconds"
+    )
+    parser.add_argument(
+        "--bandwidth", type=float, default=None, help="Body throughput cap in bytes/s"
+    )
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of failed requests")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="Share of hanging requests")
+    parser.add_argument(
+        "--time-scale", type=float, default=1.0, help="Simulated seconds per second"
+    )
+    parser.add_argument("--laser-points", type=int, default=720, help="Laser points per scan")
+    parser.add_argument(
+        "--map-size", type=int, default=256 * 1024, help="Size of the composite map in bytes"
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Seed of the random generators")
+    args = parser.parse_args(argv)
+
+    simulator = robotSimulator(
+        host=args.host,
+        port=args.port,
+        latency_s=args.latency,
+        jitter_s=args.jitter,
+        bandwidth_bytes_s=args.bandwidth,
+        failure_rate=args.failure_rate,
+        timeout_rate=args.timeout_rate,
+        robot=simulatedRobot(
+            laser_points=args.laser_points,
+            map_size_bytes=args.map_size,
+            time_scale=args.time_scale,
+            seed=args.seed,
+        ),
+        seed=args.seed,
+    )
+    simulator.serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+"""
+Module to read the state of a robot in one parallel round.
+
+A snapshot issues the status requests of a dashboard concurrently over the kept-alive connection
+pool of the robot and assembles them into one `robotSnapshot`. Total latency is about the slowest
+request instead of the sum of all of them.
+
+Fields:
+    - "power" => `system.get_power_status()`
+    - "health" => `system.get_robot_health()`
+    - "network" => `system.get_network_status()`
+    - "localization_quality" => `slam.get_localization_quality()`
+    - "action" => `motion.get_action()`
+"""
+
+# Custom Packages
+from .logger import systemLogger
+from .results import DictType
+
+# Imported Packages
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+import typing
+
+if typing.TYPE_CHECKING:
+    from robotComms.robotComms import robotComms
+
+SNAPSHOT_FIELDS: typing.Dict[str, typing.Callable[["robotComms"], typing.Any]] = {
+    "power": lambda robot: robot.system.get_power_status(),
+    "health": lambda robot: robot.system.get_robot_health(),
+    "network": lambda robot: robot.system.get_network_status(),
+    "localization_quality": lambda robot: robot.slam.get_localization_quality(),
+    "action": lambda robot: robot.motion.get_action(),
+}
+
+
+class snapshotField:
+    def __init__(
+        self,
+        value: typing.Any,
+        fetched_at: float,
+        latency_s: float,
+        error: str = "",
+    ) -> None:
+        """
+        One value of a snapshot
+
+        Args:
+            value: Value returned by the API. None if the request raised.
+            fetched_at: Host time when the response arrived in seconds since the epoch
+            latency_s: Duration of the request in seconds
+            error: Error message. Empty on success.
+        """
+        self.value: typing.Any = value
+        self.fetched_at: float = fetched_at
+        self.latency_s: float = latency_s
+        self.error: str = error
+
+    @property
+    def ok(self) -> bool:
+        # API classes return empty containers when a request fails
+        return not self.error and self.value is not None and self.value != {} and self.value != []
+
+    def age_s(self, now: typing.Optional[float] = None) -> float:
+        """
+        Returns:
+            Seconds since the response arrived
+        """
+        return (now if now is not None else time.time()) - self.fetched_at
+
+
+class robotSnapshot:
+    def __init__(self, taken_at: float, fields: typing.Dict[str, snapshotField]) -> None:
+        """
+        State of a robot read in one parallel round
+
+        Args:
+            taken_at: Host time when the round started in seconds since the epoch
+            fields: Field values keyed by field name
+        """
+        self.taken_at: float = taken_at
+        self.fields: typing.Dict[str, snapshotField] = fields
+
+    @property
+    def power(self) -> DictType:
+        return self.__value("power", {})
+
+    @property
+    def health(self) -> DictType:
+        return self.__value("health", {})
+
+    @property
+    def network(self) -> DictType:
+        return self.__value("network", {})
+
+    @property
+    def localization_quality(self) -> typing.Optional[int]:
+        value = self.__value("localization_quality", None)
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
+    @property
+    def action(self) -> DictType:
+        return self.__value("action", {})
+
+    @property
+    def latency_s(self) -> float:
+        """
+        Returns:
+            Duration of the slowest request of the round
+        """
+        return max((field.latency_s for field in self.fields.values()), default=0.0)
+
+    @property
+    def spread_s(self) -> float:
+        """
+        Returns:
+            Time between the first and the last response. Small spread => Consistent snapshot.
+        """
+        times = [field.fetched_at for field in self.fields.values()]
+        return max(times) - min(times) if times else 0.0
+
+    def is_complete(self) -> bool:
+        return all(field.ok for field in self.fields.values())
+
+    def failed_fields(self) -> typing.List[str]:
+        return [name for name, field in self.fields.items() if not field.ok]
+
+    def summary(self) -> DictType:
+        """
+        Returns:
+            Snapshot as Dictionary
+        """
+        return {
+            "taken_at": self.taken_at,
+            "latency_s": self.latency_s,
+            "spread_s": self.spread_s,
+            "fields": {
+                name: {
+                    "value": field.value,
+                    "fetched_at": field.fetched_at,
+                    "latency_s": field.latency_s,
+                    "error": field.error,
+                }
+                for name, field in self.fields.items()
+            },
+        }
+
+    def __value(self, name: str, default: typing.Any) -> typing.Any:
+        field = self.fields.get(name)
+        if field is None or not field.ok:
+            return default
+        return field.value
+
+
+class snapshotReader:
+    def __init__(
+        self,
+        robot: "robotComms",
+        fields: typing.Optional[typing.List[str]] = None,
+        logger: typing.Optional[systemLogger] = None,
+    ) -> None:
+        """
+        Parallel Reader of robot snapshots. Keep one reader per robot, it owns a small thread pool
+        started by the first `read()`.
+
+        Args:
+            robot: Robot to read. Example: `robotComms()`
+            fields: Fields to read. Default: All of `SNAPSHOT_FIELDS`
+            logger: Instance of systemLogger. If not provided, initiates with log name 'snapshot_logger'
+        """
+        self.__ROBOT = robot
+        self.__FIELDS: typing.List[str] = list(fields or SNAPSHOT_FIELDS)
+        for name in self.__FIELDS:
+            if name not in SNAPSHOT_FIELDS:
+                raise ValueError(f"Invalid Snapshot Field: {name}")
+        self.__LOGGER: systemLogger = logger or systemLogger(
+            logger_name="snapshot_logger",
+            log_file_path="logs",
+            enable_console_logging=True,
+        )
+        self.__POOL: typing.Optional[ThreadPoolExecutor] = None
+        self.__POOL_LOCK = threading.Lock()
+
+    def read(self) -> robotSnapshot:
+        """
+        Issue all requests concurrently and wait for them
+
+        Returns:
+            snapshot: Failed fields keep their error and fall back to empty values
+        """
+        taken_at = time.time()
+        pool = self.__pool()
+        futures = {name: pool.submit(self.__fetch, name) for name in self.__FIELDS}
+        snapshot = robotSnapshot(
+            taken_at, {name: future.result() for name, future in futures.items()}
+        )
+        failed = snapshot.failed_fields()
+        if failed:
+            self.__LOGGER.WARNING(f"Snapshot Incomplete | Failed Fields: {failed}")
+        self.__LOGGER.INFO(
+            f"Snapshot read in {snapshot.latency_s:.3f}s | Spread: {snapshot.spread_s:.3f}s"
+        )
+        return snapshot
+
+    def close(self) -> None:
+        """
+        Stop the thread pool. A later `read()` starts a new one.
+        """
+        with self.__POOL_LOCK:
+            if self.__POOL is not None:
+                self.__POOL.shutdown(wait=True)
+                self.__POOL = None
+
+    def __pool(self) -> ThreadPoolExecutor:
+        with self.__POOL_LOCK:
+            if self.__POOL is None:
+                self.__POOL = ThreadPoolExecutor(
+                    max_workers=len(self.__FIELDS), thread_name_prefix="snapshot"
+                )
+            return self.__POOL
+
+    def __fetch(self, name: str) -> snapshotField:
+        start = time.perf_counter()
+        try:
+            value = SNAPSHOT_FIELDS[name](self.__ROBOT)
+            error = ""
+        except Exception as e:
+            value = None
+            error = str(e)
+        return snapshotField(
+            value=value,
+            fetched_at=time.time(),
+            latency_s=time.perf_counter() - start,
+            error=error,
+        )
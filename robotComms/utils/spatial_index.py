@@ -0,0 +1,547 @@
+"""
+Module to answer geometric questions against the Map Artifacts.
+
+Builds NumPy arrays out of the artifact collections so that many points can be tested at once
+instead of looping over dictionaries.
+
+Supported Queries:
+    -> Is a point inside a Rectangular Area (forbidden, dangerous, restricted, ...)?
+    -> Which k POIs are nearest to a point?
+    -> Does a segment cross a Virtual Wall or Track?
+
+Each collection is indexed on its own and a diff from `artifactStore` only touches the collection
+it belongs to:
+    -> Rectangular Areas => Only the grid cells of the added, changed and removed areas are rebuilt
+    -> Virtual Lines and POIs => The collection is stacked into arrays again on the next query
+"""
+
+# Custom Packages
+from .logger import systemLogger
+from .results import DictType, ListDictType
+from .artifact_store import artifactDiff, artifactStore, element_key
+
+# Imported Packages
+import copy
+import math
+import threading
+import typing
+import numpy as np
+
+PointsType = typing.Union[np.ndarray, typing.Sequence[typing.Sequence[float]]]
+
+# Upper bound of elements in a temporary (points x candidates) matrix
+_CHUNK_ELEMENTS: int = 1 << 22
+
+
+def _as_points(points: PointsType) -> np.ndarray:
+    array = np.asarray(points, dtype=np.float64)
+    if array.ndim == 1:
+        array = array.reshape(1, -1)
+    if array.ndim != 2 or array.shape[1] < 2:
+        raise ValueError("Points must be of shape (N, 2)")
+    return array[:, :2]
+
+
+class _rectLayer:
+    """
+    Rectangular Areas of one usage. A rectangle is the segment start -> end widened by half_width
+    on both sides. The rectangles are bucketed in a uniform grid for point queries.
+
+    A layer is never changed once built. `updated()` returns a new layer sharing the arrays of every
+    grid cell the change does not touch, so running queries keep a consistent view.
+    """
+
+    def __init__(self, elements: ListDictType, cell_size: float) -> None:
+        self.cell_size: float = cell_size
+        # Row => Area ID. None => Row of a removed area
+        self.ids: typing.List[typing.Any] = []
+        # Element Key => Row
+        self.rows: typing.Dict[str, int] = {}
+        self.start: np.ndarray = np.empty((0, 2), dtype=np.float64)
+        self.direction: np.ndarray = np.empty((0, 2), dtype=np.float64)
+        self.length: np.ndarray = np.empty(0, dtype=np.float64)
+        self.half_width: np.ndarray = np.empty(0, dtype=np.float64)
+        # Grid Buckets => (cell_x, cell_y) : rectangle rows
+        self.buckets: typing.Dict[typing.Tuple[int, int], np.ndarray] = {}
+        self.__append(elements)
+
+    @property
+    def holes(self) -> int:
+        """
+        Rows left behind by removed areas
+        """
+        return len(self.ids) - len(self.rows)
+
+    def updated(self, removed: ListDictType, added: ListDictType) -> "_rectLayer":
+        """
+        Copy of the layer with areas removed and added. Only the grid cells of these areas are
+        rebuilt. A changed area is removed and added again.
+
+        Args:
+            removed: Areas to drop, matched by `element_key()`
+            added: Areas to insert
+        """
+        layer = copy.copy(self)
+        layer.ids = list(self.ids)
+        layer.rows = dict(self.rows)
+        layer.buckets = dict(self.buckets)
+        for element in removed:
+            row = layer.rows.pop(element_key(element), None)
+            if row is None:
+                continue
+            layer.ids[row] = None
+            for cell in layer.__cells(row):
+                remaining = layer.buckets[cell][layer.buckets[cell] != row]
+                if len(remaining):
+                    layer.buckets[cell] = remaining
+                else:
+                    del layer.buckets[cell]
+        layer.__append(added)
+        return layer
+
+    def __append(self, elements: ListDictType) -> None:
+        if not elements:
+            return
+        first = len(self.ids)
+        rows: typing.List[typing.Tuple[float, float, float, float, float]] = []
+        for element in elements:
+            area = element.get("area", {})
+            start, end = area.get("start", {}), area.get("end", {})
+            sx, sy = float(start.get("x", 0)), float(start.get("y", 0))
+            ex, ey = float(end.get("x", 0)), float(end.get("y", 0))
+            rows.append((sx, sy, ex, ey, float(area.get("half_width", 0))))
+            self.rows[element_key(element)] = len(self.ids)
+            self.ids.append(element.get("id"))
+
+        data = np.asarray(rows, dtype=np.float64).reshape(-1, 5)
+        delta = data[:, 2:4] - data[:, 0:2]
+        length = np.hypot(delta[:, 0], delta[:, 1])
+        safe = np.where(length > 0, length, 1.0)
+        direction = np.where((length > 0)[:, None], delta / safe[:, None], np.array([1.0, 0.0]))
+        # New arrays instead of in-place growth => Layers sharing the old arrays stay untouched
+        self.start = np.concatenate([self.start, data[:, 0:2]])
+        self.direction = np.concatenate([self.direction, direction])
+        self.length = np.concatenate([self.length, length])
+        self.half_width = np.concatenate([self.half_width, data[:, 4]])
+
+        buckets: typing.Dict[typing.Tuple[int, int], typing.List[int]] = {}
+        for row in range(first, len(self.ids)):
+            for cell in self.__cells(row):
+                buckets.setdefault(cell, []).append(row)
+        for cell, rows_in_cell in buckets.items():
+            new_rows = np.asarray(rows_in_cell, dtype=np.intp)
+            existing = self.buckets.get(cell)
+            self.buckets[cell] = (
+                new_rows if existing is None else np.concatenate([existing, new_rows])
+            )
+
+    def __cells(self, row: int) -> typing.List[typing.Tuple[int, int]]:
+        (min_x, min_y), (max_x, max_y) = self.__bounds(row)
+        return [
+            (cx, cy)
+            for cx in range(
+                math.floor(min_x / self.cell_size), math.floor(max_x / self.cell_size) + 1
+            )
+            for cy in range(
+                math.floor(min_y / self.cell_size), math.floor(max_y / self.cell_size) + 1
+            )
+        ]
+
+    def __bounds(self, row: int) -> typing.Tuple[np.ndarray, np.ndarray]:
+        normal = np.array([-self.direction[row, 1], self.direction[row, 0]]) * self.half_width[row]
+        end = self.start[row] + self.direction[row] * self.length[row]
+        corners = np.stack(
+            [self.start[row] + normal, self.start[row] - normal, end + normal, end - normal]
+        )
+        return corners.min(axis=0), corners.max(axis=0)
+
+    def contains(self, points: np.ndarray) -> np.ndarray:
+        """
+        Returns:
+            Row of the first rectangle containing each point or -1. Shape: (N,)
+        """
+        hits = np.full(len(points), -1, dtype=np.intp)
+        if not self.rows or not len(points):
+            return hits
+        cells = np.floor(points / self.cell_size).astype(np.int64)
+        unique_cells, inverse = np.unique(cells, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        order = np.argsort(inverse, kind="stable")
+        boundaries = np.searchsorted(inverse[order], np.arange(len(unique_cells) + 1))
+        for cell_index, cell in enumerate(unique_cells):
+            candidates = self.buckets.get((int(cell[0]), int(cell[1])))
+            if candidates is None:
+                continue
+            point_rows = order[boundaries[cell_index] : boundaries[cell_index + 1]]
+            relative = points[point_rows, None, :] - self.start[None, candidates, :]
+            direction = self.direction[None, candidates, :]
+            along = (relative * direction).sum(axis=2)
+            across = np.abs(
+                relative[:, :, 0] * direction[:, :, 1] - relative[:, :, 1] * direction[:, :, 0]
+            )
+            inside = (
+                (along >= 0)
+                & (along <= self.length[None, candidates])
+                & (across <= self.half_width[None, candidates])
+            )
+            found = inside.any(axis=1)
+            hits[point_rows[found]] = candidates[inside[found].argmax(axis=1)]
+        return hits
+
+
+class _segmentLayer:
+    """
+    Virtual Lines of one usage stored as (start, end) arrays with their bounding boxes.
+    """
+
+    def __init__(self, elements: ListDictType) -> None:
+        self.ids: typing.List[typing.Any] = [element.get("id") for element in elements]
+        data = np.asarray(
+            [
+                (
+                    float(element.get("start", {}).get("x", 0)),
+                    float(element.get("start", {}).get("y", 0)),
+                    float(element.get("end", {}).get("x", 0)),
+                    float(element.get("end", {}).get("y", 0)),
+                )
+                for element in elements
+            ],
+            dtype=np.float64,
+        ).reshape(-1, 4)
+        self.start: np.ndarray = data[:, 0:2]
+        self.end: np.ndarray = data[:, 2:4]
+        self.low: np.ndarray = np.minimum(self.start, self.end)
+        self.high: np.ndarray = np.maximum(self.start, self.end)
+
+    def crosses(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """
+        Returns:
+            Row of the first line crossed by each segment or -1. Shape: (N,)
+        """
+        hits = np.full(len(starts), -1, dtype=np.intp)
+        if not self.ids or not len(starts):
+            return hits
+        chunk = max(1, _CHUNK_ELEMENTS // len(self.ids))
+        for begin in range(0, len(starts), chunk):
+            p1, p2 = starts[begin : begin + chunk, None, :], ends[begin : begin + chunk, None, :]
+            q1, q2 = self.start[None, :, :], self.end[None, :, :]
+            # Bounding Box Check before the orientation test
+            overlap = (
+                (np.minimum(p1, p2) <= self.high[None, :, :])
+                & (np.maximum(p1, p2) >= self.low[None, :, :])
+            ).all(axis=2)
+            d1 = _cross(q2 - q1, p1 - q1)
+            d2 = _cross(q2 - q1, p2 - q1)
+            d3 = _cross(p2 - p1, q1 - p1)
+            d4 = _cross(p2 - p1, q2 - p1)
+            crossing = overlap & (d1 * d2 <= 0) & (d3 * d4 <= 0)
+            # Collinear segments pass the sign test only when they actually overlap
+            found = crossing.any(axis=1)
+            rows = np.nonzero(found)[0]
+            hits[begin + rows] = crossing[found].argmax(axis=1)
+        return hits
+
+
+def _cross(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]
+
+
+class artifactSpatialIndex:
+    def __init__(
+        self,
+        cell_size: float = 2.0,
+        logger: typing.Optional[systemLogger] = None,
+    ) -> None:
+        """
+        Spatial Index over the Map Artifacts
+
+        Args:
+            cell_size: Grid cell size in meter used to bucket Rectangular Areas. Default: 2m
+            logger: Instance of systemLogger. If not provided, initiates with log name 'spatialIndex_logger'
+        """
+        self.__CELL_SIZE: float = cell_size
+        self.__LOGGER: systemLogger = logger or systemLogger(
+            logger_name="spatialIndex_logger",
+            log_file_path="logs",
+            enable_console_logging=True,
+        )
+        self.__LOCK = threading.RLock()
+        self.__ELEMENTS: typing.Dict[str, typing.Dict[str, DictType]] = {}
+        self.__LAYERS: typing.Dict[str, typing.Any] = {}
+        self.__DIRTY: typing.Set[str] = set()
+        self.__STORE: typing.Optional[artifactStore] = None
+        self.__TOKEN: typing.Optional[int] = None
+
+    ##############################################################################################################
+    # Building the Index
+    ##############################################################################################################
+
+    def build(self, collections: typing.Dict[str, ListDictType]) -> None:
+        """
+        Replace the indexed collections
+
+        Args:
+            collections: Artifacts keyed by collection key. Same format as `artifactStore.snapshot()`
+                Example: {"rect/forbidden_area": [...], "poi": [...], "lines/walls": [...]}
+        """
+        with self.__LOCK:
+            for key, elements in collections.items():
+                if key == "laser":
+                    continue
+                self.__ELEMENTS[key] = {element_key(element): element for element in elements}
+                self.__DIRTY.add(key)
+        self.__LOGGER.INFO(f"Spatial Index Loaded: {sorted(collections)}")
+
+    def attach(self, store: artifactStore) -> None:
+        """
+        Build the index from an `artifactStore` and follow its diffs
+
+        Args:
+            store: Artifact Mirror to follow
+        """
+        self.detach()
+        self.__STORE = store
+        self.__TOKEN = store.subscribe(self.apply_diff)
+        self.build(store.snapshot())
+
+    def detach(self) -> None:
+        """
+        Stop following the `artifactStore`
+        """
+        if self.__STORE is not None and self.__TOKEN is not None:
+            self.__STORE.unsubscribe(self.__TOKEN)
+        self.__STORE = None
+        self.__TOKEN = None
+
+    def apply_diff(self, diff: artifactDiff) -> None:
+        """
+        Update one collection from a diff. Rectangular Areas update the grid cells of the changed
+        areas right away, Virtual Lines and POIs are stacked again on the next query.
+
+        Args:
+            diff: Changes of one collection
+        """
+        if diff.collection == "laser":
+            return
+        with self.__LOCK:
+            elements = self.__ELEMENTS.setdefault(diff.collection, {})
+            for element in diff.removed:
+                elements.pop(element_key(element), None)
+            for element in diff.added + diff.changed:
+                elements[element_key(element)] = element
+
+            layer = self.__LAYERS.get(diff.collection)
+            if not isinstance(layer, _rectLayer) or diff.collection in self.__DIRTY:
+                self.__DIRTY.add(diff.collection)
+                return
+            layer = layer.updated(diff.removed + diff.changed, diff.added + diff.changed)
+            if layer.holes > len(layer.rows):
+                # Mostly removed rows => Compact with a full build on the next query
+                self.__DIRTY.add(diff.collection)
+            else:
+                self.__LAYERS[diff.collection] = layer
+
+    ##############################################################################################################
+    # Queries
+    ##############################################################################################################
+
+    def points_in_areas(
+        self, points: PointsType, usages: typing.Optional[typing.List[str]] = None
+    ) -> np.ndarray:
+        """
+        Check many points against the Rectangular Areas at once
+
+        Args:
+            points: Array of shape (N, 2) with x, y in meter
+            usages: Area usages to check. Example: ["forbidden_area", "restricted_area"]. Default: All usages
+
+        Returns:
+            Boolean array of shape (N,). True => Point is inside at least one area
+        """
+        layer_hits, _, _ = self.__area_hits(_as_points(points), usages)
+        return layer_hits >= 0
+
+    def areas_at(
+        self, points: PointsType, usages: typing.Optional[typing.List[str]] = None
+    ) -> typing.List[typing.Optional[typing.Tuple[str, typing.Any]]]:
+        """
+        Find which Rectangular Area contains each point
+
+        Args:
+            points: Array of shape (N, 2) with x, y in meter
+            usages: Area usages to check in priority order. Default: All usages
+
+        Returns:
+            For each point (usage, area id) of the first matching area or None
+        """
+        layer_hits, row_hits, layers = self.__area_hits(_as_points(points), usages)
+        return [
+            (layers[layer][0].split("/", 1)[1], layers[layer][1].ids[row]) if layer >= 0 else None
+            for layer, row in zip(layer_hits.tolist(), row_hits.tolist())
+        ]
+
+    def nearest_pois(self, points: PointsType, k: int = 1) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k nearest POIs of many points at once
+
+        Args:
+            points: Array of shape (N, 2) with x, y in meter
+            k: Number of POIs per point. Default: 1
+
+        Returns:
+            (ids, distances):
+                - ids => Object array of shape (N, k) with POI IDs sorted by distance
+                - distances => Float array of shape (N, k) in meter
+            Missing neighbours (less than k POIs) have id None and distance inf
+        """
+        array = _as_points(points)
+        layers = self.__layers("poi", None)
+        ids_out = np.full((len(array), k), None, dtype=object)
+        distances_out = np.full((len(array), k), np.inf)
+        if not layers or not len(array):
+            return ids_out, distances_out
+        poi_ids, poi_xy = layers[0][1]
+        if not len(poi_ids):
+            return ids_out, distances_out
+
+        count = min(k, len(poi_ids))
+        chunk = max(1, _CHUNK_ELEMENTS // len(poi_ids))
+        for begin in range(0, len(array), chunk):
+            block = array[begin : begin + chunk]
+            squared = ((block[:, None, :] - poi_xy[None, :, :]) ** 2).sum(axis=2)
+            if count < len(poi_ids):
+                nearest = np.argpartition(squared, count - 1, axis=1)[:, :count]
+            else:
+                nearest = np.broadcast_to(np.arange(len(poi_ids)), squared.shape).copy()
+            nearest_squared = np.take_along_axis(squared, nearest, axis=1)
+            order = np.argsort(nearest_squared, axis=1)
+            nearest = np.take_along_axis(nearest, order, axis=1)
+            distances_out[begin : begin + len(block), :count] = np.sqrt(
+                np.take_along_axis(nearest_squared, order, axis=1)
+            )
+            ids_out[begin : begin + len(block), :count] = poi_ids[nearest]
+        return ids_out, distances_out
+
+    def segments_cross_lines(
+        self,
+        starts: PointsType,
+        ends: PointsType,
+        usages: typing.Optional[typing.List[str]] = None,
+    ) -> typing.List[typing.Optional[typing.Tuple[str, typing.Any]]]:
+        """
+        Check many segments against the Virtual Lines at once
+
+        Args:
+            starts: Array of shape (N, 2) with the segment starts
+            ends: Array of shape (N, 2) with the segment ends
+            usages: Line usages to check in priority order. Default: ["walls"]
+
+        Returns:
+            For each segment (usage, line id) of the first crossed line or None
+        """
+        layer_hits, row_hits, layers = self.__line_hits(starts, ends, usages or ["walls"])
+        return [
+            (layers[layer][0].split("/", 1)[1], layers[layer][1].ids[row]) if layer >= 0 else None
+            for layer, row in zip(layer_hits.tolist(), row_hits.tolist())
+        ]
+
+    def segments_cross_walls(self, starts: PointsType, ends: PointsType) -> np.ndarray:
+        """
+        Check many segments against the Virtual Walls at once
+
+        Args:
+            starts: Array of shape (N, 2) with the segment starts
+            ends: Array of shape (N, 2) with the segment ends
+
+        Returns:
+            Boolean array of shape (N,). True => Segment crosses a Virtual Wall
+        """
+        layer_hits, _, _ = self.__line_hits(starts, ends, ["walls"])
+        return layer_hits >= 0
+
+    ##############################################################################################################
+    # Private Methods
+    ##############################################################################################################
+
+    def __layers(
+        self, a_type: str, usages: typing.Optional[typing.List[str]]
+    ) -> typing.List[typing.Tuple[str, typing.Any]]:
+        with self.__LOCK:
+            if a_type == "poi":
+                keys = ["poi"]
+            elif usages is not None:
+                keys = [f"{a_type}/{usage}" for usage in usages]
+            else:
+                keys = sorted(key for key in self.__ELEMENTS if key.startswith(f"{a_type}/"))
+
+            layers = []
+            for key in keys:
+                if key not in self.__ELEMENTS:
+                    continue
+                if key in self.__DIRTY or key not in self.__LAYERS:
+                    self.__LAYERS[key] = self.__build_layer(key)
+                    self.__DIRTY.discard(key)
+                layers.append((key, self.__LAYERS[key]))
+            return layers
+
+    def __area_hits(
+        self, points: np.ndarray, usages: typing.Optional[typing.List[str]]
+    ) -> typing.Tuple[np.ndarray, np.ndarray, typing.List[typing.Tuple[str, typing.Any]]]:
+        """
+        Returns:
+            (layer per point or -1, rectangle row per point, layers)
+        """
+        layers = self.__layers("rect", usages)
+        layer_hits = np.full(len(points), -1, dtype=np.intp)
+        row_hits = np.full(len(points), -1, dtype=np.intp)
+        for layer_index, (_, layer) in enumerate(layers):
+            remaining = np.nonzero(layer_hits < 0)[0]
+            if not len(remaining):
+                break
+            hits = layer.contains(points[remaining])
+            found = hits >= 0
+            layer_hits[remaining[found]] = layer_index
+            row_hits[remaining[found]] = hits[found]
+        return layer_hits, row_hits, layers
+
+    def __line_hits(
+        self, starts: PointsType, ends: PointsType, usages: typing.List[str]
+    ) -> typing.Tuple[np.ndarray, np.ndarray, typing.List[typing.Tuple[str, typing.Any]]]:
+        """
+        Returns:
+            (layer per segment or -1, line row per segment, layers)
+        """
+        start_array, end_array = _as_points(starts), _as_points(ends)
+        if len(start_array) != len(end_array):
+            raise ValueError("starts and ends must have the same length")
+        layers = self.__layers("lines", usages)
+        layer_hits = np.full(len(start_array), -1, dtype=np.intp)
+        row_hits = np.full(len(start_array), -1, dtype=np.intp)
+        for layer_index, (_, layer) in enumerate(layers):
+            remaining = np.nonzero(layer_hits < 0)[0]
+            if not len(remaining):
+                break
+            hits = layer.crosses(start_array[remaining], end_array[remaining])
+            found = hits >= 0
+            layer_hits[remaining[found]] = layer_index
+            row_hits[remaining[found]] = hits[found]
+        return layer_hits, row_hits, layers
+
+    def __build_layer(self, key: str) -> typing.Any:
+        elements = list(self.__ELEMENTS[key].values())
+        if key.startswith("rect/"):
+            return _rectLayer(elements, self.__CELL_SIZE)
+        if key.startswith("lines/"):
+            return _segmentLayer(elements)
+        ids = np.array([element.get("id") for element in elements] + [None], dtype=object)[:-1]
+        xy = np.asarray(
+            [
+                (
+                    float(element.get("pose", {}).get("x", 0)),
+                    float(element.get("pose", {}).get("y", 0)),
+                )
+                for element in elements
+            ],
+            dtype=np.float64,
+        ).reshape(-1, 2)
+        return ids, xy
@@ -0,0 +1,476 @@
+"""
+Module to record fleet telemetry into compressed columnar files.
+
+Every sample of a robot is one row of `TELEMETRY_COLUMNS`:
+    - Pose => `slam.get_current_robot_pose()`
+    - Localization Quality => `slam.get_localization_quality()`
+    - Battery => `system.get_power_status()`
+    - Speed => `motion.get_entity("speed")`
+    - Health => `system.get_robot_health()`
+
+Rows are buffered per robot in preallocated NumPy arrays and handed to a background writer when a
+buffer holds `batch_rows` rows or its oldest row is `flush_interval_s` old. Handed over batches wait
+in a bounded queue. A full queue drops the batch (`dropped_rows`) instead of growing memory.
+
+Files are partitioned by robot and UTC hour, in the Hive layout read by pyarrow, DuckDB or Spark:
+    <directory>/robot=<robot_id>/date=<YYYY-MM-DD>/hour=<HH>/part-<first_ms>-<seq>.<ext>
+
+File Formats:
+    - "parquet" => Apache Parquet, needs pyarrow (optional). Compressed with `compression`.
+    - "npz" => NumPy compressed archive, one array per column. Always available.
+    - "auto" => "parquet" if pyarrow is installed, "npz" otherwise
+
+Both formats load only the requested columns, see `read_telemetry()`.
+"""
+
+# Custom Packages
+from .logger import systemLogger
+
+# Imported Packages
+from concurrent.futures import ThreadPoolExecutor
+import datetime
+import glob
+import math
+import os
+import queue
+import threading
+import time
+import typing
+
+import numpy as np
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - optional dependency
+    pyarrow = None
+
+if typing.TYPE_CHECKING:
+    from robotComms.robotComms import robotComms
+
+# Docking Status => Code stored in the "docking_status" column
+DOCKING_STATUS: typing.List[str] = ["unknown", "not_on_dock", "on_dock"]
+
+TELEMETRY_COLUMNS: typing.List[typing.Tuple[str, typing.Any]] = [
+    ("host_time", np.float64),
+    ("x", np.float32),
+    ("y", np.float32),
+    ("yaw", np.float32),
+    ("localization_quality", np.int8),
+    ("battery_percentage", np.float32),
+    ("is_charging", np.bool_),
+    ("docking_status", np.int8),
+    ("vx", np.float32),
+    ("vy", np.float32),
+    ("omega", np.float32),
+    ("has_warning", np.bool_),
+    ("has_error", np.bool_),
+    ("has_fatal", np.bool_),
+    ("base_errors", np.int16),
+    ("failed_requests", np.int8),
+]
+TELEMETRY_DTYPE: np.dtype = np.dtype(TELEMETRY_COLUMNS)
+FILE_FORMATS: typing.List[str] = ["auto", "parquet", "npz"]
+
+
+def _file_format(file_format: str) -> str:
+    if file_format not in FILE_FORMATS:
+        raise ValueError(f"Invalid File Format: {file_format}")
+    if file_format == "auto":
+        return "parquet" if pyarrow is not None else "npz"
+    if file_format == "parquet" and pyarrow is None:
+        raise ImportError("Parquet Telemetry needs pyarrow: pip install pyarrow")
+    return file_format
+
+
+def _hour_directory(directory: str, robot_id: str, hour: int) -> str:
+    moment = datetime.datetime.fromtimestamp(hour * 3600, tz=datetime.timezone.utc)
+    return os.path.join(
+        directory, f"robot={robot_id}", f"date={moment:%Y-%m-%d}", f"hour={moment:%H}"
+    )
+
+
+class telemetryRecorder:
+    def __init__(
+        self,
+        robots: typing.Dict[str, "robotComms"],
+        directory: str = "telemetry",
+        rate_hz: float = 1.0,
+        batch_rows: int = 3600,
+        flush_interval_s: float = 300.0,
+        max_pending_batches: int = 16,
+        max_robots: int = 8,
+        file_format: str = "auto",
+        compression: str = "zstd",
+        logger: typing.Optional[systemLogger] = None,
+    ) -> None:
+        """
+        Background Telemetry Recorder of a fleet
+
+        Args:
+            robots: Robots keyed by name. Example: {"athena-01": robotComms()}
+            directory: Root of the partitioned files. Default: "telemetry"
+            rate_hz: Samples per robot per second. Default: 1Hz
+            batch_rows: Rows per robot buffered before a write. Default: 3600
+            flush_interval_s: Max age of a buffered row before a write. Default: 300s
+            max_pending_batches: Batches waiting for the writer before new ones are dropped. Default: 16
+            max_robots: Max number of robots sampled at the same time. Default: 8
+            file_format: "auto", "parquet" or "npz". Default: "auto"
+            compression: Parquet Codec. Example: "zstd", "snappy". Ignored by "npz".
+            logger: Instance of systemLogger. If not provided, initiates with log name 'telemetry_logger'
+        """
+        self.__LOGGER: systemLogger = logger or systemLogger(
+            logger_name="telemetry_logger",
+            log_file_path="logs",
+            enable_console_logging=True,
+        )
+        self.__ROBOTS: typing.Dict[str, "robotComms"] = dict(robots)
+        self.__DIRECTORY: str = directory
+        self.__PERIOD_S: float = 1.0 / rate_hz
+        self.__BATCH_ROWS: int = max(1, batch_rows)
+        self.__FLUSH_INTERVAL_S: float = flush_interval_s
+        self.__FORMAT: str = _file_format(file_format)
+        self.__COMPRESSION: str = compression
+        self.__MAX_ROBOTS: int = max(1, max_robots)
+        self.__BUFFERS: typing.Dict[str, np.ndarray] = {
+            robot_id: np.zeros(self.__BATCH_ROWS, dtype=TELEMETRY_DTYPE) for robot_id in robots
+        }
+        self.__SIZES: typing.Dict[str, int] = {robot_id: 0 for robot_id in robots}
+        self.__LOCK = threading.Lock()
+        self.__QUEUE: "queue.Queue[typing.Optional[typing.Tuple[str, np.ndarray]]]" = queue.Queue(
+            maxsize=max(1, max_pending_batches)
+        )
+        self.__SEQUENCE: int = 0
+        self.__STOP_EVENT = threading.Event()
+        self.__SAMPLER: typing.Optional[threading.Thread] = None
+        self.__WRITER: typing.Optional[threading.Thread] = None
+        self.samples: int = 0
+        self.failed: int = 0
+        self.late: int = 0
+        self.written_rows: int = 0
+        self.dropped_rows: int = 0
+        self.files: int = 0
+        self.__LOGGER.INFO(
+            f"Telemetry Recorder [{self.__FORMAT}] | Robots: {len(robots)} | "
+            f"Max Buffered: {self.max_buffered_bytes}B"
+        )
+
+    ##############################################################################################################
+    # Recording
+    ##############################################################################################################
+
+    def sample_once(self) -> int:
+        """
+        Sample every robot once, in parallel
+
+        Returns:
+            Number of robots sampled without a failed request
+        """
+        with ThreadPoolExecutor(
+            max_workers=min(self.__MAX_ROBOTS, len(self.__ROBOTS) or 1)
+        ) as pool:
+            rows = list(pool.map(self.__sample_robot, self.__ROBOTS))
+        now = time.time()
+        healthy = 0
+        with self.__LOCK:
+            for robot_id, row in zip(self.__ROBOTS, rows):
+                self.__BUFFERS[robot_id][self.__SIZES[robot_id]] = row
+                self.__SIZES[robot_id] += 1
+                self.samples += 1
+                healthy += int(row["failed_requests"] == 0)
+                if self.__SIZES[robot_id] == self.__BATCH_ROWS:
+                    self.__hand_over(robot_id)
+                elif now - self.__BUFFERS[robot_id][0]["host_time"] >= self.__FLUSH_INTERVAL_S:
+                    self.__hand_over(robot_id)
+        self.failed += len(rows) - healthy
+        return healthy
+
+    def flush(self) -> None:
+        """
+        Hand every buffered row to the writer
+        """
+        with self.__LOCK:
+            for robot_id in self.__ROBOTS:
+                self.__hand_over(robot_id)
+
+    def start(self) -> None:
+        """
+        Sample and write in background threads
+        """
+        if self.__SAMPLER is not None and self.__SAMPLER.is_alive():
+            return
+        self.__STOP_EVENT.clear()
+        self.__WRITER = threading.Thread(
+            target=self.__write_loop, name="telemetryWriter", daemon=True
+        )
+        self.__WRITER.start()
+        self.__SAMPLER = threading.Thread(
+            target=self.__sample_loop, name="telemetrySampler", daemon=True
+        )
+        self.__SAMPLER.start()
+        self.__LOGGER.INFO(f"Telemetry Recorder started at {1.0 / self.__PERIOD_S:.2f}Hz")
+
+    def stop(self) -> None:
+        """
+        Stop sampling, write the buffered rows and stop the writer
+        """
+        self.__STOP_EVENT.set()
+        if self.__SAMPLER is not None:
+            self.__SAMPLER.join()
+            self.__SAMPLER = None
+        self.flush()
+        if self.__WRITER is not None:
+            # Sentinel waits behind the pending batches => Everything queued is written
+            self.__QUEUE.put(None)
+            self.__WRITER.join()
+            self.__WRITER = None
+        else:
+            self.__drain()
+        self.__LOGGER.INFO(
+            f"Telemetry Recorder stopped | Samples: {self.samples} | Written: {self.written_rows} | "
+            f"Dropped: {self.dropped_rows} | Files: {self.files}"
+        )
+
+    def __enter__(self) -> "telemetryRecorder":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: typing.Any) -> None:
+        self.stop()
+
+    ##############################################################################################################
+    # Getters
+    ##############################################################################################################
+
+    @property
+    def file_format(self) -> str:
+        return self.__FORMAT
+
+    @property
+    def max_buffered_bytes(self) -> int:
+        """
+        Returns:
+            Upper bound of the memory held by row buffers and pending batches in bytes
+        """
+        batch_bytes = self.__BATCH_ROWS * TELEMETRY_DTYPE.itemsize
+        return batch_bytes * (len(self.__ROBOTS) + self.__QUEUE.maxsize)
+
+    def buffered_rows(self) -> int:
+        """
+        Returns:
+            Rows buffered and not handed to the writer yet
+        """
+        with self.__LOCK:
+            return sum(self.__SIZES.values())
+
+    ##############################################################################################################
+    # Private Methods
+    ##############################################################################################################
+
+    def __sample_robot(self, robot_id: str) -> np.void:
+        robot = self.__ROBOTS[robot_id]
+        row = np.zeros(1, dtype=TELEMETRY_DTYPE)[0]
+        row["host_time"] = time.time()
+        failed = 0
+
+        pose = robot.slam.get_current_robot_pose()
+        # Failed requests answer {} or the error body of the robot => Check for a field of the answer
+        if "x" in pose:
+            row["x"], row["y"], row["yaw"] = pose.get("x", 0), pose.get("y", 0), pose.get("yaw", 0)
+        else:
+            row["x"] = row["y"] = row["yaw"] = math.nan
+            failed += 1
+
+        row["localization_quality"] = robot.slam.get_localization_quality()
+
+        power = robot.system.get_power_status()
+        if "batteryPercentage" in power:
+            row["battery_percentage"] = power.get("batteryPercentage", math.nan)
+            row["is_charging"] = bool(power.get("isCharging", False))
+            status = str(power.get("dockingStatus", "unknown"))
+            row["docking_status"] = DOCKING_STATUS.index(status) if status in DOCKING_STATUS else 0
+        else:
+            row["battery_percentage"] = math.nan
+            failed += 1
+
+        speed = robot.motion.get_entity("speed")
+        if isinstance(speed, dict) and "vx" in speed:
+            row["vx"], row["vy"] = speed.get("vx", 0), speed.get("vy", 0)
+            row["omega"] = speed.get("omega", 0)
+        else:
+            row["vx"] = row["vy"] = row["omega"] = math.nan
+            failed += 1
+
+        health = robot.system.get_robot_health()
+        if "hasError" in health:
+            row["has_warning"] = bool(health.get("hasWarning", False))
+            row["has_error"] = bool(health.get("hasError", False))
+            row["has_fatal"] = bool(health.get("hasFatal", False))
+            row["base_errors"] = len(health.get("baseError") or [])
+        else:
+            row["base_errors"] = -1
+            failed += 1
+
+        row["failed_requests"] = failed
+        return row
+
+    def __hand_over(self, robot_id: str) -> None:
+        # Caller holds the lock
+        size = self.__SIZES[robot_id]
+        if size == 0:
+            return
+        batch = self.__BUFFERS[robot_id][:size].copy()
+        self.__SIZES[robot_id] = 0
+        try:
+            self.__QUEUE.put_nowait((robot_id, batch))
+        except queue.Full:
+            self.dropped_rows += size
+            self.__LOGGER.WARNING(f"Telemetry Writer behind => Dropped {size} rows of {robot_id}")
+        if self.__WRITER is None:
+            # No writer thread => Write in the caller
+            self.__drain()
+
+    def __drain(self) -> None:
+        while True:
+            try:
+                item = self.__QUEUE.get_nowait()
+            except queue.Empty:
+                return
+            if item is not None:
+                self.__write_batch(*item)
+
+    def __write_batch(self, robot_id: str, batch: np.ndarray) -> None:
+        hours = np.floor(batch["host_time"] / 3600.0).astype(np.int64)
+        for hour in np.unique(hours):
+            part = batch[hours == hour]
+            directory = _hour_directory(self.__DIRECTORY, robot_id, int(hour))
+            self.__SEQUENCE += 1
+            name = f"part-{int(part['host_time'][0] * 1000)}-{self.__SEQUENCE:06d}.{self.__FORMAT}"
+            try:
+                os.makedirs(directory, exist_ok=True)
+                # Hidden temporary file => Readers never see a partial file
+                temporary = os.path.join(directory, f".{name}")
+                if self.__FORMAT == "parquet":
+                    table = pyarrow.table(
+                        {
+                            column: np.ascontiguousarray(part[column])
+                            for column in TELEMETRY_DTYPE.names
+                        }
+                    )
+                    pyarrow.parquet.write_table(table, temporary, compression=self.__COMPRESSION)
+                else:
+                    with open(temporary, "wb") as file:
+                        np.savez_compressed(
+                            file, **{column: part[column] for column in TELEMETRY_DTYPE.names}
+                        )
+                os.replace(temporary, os.path.join(directory, name))
+            except OSError as e:
+                self.dropped_rows += len(part)
+                self.__LOGGER.ERROR(f"Telemetry Write Failed [{robot_id}] | {e}")
+                continue
+            self.written_rows += len(part)
+            self.files += 1
+
+    def __write_loop(self) -> None:
+        while True:
+            item = self.__QUEUE.get()
+            if item is None:
+                return
+            self.__write_batch(*item)
+
+    def __sample_loop(self) -> None:
+        next_tick = time.monotonic()
+        while not self.__STOP_EVENT.is_set():
+            try:
+                self.sample_once()
+            except Exception as e:
+                self.__LOGGER.ERROR(f"Telemetry Sample Failed | {e}")
+            next_tick += self.__PERIOD_S
+            delay = next_tick - time.monotonic()
+            if delay < 0:
+                # Fleet round slower than the period => Skip the missed ticks
+                self.late += 1
+                next_tick = time.monotonic()
+                delay = 0.0
+            self.__STOP_EVENT.wait(delay)
+
+
+def read_telemetry(
+    directory: str = "telemetry",
+    columns: typing.Optional[typing.List[str]] = None,
+    robots: typing.Optional[typing.List[str]] = None,
+    start: typing.Optional[float] = None,
+    end: typing.Optional[float] = None,
+) -> typing.Dict[str, np.ndarray]:
+    """
+    Load recorded telemetry. Only the requested columns and the partitions in the time range are read.
+
+    Args:
+        directory: Root of the partitioned files
+        columns: Columns of `TELEMETRY_COLUMNS` to load. "robot_id" adds the robot of every row.
+            Default: All columns and "robot_id"
+        robots: Robots to load. Default: All robots
+        start: Earliest host time in seconds since the epoch. Default: No limit
+        end: Latest host time in seconds since the epoch. Default: No limit
+
+    Returns:
+        Column Name => Array, rows sorted by robot then time
+    """
+    wanted = columns if columns is not None else [*TELEMETRY_DTYPE.names, "robot_id"]
+    stored = [name for name in wanted if name in TELEMETRY_DTYPE.names]
+    # "host_time" gives the row count and the time filter
+    loaded = stored if "host_time" in stored else stored + ["host_time"]
+    chunks: typing.Dict[str, typing.List[np.ndarray]] = {name: [] for name in wanted}
+
+    for robot_directory in sorted(glob.glob(os.path.join(directory, "robot=*"))):
+        robot_id = os.path.basename(robot_directory)[len("robot=") :]
+        if robots is not None and robot_id not in robots:
+            continue
+        for hour_directory in sorted(glob.glob(os.path.join(robot_directory, "date=*", "hour=*"))):
+            date = os.path.basename(os.path.dirname(hour_directory))[len("date=") :]
+            hour = os.path.basename(hour_directory)[len("hour=") :]
+            hour_start = datetime.datetime.strptime(f"{date} {hour}", "%Y-%m-%d %H").replace(
+                tzinfo=datetime.timezone.utc
+            )
+            if end is not None and hour_start.timestamp() > end:
+                continue
+            if start is not None and hour_start.timestamp() + 3600 <= start:
+                continue
+            for path in sorted(glob.glob(os.path.join(hour_directory, "part-*"))):
+                data = _read_part(path, loaded)
+                if data is None:
+                    continue
+                mask = np.ones(len(data["host_time"]), dtype=bool)
+                if start is not None:
+                    mask &= data["host_time"] >= start
+                if end is not None:
+                    mask &= data["host_time"] <= end
+                for name in stored:
+                    chunks[name].append(data[name][mask])
+                if "robot_id" in chunks:
+                    chunks["robot_id"].append(np.full(int(mask.sum()), robot_id))
+
+    result: typing.Dict[str, np.ndarray] = {}
+    for name in wanted:
+        if chunks[name]:
+            result[name] = np.concatenate(chunks[name])
+        elif name == "robot_id":
+            result[name] = np.array([], dtype=str)
+        else:
+            result[name] = np.array([], dtype=TELEMETRY_DTYPE[name])
+    return result
+
+
+def _read_part(
+    path: str, columns: typing.List[str]
+) -> typing.Optional[typing.Dict[str, np.ndarray]]:
+    if path.endswith(".parquet"):
+        if pyarrow is None:
+            raise ImportError("Parquet Telemetry needs pyarrow: pip install pyarrow")
+        table = pyarrow.parquet.read_table(path, columns=columns)
+        return {name: table.column(name).to_numpy() for name in columns}
+    if path.endswith(".npz"):
+        # Members of an archive are decompressed on access => Only the listed columns are read
+        with np.load(path, allow_pickle=False) as archive:
+            return {name: archive[name] for name in columns}
+    return None
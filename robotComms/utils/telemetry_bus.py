@@ -0,0 +1,604 @@
+"""
+Module to share the telemetry of one robot between local processes through shared memory.
+
+One producer process owns the robot connection and publishes every channel into a ring buffer in
+shared memory. Consumer processes (planner, UI backend, safety monitor, ...) attach by bus name and
+read the buffers directly: no HTTP request, no socket and no copy of the fixed size channels.
+
+Channels:
+    - "pose" => `slam.get_current_robot_pose()` as one `POSE_DTYPE` record
+    - "laserscan" => `system.get_laserscan()` as one `laserscan_dtype(max_points)` record
+    - "health" => `system.get_robot_health()` as JSON
+    - "events" => New events of `platform.get_events()`, one JSON message per event
+
+Shared Memory Layout (one segment per channel, named "<bus name>.<channel>"):
+    -> Header: `HEADER_DTYPE`. "head" is the sequence of the last published message.
+    -> `capacity` slots of `slot_dtype(payload_size)`. Message `n` goes to slot `(n - 1) % capacity`.
+
+Each slot is guarded by its sequence: the producer clears it, writes the payload and then stores the
+sequence of the message. A reader takes a message only when the slot holds the same sequence before
+and after the read. Views returned with `copy=False` stay valid until the producer wraps around the
+ring, `telemetryBusReader.valid()` tells when that happened.
+
+Run the producer:
+    bus = telemetryBus(robotComms(), name="athena-01")
+    bus.start()
+
+Read in another process:
+    reader = telemetryBusReader("athena-01")
+    sequence, host_time, pose = reader.latest("pose")
+"""
+
+# Custom Packages
+from .logger import systemLogger
+from .results import DictType
+from .decoders import get_decoder
+from .event_stream import eventStream
+
+# Imported Packages
+from multiprocessing import shared_memory
+import json
+import mmap
+import os
+import threading
+import time
+import typing
+
+import numpy as np
+
+try:
+    import _posixshmem
+except ImportError:  # pragma: no cover - Windows
+    _posixshmem = None
+
+if typing.TYPE_CHECKING:
+    from robotComms.robotComms import robotComms
+
+MessageType = typing.Tuple[int, float, typing.Any]
+
+CHANNELS: typing.List[str] = ["pose", "laserscan", "health", "events"]
+# Polls per second of every channel. 0 => Only `publish()` writes the channel.
+DEFAULT_RATES_HZ: typing.Dict[str, float] = {
+    "pose": 10.0,
+    "laserscan": 5.0,
+    "health": 1.0,
+    "events": 2.0,
+}
+
+# Field every answer of a polled channel has. Failed requests answer {} or the error body of the robot.
+_ANSWER_FIELDS: typing.Dict[str, str] = {
+    "pose": "x",
+    "laserscan": "laser_points",
+    "health": "hasError",
+}
+
+# "TBUS" => Marks a segment written by this module
+_MAGIC: int = 0x53554254
+
+HEADER_DTYPE: np.dtype = np.dtype(
+    [
+        ("magic", "<u8"),
+        ("capacity", "<u8"),
+        ("payload_size", "<u8"),
+        ("max_points", "<u8"),
+        ("head", "<u8"),
+    ]
+)
+POSE_DTYPE: np.dtype = np.dtype(
+    [
+        ("x", "<f8"),
+        ("y", "<f8"),
+        ("z", "<f8"),
+        ("yaw", "<f8"),
+        ("pitch", "<f8"),
+        ("roll", "<f8"),
+    ]
+)
+
+
+def laserscan_dtype(max_points: int) -> np.dtype:
+    """
+    Record of one laser scan. Only the first "count" points are set.
+
+    Args:
+        max_points: Points a record can hold
+
+    Returns:
+        Structured dtype with the pose of the scan and one array per point field
+    """
+    return np.dtype(
+        [
+            ("x", "<f8"),
+            ("y", "<f8"),
+            ("yaw", "<f8"),
+            ("count", "<u4"),
+            ("angle", "<f4", (max_points,)),
+            ("distance", "<f4", (max_points,)),
+            ("valid", "?", (max_points,)),
+        ]
+    )
+
+
+def slot_dtype(payload_size: int) -> np.dtype:
+    """
+    Args:
+        payload_size: Max payload bytes of a message
+
+    Returns:
+        Structured dtype of one ring slot
+    """
+    return np.dtype(
+        [
+            ("sequence", "<u8"),
+            ("host_time", "<f8"),
+            ("length", "<u8"),
+            ("payload", "u1", (payload_size,)),
+        ]
+    )
+
+
+def _segment_name(name: str, channel: str) -> str:
+    return f"{name}.{channel}"
+
+
+def _attach_read_only(segment: str) -> typing.Tuple[typing.Any, typing.Callable[[], None]]:
+    if _posixshmem is None:  # pragma: no cover - Windows
+        # Windows frees a segment with its last handle => No tracker involved
+        memory = shared_memory.SharedMemory(name=segment)
+        return memory.buf, memory.close
+    # Mapped without `SharedMemory` => The segment is not registered with the resource tracker of
+    # this process, which would remove it when the process exits, and the pages are read-only
+    descriptor = _posixshmem.shm_open(f"/{segment}", os.O_RDONLY, mode=0)
+    try:
+        mapping = mmap.mmap(descriptor, os.fstat(descriptor).st_size, prot=mmap.PROT_READ)
+    finally:
+        os.close(descriptor)
+    return mapping, mapping.close
+
+
+class _ringBuffer:
+    def __init__(self, segment: str, buffer: typing.Any, close: typing.Callable[[], None]) -> None:
+        """
+        Header and slots of one channel, as NumPy views over the shared memory
+
+        Args:
+            segment: Name of the shared memory segment
+            buffer: Mapping of the segment. Read-only mappings give read-only views.
+            close: Unmaps the segment
+        """
+        self.segment: str = segment
+        self.header: np.ndarray = np.ndarray((), dtype=HEADER_DTYPE, buffer=buffer)
+        if int(self.header["magic"]) != _MAGIC:
+            raise ValueError(f"Shared Memory {segment} is not a telemetry bus channel")
+        self.capacity: int = int(self.header["capacity"])
+        self.payload_size: int = int(self.header["payload_size"])
+        self.max_points: int = int(self.header["max_points"])
+        self.slots: np.ndarray = np.ndarray(
+            (self.capacity,),
+            dtype=slot_dtype(self.payload_size),
+            buffer=buffer,
+            offset=HEADER_DTYPE.itemsize,
+        )
+        self.__CLOSE = close
+
+    @staticmethod
+    def size(capacity: int, payload_size: int) -> int:
+        return HEADER_DTYPE.itemsize + capacity * slot_dtype(payload_size).itemsize
+
+    def release(self) -> None:
+        # Views hold exports of the buffer => Dropped before the segment can close
+        del self.header
+        del self.slots
+        self.__CLOSE()
+
+
+class telemetryBus:
+    def __init__(
+        self,
+        robot: "robotComms",
+        name: str = "robotComms",
+        capacity: int = 64,
+        max_laser_points: int = 2048,
+        max_message_bytes: int = 16 * 1024,
+        rates_hz: typing.Optional[typing.Dict[str, float]] = None,
+        logger: typing.Optional[systemLogger] = None,
+    ) -> None:
+        """
+        Producer of the telemetry bus. Creates the shared memory of every channel.
+
+        Args:
+            robot: Robot whose telemetry is published. Its connection is the only one to the robot.
+            name: Bus Name the readers attach to. Unique per robot on the host. Default: "robotComms"
+            capacity: Messages kept per channel. Default: 64
+            max_laser_points: Points per published scan. Longer scans are cut. Default: 2048
+            max_message_bytes: Max JSON size of a "health" or "events" message. Default: 16 KiB
+            rates_hz: Polls per second per channel. Missing channels use `DEFAULT_RATES_HZ`.
+            logger: Instance of systemLogger. If not provided, initiates with log name 'telemetryBus_logger'
+        """
+        self.__LOGGER: systemLogger = logger or systemLogger(
+            logger_name="telemetryBus_logger",
+            log_file_path="logs",
+            enable_console_logging=True,
+        )
+        self.__ROBOT = robot
+        self.__NAME: str = name
+        self.__RATES_HZ: typing.Dict[str, float] = {**DEFAULT_RATES_HZ, **(rates_hz or {})}
+        self.__LASER_DTYPE: np.dtype = laserscan_dtype(max(1, max_laser_points))
+        self.__EVENTS: typing.Optional[eventStream] = None
+        self.__LOCKS: typing.Dict[str, threading.Lock] = {
+            channel: threading.Lock() for channel in CHANNELS
+        }
+        self.__STOP_EVENT = threading.Event()
+        self.__WORKERS: typing.List[threading.Thread] = []
+        self.published: typing.Dict[str, int] = {channel: 0 for channel in CHANNELS}
+        self.failed: typing.Dict[str, int] = {channel: 0 for channel in CHANNELS}
+        self.dropped: typing.Dict[str, int] = {channel: 0 for channel in CHANNELS}
+
+        payload_sizes = {
+            "pose": POSE_DTYPE.itemsize,
+            "laserscan": self.__LASER_DTYPE.itemsize,
+            "health": max_message_bytes,
+            "events": max_message_bytes,
+        }
+        self.__MEMORY: typing.Dict[str, shared_memory.SharedMemory] = {}
+        self.__RINGS: typing.Dict[str, _ringBuffer] = {}
+        for channel in CHANNELS:
+            memory = self.__MEMORY[channel] = shared_memory.SharedMemory(
+                name=_segment_name(name, channel),
+                create=True,
+                size=_ringBuffer.size(max(1, capacity), payload_sizes[channel]),
+            )
+            header = np.ndarray((), dtype=HEADER_DTYPE, buffer=memory.buf)
+            header["capacity"] = max(1, capacity)
+            header["payload_size"] = payload_sizes[channel]
+            header["max_points"] = self.__LASER_DTYPE["angle"].shape[0]
+            header["head"] = 0
+            # Written last => A reader attaching meanwhile sees no valid segment yet
+            header["magic"] = _MAGIC
+            del header
+            self.__RINGS[channel] = _ringBuffer(memory.name, memory.buf, memory.close)
+        self.__LOGGER.INFO(
+            f"Telemetry Bus {name} | Channels: {CHANNELS} | "
+            f"Shared Memory: {sum(memory.size for memory in self.__MEMORY.values())}B"
+        )
+
+    ##############################################################################################################
+    # Publishing
+    ##############################################################################################################
+
+    def publish(self, channel: str, value: typing.Any) -> int:
+        """
+        Write one message into a channel
+
+        Args:
+            channel: One of `CHANNELS`
+            value: Response of the API call of the channel. Example: pose dictionary for "pose"
+
+        Returns:
+            Sequence of the message. 0 => Dropped, the JSON message exceeds `max_message_bytes`.
+        """
+        ring = self.__RINGS[channel]
+        with self.__LOCKS[channel]:
+            sequence = int(ring.header["head"]) + 1
+            slot = ring.slots[(sequence - 1) % ring.capacity]
+            slot["sequence"] = 0
+            if channel == "pose":
+                record = slot["payload"].view(POSE_DTYPE)[0]
+                for field in POSE_DTYPE.names:
+                    record[field] = value.get(field, 0.0)
+                slot["length"] = POSE_DTYPE.itemsize
+            elif channel == "laserscan":
+                slot["length"] = self.__write_laserscan(slot["payload"], value)
+            else:
+                body = json.dumps(value, separators=(",", ":")).encode("utf-8")
+                if len(body) > ring.payload_size:
+                    # Slot left cleared => Readers skip it like an overwritten message
+                    self.dropped[channel] += 1
+                    self.__LOGGER.WARNING(
+                        f"Telemetry Bus {channel} message too large: {len(body)}B"
+                    )
+                    return 0
+                slot["payload"][: len(body)] = np.frombuffer(body, dtype=np.uint8)
+                slot["length"] = len(body)
+            slot["host_time"] = time.time()
+            slot["sequence"] = sequence
+            ring.header["head"] = sequence
+        self.published[channel] += 1
+        return sequence
+
+    def poll_once(self, channel: str) -> int:
+        """
+        Fetch a channel from the robot once and publish it
+
+        Args:
+            channel: One of `CHANNELS`
+
+        Returns:
+            Number of published messages
+        """
+        if channel == "pose":
+            values = [self.__ROBOT.slam.get_current_robot_pose()]
+        elif channel == "laserscan":
+            values = [self.__ROBOT.system.get_laserscan()]
+        elif channel == "health":
+            values = [self.__ROBOT.system.get_robot_health()]
+        elif channel == "events":
+            if self.__EVENTS is None:
+                self.__EVENTS = eventStream(self.__ROBOT.platform, logger=self.__LOGGER)
+            values = self.__EVENTS.poll_once()
+        else:
+            raise ValueError(f"Invalid Channel: {channel}")
+        if channel != "events" and _ANSWER_FIELDS[channel] not in values[0]:
+            self.failed[channel] += 1
+            return 0
+        return sum(1 for value in values if self.publish(channel, value))
+
+    def start(self) -> None:
+        """
+        Poll every channel with a positive rate in its own thread
+        """
+        if any(worker.is_alive() for worker in self.__WORKERS):
+            return
+        self.__STOP_EVENT.clear()
+        self.__WORKERS = [
+            threading.Thread(
+                target=self.__poll_loop,
+                args=(channel, 1.0 / rate),
+                name=f"telemetryBus.{channel}",
+                daemon=True,
+            )
+            for channel, rate in self.__RATES_HZ.items()
+            if channel in self.__RINGS and rate > 0
+        ]
+        for worker in self.__WORKERS:
+            worker.start()
+        self.__LOGGER.INFO(f"Telemetry Bus {self.__NAME} started | Rates: {self.__RATES_HZ}")
+
+    def stop(self) -> None:
+        """
+        Stop polling. The shared memory stays readable.
+        """
+        self.__STOP_EVENT.set()
+        for worker in self.__WORKERS:
+            worker.join()
+        self.__WORKERS = []
+        self.__LOGGER.INFO(
+            f"Telemetry Bus {self.__NAME} stopped | Published: {self.published} | Failed: {self.failed}"
+        )
+
+    def close(self) -> None:
+        """
+        Stop polling and remove the shared memory. Attached readers keep their mapping until they close.
+        """
+        self.stop()
+        for channel, ring in self.__RINGS.items():
+            ring.release()
+            self.__MEMORY[channel].unlink()
+        self.__RINGS = {}
+        self.__MEMORY = {}
+
+    def __enter__(self) -> "telemetryBus":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: typing.Any) -> None:
+        self.close()
+
+    ##############################################################################################################
+    # Getters
+    ##############################################################################################################
+
+    @property
+    def name(self) -> str:
+        return self.__NAME
+
+    ##############################################################################################################
+    # Private Methods
+    ##############################################################################################################
+
+    def __write_laserscan(self, payload: np.ndarray, scan: DictType) -> int:
+        record = payload.view(self.__LASER_DTYPE)[0]
+        pose = scan.get("pose") or {}
+        record["x"], record["y"] = pose.get("x", 0.0), pose.get("y", 0.0)
+        record["yaw"] = pose.get("yaw", 0.0)
+        points = (scan.get("laser_points") or [])[: record["angle"].shape[0]]
+        count = len(points)
+        record["count"] = count
+        if count:
+            record["angle"][:count] = [point.get("angle", 0.0) for point in points]
+            record["distance"][:count] = [point.get("distance", 0.0) for point in points]
+            record["valid"][:count] = [bool(point.get("valid", False)) for point in points]
+        return self.__LASER_DTYPE.itemsize
+
+    def __poll_loop(self, channel: str, period_s: float) -> None:
+        next_tick = time.monotonic()
+        while not self.__STOP_EVENT.is_set():
+            try:
+                self.poll_once(channel)
+            except Exception as e:
+                self.failed[channel] += 1
+                self.__LOGGER.ERROR(f"Telemetry Bus {channel} Poll Failed | {e}")
+            next_tick += period_s
+            delay = next_tick - time.monotonic()
+            if delay < 0:
+                # Robot slower than the rate => Skip the missed ticks
+                next_tick = time.monotonic()
+                delay = 0.0
+            self.__STOP_EVENT.wait(delay)
+
+
+class telemetryBusReader:
+    def __init__(
+        self,
+        name: str = "robotComms",
+        channels: typing.Optional[typing.List[str]] = None,
+        decoder: str = "auto",
+    ) -> None:
+        """
+        Consumer of the telemetry bus. Maps the shared memory of a running `telemetryBus` read-only.
+
+        Args:
+            name: Bus Name of the producer. Default: "robotComms"
+            channels: Channels to attach. Default: Every channel
+            decoder: JSON Decoder of the "health" and "events" channels. See `get_decoder()`.
+        """
+        self.__NAME: str = name
+        self.__DECODE = get_decoder(decoder)
+        self.__RINGS: typing.Dict[str, _ringBuffer] = {}
+        for channel in channels or CHANNELS:
+            segment = _segment_name(name, channel)
+            self.__RINGS[channel] = _ringBuffer(segment, *_attach_read_only(segment))
+        self.lost: typing.Dict[str, int] = {channel: 0 for channel in self.__RINGS}
+
+    ##############################################################################################################
+    # Reading
+    ##############################################################################################################
+
+    def sequence(self, channel: str) -> int:
+        """
+        Returns:
+            Sequence of the last published message of a channel. 0 => Nothing published yet.
+        """
+        return int(self.__RINGS[channel].header["head"])
+
+    def latest(self, channel: str, copy: bool = True) -> typing.Optional[MessageType]:
+        """
+        Read the last message of a channel
+
+        Args:
+            channel: One of the attached channels
+            copy: False => "pose" and "laserscan" are returned as read-only views into the shared
+                memory. Check them with `valid()` after use, the producer overwrites them after
+                `capacity` messages.
+
+        Returns:
+            (sequence, host time of the publish, value). None => Nothing published yet.
+            Values: `POSE_DTYPE` record for "pose", `laserscan_dtype()` record for "laserscan",
+            decoded JSON for "health" and "events".
+        """
+        for _ in range(3):
+            sequence = self.sequence(channel)
+            if sequence == 0:
+                return None
+            message = self.__read(channel, sequence, copy)
+            if message is not None:
+                return message
+        return None
+
+    def read_since(
+        self, channel: str, sequence: int, copy: bool = True
+    ) -> typing.List[MessageType]:
+        """
+        Read the messages published after a sequence, oldest first
+
+        Messages already overwritten by the producer are counted in `lost[channel]`.
+
+        Args:
+            channel: One of the attached channels
+            sequence: Sequence of the last message the caller has. 0 => Every message in the ring
+            copy: See `latest()`
+
+        Returns:
+            Messages as (sequence, host time of the publish, value)
+        """
+        ring = self.__RINGS[channel]
+        head = self.sequence(channel)
+        first = max(sequence + 1, head - ring.capacity + 1, 1)
+        if sequence and first > sequence + 1:
+            self.lost[channel] += first - sequence - 1
+        messages = []
+        for current in range(first, head + 1):
+            message = self.__read(channel, current, copy)
+            if message is None:
+                self.lost[channel] += 1
+                continue
+            messages.append(message)
+        return messages
+
+    def wait(
+        self,
+        channel: str,
+        sequence: int,
+        timeout_s: typing.Optional[float] = None,
+        poll_interval_s: float = 0.0005,
+    ) -> int:
+        """
+        Wait until a message newer than `sequence` is published
+
+        Args:
+            channel: One of the attached channels
+            sequence: Sequence of the last message the caller has
+            timeout_s: Max wait in seconds. None => No limit
+            poll_interval_s: Sleep between two checks. 0 => Spin, lowest latency for a full CPU core.
+
+        Returns:
+            Sequence of the last published message. Unchanged `sequence` on timeout.
+        """
+        deadline = None if timeout_s is None else time.monotonic() + timeout_s
+        while True:
+            head = self.sequence(channel)
+            if head > sequence:
+                return head
+            if deadline is not None and time.monotonic() >= deadline:
+                return sequence
+            time.sleep(poll_interval_s)
+
+    def valid(self, channel: str, sequence: int) -> bool:
+        """
+        Returns:
+            True while the slot of a message still holds it, i.e. a view of it was not overwritten
+        """
+        ring = self.__RINGS[channel]
+        return int(ring.slots["sequence"][(sequence - 1) % ring.capacity]) == sequence
+
+    def close(self) -> None:
+        """
+        Detach from the shared memory. Views returned with `copy=False` must not be used afterwards.
+        """
+        for ring in self.__RINGS.values():
+            ring.release()
+        self.__RINGS = {}
+
+    def __enter__(self) -> "telemetryBusReader":
+        return self
+
+    def __exit__(self, *exc_info: typing.Any) -> None:
+        self.close()
+
+    ##############################################################################################################
+    # Getters
+    ##############################################################################################################
+
+    @property
+    def name(self) -> str:
+        return self.__NAME
+
+    @property
+    def channels(self) -> typing.List[str]:
+        return list(self.__RINGS)
+
+    ##############################################################################################################
+    # Private Methods
+    ##############################################################################################################
+
+    def __read(self, channel: str, sequence: int, copy: bool) -> typing.Optional[MessageType]:
+        ring = self.__RINGS[channel]
+        slot = ring.slots[(sequence - 1) % ring.capacity]
+        if int(slot["sequence"]) != sequence:
+            return None
+        host_time = float(slot["host_time"])
+        length = int(slot["length"])
+        if channel == "pose":
+            value: typing.Any = slot["payload"].view(POSE_DTYPE)[0]
+        elif channel == "laserscan":
+            value = slot["payload"].view(laserscan_dtype(ring.max_points))[0]
+        else:
+            value = bytes(slot["payload"][:length])
+        if copy and not isinstance(value, bytes):
+            value = value.copy()
+        # Sequence unchanged after the read => The producer did not write the slot meanwhile
+        if int(slot["sequence"]) != sequence:
+            return None
+        if isinstance(value, bytes):
+            value = self.__DECODE(value)
+        return sequence, host_time, value
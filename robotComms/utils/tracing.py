@@ -0,0 +1,421 @@
+"""
+Module with the request tracing hooks of `restAdapter` and the API classes.
+
+Spans:
+    -> One "api" span per public API class call. Example: "motion.get_action"
+    -> One "request" span per HTTP request, child of the API call that issued it
+    -> The time of a request is split into phases: "prepare", "network", "decode" and "log"
+
+Hook Points:
+    - "before_send" => Request about to be sent
+    - "after_receive" => Response headers and body received
+    - "after_decode" => Body decoded
+    - "on_error" => Timeout or connection error
+    - "on_finish" => Span ended. Exporters listen here.
+
+API spans carry the method name, the robot id and, for `motion`, the action id. Extra context is kept in a `contextvars.ContextVar`, so it follows
+the calling thread or asyncio task down to the transport. Set it with `trace_context()`.
+
+With no hook registered the tracer is inactive and every traced call costs one attribute check.
+"""
+
+# Custom Packages
+from .results import DictType
+
+# Imported Packages
+import contextlib
+import contextvars
+import functools
+import inspect
+import itertools
+import json
+import os
+import threading
+import time
+import typing
+from urllib.parse import urlsplit
+
+HOOK_POINTS: typing.Tuple[str, ...] = (
+    "before_send",
+    "after_receive",
+    "after_decode",
+    "on_error",
+    "on_finish",
+)
+
+HookType = typing.Callable[["traceSpan"], None]
+
+_CONTEXT: contextvars.ContextVar[typing.Optional[DictType]] = contextvars.ContextVar(
+    "trace_context", default=None
+)
+_CURRENT_SPAN: contextvars.ContextVar[typing.Optional["traceSpan"]] = contextvars.ContextVar(
+    "trace_span", default=None
+)
+_SPAN_IDS = itertools.count(1)
+
+
+class traceSpan:
+    __slots__ = (
+        "name",
+        "category",
+        "span_id",
+        "parent_id",
+        "thread_id",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "phases",
+        "error",
+        "_mark_ns",
+        "_tracer",
+    )
+
+    def __init__(
+        self,
+        tracer: "requestTracer",
+        name: str,
+        category: str,
+        attributes: DictType,
+        parent: typing.Optional["traceSpan"] = None,
+    ) -> None:
+        """
+        Timed operation. Created by `requestTracer`, not by hand.
+
+        Args:
+            tracer: Owning Tracer
+            name: Example: "motion.get_action" or "GET motion/actions/:current"
+            category: "api" or "request"
+            attributes: Context of the span. Example: {"robot_id": "...", "action_id": 3}
+            parent: Enclosing Span
+        """
+        self._tracer: "requestTracer" = tracer
+        self.name: str = name
+        self.category: str = category
+        self.span_id: int = next(_SPAN_IDS)
+        self.parent_id: typing.Optional[int] = parent.span_id if parent is not None else None
+        self.thread_id: int = threading.get_ident()
+        self.start_ns: int = time.perf_counter_ns()
+        self.end_ns: int = 0
+        self.attributes: DictType = attributes
+        self.phases: typing.Dict[str, typing.Tuple[int, int]] = {}
+        self.error: str = ""
+        self._mark_ns: int = self.start_ns
+
+    @property
+    def duration_s(self) -> float:
+        end_ns = self.end_ns or time.perf_counter_ns()
+        return (end_ns - self.start_ns) / 1e9
+
+    def phase_s(self, phase: str) -> float:
+        """
+        Returns:
+            Time spent in a phase in seconds. 0.0 if the phase did not occur.
+        """
+        return self.phases.get(phase, (0, 0))[1] / 1e9
+
+    def mark(self, phase: str) -> None:
+        """
+        Close a phase. The time since the previous mark is added to `phase`.
+        """
+        now = time.perf_counter_ns()
+        start, total = self.phases.get(phase, (self._mark_ns, 0))
+        self.phases[phase] = (start, total + now - self._mark_ns)
+        self._mark_ns = now
+
+    def before_send(self) -> None:
+        self.mark("prepare")
+        self._tracer.emit("before_send", self)
+
+    def after_receive(self, status_code: int, bytes_in: int = 0) -> None:
+        self.mark("network")
+        self.attributes["status_code"] = status_code
+        self.attributes["bytes_in"] = bytes_in
+        self._tracer.emit("after_receive", self)
+
+    def after_decode(self) -> None:
+        self.mark("decode")
+        self._tracer.emit("after_decode", self)
+
+    def fail(self, error: BaseException) -> None:
+        self.mark("network")
+        self.error = f"{type(error).__name__}: {error}"
+        self._tracer.emit("on_error", self)
+
+    def summary(self) -> DictType:
+        """
+        Returns:
+            Span as Dictionary
+        """
+        return {
+            "name": self.name,
+            "category": self.category,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "thread_id": self.thread_id,
+            "duration_s": self.duration_s,
+            "phases_s": {phase: total / 1e9 for phase, (_start, total) in self.phases.items()},
+            "attributes": dict(self.attributes),
+            "error": self.error,
+        }
+
+
+class requestTracer:
+    def __init__(self) -> None:
+        """
+        Registry of the tracing hooks. Use the process-wide instance from `get_tracer()`.
+        """
+        self.__HOOKS: typing.Dict[str, typing.List[HookType]] = {point: [] for point in HOOK_POINTS}
+        self.__LOCK = threading.Lock()
+        # Read on every traced call => Plain attribute, no lock
+        self.active: bool = False
+
+    ##############################################################################################################
+    # Hooks
+    ##############################################################################################################
+
+    def add_hook(self, point: str, hook: HookType) -> None:
+        """
+        Register a hook
+
+        Args:
+            point: One of `HOOK_POINTS`
+            hook: Callable taking the span. Exceptions raised by hooks are swallowed.
+        """
+        if point not in HOOK_POINTS:
+            raise ValueError(f"Invalid Hook Point: {point}")
+        with self.__LOCK:
+            # Copy on write => `emit` iterates without the lock
+            self.__HOOKS = {**self.__HOOKS, point: self.__HOOKS[point] + [hook]}
+            self.active = True
+
+    def remove_hook(self, point: str, hook: HookType) -> None:
+        with self.__LOCK:
+            hooks = [
+                registered for registered in self.__HOOKS.get(point, []) if registered is not hook
+            ]
+            self.__HOOKS = {**self.__HOOKS, point: hooks}
+            self.active = any(self.__HOOKS.values())
+
+    def add_exporter(self, exporter: "chromeTraceExporter") -> None:
+        """
+        Send every finished span to an exporter
+        """
+        self.add_hook("on_finish", exporter.export)
+
+    def remove_exporter(self, exporter: "chromeTraceExporter") -> None:
+        self.remove_hook("on_finish", exporter.export)
+
+    def emit(self, point: str, span: traceSpan) -> None:
+        for hook in self.__HOOKS[point]:
+            try:
+                hook(span)
+            except Exception:
+                # A broken hook must never break a robot request
+                pass
+
+    ##############################################################################################################
+    # Spans
+    ##############################################################################################################
+
+    def start_span(self, name: str, category: str, **attributes: typing.Any) -> traceSpan:
+        """
+        Open a span under the current span and context
+
+        Args:
+            name: Span Name
+            category: "api" or "request"
+            attributes: Extra attributes. They override the context values.
+
+        Returns:
+            Span. Pass it to `end_span()` once done.
+        """
+        return traceSpan(
+            self,
+            name,
+            category,
+            {**(_CONTEXT.get() or {}), **attributes},
+            parent=_CURRENT_SPAN.get(),
+        )
+
+    def end_span(self, span: traceSpan) -> None:
+        span.end_ns = time.perf_counter_ns()
+        self.emit("on_finish", span)
+
+    def request_span(self, method: str, url: str) -> traceSpan:
+        """
+        Open the span of an HTTP request. Called by `restAdapter`.
+        """
+        split = urlsplit(url)
+        span = self.start_span(f"{method} {split.path}", "request", method=method, url=url)
+        span.attributes.setdefault("robot_id", split.netloc)
+        return span
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str = "api", **attributes: typing.Any):
+        """
+        Trace a block as a span. Requests issued inside become its children.
+
+        Args:
+            name: Span Name. Example: "mission.go_to_dock"
+            category: Span Category. Default: "api"
+            attributes: Extra attributes of the span
+        """
+        if not self.active:
+            yield None
+            return
+        span = self.start_span(name, category, **attributes)
+        token = _CURRENT_SPAN.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _CURRENT_SPAN.reset(token)
+            self.end_span(span)
+
+
+_TRACER = requestTracer()
+
+
+def get_tracer() -> requestTracer:
+    """
+    Returns:
+        Process-wide Tracer used by `restAdapter` and the API classes
+    """
+    return _TRACER
+
+
+@contextlib.contextmanager
+def trace_context(**attributes: typing.Any):
+    """
+    Add context to every span opened inside the block, including the spans of other threads or
+    tasks started with a copy of the current context.
+
+    Args:
+        attributes: Example: robot_id="athena-03", action_id=12
+    """
+    token = _CONTEXT.set({**(_CONTEXT.get() or {}), **attributes})
+    try:
+        yield
+    finally:
+        _CONTEXT.reset(token)
+
+
+def traced_api(
+    cls: typing.Optional[type] = None,
+    *,
+    arguments: typing.Optional[typing.Dict[str, str]] = None,
+):
+    """
+    Class Decorator tracing every public method of an API class as an "api" span
+
+    Args:
+        cls: API Class
+        arguments: Method arguments copied into the span attributes. Example: {"id": "action_id"}
+    """
+
+    def decorate(api_cls: type) -> type:
+        for name, method in list(vars(api_cls).items()):
+            # Generators return before their work starts => Their requests trace on their own
+            if name.startswith("_") or not inspect.isfunction(method):
+                continue
+            if inspect.isgeneratorfunction(method):
+                continue
+            setattr(api_cls, name, _traced_method(api_cls.__name__, method, arguments or {}))
+        return api_cls
+
+    return decorate(cls) if cls is not None else decorate
+
+
+def _traced_method(
+    class_name: str, method: typing.Callable[..., typing.Any], arguments: typing.Dict[str, str]
+) -> typing.Callable[..., typing.Any]:
+    span_name = f"{class_name}.{method.__name__}"
+    ip_attribute = f"_{class_name}__IP_ADDR"
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(*args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+        if not _TRACER.active:
+            return method(*args, **kwargs)
+        # API classes keep their robot address as a private `__IP_ADDR`
+        robot_id = str(getattr(args[0], ip_attribute, "")).split("://")[-1]
+        attributes: DictType = {"robot_id": robot_id}
+        if arguments:
+            bound = signature.bind_partial(*args, **kwargs).arguments
+            for argument, attribute in arguments.items():
+                if bound.get(argument) is not None:
+                    attributes[attribute] = bound[argument]
+        with _TRACER.span(span_name, "api", **attributes):
+            return method(*args, **kwargs)
+
+    return wrapper
+
+
+class chromeTraceExporter:
+    def __init__(self, file_path: str) -> None:
+        """
+        Write finished spans to a Chrome Trace Event file. Open it in https://ui.perfetto.dev or
+        chrome://tracing. Request phases are written as nested slices of their request.
+
+        Args:
+            file_path: Output File. Example: "logs/trace.json"
+        """
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file_path: str = file_path
+        self.__FILE = open(file_path, "w")
+        self.__FILE.write("[")
+        self.__LOCK = threading.Lock()
+        self.__FIRST: bool = True
+        self.__PID: int = os.getpid()
+        # perf_counter has no epoch => Anchor it to the wall clock once
+        self.__EPOCH_NS: int = time.time_ns() - time.perf_counter_ns()
+
+    def export(self, span: traceSpan) -> None:
+        events = [self.__event(span.name, span.category, span.start_ns, span.end_ns, span)]
+        for phase, (start_ns, total_ns) in span.phases.items():
+            events.append(self.__event(phase, "phase", start_ns, start_ns + total_ns, span))
+        lines = [json.dumps(event, default=str) for event in events]
+        with self.__LOCK:
+            if self.__FILE.closed:
+                return
+            for line in lines:
+                self.__FILE.write(("\n" if self.__FIRST else ",\n") + line)
+                self.__FIRST = False
+
+    def flush(self) -> None:
+        with self.__LOCK:
+            if not self.__FILE.closed:
+                self.__FILE.flush()
+
+    def close(self) -> None:
+        """
+        Terminate the JSON array and close the file
+        """
+        with self.__LOCK:
+            if not self.__FILE.closed:
+                self.__FILE.write("\n]\n")
+                self.__FILE.close()
+
+    def __event(
+        self, name: str, category: str, start_ns: int, end_ns: int, span: traceSpan
+    ) -> DictType:
+        args = dict(span.attributes)
+        if category != "phase":
+            args["span_id"] = span.span_id
+            args["parent_id"] = span.parent_id
+            if span.error:
+                args["error"] = span.error
+        return {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start_ns + self.__EPOCH_NS) / 1000.0,
+            "dur": max(0, end_ns - start_ns) / 1000.0,
+            "pid": self.__PID,
+            "tid": span.thread_id,
+            "args": args,
+        }
@@ -0,0 +1,42 @@
+"""
+Fixtures of the test suite. Every test runs against `robotComms.utils.simulator`, no robot needed.
+
+Run:
+    python -m pytest -q
+"""
+
+# Custom Packages
+from robotComms.utils.logger import systemLogger
+from robotComms.utils.simulator import robotSimulator, simulatedRobot, simulatorClient
+
+# Imported Packages
+import typing
+
+import pytest
+
+# Simulated seconds per real second => A 5s delivery task takes 10ms
+TIME_SCALE: float = 500.0
+
+
+@pytest.fixture(scope="session")
+def logger(tmp_path_factory: pytest.TempPathFactory) -> systemLogger:
+    return systemLogger(
+        logger_name="test_logger",
+        log_file_path=str(tmp_path_factory.mktemp("logs")),
+        enable_console_logging=False,
+    )
+
+
+@pytest.fixture
+def simulator(logger: systemLogger) -> typing.Iterator[robotSimulator]:
+    simulator = robotSimulator(port=0, robot=simulatedRobot(time_scale=TIME_SCALE), logger=logger)
+    simulator.start()
+    yield simulator
+    simulator.stop()
+
+
+@pytest.fixture
+def client(simulator: robotSimulator, logger: systemLogger) -> typing.Iterator[simulatorClient]:
+    client = simulator.connect(logger)
+    yield client
+    client.close()
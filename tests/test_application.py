@@ -0,0 +1,81 @@
+"""
+Tests of `robotComms.api_classes.application`: the cached app list, batched configuration reads and
+writes and the invalidation after changes against the simulator
+"""
+
+# Custom Packages
+from robotComms.utils.simulator import robotSimulator, simulatorClient
+
+# Imported Packages
+import pathlib
+import threading
+
+APPS: str = "/api/core/application/v1/apps"
+DELIVERY: str = "com.slamtec.delivery"
+CONFIG: str = f"{APPS}/{DELIVERY}/config"
+
+
+def test_app_list_is_fetched_once(simulator: robotSimulator, client: simulatorClient):
+    assert [app["package_name"] for app in client.application.get_apps()] == [DELIVERY]
+    assert client.application.get_app(DELIVERY)["state"] == "RUNNING"
+    assert client.application.get_app("com.example.missing") == {}
+    assert simulator.request_counts()[f"GET {APPS}"] == 1
+
+    client.application.get_apps(refresh=True)
+    assert simulator.request_counts()[f"GET {APPS}"] == 2
+
+
+def test_failed_app_list_is_not_cached(simulator: robotSimulator, client: simulatorClient):
+    simulator.inject_failure(APPS, status_code=500)
+    assert client.application.get_apps() == []
+    assert client.application.get_app(DELIVERY)["package_name"] == DELIVERY
+    assert simulator.request_counts()[f"GET {APPS}"] == 2
+
+
+def test_config_keys_are_read_from_one_request(simulator: robotSimulator, client: simulatorClient):
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(client.application.get_config(DELIVERY, ["volume"]))
+        )
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [{"volume": 80}] * 8
+    assert client.application.get_config(DELIVERY, ["language", "missing"]) == {"language": "en"}
+    assert simulator.request_counts()[f"GET {CONFIG}"] == 1
+
+
+def test_written_config_is_read_back(simulator: robotSimulator, client: simulatorClient):
+    assert client.application.get_config(DELIVERY) == {"volume": 80, "language": "en"}
+    assert client.application.set_config(DELIVERY, {"volume": 60})
+    assert client.application.get_config(DELIVERY) == {"volume": 60, "language": "en"}
+    assert simulator.request_counts()[f"GET {CONFIG}"] == 2
+
+    # Failed write => Cached configuration dropped all the same
+    simulator.inject_failure(CONFIG, status_code=500)
+    assert not client.application.set_config(DELIVERY, {"volume": 20})
+    assert client.application.get_config(DELIVERY)["volume"] == 60
+    assert simulator.request_counts()[f"GET {CONFIG}"] == 3
+
+
+def test_install_and_uninstall_refresh_the_list(
+    tmp_path: pathlib.Path, simulator: robotSimulator, client: simulatorClient
+):
+    apk = tmp_path / "app.apk"
+    apk.write_bytes(b"PK\x03\x04simulated")
+    assert len(client.application.get_apps()) == 1
+
+    assert client.application.install_app(str(apk))
+    apps = client.application.get_apps()
+    assert len(apps) == 2
+    package_name = next(app["package_name"] for app in apps if app["package_name"] != DELIVERY)
+
+    assert client.application.uninstall_app(package_name)
+    assert client.application.get_app(package_name) == {}
+    assert not client.application.uninstall_app(package_name)
+    assert simulator.request_counts()[f"GET {APPS}"] == 3
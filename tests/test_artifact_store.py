@@ -0,0 +1,157 @@
+"""
+Tests of `robotComms.utils.artifact_store.artifactStore`: refresh diffs, optimistic writes and the
+order in which subscribers see them
+"""
+
+# Custom Packages
+from robotComms.utils.artifact_store import artifactDiff, artifactStore, element_key
+from robotComms.utils.logger import systemLogger
+from robotComms.utils.simulator import robotSimulator, simulatorClient
+from robotComms.utils.spatial_index import artifactSpatialIndex
+
+# Imported Packages
+import threading
+import typing
+
+POIS: typing.List[typing.Tuple[str, typing.Optional[str]]] = [("poi", None)]
+FORBIDDEN: typing.List[typing.Tuple[str, typing.Optional[str]]] = [("rect", "forbidden_area")]
+FORBIDDEN_KEY: str = "rect/forbidden_area"
+
+
+def _rect(x: float, y: float) -> typing.Dict[str, typing.Any]:
+    # 1m long, 1m wide area centered on (x + 0.5, y)
+    return {
+        "area": {"start": {"x": x, "y": y}, "end": {"x": x + 1.0, "y": y}, "half_width": 0.5},
+        "metadata": {},
+    }
+
+
+def _poi(name: str, x: float = 0.0) -> typing.Dict[str, typing.Any]:
+    return {"id": name, "pose": {"x": x, "y": 0.0, "yaw": 0.0}, "metadata": {"display_name": name}}
+
+
+def test_refresh_hands_only_the_changes_to_subscribers(
+    client: simulatorClient, logger: systemLogger
+):
+    store = artifactStore(client.artifact, collections=FORBIDDEN + POIS, logger=logger)
+    assert store.get("rect", "forbidden_area") == []
+    diffs: typing.List[artifactDiff] = []
+    store.subscribe(diffs.append, FORBIDDEN)
+
+    assert client.artifact.add_artifact("rect", "forbidden_area", [_rect(0.0, 0.0)])
+    assert client.artifact.add_artifact("poi", dict_value=[_poi("A101")])
+    refreshed = store.refresh()
+
+    assert sorted(diff.collection for diff in refreshed) == ["poi", "rect/forbidden_area"]
+    assert [(diff.collection, len(diff.added), diff.source) for diff in diffs] == [
+        ("rect/forbidden_area", 1, "refresh")
+    ]
+    assert store.refresh() == []
+
+
+def test_added_areas_get_distinct_provisional_keys(client: simulatorClient, logger: systemLogger):
+    store = artifactStore(client.artifact, collections=FORBIDDEN, logger=logger)
+    store.refresh()
+    index = artifactSpatialIndex(logger=logger)
+    index.attach(store)
+    provisional: typing.List[typing.Any] = []
+
+    def on_diff(diff: artifactDiff) -> None:
+        # Subscribed after the index => The index already holds the optimistic entries
+        if diff.source == "local":
+            provisional.append(
+                ([element_key(e) for e in diff.added], store.snapshot()[FORBIDDEN_KEY])
+            )
+            provisional.append(index.areas_at([[0.5, 0.0], [10.5, 0.0]], ["forbidden_area"]))
+
+    store.subscribe(on_diff)
+    assert store.add_artifact("rect", "forbidden_area", [_rect(0.0, 0.0), _rect(10.0, 0.0)])
+
+    (keys, mirrored), hits = provisional
+    assert len(set(keys)) == 2 and all(key.startswith("local:") for key in keys)
+    assert sorted(element_key(e) for e in mirrored) == sorted(keys)
+    assert [hit[1] for hit in hits] == keys
+
+    # Refreshed after the add => The robot IDs replaced the provisional ones
+    robot_ids = sorted(
+        str(rect["id"]) for rect in client.artifact.get_artifact("rect", "forbidden_area")
+    )
+    assert sorted(element_key(e) for e in store.get("rect", "forbidden_area")) == robot_ids
+    assert sorted(str(hit[1]) for hit in index.areas_at([[0.5, 0.0], [10.5, 0.0]])) == robot_ids
+    index.detach()
+
+
+def test_failed_write_rolls_the_mirror_back(
+    simulator: robotSimulator, client: simulatorClient, logger: systemLogger
+):
+    store = artifactStore(client.artifact, collections=POIS, logger=logger)
+    assert store.add_artifact("poi", dict_value=[_poi("A101")])
+    diffs: typing.List[artifactDiff] = []
+    store.subscribe(diffs.append)
+
+    simulator.inject_failure("/api/core/artifact/v1/pois", status_code=500)
+    assert not store.add_artifact("poi", dict_value=[_poi("A102")])
+
+    assert [(diff.source, len(diff.added), len(diff.removed)) for diff in diffs] == [
+        ("local", 1, 0),
+        ("rollback", 0, 1),
+    ]
+    assert [element_key(poi) for poi in store.get("poi")] == ["A101"]
+
+
+def test_subscribers_see_concurrent_writes_in_commit_order(
+    client: simulatorClient, logger: systemLogger
+):
+    store = artifactStore(client.artifact, collections=POIS, logger=logger)
+    store.get("poi")
+    rebuilt: typing.Dict[str, typing.Any] = {}
+
+    def rebuild(diff: artifactDiff) -> None:
+        for element in diff.removed:
+            del rebuilt[element_key(element)]
+        for element in diff.added + diff.changed:
+            rebuilt[element_key(element)] = element
+
+    store.subscribe(rebuild)
+
+    def writer(worker: int) -> None:
+        for n in range(10):
+            name = f"W{worker}-{n}"
+            store.add_artifact("poi", dict_value=[_poi(name, x=float(n))])
+            if n % 3 == 0:
+                store.delete_artifact("poi", id=name)
+            else:
+                store.modify_artifact("poi", id=name, dict_value={"metadata": {"n": n}})
+            if n % 4 == 0:
+                store.refresh()
+
+    threads = [threading.Thread(target=writer, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # A refresh racing a write may fetch the robot before the write landed => Settle with one more
+    store.refresh()
+    mirrored = {element_key(element): element for element in store.get("poi")}
+    assert sorted(mirrored) == sorted(poi["id"] for poi in client.artifact.get_artifact("poi"))
+    assert len(mirrored) == 4 * 6
+    assert rebuilt == mirrored
+
+
+def test_write_from_a_callback_queues_behind_the_current_diff(
+    client: simulatorClient, logger: systemLogger
+):
+    store = artifactStore(client.artifact, collections=POIS, logger=logger)
+    store.get("poi")
+    seen: typing.List[typing.Tuple[str, typing.List[str]]] = []
+
+    def follow_up(diff: artifactDiff) -> None:
+        if diff.source == "local" and element_key(diff.added[0]) == "A101":
+            store.add_artifact("poi", dict_value=[_poi("A102")])
+
+    store.subscribe(follow_up)
+    store.subscribe(lambda diff: seen.append((diff.source, [element_key(e) for e in diff.added])))
+    assert store.add_artifact("poi", dict_value=[_poi("A101")])
+
+    assert seen == [("local", ["A101"]), ("local", ["A102"])]
@@ -0,0 +1,120 @@
+"""
+Tests of `robotComms.utils.cache.ttlCache`
+"""
+
+# Custom Packages
+from robotComms.utils.cache import ttlCache
+
+# Imported Packages
+import threading
+import time
+import typing
+
+
+class _slowLoader:
+    def __init__(self, value: typing.Any) -> None:
+        # Load held until `release()` => Tests change the source while it is in flight
+        self.value: typing.Any = value
+        self.calls: int = 0
+        self.started = threading.Event()
+        self.__RELEASE = threading.Event()
+
+    def __call__(self) -> typing.Any:
+        self.calls += 1
+        value = self.value
+        self.started.set()
+        self.__RELEASE.wait(5.0)
+        return value
+
+    def release(self) -> None:
+        self.__RELEASE.set()
+
+
+class _loadThread(threading.Thread):
+    def __init__(self, cache: ttlCache, key: tuple, loader: _slowLoader) -> None:
+        # Calls `get_or_load()` and returns once the load is in flight
+        super().__init__(daemon=True)
+        self.cache: ttlCache = cache
+        self.key: tuple = key
+        self.loader: _slowLoader = loader
+        self.result: typing.Any = None
+        self.start()
+        assert loader.started.wait(5.0)
+
+    def run(self) -> None:
+        self.result = self.cache.get_or_load(self.key, self.loader)
+
+    def finish(self) -> typing.Any:
+        self.loader.release()
+        self.join(5.0)
+        return self.result
+
+
+def test_get_or_load_caches_until_expiry():
+    cache = ttlCache(ttl_s=0.05)
+    calls = []
+    assert cache.get_or_load(("a",), lambda: calls.append(1) or "one") == "one"
+    assert cache.get_or_load(("a",), lambda: calls.append(1) or "two") == "one"
+    time.sleep(0.06)
+    assert cache.get_or_load(("a",), lambda: calls.append(1) or "three") == "three"
+    assert len(calls) == 2
+
+
+def test_concurrent_callers_share_one_load():
+    cache = ttlCache(ttl_s=60)
+    loader = _slowLoader("value")
+    load = _loadThread(cache, ("a",), loader)
+    waiter: typing.List[typing.Any] = []
+    thread = threading.Thread(target=lambda: waiter.append(cache.get_or_load(("a",), loader)))
+    thread.start()
+    assert load.finish() == "value"
+    thread.join(5.0)
+    assert waiter == ["value"]
+    assert loader.calls == 1
+
+
+def test_invalidate_during_load_keeps_stale_value_out():
+    cache = ttlCache(ttl_s=60)
+    load = _loadThread(cache, ("a",), _slowLoader("old"))
+
+    # Write through while the read is in flight => Its value is outdated
+    cache.invalidate(("a",))
+    assert cache.get_or_load(("a",), lambda: "new") == "new"
+
+    assert load.finish() == "old"
+    assert cache.get(("a",)) == "new"
+
+
+def test_refresh_after_invalidate_starts_new_load():
+    cache = ttlCache(ttl_s=60)
+    load = _loadThread(cache, ("a",), _slowLoader("old"))
+
+    cache.invalidate(("a",))
+    refresh = _loadThread(cache, ("a",), _slowLoader("new"))
+    assert refresh.finish() == "new"
+    assert load.finish() == "old"
+
+    assert refresh.loader.calls == 1
+    assert cache.get(("a",)) == "new"
+
+
+def test_put_during_load_wins():
+    cache = ttlCache(ttl_s=60)
+    load = _loadThread(cache, ("a",), _slowLoader("old"))
+    cache.put(("a",), "written")
+    load.finish()
+    assert cache.get(("a",)) == "written"
+
+
+def test_invalidate_where_and_clear_drop_loads_in_flight():
+    cache = ttlCache(ttl_s=60)
+    load = _loadThread(cache, ("E", "map"), _slowLoader("map"))
+    cache.invalidate_where(lambda key: key[0] == "E")
+    load.finish()
+    assert ("E", "map") not in cache
+
+    load = _loadThread(cache, ("E", "pois"), _slowLoader("pois"))
+    cache.clear()
+    load.finish()
+    assert ("E", "pois") not in cache
+    assert len(cache) == 0
@@ -0,0 +1,62 @@
+"""
+Tests of `robotComms.utils.clock_sync.robotClock` against the uptime clock of a simulated robot
+"""
+
+# Custom Packages
+from robotComms.utils.clock_sync import robotClock
+from robotComms.utils.logger import systemLogger
+from robotComms.utils.simulator import robotSimulator, simulatedRobot, simulatorClient
+
+# Imported Packages
+import time
+
+import pytest
+
+
+def _error_s(clock: robotClock, client: simulatorClient) -> float:
+    before = time.time()
+    robot_ms = client.platform.get_timestamp()
+    after = time.time()
+    return abs(clock.to_host_time(robot_ms) - (before + after) / 2.0)
+
+
+def test_sync_converts_robot_timestamps(client: simulatorClient, logger: systemLogger):
+    clock = robotClock(client.platform, logger=logger)
+    assert not clock.is_synced() and clock.uncertainty_s() == float("inf")
+    assert clock.sync()
+
+    assert clock.is_synced() and clock.uncertainty_s() < 0.05
+    assert _error_s(clock, client) < 0.02
+    host_s = time.time()
+    assert clock.to_host_time(clock.to_robot_time(host_s)) == pytest.approx(host_s, abs=1e-6)
+
+
+def test_drift_is_fitted_over_the_syncs(logger: systemLogger):
+    # 2% fast robot clock => 30ms off after 1.5s without the drift fit
+    simulator = robotSimulator(port=0, robot=simulatedRobot(clock_drift_ppm=20_000), logger=logger)
+    simulator.start()
+    client = simulator.connect(logger)
+    try:
+        clock = robotClock(client.platform, logger=logger)
+        assert clock.sync()
+        time.sleep(1.2)
+        assert clock.sync()
+        assert clock.drift_ppm() != 0.0
+
+        time.sleep(0.3)
+        assert _error_s(clock, client) < 0.01
+    finally:
+        client.close()
+        simulator.stop()
+
+
+def test_failed_sync_keeps_the_estimate(
+    simulator: robotSimulator, client: simulatorClient, logger: systemLogger
+):
+    clock = robotClock(client.platform, samples_per_sync=2, logger=logger)
+    simulator.inject_failure("/api/platform/v1/timestamp", status_code=500, count=2)
+    assert not clock.sync()
+    assert not clock.is_synced()
+
+    assert clock.sync()
+    assert _error_s(clock, client) < 0.02
@@ -0,0 +1,69 @@
+"""
+Tests of `robotComms.utils.decoders` and of the JSON decoder setting of the REST Adapter
+"""
+
+# Custom Packages
+from robotComms.utils import decoders
+from robotComms.utils.decoders import available_decoders, decoder_name, get_decoder
+from robotComms.utils.logger import systemLogger
+from robotComms.utils.simulator import robotSimulator, simulatedRobot
+
+# Imported Packages
+import json
+
+import pytest
+
+BODY: bytes = json.dumps(
+    {"pose": {"x": 1.25, "y": -3.5}, "name": "A101 é", "points": [1, 2, 3], "ok": True}
+).encode("utf-8")
+
+
+def test_auto_picks_the_first_installed_decoder():
+    assert available_decoders()[-1] == "json"
+    assert decoder_name("auto") == available_decoders()[0]
+    assert decoder_name(lambda content: None) == "custom"
+    with pytest.raises(ValueError):
+        get_decoder("simdjson")
+
+
+def test_missing_decoder_falls_back_to_the_stdlib(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(decoders, "DECODERS", {"json": decoders._decode_stdlib})
+    assert decoder_name("orjson") == "json" and decoder_name("auto") == "json"
+
+
+@pytest.mark.parametrize("name", available_decoders())
+def test_decoders_agree_with_the_stdlib(name: str):
+    decode = get_decoder(name)
+    assert decode(BODY) == json.loads(BODY)
+    with pytest.raises(ValueError):
+        decode(b"{not json")
+
+
+@pytest.mark.parametrize("name", available_decoders())
+def test_clients_decode_the_same_results(logger: systemLogger, name: str):
+    simulator = robotSimulator(port=0, robot=simulatedRobot(laser_noise_m=0.0), logger=logger)
+    simulator.start()
+    reference = simulator.connect(logger, decoder="json")
+    client = simulator.connect(logger, decoder=name)
+    try:
+        assert client.system.get_laserscan() == reference.system.get_laserscan()
+        assert client.system.get_robot_info() == reference.system.get_robot_info()
+    finally:
+        client.close()
+        reference.close()
+        simulator.stop()
+
+
+def test_stdlib_decoder_detects_utf16():
+    assert get_decoder("json")("[1.5]".encode("utf-16")) == [1.5]
+
+
+def test_undecodable_body_falls_back_to_empty(simulator: robotSimulator, logger: systemLogger):
+    def broken(content: bytes) -> None:
+        raise ValueError("Broken Body")
+
+    client = simulator.connect(logger, decoder=broken)
+    try:
+        assert client.system.get_robot_info() == {}
+    finally:
+        client.close()
@@ -0,0 +1,184 @@
+"""
+Tests of `robotComms.utils.dispatcher.deliveryDispatcher` against simulated robots
+"""
+
+# Custom Packages
+from robotComms.utils.dispatcher import deliveryDispatcher, deliveryOrder
+from robotComms.utils.logger import systemLogger
+from robotComms.utils.simulator import DELIVERY_TASK_S, robotSimulator, simulatorClient
+
+from .conftest import TIME_SCALE
+
+# Imported Packages
+import threading
+import time
+import typing
+
+import pytest
+
+TASK: typing.Dict[str, typing.Any] = {"task_type": "FOOD_DELIVERY", "target": {"poi_name": "A101"}}
+TASKS_PATH: str = "/api/delivery/v1/tasks"
+
+
+@pytest.fixture
+def changes() -> typing.Dict[int, typing.List[str]]:
+    return {}
+
+
+@pytest.fixture
+def dispatcher(
+    client: simulatorClient,
+    logger: systemLogger,
+    changes: typing.Dict[int, typing.List[str]],
+) -> typing.Iterator[deliveryDispatcher]:
+    def on_change(order: deliveryOrder) -> None:
+        changes.setdefault(order.order_id, []).append(order.state)
+
+    # Polls only through `poll_once()` => The tests decide when the robot is asked
+    dispatcher = deliveryDispatcher(
+        {"robot": client},
+        batch_window_s=0.01,
+        poll_interval_s=3600.0,
+        on_change=on_change,
+        logger=logger,
+    )
+    dispatcher.start()
+    yield dispatcher
+    dispatcher.stop(drain=False)
+
+
+def _run_tasks(simulator: robotSimulator, tasks: int) -> None:
+    # The queue only advances when read => Start the first task now
+    simulator.robot.task_execution = True
+    simulator.robot.delivery_tasks()
+    time.sleep(tasks * DELIVERY_TASK_S / TIME_SCALE + 0.05)
+
+
+def test_orders_follow_the_robot_states(
+    simulator: robotSimulator,
+    dispatcher: deliveryDispatcher,
+    changes: typing.Dict[int, typing.List[str]],
+):
+    simulator.robot.task_execution = False
+    orders = [dispatcher.submit("robot", TASK) for _ in range(3)]
+    assert dispatcher.flush(timeout=5.0)
+    assert [order.state for order in orders] == ["PENDING"] * 3
+    assert all(order.task_id for order in orders)
+    assert dispatcher.stats()["batches"] == 1
+
+    simulator.robot.task_execution = True
+    dispatcher.poll_once()
+    assert orders[0].state == "RUNNING"
+    assert [order.state for order in orders[1:]] == ["PENDING"] * 2
+
+    _run_tasks(simulator, 3)
+    assert dispatcher.poll_once() == 3
+    assert all(order.wait(1.0) for order in orders)
+    assert changes[orders[0].order_id] == ["PENDING", "RUNNING", "FINISHED"]
+    assert changes[orders[1].order_id] == ["PENDING", "FINISHED"]
+    assert dispatcher.stats()["active"] == 0
+
+
+def test_failed_polls_keep_orders(simulator: robotSimulator, dispatcher: deliveryDispatcher):
+    simulator.robot.task_execution = False
+    orders = [dispatcher.submit("robot", TASK) for _ in range(2)]
+    assert dispatcher.flush(timeout=5.0)
+
+    simulator.inject_failure(TASKS_PATH, status_code=503, count=-1)
+    _run_tasks(simulator, 2)
+    assert [dispatcher.poll_once() for _ in range(3)] == [0, 0, 0]
+    assert not any(order.done for order in orders)
+    assert dispatcher.stats()["failed_polls"] == 3
+
+    simulator.clear_failures()
+    assert dispatcher.poll_once() == 2
+    assert [order.state for order in orders] == ["FINISHED"] * 2
+
+
+def test_failed_batch_fails_its_orders(simulator: robotSimulator, dispatcher: deliveryDispatcher):
+    simulator.inject_failure(f"{TASKS_PATH}/:batch", status_code=500)
+    orders = [dispatcher.submit("robot", TASK) for _ in range(2)]
+    assert dispatcher.flush(timeout=5.0)
+    assert all(order.wait(1.0) for order in orders)
+    assert [order.state for order in orders] == ["FAILED"] * 2
+    assert dispatcher.stats()["failed_batches"] == 1
+
+
+def test_cancel_queued_and_submitted_orders(
+    simulator: robotSimulator, dispatcher: deliveryDispatcher
+):
+    simulator.robot.task_execution = False
+    submitted = dispatcher.submit("robot", TASK)
+    assert dispatcher.flush(timeout=5.0)
+    assert dispatcher.cancel(submitted)
+    assert submitted.state == "CANCELED"
+    assert not dispatcher.cancel(submitted)
+
+    dispatcher.stop(drain=False)
+    queued = dispatcher.submit("robot", TASK)
+    assert dispatcher.cancel(queued)
+    assert queued.state == "CANCELED"
+    assert dispatcher.poll_once() == 0
+
+
+def test_callbacks_run_without_the_dispatcher_lock(
+    simulator: robotSimulator, client: simulatorClient, logger: systemLogger
+):
+    blocked: typing.List[bool] = []
+
+    def on_change(order: deliveryOrder) -> None:
+        # Another thread reading the dispatcher must not wait for the callback
+        reader = threading.Thread(target=dispatcher.stats)
+        reader.start()
+        reader.join(1.0)
+        blocked.append(reader.is_alive())
+
+    dispatcher = deliveryDispatcher(
+        {"robot": client},
+        batch_window_s=0.01,
+        poll_interval_s=3600.0,
+        on_change=on_change,
+        logger=logger,
+    )
+    dispatcher.start()
+    try:
+        simulator.robot.task_execution = False
+        order = dispatcher.submit("robot", TASK)
+        assert dispatcher.flush(timeout=5.0)
+        _run_tasks(simulator, 1)
+        dispatcher.poll_once()
+        assert order.wait(1.0)
+    finally:
+        dispatcher.stop(drain=False)
+    assert blocked and not any(blocked)
+
+
+def test_robots_are_polled_in_parallel(logger: systemLogger):
+    latency_s = 0.1
+    simulators = [robotSimulator(port=0, latency_s=latency_s, logger=logger) for _ in range(4)]
+    clients: typing.Dict[str, simulatorClient] = {}
+    try:
+        for index, simulator in enumerate(simulators):
+            simulator.start()
+            simulator.robot.task_execution = False
+            clients[f"robot-{index}"] = simulator.connect(logger)
+        dispatcher = deliveryDispatcher(
+            clients, batch_window_s=0.01, poll_interval_s=3600.0, logger=logger
+        )
+        dispatcher.start()
+        try:
+            for robot_id in clients:
+                dispatcher.submit(robot_id, TASK)
+            assert dispatcher.flush(timeout=5.0)
+            start = time.perf_counter()
+            dispatcher.poll_once()
+            duration = time.perf_counter() - start
+        finally:
+            dispatcher.stop(drain=False)
+    finally:
+        for client in clients.values():
+            client.close()
+        for simulator in simulators:
+            simulator.stop()
+    assert dispatcher.stats()["polls"] == 4
+    assert duration < 2 * latency_s
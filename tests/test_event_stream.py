@@ -0,0 +1,95 @@
+"""
+Tests of `robotComms.utils.event_stream.eventStream` against the events of a simulated robot
+"""
+
+# Custom Packages
+from robotComms.utils.event_stream import eventStream
+from robotComms.utils.logger import systemLogger
+from robotComms.utils.simulator import robotSimulator, simulatorClient
+
+# Imported Packages
+import asyncio
+import typing
+
+import pytest
+
+
+def _messages(events: typing.List[typing.Dict[str, typing.Any]]) -> typing.List[str]:
+    return [event["message"] for event in events]
+
+
+def test_each_event_is_handed_out_once(
+    simulator: robotSimulator, client: simulatorClient, logger: systemLogger
+):
+    stream = eventStream(client.platform, logger=logger)
+    simulator.robot.add_event("DEVICE_ERROR", message="e1")
+    simulator.robot.add_event("DEVICE_ERROR", message="e2")
+    with stream.subscribe() as subscription:
+        assert _messages(stream.poll_once()) == ["e1", "e2"]
+        assert stream.poll_once() == []
+        simulator.robot.add_event("DEVICE_ERROR", message="e3")
+        assert _messages(stream.poll_once()) == ["e3"]
+
+        assert _messages([subscription.get(timeout=0) for _ in range(3)]) == ["e1", "e2", "e3"]
+        assert subscription.get(timeout=0) is None
+
+
+@pytest.mark.parametrize(
+    "overflow, expected", [("drop_oldest", ["e3", "e4"]), ("drop_newest", ["e1", "e2"])]
+)
+def test_full_queue_follows_its_overflow_policy(
+    simulator: robotSimulator,
+    client: simulatorClient,
+    logger: systemLogger,
+    overflow: str,
+    expected: typing.List[str],
+):
+    stream = eventStream(client.platform, logger=logger)
+    slow = stream.subscribe(max_queue=2, overflow=overflow)
+    fast = stream.subscribe()
+    for n in range(1, 5):
+        simulator.robot.add_event("DEVICE_ERROR", message=f"e{n}")
+    stream.poll_once()
+
+    assert _messages([slow.get(timeout=0) for _ in range(2)]) == expected
+    assert slow.dropped == 2
+    # A slow subscriber only loses its own events
+    assert fast.pending() == 4 and fast.dropped == 0
+
+
+def test_late_subscriber_replays_the_window(
+    simulator: robotSimulator, client: simulatorClient, logger: systemLogger
+):
+    stream = eventStream(client.platform, replay_window=2, logger=logger)
+    for n in range(1, 4):
+        simulator.robot.add_event("DEVICE_ERROR" if n % 2 else "INFO", message=f"e{n}")
+    stream.poll_once()
+
+    late = stream.subscribe(replay=True, event_types=["DEVICE_ERROR"])
+    assert _messages([late.get(timeout=0)]) == ["e3"]
+    assert late.get(timeout=0) is None
+
+
+def test_async_iteration_follows_the_poller(
+    simulator: robotSimulator, client: simulatorClient, logger: systemLogger
+):
+    stream = eventStream(client.platform, poll_interval_s=0.01, logger=logger)
+    subscription = stream.subscribe()
+
+    async def read(count: int) -> typing.List[str]:
+        messages: typing.List[str] = []
+        async for event in subscription:
+            messages.append(event["message"])
+            if len(messages) == count:
+                break
+        return messages
+
+    stream.start()
+    try:
+        for n in range(1, 4):
+            simulator.robot.add_event("DEVICE_ERROR", message=f"e{n}")
+        assert asyncio.run(asyncio.wait_for(read(3), timeout=5.0)) == ["e1", "e2", "e3"]
+    finally:
+        stream.stop()
+        subscription.close()
+    assert subscription.get(timeout=0) is None
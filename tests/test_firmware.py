@@ -0,0 +1,177 @@
+"""
+Tests of `robotComms.api_classes.firmware` and `robotComms.utils.fleet.firmwareRollout`: chunked
+uploads across dropped links, resumed uploads, the upgrade wait and rollouts in waves against
+simulated robots
+"""
+
+# Custom Packages
+from robotComms.utils.fleet import firmwareRollout
+from robotComms.utils.logger import systemLogger
+from robotComms.utils.simulator import robotSimulator, simulatedRobot, simulatorClient
+
+from .conftest import TIME_SCALE
+
+# Imported Packages
+import os
+import pathlib
+import time
+import typing
+
+import pytest
+
+UPLOADS: str = "/api/core/firmware/v1/uploads"
+CHUNK: int = 4096
+VERSION: str = "4.6.0"
+
+
+@pytest.fixture
+def image(tmp_path: pathlib.Path) -> str:
+    file_path = tmp_path / f"firmware-{VERSION}.bin"
+    file_path.write_bytes(os.urandom(CHUNK * 2 + 100))
+    return str(file_path)
+
+
+@pytest.fixture
+def fleet(
+    logger: systemLogger,
+) -> typing.Iterator[typing.Dict[str, typing.Tuple[robotSimulator, simulatorClient]]]:
+    robots = {}
+    for robot_id in ["R1", "R2", "R3"]:
+        simulator = robotSimulator(
+            port=0, robot=simulatedRobot(time_scale=TIME_SCALE), logger=logger
+        )
+        simulator.start()
+        robots[robot_id] = (simulator, simulator.connect(logger))
+    yield robots
+    for simulator, client in robots.values():
+        client.close()
+        simulator.stop()
+
+
+def _rollout(
+    image: str,
+    fleet: typing.Dict[str, typing.Tuple[robotSimulator, simulatorClient]],
+    logger: systemLogger,
+    **options: typing.Any,
+) -> firmwareRollout:
+    return firmwareRollout(
+        image,
+        {robot_id: client for robot_id, (_, client) in fleet.items()},
+        upgrade_timeout_s=5.0,
+        poll_interval_s=0.01,
+        logger=logger,
+        **options,
+    )
+
+
+def test_upload_streams_the_image_in_chunks(image: str, client: simulatorClient):
+    progress: typing.List[typing.Tuple[int, int]] = []
+    report = client.firmware.upload_firmware(
+        image, chunk_size=CHUNK, progress=lambda sent, size: progress.append((sent, size))
+    )
+
+    size = os.path.getsize(image)
+    assert report["success"] and report["retries"] == 0 and report["size"] == size
+    assert progress == [(CHUNK, size), (2 * CHUNK, size), (size, size)]
+    assert client.firmware.get_upload(report["upload_id"])["offset"] == size
+
+
+def test_dropped_link_resumes_where_the_robot_stopped(
+    image: str, simulator: robotSimulator, client: simulatorClient
+):
+    def drop_once(sent: int, size: int) -> None:
+        if sent == CHUNK:
+            # Dropped connection => RequestException in the client
+            simulator.inject_failure(f"{UPLOADS}/1", status_code=0)
+
+    report = client.firmware.upload_firmware(
+        image, chunk_size=CHUNK, retry_delay_s=0.01, progress=drop_once
+    )
+
+    assert report["success"] and report["retries"] == 1
+    # First chunk, dropped second chunk, second chunk again, last chunk
+    assert simulator.request_counts()[f"PUT {UPLOADS}/1"] == 4
+
+
+def test_interrupted_upload_is_resumed_by_id(
+    image: str, tmp_path: pathlib.Path, simulator: robotSimulator, client: simulatorClient
+):
+    def fail_after_first_chunk(sent: int, size: int) -> None:
+        simulator.inject_failure(f"{UPLOADS}/1", status_code=503, count=-1)
+
+    report = client.firmware.upload_firmware(
+        image, chunk_size=CHUNK, max_retries=1, retry_delay_s=0.01, progress=fail_after_first_chunk
+    )
+    assert not report["success"] and report["retries"] == 2
+    simulator.clear_failures()
+
+    other = tmp_path / "other.bin"
+    other.write_bytes(b"\x00" * 10)
+    assert not client.firmware.upload_firmware(str(other), upload_id="1")["success"]
+
+    report = client.firmware.upload_firmware(image, upload_id="1", chunk_size=CHUNK)
+    assert report["success"] and report["resumed_from"] == CHUNK
+    assert client.firmware.cancel_upload("1")
+    assert client.firmware.get_upload("1") == {}
+
+
+def test_upgrade_installs_the_uploaded_version(image: str, client: simulatorClient):
+    version_before = client.firmware.get_upgrade_status()["version"]
+    upload_id = client.firmware.create_upload("firmware-9.9.9.bin", 10, "0" * 64)["upload_id"]
+    # Incomplete upload => Rejected
+    assert not client.firmware.start_upgrade(upload_id)
+
+    report = client.firmware.upload_firmware(image)
+    assert client.firmware.start_upgrade(report["upload_id"])
+    status = client.firmware.wait_for_upgrade(
+        timeout_s=5.0, poll_interval_s=0.01, version_before=version_before
+    )
+    assert (status["stage"], status["version"]) == ("DONE", VERSION)
+    assert client.system.get_robot_info()["softwareVersion"] == VERSION
+
+
+def test_earlier_done_stage_does_not_end_the_wait(image: str, client: simulatorClient):
+    report = client.firmware.upload_firmware(image)
+    assert client.firmware.start_upgrade(report["upload_id"])
+    client.firmware.wait_for_upgrade(timeout_s=5.0, poll_interval_s=0.01)
+
+    # "DONE" of the upgrade above with the version it installed => Nothing new to wait for
+    start = time.monotonic()
+    status = client.firmware.wait_for_upgrade(
+        timeout_s=0.2, poll_interval_s=0.01, version_before=VERSION
+    )
+    assert time.monotonic() - start >= 0.2 and status["stage"] == "DONE"
+
+
+def test_rollout_upgrades_healthy_robots_in_waves(
+    image: str,
+    fleet: typing.Dict[str, typing.Tuple[robotSimulator, simulatorClient]],
+    logger: systemLogger,
+):
+    fleet["R2"][0].robot.inject_device_error("motor brake released")
+    # Failed health request => Error body of the robot, not a healthy answer
+    fleet["R3"][0].inject_failure("/api/core/system/v1/robot/health", status_code=500)
+    rollout = _rollout(image, fleet, logger, canary=1, wave_size=2)
+    assert rollout.plan() == [["R1"], ["R2", "R3"]]
+
+    reports = rollout.run()
+
+    assert reports["R1"].success and reports["R1"].version_after == VERSION
+    assert reports["R2"].skipped and reports["R2"].message == "Unhealthy before upgrade"
+    assert reports["R3"].skipped and reports["R3"].message == "Robot Unreachable"
+    for robot_id in ["R2", "R3"]:
+        assert fleet[robot_id][1].firmware.get_upgrade_status()["version"] != VERSION
+
+
+def test_failed_canary_halts_the_rollout(
+    image: str,
+    fleet: typing.Dict[str, typing.Tuple[robotSimulator, simulatorClient]],
+    logger: systemLogger,
+):
+    fleet["R1"][0].inject_failure(UPLOADS, status_code=500)
+    reports = _rollout(image, fleet, logger, canary=1, wave_size=2).run()
+
+    assert not reports["R1"].success and reports["R1"].message == "Upload Failed"
+    assert [reports[robot_id].skipped for robot_id in ["R2", "R3"]] == [True, True]
+    assert reports["R2"].message == "Rollout halted after wave 0"
+    assert fleet["R2"][0].request_counts().get(f"POST {UPLOADS}", 0) == 0
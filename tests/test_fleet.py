@@ -0,0 +1,85 @@
+"""
+Tests of `robotComms.utils.fleet.layoutReconciler` against a fleet of simulated robots
+"""
+
+# Custom Packages
+from robotComms.utils.fleet import layoutReconciler
+from robotComms.utils.logger import systemLogger
+from robotComms.utils.simulator import robotSimulator, simulatorClient
+
+# Imported Packages
+import typing
+
+import pytest
+
+AREAS: str = "/api/core/artifact/v1/rectangle-areas/forbidden_area"
+LAYOUT: typing.Dict[str, typing.Any] = {
+    "rect/forbidden_area": [
+        {
+            "area": {"start": {"x": 0, "y": 0}, "end": {"x": 1, "y": 0}, "half_width": 0.5},
+            "metadata": {},
+        }
+    ],
+    "poi": [{"id": "A101", "pose": {"x": 1.0, "y": 2.0, "yaw": 0.0}, "metadata": {}}],
+}
+
+
+@pytest.fixture
+def fleet(
+    logger: systemLogger,
+) -> typing.Iterator[typing.Dict[str, typing.Tuple[robotSimulator, simulatorClient]]]:
+    robots = {}
+    for robot_id in ["R1", "R2", "R3"]:
+        simulator = robotSimulator(port=0, logger=logger)
+        simulator.start()
+        robots[robot_id] = (simulator, simulator.connect(logger))
+    yield robots
+    for simulator, client in robots.values():
+        client.close()
+        simulator.stop()
+
+
+def _reconciler(
+    fleet: typing.Dict[str, typing.Tuple[robotSimulator, simulatorClient]], logger: systemLogger
+) -> layoutReconciler:
+    return layoutReconciler(
+        LAYOUT,
+        {robot_id: client for robot_id, (_, client) in fleet.items()},
+        requests_per_second=0,
+        logger=logger,
+    )
+
+
+def test_reconcile_applies_only_the_drift(
+    fleet: typing.Dict[str, typing.Tuple[robotSimulator, simulatorClient]], logger: systemLogger
+):
+    # R1 in sync, R2 misses the area, R3 misses everything
+    for robot_id in ["R1", "R2"]:
+        _, client = fleet[robot_id]
+        assert client.artifact.add_artifact("poi", dict_value=LAYOUT["poi"])
+    _, r1 = fleet["R1"]
+    assert r1.artifact.add_artifact("rect", "forbidden_area", LAYOUT["rect/forbidden_area"])
+    reconciler = _reconciler(fleet, logger)
+
+    drift = reconciler.check()
+    assert drift["R1"].in_sync
+    assert drift["R2"].drift == {"rect/forbidden_area": {"add": 1, "modify": 0, "delete": 0}}
+    assert drift["R3"].drift["poi"]["add"] == 1
+
+    reports = reconciler.reconcile()
+    assert [reports[robot_id].applied for robot_id in ["R1", "R2", "R3"]] == [False, True, True]
+    assert all(report.success and report.reachable for report in reports.values())
+    assert all(report.in_sync for report in reconciler.check().values())
+
+
+def test_failed_export_marks_the_robot_unreachable(
+    fleet: typing.Dict[str, typing.Tuple[robotSimulator, simulatorClient]], logger: systemLogger
+):
+    simulator, client = fleet["R2"]
+    simulator.inject_failure(AREAS, status_code=408, count=-1)
+
+    reports = _reconciler(fleet, logger).reconcile()
+    assert not reports["R2"].reachable and not reports["R2"].success
+    assert reports["R2"].layout_report.export_failed == ["rect/forbidden_area"]
+    assert client.artifact.get_artifact("poi") == []
+    assert reports["R1"].reachable and reports["R1"].success
@@ -0,0 +1,155 @@
+"""
+Tests of `robotComms.utils.gateway.robotGateway`: caching, coalescing, invalidation, routing, rate
+limiting and the upstream metrics in front of simulated robots
+"""
+
+# Custom Packages
+from robotComms.api_classes.system import system
+from robotComms.utils.gateway import robotGateway
+from robotComms.utils.logger import systemLogger
+from robotComms.utils.metrics import OVERFLOW_ENDPOINT
+from robotComms.utils.simulator import robotSimulator
+
+# Imported Packages
+import threading
+import typing
+
+import pytest
+import requests
+
+INFO: str = "/api/core/system/v1/robot/info"
+POSE: str = "/api/core/slam/v1/localization/pose"
+POIS: str = "/api/core/artifact/v1/pois"
+
+
+@pytest.fixture
+def gateway(simulator: robotSimulator, logger: systemLogger) -> typing.Iterator[robotGateway]:
+    gateway = robotGateway(simulator.url, port=0, requests_per_second=0, logger=logger)
+    gateway.start()
+    yield gateway
+    gateway.stop()
+
+
+def _get(gateway: robotGateway, path: str) -> requests.Response:
+    return requests.get(f"{gateway.url}{path}", timeout=5.0)
+
+
+def test_gateway_needs_a_robot(logger: systemLogger):
+    with pytest.raises(ValueError, match="at least one robot"):
+        robotGateway({}, logger=logger)
+
+
+def test_get_answers_are_cached_per_path(gateway: robotGateway, simulator: robotSimulator):
+    answers = [_get(gateway, INFO) for _ in range(3)]
+    assert [answer.headers["X-Gateway-Cache"] for answer in answers] == ["MISS", "HIT", "HIT"]
+    assert answers[2].json() == answers[0].json()
+    assert simulator.request_counts()[f"GET {INFO}"] == 1
+
+    # No TTL => Every request reaches the robot
+    assert [_get(gateway, POSE).headers["X-Gateway-Cache"] for _ in range(2)] == [
+        "BYPASS",
+        "BYPASS",
+    ]
+    assert simulator.request_counts()[f"GET {POSE}"] == 2
+    assert gateway.stats()["cache_hits"] == 2
+
+
+def test_failed_answers_are_not_cached(gateway: robotGateway, simulator: robotSimulator):
+    simulator.inject_failure(INFO, status_code=500)
+    assert _get(gateway, INFO).status_code == 500
+    assert _get(gateway, INFO).status_code == 200
+    assert simulator.request_counts()[f"GET {INFO}"] == 2
+
+    # Dropped connection => 502 to the client
+    simulator.inject_failure(POSE, status_code=0)
+    assert _get(gateway, POSE).status_code == 502
+    assert gateway.stats()["upstream_errors"] == 1
+
+
+def test_identical_requests_in_flight_share_one_upstream_request(logger: systemLogger):
+    simulator = robotSimulator(port=0, latency_s=0.2, logger=logger)
+    simulator.start()
+    gateway = robotGateway(simulator.url, port=0, requests_per_second=0, logger=logger)
+    gateway.start()
+    try:
+        barrier = threading.Barrier(8)
+        answers: typing.List[requests.Response] = []
+
+        def client() -> None:
+            barrier.wait()
+            answers.append(_get(gateway, POSE))
+
+        threads = [threading.Thread(target=client) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert [answer.status_code for answer in answers] == [200] * 8
+        assert simulator.request_counts()[f"GET {POSE}"] == 1
+        assert sorted(answer.headers["X-Gateway-Cache"] for answer in answers) == [
+            "BYPASS",
+            *["HIT"] * 7,
+        ]
+    finally:
+        gateway.stop()
+        simulator.stop()
+
+
+def test_write_drops_the_cached_answers_of_its_module(
+    gateway: robotGateway, simulator: robotSimulator, logger: systemLogger
+):
+    api = system(gateway.url, "v1", logger)
+    assert api.get_parameter("base.max_moving_speed") == "0.7"
+    _get(gateway, POIS)
+    _get(gateway, INFO)
+
+    assert api.set_parameter("base.max_moving_speed", "0.5")
+    # Client cache of the API class dropped by the write, gateway cache by the PUT
+    assert api.get_parameter("base.max_moving_speed") == "0.5"
+    assert _get(gateway, INFO).headers["X-Gateway-Cache"] == "MISS"
+    # Other API modules keep their cached answers
+    assert _get(gateway, POIS).headers["X-Gateway-Cache"] == "HIT"
+
+
+def test_requests_are_routed_to_their_robot(simulator: robotSimulator, logger: systemLogger):
+    other = robotSimulator(port=0, logger=logger)
+    other.start()
+    other.robot.info["deviceID"] = "R2"
+    with robotGateway(
+        {"R1": simulator.url, "R2": other.url}, port=0, requests_per_second=0, logger=logger
+    ) as gateway:
+        try:
+            default = _get(gateway, INFO).json()["deviceID"]
+            assert _get(gateway, f"/robots/R1{INFO}").json()["deviceID"] == default
+            assert _get(gateway, f"/robots/R2{INFO}").json()["deviceID"] == "R2"
+            assert _get(gateway, f"/robots/R3{INFO}").status_code == 404
+
+            stats = _get(gateway, "/gateway/stats").json()
+            assert stats["cached"] == {"R1": 1, "R2": 1}
+            assert "robotcomms" in _get(gateway, "/gateway/metrics").text
+            assert _get(gateway, "/gateway/other").status_code == 404
+        finally:
+            other.stop()
+
+
+def test_upstream_budget_answers_429(simulator: robotSimulator, logger: systemLogger):
+    with robotGateway(
+        simulator.url, port=0, requests_per_second=1, max_wait_s=0, logger=logger
+    ) as gateway:
+        assert _get(gateway, POSE).status_code == 200
+        limited = _get(gateway, POSE)
+        assert limited.status_code == 429 and limited.headers["Retry-After"] == "1"
+        assert gateway.stats()["rate_limited"] == 1
+        assert simulator.request_counts()[f"GET {POSE}"] == 1
+
+
+def test_unknown_paths_share_one_metric_series(gateway: robotGateway):
+    for n in range(5):
+        assert _get(gateway, f"/api/core/probe/v1/path{n}").status_code == 404
+    for _ in range(2):
+        _get(gateway, POSE)
+
+    series = {(entry["endpoint"], entry["count"]) for entry in gateway.metrics.snapshot()}
+    # First answer of the pose endpoint made it known => Later requests get their own series
+    assert series == {(OVERFLOW_ENDPOINT, 6), ("slam/localization/pose", 1)}
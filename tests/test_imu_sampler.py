@@ -0,0 +1,80 @@
+"""
+Tests of `robotComms.utils.imu_sampler.imuSampler` against the IMU of a simulated robot
+"""
+
+# Custom Packages
+from robotComms.utils.imu_sampler import imu_dtype, imuSampler
+from robotComms.utils.logger import systemLogger
+from robotComms.utils.simulator import robotSimulator, simulatorClient
+
+# Imported Packages
+import pathlib
+import time
+
+import numpy as np
+import pytest
+
+
+def test_statistics_of_a_robot_at_rest(client: simulatorClient, logger: systemLogger):
+    sampler = imuSampler(client, capacity=64, logger=logger)
+    for _ in range(20):
+        assert sampler.sample_once()
+
+    assert sampler.count() == 20 and len(sampler) == 20
+    assert sampler.mean()["acc"][2] == pytest.approx(9.81, abs=0.01)
+    assert 0 < sampler.variance()["acc"][2] < 1e-4
+    assert np.allclose(sampler.bias({"acc": [0, 0, 9.81]})["acc"], 0, atol=0.01)
+    assert np.allclose(sampler.mean()["quaternion"], [1, 0, 0, 0], atol=1e-6)
+
+    sampler.reset_statistics()
+    assert sampler.count() == 0 and len(sampler) == 20
+
+
+def test_ring_buffer_keeps_the_newest_samples(client: simulatorClient, logger: systemLogger):
+    sampler = imuSampler(client, source="raw_adc", capacity=4, logger=logger)
+    assert sampler.nbytes == 4 * imu_dtype("raw_adc").itemsize
+    for _ in range(6):
+        assert sampler.sample_once()
+        time.sleep(0.002)
+
+    data = sampler.data()
+    assert len(data) == 4 and sampler.overwritten == 2 and sampler.count() == 6
+    assert np.all(np.diff(data["timestamp"]) > 0)
+    # ADC values are scaled by 1000 in the simulator
+    assert data["acc"][:, 2] == pytest.approx(9810, abs=10)
+
+
+def test_saved_samples_load_back(
+    client: simulatorClient, logger: systemLogger, tmp_path: pathlib.Path
+):
+    sampler = imuSampler(client, source="raw_calculated", capacity=8, logger=logger)
+    for _ in range(3):
+        sampler.sample_once()
+    path = str(tmp_path / "imu.npy")
+    assert sampler.save(path)
+
+    loaded = imuSampler.load(path)
+    assert loaded.dtype == imu_dtype("raw_calculated")
+    assert np.array_equal(loaded, sampler.data())
+
+
+def test_failed_requests_are_counted(
+    simulator: robotSimulator, client: simulatorClient, logger: systemLogger
+):
+    sampler = imuSampler(client, logger=logger)
+    simulator.inject_failure("/api/core/slam/v1/imu", status_code=500, count=2)
+    assert [sampler.sample_once() for _ in range(3)] == [False, False, True]
+    assert sampler.failed == 2 and len(sampler) == 1
+
+
+def test_background_sampling_runs_at_its_rate(client: simulatorClient, logger: systemLogger):
+    sampler = imuSampler(client, rate_hz=100, logger=logger)
+    sampler.start()
+    time.sleep(0.3)
+    sampler.stop()
+    # Roughly 30 ticks. Late ticks are skipped, never sent in a burst.
+    assert 10 <= len(sampler) + sampler.late <= 40
+    assert len(sampler) <= 31
+
+    with pytest.raises(ValueError):
+        imuSampler(client, source="gps", logger=logger)
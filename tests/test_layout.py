@@ -0,0 +1,161 @@
+"""
+Tests of `robotComms.utils.layout`: layout files, minimal plans and transactional apply against the
+simulator
+"""
+
+# Custom Packages
+from robotComms.utils.layout import (
+    layoutManager,
+    load_layout,
+    plan_layout,
+    save_layout,
+)
+from robotComms.utils.logger import systemLogger
+from robotComms.utils.simulator import robotSimulator, simulatorClient
+
+# Imported Packages
+import pathlib
+import typing
+
+import pytest
+
+AREAS: str = "/api/core/artifact/v1/rectangle-areas/forbidden_area"
+
+
+def _rect(x: float) -> typing.Dict[str, typing.Any]:
+    return {
+        "area": {"start": {"x": x, "y": 0.0}, "end": {"x": x + 1.0, "y": 0.0}, "half_width": 0.5},
+        "metadata": {},
+    }
+
+
+def _poi(name: str, x: float = 0.0) -> typing.Dict[str, typing.Any]:
+    return {"id": name, "pose": {"x": x, "y": 0.0, "yaw": 0.0}, "metadata": {"display_name": name}}
+
+
+def _areas(client: simulatorClient) -> typing.List[float]:
+    return sorted(
+        rect["area"]["start"]["x"]
+        for rect in client.artifact.get_artifact("rect", "forbidden_area")
+    )
+
+
+class _failingArtifact:
+    def __init__(
+        self,
+        client: simulatorClient,
+        simulator: robotSimulator,
+        fail_at: int,
+        failures: int = 1,
+    ) -> None:
+        # Artifact API failing the `fail_at`-th area add. failures=2 => The next export fails too
+        self.__CLIENT = client
+        self.__SIMULATOR = simulator
+        self.__FAIL_AT: int = fail_at
+        self.__FAILURES: int = failures
+        self.__ADDS: int = 0
+
+    def __getattr__(self, name: str) -> typing.Any:
+        return getattr(self.__CLIENT.artifact, name)
+
+    def add_artifact(self, a_type: str, a_usage: typing.Optional[str], body: typing.Any) -> bool:
+        if a_type == "rect":
+            self.__ADDS += 1
+            if self.__ADDS == self.__FAIL_AT:
+                self.__SIMULATOR.inject_failure(AREAS, status_code=500, count=self.__FAILURES)
+        return self.__CLIENT.artifact.add_artifact(a_type, a_usage, body)
+
+
+@pytest.mark.parametrize("geojson", [False, True])
+def test_layout_file_round_trip(tmp_path: pathlib.Path, geojson: bool):
+    layout = {
+        "lines/walls": [{"id": 1, "start": {"x": 0, "y": 0}, "end": {"x": 1, "y": 0}}],
+        "rect/forbidden_area": [{"id": 2, **_rect(3.0)}],
+        "poi": [_poi("A101", x=2.0)],
+    }
+    file_path = str(tmp_path / "layout.json")
+    save_layout(layout, file_path, geojson=geojson)
+    assert load_layout(file_path) == layout
+
+
+def test_plan_matches_areas_by_content_and_pois_by_id():
+    current = {
+        "rect/forbidden_area": [{"id": 7, **_rect(0.0)}, {"id": 8, **_rect(5.0)}],
+        "poi": [_poi("A101"), _poi("A102")],
+    }
+    desired = {
+        "rect/forbidden_area": [_rect(0.0), _rect(9.0)],
+        "poi": [_poi("A101", x=1.0), _poi("A103")],
+    }
+    plan = plan_layout(desired, current)
+    assert [(op.kind, op.collection, op.id) for op in plan.operations] == [
+        ("delete", "rect/forbidden_area", 8),
+        ("delete", "poi", "A102"),
+        ("modify", "poi", "A101"),
+        ("add", "rect/forbidden_area", None),
+        ("add", "poi", "A103"),
+    ]
+    assert plan_layout(current, current).is_empty()
+
+
+def test_apply_reaches_the_desired_layout(client: simulatorClient, logger: systemLogger):
+    manager = layoutManager(client.artifact, logger=logger)
+    desired = {"rect/forbidden_area": [_rect(0.0), _rect(5.0)], "poi": [_poi("A101")]}
+
+    report = manager.apply(desired)
+    assert report.success and report.plan.count() == {"add": 3, "modify": 0, "delete": 0}
+    assert _areas(client) == [0.0, 5.0]
+
+    report = manager.apply(desired)
+    assert report.success and report.message == "Layout already applied"
+
+
+def test_failed_export_applies_nothing(
+    simulator: robotSimulator, client: simulatorClient, logger: systemLogger
+):
+    manager = layoutManager(client.artifact, logger=logger)
+    simulator.inject_failure(AREAS, status_code=500)
+    report = manager.apply({"rect/forbidden_area": [_rect(5.0)], "poi": [_poi("A101")]})
+
+    assert not report.success and report.plan.is_empty()
+    assert "rect/forbidden_area" in report.message
+    assert client.artifact.get_artifact("poi") == []
+
+
+def test_failed_apply_restores_the_touched_collections(
+    simulator: robotSimulator, client: simulatorClient, logger: systemLogger
+):
+    assert client.artifact.add_artifact("rect", "forbidden_area", [_rect(0.0)])
+    manager = layoutManager(_failingArtifact(client, simulator, fail_at=2), logger=logger)
+
+    report = manager.apply(
+        {"rect/forbidden_area": [_rect(0.0), _rect(5.0), _rect(9.0)], "poi": [_poi("A101")]}
+    )
+
+    assert not report.success and len(report.failed) == 1
+    assert report.rolled_back and report.rollback_success is True
+    assert _areas(client) == [0.0]
+    assert client.artifact.get_artifact("poi") == []
+
+
+def test_rollback_skips_collections_it_cannot_export(
+    simulator: robotSimulator, client: simulatorClient, logger: systemLogger
+):
+    assert client.artifact.add_artifact("rect", "forbidden_area", [_rect(0.0)])
+    manager = layoutManager(
+        _failingArtifact(client, simulator, fail_at=2, failures=2), logger=logger
+    )
+
+    desired = {
+        "rect/forbidden_area": [_rect(0.0), _rect(5.0), _rect(9.0)],
+        "poi": [_poi("A101")],
+    }
+    report = manager.apply(desired)
+
+    assert not report.success and len(report.failed) == 1
+    assert report.rolled_back and report.rollback_success is False
+    assert "['rect/forbidden_area']" in report.message and "Not rolled back" in report.message
+    # Areas left as the failed apply put them instead of the exported one added a second time
+    assert _areas(client) == [0.0, 5.0]
+    # POIs were exported again and restored
+    assert client.artifact.get_artifact("poi") == []
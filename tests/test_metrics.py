@@ -0,0 +1,80 @@
+"""
+Tests of `robotComms.utils.metrics.requestMetrics`
+"""
+
+# Custom Packages
+from robotComms.utils.metrics import OVERFLOW_ENDPOINT, endpoint_template, requestMetrics
+from robotComms.utils.simulator import simulatorClient
+
+# Imported Packages
+import threading
+import typing
+
+import pytest
+
+HOST: str = "http://192.168.11.1:1448"
+
+
+def _record(metrics: requestMetrics, url: str, method: str = "GET") -> None:
+    metrics.end(metrics.begin(method, url), 200, bytes_in=10)
+
+
+def _counts(metrics: requestMetrics) -> typing.Dict[str, int]:
+    return {row["endpoint"]: row["count"] for row in metrics.snapshot()}
+
+
+@pytest.mark.parametrize(
+    "url, template",
+    [
+        (f"{HOST}/api/core/slam/v1/localization/pose", "slam/localization/pose"),
+        (f"{HOST}/api/core/motion/v1/actions/12", "motion/actions/{id}"),
+        (f"{HOST}/api/core/artifact/v1/pois/A101", "artifact/pois/{id}"),
+        (f"{HOST}/api/core/artifact/v1/lines/walls/12", "artifact/lines/walls/{id}"),
+        (f"{HOST}/api/delivery/v1/tasks/:batch", "delivery/tasks/:batch"),
+        (
+            f"{HOST}/api/core/application/v1/apps/com.slamtec.delivery/config",
+            "application/apps/{id}/config",
+        ),
+    ],
+)
+def test_endpoint_template(url: str, template: str):
+    assert endpoint_template(url) == ("192.168.11.1:1448", template)
+
+
+def test_shards_of_finished_threads_are_retired():
+    metrics = requestMetrics()
+    url = f"{HOST}/api/core/slam/v1/localization/pose"
+    threads = [
+        threading.Thread(target=lambda: [_record(metrics, url) for _ in range(3)])
+        for _ in range(120)
+    ]
+    for thread in threads:
+        thread.start()
+        thread.join()
+
+    assert metrics.shard_count() == 0
+    assert _counts(metrics) == {"slam/localization/pose": 360}
+
+    _record(metrics, url)
+    assert metrics.shard_count() == 1
+    assert _counts(metrics) == {"slam/localization/pose": 361}
+
+
+def test_series_beyond_the_cap_overflow():
+    metrics = requestMetrics(max_series=2)
+    for name in ["a", "b", "c", "d"]:
+        _record(metrics, f"{HOST}/api/core/system/v1/{name}")
+    _record(metrics, f"{HOST}/api/core/system/v1/a")
+
+    assert _counts(metrics) == {"system/a": 2, "system/b": 1, OVERFLOW_ENDPOINT: 2}
+
+    metrics.reset()
+    _record(metrics, f"{HOST}/api/core/system/v1/c")
+    assert _counts(metrics) == {"system/c": 1}
+
+
+def test_client_requests_are_recorded(client: simulatorClient):
+    for _ in range(3):
+        client.slam.get_current_robot_pose()
+    rows = client.metrics.endpoint("slam/localization/pose", "GET")
+    assert sum(row["count"] for row in rows) == 3
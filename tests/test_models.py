@@ -0,0 +1,74 @@
+"""
+Tests of `robotComms.utils.models`: decoding simulated robot results into slotted models
+"""
+
+# Custom Packages
+from robotComms.utils.models import (
+    area_Model,
+    health_Model,
+    models_from_list,
+    poi_Model,
+    pose_Model,
+)
+from robotComms.utils.results import Response_Type, model_Result
+from robotComms.utils.simulator import robotSimulator, simulatorClient
+
+# Imported Packages
+import pytest
+
+POI: dict = {
+    "id": "A101",
+    "pose": {"x": 1.5, "y": -2.0, "yaw": 0.5},
+    "metadata": {"display_name": "A101"},
+}
+AREA: dict = {
+    "area": {"start": {"x": 0.0, "y": 0.0}, "end": {"x": 2.0, "y": 0.0}, "half_width": 0.5},
+    "metadata": {},
+}
+
+
+def test_models_have_no_instance_dict():
+    for model in [pose_Model(), poi_Model(), area_Model(), health_Model()]:
+        assert not hasattr(model, "__dict__")
+        with pytest.raises(AttributeError):
+            model.extra = 1  # type: ignore[attr-defined]
+
+
+def test_models_round_trip_the_api_format(client: simulatorClient):
+    pose = client.slam.get_current_robot_pose()
+    assert pose_Model.from_dict(pose).to_dict() == {
+        key: pytest.approx(pose.get(key, 0.0)) for key in ["x", "y", "z", "yaw", "pitch", "roll"]
+    }
+
+    assert client.artifact.add_artifact("poi", dict_value=[POI])
+    assert client.artifact.add_artifact("rect", "forbidden_area", [AREA])
+    pois = models_from_list(poi_Model, client.artifact.get_artifact("poi"))
+    assert [poi.to_dict() for poi in pois] == [POI] and pois[0].name() == "A101"
+
+    areas = models_from_list(
+        area_Model, client.artifact.get_artifact("rect", "forbidden_area"), usage="forbidden_area"
+    )
+    assert len(areas) == 1 and areas[0].usage == "forbidden_area"
+    assert {k: v for k, v in areas[0].to_dict().items() if k != "id"} == AREA
+    assert models_from_list(poi_Model, False) == []  # type: ignore[arg-type]
+
+
+def test_rest_adapter_decodes_into_models(simulator: robotSimulator, client: simulatorClient):
+    client.artifact.add_artifact("poi", dict_value=[POI])
+    result = client.rest_adapter.get(
+        f"{simulator.url}/api/core/artifact/v1/pois", Response_Type.LIST_JSON, model=poi_Model
+    )
+    assert isinstance(result, model_Result) and result.status_code == 200
+    assert [poi.id for poi in result.data] == ["A101"]
+
+    result = client.rest_adapter.get(
+        f"{simulator.url}/api/core/system/v1/robot/health", Response_Type.JSON, model=health_Model
+    )
+    assert isinstance(result.data, health_Model)
+    assert result.data.to_dict()["hasError"] == client.system.get_robot_health()["hasError"]
+
+    simulator.inject_failure("/api/core/artifact/v1/pois", status_code=500)
+    result = client.rest_adapter.get(
+        f"{simulator.url}/api/core/artifact/v1/pois", Response_Type.LIST_JSON, model=poi_Model
+    )
+    assert result.status_code == 500 and result.data is None
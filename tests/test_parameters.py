@@ -0,0 +1,136 @@
+"""
+Tests of the bulk parameter API of `robotComms.api_classes.system` and of
+`robotComms.utils.fleet.parameterProfile` against simulated robots
+"""
+
+# Custom Packages
+from robotComms.utils.fleet import parameterProfile
+from robotComms.utils.logger import systemLogger
+from robotComms.utils.simulator import robotSimulator, simulatorClient
+
+# Imported Packages
+import typing
+
+import pytest
+
+PARAMETER: str = "/api/core/system/v1/parameter"
+SPEED: str = parameterProfile.MAX_LINEAR_SPEED
+ANGULAR: str = parameterProfile.MAX_ANGULAR_SPEED
+DOCK: str = parameterProfile.DOCK_STRATEGY
+PROFILE: typing.Dict[str, str] = {SPEED: "0.5", ANGULAR: "1.0", DOCK: "always"}
+
+
+@pytest.fixture
+def fleet(
+    logger: systemLogger,
+) -> typing.Iterator[typing.Dict[str, typing.Tuple[robotSimulator, simulatorClient]]]:
+    robots = {}
+    for robot_id in ["R1", "R2", "R3"]:
+        simulator = robotSimulator(port=0, logger=logger)
+        simulator.start()
+        robots[robot_id] = (simulator, simulator.connect(logger))
+    yield robots
+    for simulator, client in robots.values():
+        client.close()
+        simulator.stop()
+
+
+class _rejectingSystem:
+    def __init__(self, client: simulatorClient, simulator: robotSimulator) -> None:
+        # System API whose next parameter write fails
+        self.__CLIENT = client
+        self.__SIMULATOR = simulator
+
+    def __getattr__(self, name: str) -> typing.Any:
+        return getattr(self.__CLIENT.system, name)
+
+    def set_parameters(self, *args: typing.Any, **kwargs: typing.Any) -> typing.Dict[str, bool]:
+        self.__SIMULATOR.inject_failure(PARAMETER, status_code=500)
+        return self.__CLIENT.system.set_parameters(*args, **kwargs)
+
+
+def _puts(simulator: robotSimulator) -> int:
+    return simulator.request_counts().get(f"PUT {PARAMETER}", 0)
+
+
+def test_missing_keys_are_fetched_once(simulator: robotSimulator, client: simulatorClient):
+    keys = [SPEED, ANGULAR, DOCK, "base.missing", SPEED]
+    expected = {SPEED: "0.7", ANGULAR: "1.0", DOCK: "always"}
+
+    assert client.system.get_parameters(keys) == expected
+    assert simulator.request_counts()[f"GET {PARAMETER}"] == 4
+    # Cached keys are not fetched again, the failed one is
+    assert client.system.get_parameters(keys, max_workers=2) == expected
+    assert simulator.request_counts()[f"GET {PARAMETER}"] == 5
+
+    assert client.system.get_parameters([SPEED, DOCK], refresh=True) == {
+        SPEED: "0.7",
+        DOCK: "always",
+    }
+    assert simulator.request_counts()[f"GET {PARAMETER}"] == 7
+
+
+def test_legacy_parameter_getter(client: simulatorClient):
+    assert client.system.get_system_parameters("max_s") == 0.7
+    assert client.system.get_system_parameters("dock") == 1
+    assert client.system.get_system_parameters("speed") == -2
+
+
+def test_written_values_are_read_back(simulator: robotSimulator, client: simulatorClient):
+    assert client.system.get_parameter(SPEED) == "0.7"
+    written = client.system.set_parameters({SPEED: "0.5", ANGULAR: "0.80"}, verify=True)
+
+    assert written == {SPEED: True, ANGULAR: True}
+    # Write dropped the cached value => Read from the robot
+    assert client.system.get_parameter(SPEED) == "0.5"
+    assert simulator.robot.parameters[ANGULAR] == "0.80"
+
+
+def test_failed_write_is_reported_per_key(simulator: robotSimulator, client: simulatorClient):
+    simulator.inject_failure(PARAMETER, status_code=500)
+    written = client.system.set_parameters({SPEED: "0.5", ANGULAR: "0.8"}, verify=True)
+
+    assert sorted(written.values()) == [False, True]
+    failed = next(key for key, ok in written.items() if not ok)
+    assert client.system.get_parameter(failed) == {SPEED: "0.7", ANGULAR: "1.0"}[failed]
+
+
+def test_profile_check_reports_the_drift_only(
+    fleet: typing.Dict[str, typing.Tuple[robotSimulator, simulatorClient]], logger: systemLogger
+):
+    # R1 in sync (numbers compare by value), R2 drifted on the speed, R3 on every key but one
+    fleet["R1"][0].robot.parameters[SPEED] = "0.50"
+    fleet["R3"][0].robot.parameters.update({ANGULAR: 0.3, DOCK: "no_pile"})
+    profile = parameterProfile(
+        PROFILE, {robot_id: client for robot_id, (_, client) in fleet.items()}, logger=logger
+    )
+
+    reports = profile.check()
+    assert reports["R1"].in_sync and reports["R1"].success
+    assert reports["R2"].drift == [SPEED] and reports["R2"].message == "Drifted"
+    assert reports["R3"].drift == [SPEED, ANGULAR, DOCK]
+    assert [_puts(simulator) for simulator, _ in fleet.values()] == [0, 0, 0]
+
+    reports = profile.apply()
+    assert all(report.success for report in reports.values())
+    assert [_puts(simulator) for simulator, _ in fleet.values()] == [0, 1, 3]
+    assert all(report.in_sync for report in profile.check().values())
+
+
+def test_profile_reports_unreachable_and_rejecting_robots(
+    fleet: typing.Dict[str, typing.Tuple[robotSimulator, simulatorClient]], logger: systemLogger
+):
+    (r1, r1_client), (r2, r2_client), (_, r3_client) = fleet.values()
+    r1.inject_failure(PARAMETER, status_code=503, count=-1)
+    profile = parameterProfile(
+        PROFILE,
+        {"R1": r1_client, "R2": _rejectingSystem(r2_client, r2), "R3": r3_client.system},
+        logger=logger,
+    )
+
+    reports = profile.apply()
+
+    assert not reports["R1"].reachable and reports["R1"].message == "Robot Unreachable"
+    assert reports["R2"].applied and reports["R2"].rejected == [SPEED]
+    assert not reports["R2"].success and reports["R2"].message == "Not kept by the robot"
+    assert reports["R3"].success and reports["R3"].applied
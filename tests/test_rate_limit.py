@@ -0,0 +1,46 @@
+"""
+Tests of `robotComms.utils.rate_limit.rateLimiter`
+"""
+
+# Custom Packages
+from robotComms.utils.rate_limit import rateLimiter
+
+# Imported Packages
+import time
+
+import pytest
+
+
+def test_burst_then_refill_rate():
+    limiter = rateLimiter(rate=50, burst=5)
+    start = time.monotonic()
+    for _ in range(5):
+        assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+
+    for _ in range(5):
+        assert limiter.acquire()
+    # 5 tokens refilled at 50/s
+    assert time.monotonic() - start >= 0.09
+
+
+def test_timeout_gives_up_before_waiting():
+    limiter = rateLimiter(rate=1, burst=1)
+    assert limiter.acquire()
+    start = time.monotonic()
+    assert not limiter.acquire(timeout=0.1)
+    assert time.monotonic() - start < 0.05
+
+
+def test_more_tokens_than_the_burst_are_refused():
+    limiter = rateLimiter(rate=10, burst=2)
+    with pytest.raises(ValueError):
+        limiter.acquire(3)
+    with pytest.raises(ValueError):
+        limiter.try_acquire(3)
+    assert limiter.acquire(2)
+
+
+def test_disabled_limit_never_waits():
+    limiter = rateLimiter(rate=0)
+    assert all(limiter.try_acquire(100) for _ in range(1000))
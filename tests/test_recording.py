@@ -0,0 +1,102 @@
+"""
+Tests of `robotComms.utils.recording`: record a session against the simulator, read and replay it
+"""
+
+# Custom Packages
+from robotComms.utils.logger import systemLogger
+from robotComms.utils.recording import read_recording, recordingTransport, replay_client
+from robotComms.utils.simulator import robotSimulator
+
+# Imported Packages
+import pathlib
+import typing
+
+import pytest
+
+FIRMWARE: bytes = bytes(range(256)) * 64
+
+
+def _session(client: typing.Any) -> typing.Dict[str, typing.Any]:
+    # Composite map last => The largest exchange ends the file, the truncation tests cut into it
+    return {
+        "info": client.system.get_robot_info(),
+        "pose": client.slam.get_current_robot_pose(),
+        "pois": client.artifact.get_artifact("poi"),
+        "map": client.slam.get_composite_map(),
+    }
+
+
+def _record(
+    simulator: robotSimulator, logger: systemLogger, file_path: str
+) -> typing.Dict[str, typing.Any]:
+    client = simulator.connect(logger)
+    client.rest_adapter.mount_transport(recordingTransport(file_path, logger=logger))
+    try:
+        return _session(client)
+    finally:
+        client.close()
+
+
+@pytest.mark.parametrize("file_name", ["session.rec", "session.rec.gz"])
+def test_replay_answers_like_the_robot(
+    simulator: robotSimulator, logger: systemLogger, tmp_path: pathlib.Path, file_name: str
+):
+    file_path = str(tmp_path / file_name)
+    recorded = _record(simulator, logger, file_path)
+    assert [exchange.method for exchange in read_recording(file_path)] == ["GET"] * 4
+
+    replay = replay_client(file_path, speed=0, logger=logger)
+    try:
+        assert _session(replay) == recorded
+        assert replay.rest_adapter.transport.remaining == 0
+    finally:
+        replay.close()
+
+
+@pytest.mark.parametrize("file_name", ["session.rec", "session.rec.gz"])
+def test_truncated_recording_keeps_whole_exchanges(
+    simulator: robotSimulator, logger: systemLogger, tmp_path: pathlib.Path, file_name: str
+):
+    file_path = str(tmp_path / file_name)
+    _record(simulator, logger, file_path)
+    exchanges = list(read_recording(file_path))
+
+    # Crash while the composite map was written
+    cut_path = str(tmp_path / f"cut-{file_name}")
+    with open(file_path, "rb") as file:
+        data = file.read()
+    with open(cut_path, "wb") as file:
+        file.write(data[: len(data) // 2])
+
+    cut = list(read_recording(cut_path))
+    assert [exchange.url for exchange in cut] == [exchange.url for exchange in exchanges[:3]]
+    assert [exchange.content for exchange in cut] == [
+        exchange.content for exchange in exchanges[:3]
+    ]
+
+
+def test_binary_request_bodies_round_trip(
+    simulator: robotSimulator, logger: systemLogger, tmp_path: pathlib.Path
+):
+    image_path = str(tmp_path / "firmware-4.6.0.bin")
+    with open(image_path, "wb") as image:
+        image.write(FIRMWARE)
+    file_path = str(tmp_path / "upload.rec.gz")
+
+    client = simulator.connect(logger)
+    client.rest_adapter.mount_transport(recordingTransport(file_path, logger=logger))
+    try:
+        assert client.firmware.upload_firmware(image_path, chunk_size=len(FIRMWARE) // 4)["success"]
+    finally:
+        client.close()
+
+    chunks = [exchange for exchange in read_recording(file_path) if exchange.method == "PUT"]
+    assert [exchange.body_encoding for exchange in chunks] == ["base64"] * 4
+    assert b"".join(exchange.request_content for exchange in chunks) == FIRMWARE
+
+    replay = replay_client(file_path, speed=0, loop=False, logger=logger)
+    try:
+        assert replay.firmware.upload_firmware(image_path, chunk_size=len(FIRMWARE) // 4)["success"]
+        assert replay.rest_adapter.transport.misses == 0
+    finally:
+        replay.close()
@@ -0,0 +1,92 @@
+"""
+Tests of the `Response_Type` dispatch of the REST Adapter against a simulated robot
+"""
+
+# Custom Packages
+from robotComms.utils.decoders import decode_scalar
+from robotComms.utils.results import (
+    Response_Type,
+    bytes_Result,
+    dict_Result,
+    list_Result,
+    str_Result,
+    stream_Result,
+)
+from robotComms.utils.simulator import robotSimulator, simulatorClient
+
+# Imported Packages
+import pathlib
+
+import pytest
+
+STCM: str = "/api/core/slam/v1/maps/stcm"
+
+
+def test_response_types_are_distinct():
+    assert len({kind.value for kind in Response_Type}) == len(Response_Type)
+
+
+@pytest.mark.parametrize(
+    "body, text",
+    [
+        (b"1234", "1234"),
+        (b" 0.5\n", "0.5"),
+        (b"true", "True"),
+        (b"false", "False"),
+        (b'"always"', "always"),
+        (b'"line\\nbreak"', "line\nbreak"),
+        (b"null", ""),
+        (b"", ""),
+    ],
+)
+def test_decode_scalar(body: bytes, text: str):
+    assert decode_scalar(body) == text
+
+
+@pytest.mark.parametrize(
+    "path, response_type, result_type",
+    [
+        ("/api/core/system/v1/robot/info", Response_Type.JSON, dict_Result),
+        ("/api/core/artifact/v1/pois", Response_Type.LIST_JSON, list_Result),
+        ("/api/platform/v1/timestamp", Response_Type.STR, str_Result),
+        ("/api/platform/v1/timestamp", Response_Type.TEXT, str_Result),
+        # JSON scalar where an object was expected => Same as STR instead of an exception
+        ("/api/platform/v1/timestamp", Response_Type.JSON, str_Result),
+        (STCM, Response_Type.BYTES, bytes_Result),
+        (STCM, Response_Type.STREAM, stream_Result),
+    ],
+)
+def test_dispatch_builds_the_matching_result(
+    simulator: robotSimulator,
+    client: simulatorClient,
+    path: str,
+    response_type: Response_Type,
+    result_type: type,
+):
+    result = client.rest_adapter.get(f"{simulator.url}{path}", response_type)
+    assert result.status_code == 200 and isinstance(result, result_type)
+    if isinstance(result, stream_Result):
+        result.close()
+
+
+def test_scalar_endpoints_are_numbers(client: simulatorClient):
+    assert isinstance(client.slam.get_localization_quality(), int)
+    assert isinstance(client.statistics.get_odometry(), float)
+    assert client.statistics.get_runtime() > 0.0
+
+
+def test_composite_map_as_bytes_and_stream(
+    simulator: robotSimulator, client: simulatorClient, tmp_path: pathlib.Path
+):
+    content = client.slam.get_composite_map()
+    assert content == simulator.robot.composite_map()
+
+    file_path = tmp_path / "map.stcm"
+    assert client.slam.save_composite_map(str(file_path))
+    assert file_path.read_bytes() == content
+
+    simulator.inject_failure(STCM, status_code=503, count=2)
+    assert client.slam.get_composite_map() == b""
+    assert not client.slam.save_composite_map(str(tmp_path / "failed.stcm"))
+    # The failed stream was closed => The pooled connection serves the next request
+    assert client.slam.get_composite_map() == content
@@ -0,0 +1,115 @@
+"""
+Tests of `robotComms.api_classes.sensors` and `robotComms.utils.sensor_readout`: the cached sensor
+list, batched readouts and the edges yielded by `watch()` against the simulator
+"""
+
+# Custom Packages
+from robotComms.utils.sensor_readout import sensorChanges, sensorReadout
+from robotComms.utils.simulator import SIMULATED_SENSORS, robotSimulator, simulatorClient
+
+# Imported Packages
+import threading
+import typing
+
+import numpy as np
+
+SENSORS: str = "/api/core/sensors/v1/sensors"
+BUMPER_IDS: typing.List[int] = [
+    n for n, sensor in enumerate(SIMULATED_SENSORS) if sensor[0] == "bumper"
+]
+SONAR_IDS: typing.List[int] = [
+    n for n, sensor in enumerate(SIMULATED_SENSORS) if sensor[0] == "sonar"
+]
+
+
+def test_sensor_list_is_fetched_once_and_filtered(
+    simulator: robotSimulator, client: simulatorClient
+):
+    assert len(client.sensors.get_sensors()) == len(SIMULATED_SENSORS)
+    assert [sensor["id"] for sensor in client.sensors.get_sensors("sonar")] == SONAR_IDS
+    assert client.sensors.get_sensors("lidar") == []
+    assert simulator.request_counts()[f"GET {SENSORS}"] == 1
+
+    client.sensors.get_sensors(refresh=True)
+    assert simulator.request_counts()[f"GET {SENSORS}"] == 2
+
+
+def test_readout_holds_every_sensor_by_id(simulator: robotSimulator, client: simulatorClient):
+    simulator.robot.trigger_sensor(BUMPER_IDS[1])
+    readout = client.sensors.read_sensors()
+
+    assert len(readout) == len(SIMULATED_SENSORS)
+    assert readout.types.tolist() == [sensor[0] for sensor in SIMULATED_SENSORS]
+    assert readout.ids("bumper").tolist() == BUMPER_IDS
+    assert readout.triggered[BUMPER_IDS].tolist() == [False, True, False, False]
+    assert readout.any_triggered("bumper") and not readout.any_triggered("cliff")
+    # Sonars measure the walls of the room
+    assert np.all(readout.values[SONAR_IDS] > 0)
+    assert readout.to_dict()[BUMPER_IDS[1]]["is_triggered"] is True
+
+
+def test_readout_of_some_sensors(client: simulatorClient):
+    readout = client.sensors.read_sensors("sonar")
+    assert readout.ids().tolist() == SONAR_IDS
+    assert len(readout.types) == len(SIMULATED_SENSORS)
+
+    readout = client.sensors.read_sensors("sonar", ids=[BUMPER_IDS[0]])
+    assert readout.ids().tolist() == [BUMPER_IDS[0]]
+
+
+def test_failed_sensor_is_left_out_of_the_readout(
+    simulator: robotSimulator, client: simulatorClient
+):
+    client.sensors.get_sensors()
+    simulator.inject_failure(f"{SENSORS}/{SONAR_IDS[2]}", status_code=500)
+    readout = client.sensors.read_sensors()
+
+    assert len(readout) == len(SIMULATED_SENSORS) - 1
+    assert not readout.valid[SONAR_IDS[2]] and np.isnan(readout.values[SONAR_IDS[2]])
+
+
+def test_changes_keep_the_edges_only():
+    types = np.array(["bumper", "bumper", "sonar"], dtype="<U8")
+
+    def readout(values: typing.List[float], triggered: typing.List[bool]) -> sensorReadout:
+        return sensorReadout.from_list(
+            [
+                {"id": n, "value": value, "is_triggered": hit, "timestamp": 0}
+                for n, (value, hit) in enumerate(zip(values, triggered))
+                if not np.isnan(value)
+            ],
+            taken_at=0.0,
+            types=types,
+        )
+
+    first = readout([0.0, 1.0, 2.0], [False, True, False])
+    changes = first.changes_from(None)
+    assert changes.triggered.tolist() == [1] and changes.changed.tolist() == [0, 1, 2]
+
+    second = readout([1.0, 0.0, 2.04], [True, False, False])
+    changes = second.changes_from(first, deadband=0.05)
+    assert (changes.triggered.tolist(), changes.released.tolist()) == ([0], [1])
+    assert changes.changed.tolist() == [0, 1]
+    assert not second.changes_from(second)
+
+    third = readout([1.0, 0.0, np.nan], [True, False, False])
+    assert third.changes_from(second).lost.tolist() == [2]
+
+
+def test_watch_yields_only_when_a_sensor_changes(
+    simulator: robotSimulator, client: simulatorClient
+):
+    stop_event = threading.Event()
+    seen: typing.List[sensorChanges] = []
+    for changes in client.sensors.watch(rate_hz=100.0, sensor_type="bumper", stop_event=stop_event):
+        seen.append(changes)
+        if len(seen) == 1:
+            simulator.robot.trigger_sensor(BUMPER_IDS[2])
+        elif len(seen) == 2:
+            simulator.robot.trigger_sensor(BUMPER_IDS[2], False)
+        else:
+            stop_event.set()
+
+    assert seen[0].changed.tolist() == BUMPER_IDS and seen[0].triggered.tolist() == []
+    assert seen[1].triggered.tolist() == [BUMPER_IDS[2]]
+    assert seen[2].released.tolist() == [BUMPER_IDS[2]] and seen[2].triggered.tolist() == []
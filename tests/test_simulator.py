@@ -0,0 +1,134 @@
+"""
+Tests of `robotComms.utils.simulator`: the simulated robot behind the API classes and the network
+conditions of the server
+"""
+
+# Custom Packages
+from robotComms.utils.logger import systemLogger
+from robotComms.utils.simulator import robotSimulator, simulatedRobot, simulatorClient
+
+# Imported Packages
+import math
+import time
+import typing
+
+import pytest
+import requests
+
+MOVE_TO: str = "slamtec.agent.actions.MoveToAction"
+
+
+def _wait_for_action_end(client: simulatorClient, timeout_s: float = 5.0) -> typing.Dict:
+    deadline = time.monotonic() + timeout_s
+    action = client.motion.get_action()
+    while action.get("state", {}).get("status") != 4 and time.monotonic() < deadline:
+        time.sleep(0.01)
+        action = client.motion.get_action()
+    return action
+
+
+def test_move_action_reaches_its_target(client: simulatorClient):
+    start = client.slam.get_current_robot_pose()
+    target = {"x": start["x"] + 1.0, "y": start["y"], "z": 0}
+    created = client.motion.create_new_motion(
+        {"action_name": MOVE_TO, "options": {"target": target}}
+    )
+    assert created["state"]["status"] == 1
+
+    action = _wait_for_action_end(client)
+    assert action["action_id"] == created["action_id"]
+    assert action["state"]["result"] == 0
+    pose = client.slam.get_current_robot_pose()
+    assert math.hypot(pose["x"] - target["x"], pose["y"] - target["y"]) < 0.05
+
+
+def test_new_action_cancels_the_running_one(client: simulatorClient):
+    first = client.motion.create_new_motion(
+        {"action_name": MOVE_TO, "options": {"target": {"x": 100.0, "y": 0, "z": 0}}}
+    )
+    client.motion.create_new_motion(
+        {"action_name": MOVE_TO, "options": {"target": {"x": 0.5, "y": 0, "z": 0}}}
+    )
+    canceled = client.motion.get_action(str(first["action_id"]))
+    assert canceled["state"]["status"] == 4
+    assert canceled["state"]["result"] != 0
+
+
+def test_laser_scan_sees_the_room(client: simulatorClient):
+    scan = client.system.get_laserscan()
+    points = scan["laser_points"]
+    assert len(points) == 720
+    valid = [point["distance"] for point in points if point["valid"]]
+    # Room of 20m x 12m => No wall is further than its diagonal
+    assert valid and max(valid) < math.hypot(20.0, 12.0)
+
+
+def test_artifacts_round_trip(client: simulatorClient):
+    poi = {"id": "", "metadata": {"display_name": "A101"}, "pose": {"x": 1.0, "y": 2.0, "yaw": 0}}
+    assert client.artifact.add_artifact("poi", dict_value=[poi])
+    names = [p["metadata"]["display_name"] for p in client.artifact.get_artifact("poi")]
+    assert "A101" in names
+
+
+def test_latency_is_added_to_every_request(logger: systemLogger):
+    simulator = robotSimulator(port=0, latency_s=0.05, logger=logger)
+    simulator.start()
+    client = simulator.connect(logger)
+    try:
+        start = time.perf_counter()
+        for _ in range(3):
+            client.slam.get_current_robot_pose()
+        assert time.perf_counter() - start >= 3 * 0.05
+    finally:
+        client.close()
+        simulator.stop()
+
+
+def test_bandwidth_cap_slows_large_bodies(logger: systemLogger):
+    simulator = robotSimulator(
+        port=0,
+        bandwidth_bytes_s=500_000,
+        robot=simulatedRobot(map_size_bytes=50_000),
+        logger=logger,
+    )
+    simulator.start()
+    client = simulator.connect(logger)
+    try:
+        start = time.perf_counter()
+        assert len(client.slam.get_composite_map()) == 50_000
+        assert time.perf_counter() - start >= 0.09
+    finally:
+        client.close()
+        simulator.stop()
+
+
+def test_injected_failures_hit_only_their_path(simulator: robotSimulator):
+    pose_url = f"{simulator.url}/api/core/slam/v1/localization/pose"
+    info_url = f"{simulator.url}/api/core/system/v1/robot/info"
+    simulator.inject_failure("/api/core/slam/v1/localization/pose", status_code=503, count=2)
+
+    assert requests.get(pose_url, timeout=2.0).status_code == 503
+    assert requests.get(info_url, timeout=2.0).status_code == 200
+    assert requests.get(pose_url, timeout=2.0).status_code == 503
+    assert requests.get(pose_url, timeout=2.0).status_code == 200
+    assert simulator.request_counts()["GET /api/core/slam/v1/localization/pose"] == 3
+
+
+def test_failure_rate_fails_every_request(logger: systemLogger):
+    simulator = robotSimulator(port=0, failure_rate=1.0, failure_status=503, logger=logger)
+    simulator.start()
+    try:
+        statuses = {
+            requests.get(f"{simulator.url}/api/core/system/v1/robot/info", timeout=2.0).status_code
+            for _ in range(5)
+        }
+        assert statuses == {503}
+    finally:
+        simulator.stop()
+
+
+def test_dropped_connection_reaches_the_client(simulator: robotSimulator, client: simulatorClient):
+    simulator.inject_failure("/api/core/system/v1/robot/info", status_code=0)
+    with pytest.raises(requests.ConnectionError):
+        client.system.get_robot_info()
+    assert client.system.get_robot_info()
@@ -0,0 +1,79 @@
+"""
+Tests of `robotComms.utils.snapshot.snapshotReader` against a simulated robot
+"""
+
+# Custom Packages
+from robotComms.utils.logger import systemLogger
+from robotComms.utils.simulator import robotSimulator, simulatorClient
+from robotComms.utils.snapshot import SNAPSHOT_FIELDS, snapshotReader
+
+# Imported Packages
+import threading
+import time
+
+import pytest
+
+
+def _snapshot_threads() -> int:
+    return sum(thread.name.startswith("snapshot") for thread in threading.enumerate())
+
+
+def test_snapshot_reads_every_field(client: simulatorClient):
+    # No action => "action" comes back empty and counts as failed
+    assert client.snapshot.read().failed_fields() == ["action"]
+    client.motion.create_new_motion(
+        {
+            "action_name": "slamtec.agent.actions.MoveToAction",
+            "options": {"target": {"x": 1.0, "y": 0.0, "z": 0}},
+        }
+    )
+    snapshot = client.snapshot.read()
+    assert snapshot.is_complete() and snapshot.failed_fields() == []
+    assert set(snapshot.summary()["fields"]) == set(SNAPSHOT_FIELDS)
+    assert snapshot.health == client.system.get_robot_health()
+    assert isinstance(snapshot.localization_quality, int)
+
+
+def test_requests_run_in_parallel(logger: systemLogger):
+    simulator = robotSimulator(port=0, latency_s=0.1, logger=logger)
+    simulator.start()
+    client = simulator.connect(logger)
+    try:
+        client.snapshot.read()
+        start = time.perf_counter()
+        snapshot = client.snapshot.read()
+        # 5 requests of 100ms each => About one request instead of five
+        assert time.perf_counter() - start < 0.3
+        assert snapshot.latency_s >= 0.1 and snapshot.spread_s < 0.1
+    finally:
+        client.close()
+        simulator.stop()
+
+
+def test_failed_field_falls_back_to_empty(
+    simulator: robotSimulator, client: simulatorClient, logger: systemLogger
+):
+    simulator.inject_failure("/api/core/system/v1/robot/health", status_code=0)
+    reader = snapshotReader(client, fields=["health", "network"], logger=logger)
+    snapshot = reader.read()
+    reader.close()
+
+    assert snapshot.failed_fields() == ["health"]
+    assert snapshot.health == {} and snapshot.fields["health"].error
+    assert snapshot.network == client.system.get_network_status()
+
+
+def test_pool_starts_lazily_and_again_after_close(client: simulatorClient, logger: systemLogger):
+    threads = _snapshot_threads()
+    reader = snapshotReader(client, logger=logger)
+    assert _snapshot_threads() == threads
+
+    reader.read()
+    assert _snapshot_threads() > threads
+    reader.close()
+    assert _snapshot_threads() == threads
+    assert reader.read().failed_fields() == ["action"]
+    reader.close()
+
+    with pytest.raises(ValueError):
+        snapshotReader(client, fields=["battery"], logger=logger)
@@ -0,0 +1,144 @@
+"""
+Tests of `robotComms.utils.spatial_index.artifactSpatialIndex`: queries against brute force, diffs
+from the artifact mirror and queries racing new collections
+"""
+
+# Custom Packages
+from robotComms.utils.artifact_store import artifactDiff, artifactStore
+from robotComms.utils.logger import systemLogger
+from robotComms.utils.simulator import simulatorClient
+from robotComms.utils.spatial_index import artifactSpatialIndex
+
+# Imported Packages
+import threading
+import typing
+
+import numpy as np
+
+
+def _rect(id: int, sx: float, sy: float, ex: float, ey: float, half_width: float) -> typing.Dict:
+    return {
+        "id": id,
+        "area": {"start": {"x": sx, "y": sy}, "end": {"x": ex, "y": ey}, "half_width": half_width},
+        "metadata": {},
+    }
+
+
+def _line(id: int, sx: float, sy: float, ex: float, ey: float) -> typing.Dict:
+    return {"id": id, "start": {"x": sx, "y": sy}, "end": {"x": ex, "y": ey}}
+
+
+def _inside(rect: typing.Dict, point: np.ndarray) -> bool:
+    area = rect["area"]
+    start = np.array([area["start"]["x"], area["start"]["y"]])
+    end = np.array([area["end"]["x"], area["end"]["y"]])
+    length = np.linalg.norm(end - start)
+    direction = (end - start) / length
+    relative = point - start
+    along = relative @ direction
+    across = abs(relative[0] * direction[1] - relative[1] * direction[0])
+    return 0 <= along <= length and across <= area["half_width"]
+
+
+def test_points_in_areas_match_brute_force(logger: systemLogger):
+    rng = np.random.default_rng(7)
+    rects = [
+        _rect(n, *rng.uniform(-20, 20, 2), *rng.uniform(-20, 20, 2), rng.uniform(0.1, 2.0))
+        for n in range(60)
+    ]
+    index = artifactSpatialIndex(logger=logger)
+    index.build({"rect/forbidden_area": rects})
+    points = rng.uniform(-22, 22, (2000, 2))
+
+    expected = [any(_inside(rect, point) for rect in rects) for point in points]
+    assert index.points_in_areas(points).tolist() == expected
+    for point, hit in zip(points, index.areas_at(points)):
+        assert hit is None or _inside(rects[hit[1]], point)
+
+
+def test_area_diffs_update_the_grid(logger: systemLogger):
+    index = artifactSpatialIndex(cell_size=1.0, logger=logger)
+    index.build({"rect/forbidden_area": [_rect(1, 0, 0, 4, 0, 0.5)]})
+    points = [[2.0, 0.0], [2.0, 5.0]]
+    assert index.points_in_areas(points).tolist() == [True, False]
+
+    index.apply_diff(
+        artifactDiff(
+            "rect/forbidden_area",
+            added=[_rect(2, 0, 5, 4, 5, 0.5)],
+            removed=[_rect(1, 0, 0, 4, 0, 0.5)],
+        )
+    )
+    assert index.points_in_areas(points).tolist() == [False, True]
+    assert index.areas_at(points) == [None, ("forbidden_area", 2)]
+
+
+def test_segments_and_nearest_pois(logger: systemLogger):
+    index = artifactSpatialIndex(logger=logger)
+    index.build(
+        {
+            "lines/walls": [_line(1, 0, -1, 0, 1)],
+            "lines/tracks": [_line(2, 5, -1, 5, 1)],
+            "poi": [
+                {"id": "A", "pose": {"x": 0, "y": 0}},
+                {"id": "B", "pose": {"x": 3, "y": 0}},
+                {"id": "C", "pose": {"x": 10, "y": 0}},
+            ],
+        }
+    )
+    starts, ends = [[-1, 0], [4, 0], [1, 0]], [[1, 0], [6, 0], [2, 0]]
+    assert index.segments_cross_walls(starts, ends).tolist() == [True, False, False]
+    assert index.segments_cross_lines(starts, ends, ["walls", "tracks"]) == [
+        ("walls", 1),
+        ("tracks", 2),
+        None,
+    ]
+
+    ids, distances = index.nearest_pois([[2.5, 0], [9, 0]], k=2)
+    assert ids.tolist() == [["B", "A"], ["C", "B"]]
+    assert np.allclose(distances, [[0.5, 2.5], [1.0, 6.0]])
+    ids, distances = index.nearest_pois([[0, 0]], k=4)
+    assert ids[0, 3] is None and np.isinf(distances[0, 3])
+
+
+def test_queries_race_new_collections(logger: systemLogger):
+    index = artifactSpatialIndex(logger=logger)
+    stop = threading.Event()
+    errors: typing.List[BaseException] = []
+
+    def query() -> None:
+        while not stop.is_set():
+            try:
+                index.points_in_areas([[0.5, 0.0]])
+            except BaseException as e:
+                errors.append(e)
+                return
+
+    thread = threading.Thread(target=query)
+    thread.start()
+    for n in range(300):
+        index.apply_diff(artifactDiff(f"rect/usage_{n}", added=[_rect(n, 0, 0, 1, 0, 0.5)]))
+    stop.set()
+    thread.join()
+
+    assert errors == []
+    assert index.areas_at([[0.5, 0.0]]) == [("usage_0", 0)]
+
+
+def test_index_follows_the_mirror(client: simulatorClient, logger: systemLogger):
+    store = artifactStore(client.artifact, collections=[("rect", "forbidden_area")], logger=logger)
+    store.refresh()
+    index = artifactSpatialIndex(logger=logger)
+    index.attach(store)
+    assert not index.points_in_areas([[0.5, 0.0]])[0]
+
+    area = {
+        "area": {"start": {"x": 0, "y": 0}, "end": {"x": 1, "y": 0}, "half_width": 0.5},
+        "metadata": {},
+    }
+    assert store.add_artifact("rect", "forbidden_area", [area])
+    assert index.points_in_areas([[0.5, 0.0]])[0]
+
+    assert store.delete_artifact("rect", "forbidden_area")
+    assert not index.points_in_areas([[0.5, 0.0]])[0]
+    index.detach()
@@ -0,0 +1,131 @@
+"""
+Tests of `robotComms.utils.telemetry`: sampled rows, failed requests, hour partitions and the columns
+read back against the simulator
+"""
+
+# Custom Packages
+from robotComms.utils import telemetry
+from robotComms.utils.logger import systemLogger
+from robotComms.utils.simulator import robotSimulator, simulatorClient
+from robotComms.utils.telemetry import read_telemetry, telemetryRecorder
+
+# Imported Packages
+import datetime
+import math
+import pathlib
+import time
+
+import numpy as np
+import pytest
+
+
+def test_invalid_file_format_is_refused(client: simulatorClient, logger: systemLogger):
+    with pytest.raises(ValueError, match="Invalid File Format"):
+        telemetryRecorder({"athena-01": client}, file_format="csv", logger=logger)
+
+
+@pytest.mark.skipif(telemetry.pyarrow is not None, reason="pyarrow installed")
+def test_parquet_needs_pyarrow(client: simulatorClient, logger: systemLogger):
+    with pytest.raises(ImportError):
+        telemetryRecorder({"athena-01": client}, file_format="parquet", logger=logger)
+    recorder = telemetryRecorder({"athena-01": client}, logger=logger)
+    assert recorder.file_format == "npz"
+
+
+def test_rows_of_every_robot_are_read_back(
+    tmp_path: pathlib.Path, simulator: robotSimulator, client: simulatorClient, logger: systemLogger
+):
+    other = robotSimulator(port=0, logger=logger)
+    other.start()
+    other_client = other.connect(logger)
+    try:
+        other.robot.inject_device_error("motor brake released")
+        recorder = telemetryRecorder(
+            {"athena-01": client, "athena-02": other_client},
+            directory=str(tmp_path),
+            file_format="npz",
+            logger=logger,
+        )
+        for _ in range(3):
+            assert recorder.sample_once() == 2
+        assert recorder.buffered_rows() == 6
+        recorder.stop()
+    finally:
+        other_client.close()
+        other.stop()
+
+    assert (recorder.samples, recorder.written_rows, recorder.dropped_rows) == (6, 6, 0)
+    data = read_telemetry(str(tmp_path))
+    assert data["robot_id"].tolist() == ["athena-01"] * 3 + ["athena-02"] * 3
+    assert np.all(np.diff(data["host_time"][:3]) >= 0)
+    assert np.allclose(data["battery_percentage"], 90)
+    assert data["docking_status"].tolist() == [1] * 6
+    assert data["base_errors"].tolist() == [0] * 3 + [1] * 3
+    assert data["has_error"].tolist() == [False] * 3 + [True] * 3
+    assert data["failed_requests"].tolist() == [0] * 6
+
+
+def test_failed_request_leaves_nan_and_is_counted(
+    tmp_path: pathlib.Path, simulator: robotSimulator, client: simulatorClient, logger: systemLogger
+):
+    recorder = telemetryRecorder(
+        {"athena-01": client},
+        directory=str(tmp_path),
+        file_format="npz",
+        logger=logger,
+    )
+    simulator.inject_failure("/api/core/system/v1/power/status", status_code=500)
+    assert recorder.sample_once() == 0
+    assert recorder.sample_once() == 1
+    recorder.stop()
+
+    assert recorder.failed == 1
+    data = read_telemetry(str(tmp_path), columns=["battery_percentage", "failed_requests"])
+    assert sorted(data) == ["battery_percentage", "failed_requests"]
+    assert math.isnan(data["battery_percentage"][0]) and data["battery_percentage"][1] == 90
+    assert data["failed_requests"].tolist() == [1, 0]
+
+
+def test_full_batches_are_written_to_their_hour_partition(
+    tmp_path: pathlib.Path, client: simulatorClient, logger: systemLogger
+):
+    recorder = telemetryRecorder(
+        {"athena-01": client},
+        directory=str(tmp_path),
+        batch_rows=2,
+        file_format="npz",
+        logger=logger,
+    )
+    for _ in range(3):
+        recorder.sample_once()
+    # Two rows => One batch written, the third row still buffered
+    assert (recorder.files, recorder.written_rows, recorder.buffered_rows()) == (1, 2, 1)
+    recorder.stop()
+
+    parts = sorted(tmp_path.glob("robot=athena-01/date=*/hour=*/part-*.npz"))
+    assert recorder.files == len(parts) >= 2
+    host_time = read_telemetry(str(tmp_path), columns=["host_time"])["host_time"]
+    moment = datetime.datetime.fromtimestamp(host_time[0], tz=datetime.timezone.utc)
+    assert parts[0].parent.name == f"hour={moment:%H}"
+    assert parts[0].parent.parent.name == f"date={moment:%Y-%m-%d}"
+
+    # Time range filters rows as well as partitions
+    assert len(read_telemetry(str(tmp_path), start=host_time[1])["host_time"]) == 2
+    assert len(read_telemetry(str(tmp_path), end=host_time[0] - 3600)["host_time"]) == 0
+    assert len(read_telemetry(str(tmp_path), robots=["athena-02"])["robot_id"]) == 0
+
+
+def test_background_recorder_writes_every_sample(
+    tmp_path: pathlib.Path, client: simulatorClient, logger: systemLogger
+):
+    with telemetryRecorder(
+        {"athena-01": client},
+        directory=str(tmp_path),
+        rate_hz=50.0,
+        file_format="npz",
+        logger=logger,
+    ) as recorder:
+        time.sleep(0.3)
+
+    assert recorder.samples > 0 and recorder.written_rows == recorder.samples
+    assert len(read_telemetry(str(tmp_path))["host_time"]) == recorder.samples
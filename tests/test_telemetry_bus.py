@@ -0,0 +1,143 @@
+"""
+Tests of `robotComms.utils.telemetry_bus`: channels polled from the simulator, the ring buffer seen
+by readers in this and in another process, lost messages and invalid segments
+"""
+
+# Custom Packages
+from robotComms.utils.logger import systemLogger
+from robotComms.utils.simulator import robotSimulator, simulatorClient
+from robotComms.utils.telemetry_bus import telemetryBus, telemetryBusReader
+
+# Imported Packages
+from multiprocessing import shared_memory
+import subprocess
+import sys
+import typing
+import uuid
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def bus(client: simulatorClient, logger: systemLogger) -> typing.Iterator[telemetryBus]:
+    bus = telemetryBus(
+        client,
+        name=f"test-{uuid.uuid4().hex[:8]}",
+        capacity=4,
+        max_laser_points=100,
+        max_message_bytes=256,
+        logger=logger,
+    )
+    yield bus
+    bus.close()
+
+
+def test_polled_channels_reach_the_reader(
+    bus: telemetryBus, simulator: robotSimulator, client: simulatorClient
+):
+    for channel in ["pose", "laserscan", "health"]:
+        assert bus.poll_once(channel) == 1
+    simulator.robot.add_event("DEVICE_ERROR", message="motor brake released")
+    assert bus.poll_once("events") >= 1
+
+    with telemetryBusReader(bus.name) as reader:
+        sequence, host_time, pose = reader.latest("pose")
+        assert sequence == 1 and host_time > 0
+        expected = client.slam.get_current_robot_pose()
+        assert (pose["x"], pose["y"], pose["yaw"]) == (
+            expected["x"],
+            expected["y"],
+            expected["yaw"],
+        )
+
+        _, _, scan = reader.latest("laserscan")
+        # 720 points of the simulated lidar cut to `max_laser_points`
+        assert scan["count"] == 100 and np.all(scan["distance"][scan["valid"]] > 0)
+
+        assert reader.latest("health")[2]["hasError"] is False
+        assert reader.latest("events")[2]["type"] == "DEVICE_ERROR"
+
+
+def test_failed_request_is_not_published(bus: telemetryBus, simulator: robotSimulator):
+    simulator.inject_failure("/api/core/slam/v1/localization/pose", status_code=500)
+    assert bus.poll_once("pose") == 0
+    assert bus.failed["pose"] == 1
+
+    with telemetryBusReader(bus.name, ["pose"]) as reader:
+        assert reader.latest("pose") is None
+        assert bus.poll_once("pose") == 1
+        assert reader.sequence("pose") == 1
+
+
+def test_reader_counts_the_overwritten_messages(bus: telemetryBus):
+    with telemetryBusReader(bus.name, ["health"]) as reader:
+        for n in range(10):
+            bus.publish("health", {"n": n})
+
+        assert [message[2]["n"] for message in reader.read_since("health", 0)] == [6, 7, 8, 9]
+        messages = reader.read_since("health", 2)
+        # Capacity of 4 => Messages 3 to 6 were overwritten
+        assert [message[0] for message in messages] == [7, 8, 9, 10] and reader.lost["health"] == 4
+        assert reader.read_since("health", 10) == []
+
+
+def test_views_are_valid_until_the_ring_wraps(bus: telemetryBus):
+    with telemetryBusReader(bus.name, ["pose"]) as reader:
+        bus.publish("pose", {"x": 1.0})
+        sequence, _, view = reader.latest("pose", copy=False)
+        assert view["x"] == 1.0 and reader.valid("pose", sequence)
+        with pytest.raises(ValueError):
+            view["x"] = 2.0
+
+        for n in range(4):
+            bus.publish("pose", {"x": float(n)})
+        assert not reader.valid("pose", sequence)
+
+
+def test_oversized_message_is_dropped(bus: telemetryBus):
+    assert bus.publish("health", {"message": "x" * 512}) == 0
+    assert bus.dropped["health"] == 1
+    assert bus.publish("health", {"message": "ok"}) == 1
+
+
+def test_wait_returns_on_the_next_message(bus: telemetryBus):
+    with telemetryBusReader(bus.name, ["pose"]) as reader:
+        assert reader.wait("pose", 0, timeout_s=0.05) == 0
+        bus.start()
+        try:
+            assert reader.wait("pose", 0, timeout_s=2.0) >= 1
+        finally:
+            bus.stop()
+
+
+def test_reader_in_another_process(bus: telemetryBus):
+    bus.publish("pose", {"x": 1.5, "y": -2.0})
+    script = (
+        "from robotComms.utils.telemetry_bus import telemetryBusReader\n"
+        f"with telemetryBusReader({bus.name!r}, ['pose']) as reader:\n"
+        "    _, _, pose = reader.latest('pose')\n"
+        "    print(pose['x'], pose['y'])\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, timeout=30, check=True
+    )
+    assert output.stdout.split() == ["1.5", "-2.0"]
+
+    # Segments still readable once the other process exited
+    with telemetryBusReader(bus.name, ["pose"]) as reader:
+        assert reader.latest("pose")[2]["x"] == 1.5
+
+
+def test_invalid_channel_and_segment(bus: telemetryBus):
+    with pytest.raises(ValueError, match="Invalid Channel"):
+        bus.poll_once("battery")
+
+    name = f"test-{uuid.uuid4().hex[:8]}"
+    memory = shared_memory.SharedMemory(name=f"{name}.pose", create=True, size=4096)
+    try:
+        with pytest.raises(ValueError, match="not a telemetry bus channel"):
+            telemetryBusReader(name, ["pose"])
+    finally:
+        memory.close()
+        memory.unlink()
@@ -0,0 +1,120 @@
+"""
+Tests of `robotComms.utils.tracing`: request and API spans, their phases, hooks and the Chrome
+trace exporter
+"""
+
+# Custom Packages
+from robotComms.utils.simulator import robotSimulator, simulatorClient
+from robotComms.utils.tracing import (
+    HOOK_POINTS,
+    chromeTraceExporter,
+    get_tracer,
+    trace_context,
+    traceSpan,
+)
+
+# Imported Packages
+import json
+import pathlib
+import typing
+
+import pytest
+import requests
+
+MOVE_TO: str = "slamtec.agent.actions.MoveToAction"
+
+
+class _recorder:
+    def __init__(self) -> None:
+        # (hook point, span) in the order the hooks fired
+        self.calls: typing.List[typing.Tuple[str, traceSpan]] = []
+
+    def hook(self, point: str) -> typing.Callable[[traceSpan], None]:
+        return lambda span: self.calls.append((point, span))
+
+    def finished(self, category: str) -> typing.List[traceSpan]:
+        return [
+            span for point, span in self.calls if point == "on_finish" and span.category == category
+        ]
+
+
+@pytest.fixture
+def recorder() -> typing.Iterator[_recorder]:
+    tracer = get_tracer()
+    recorder = _recorder()
+    hooks = {point: recorder.hook(point) for point in HOOK_POINTS}
+    for point, hook in hooks.items():
+        tracer.add_hook(point, hook)
+    yield recorder
+    for point, hook in hooks.items():
+        tracer.remove_hook(point, hook)
+    assert not tracer.active
+
+
+def test_request_spans_nest_under_api_spans(client: simulatorClient, recorder: _recorder):
+    created = client.motion.create_new_motion(
+        {"action_name": MOVE_TO, "options": {"target": {"x": 1.0, "y": 0.0, "z": 0}}}
+    )
+    recorder.calls.clear()
+    with trace_context(mission="dock"):
+        client.motion.get_action(str(created["action_id"]))
+
+    assert [point for point, _ in recorder.calls] == [
+        "before_send",
+        "after_receive",
+        "after_decode",
+        "on_finish",
+        "on_finish",
+    ]
+    (request,), (api,) = recorder.finished("request"), recorder.finished("api")
+    assert api.name == "motion.get_action" and request.parent_id == api.span_id
+    assert api.attributes["action_id"] == str(created["action_id"])
+    assert request.attributes["status_code"] == 200 and request.attributes["mission"] == "dock"
+    assert request.attributes["robot_id"] == api.attributes["robot_id"]
+
+
+def test_phases_cover_the_response_logging(client: simulatorClient, recorder: _recorder):
+    client.system.get_laserscan()
+    (request,) = recorder.finished("request")
+
+    assert set(request.phases) == {"prepare", "network", "decode", "log"}
+    # Pretty printing the 720 laser points is timed in "log", not left outside every phase
+    unattributed = request.duration_s - sum(request.phase_s(phase) for phase in request.phases)
+    assert unattributed < max(0.001, 0.1 * request.duration_s)
+    assert request.phase_s("log") > 0
+
+
+def test_connection_errors_reach_on_error(
+    simulator: robotSimulator, client: simulatorClient, recorder: _recorder
+):
+    simulator.inject_failure("/api/core/system/v1/robot/info", status_code=0)
+    with pytest.raises(requests.ConnectionError):
+        client.system.get_robot_info()
+
+    errors = [span for point, span in recorder.calls if point == "on_error"]
+    assert errors and "ConnectionError" in errors[0].error
+    assert all(span.error for span in recorder.finished("api") + recorder.finished("request"))
+
+
+def test_chrome_trace_export(client: simulatorClient, tmp_path: pathlib.Path):
+    tracer = get_tracer()
+    exporter = chromeTraceExporter(str(tmp_path / "trace" / "trace.json"))
+    tracer.add_exporter(exporter)
+    try:
+        client.slam.get_current_robot_pose()
+    finally:
+        tracer.remove_exporter(exporter)
+        exporter.close()
+
+    with open(exporter.file_path) as file:
+        events = json.load(file)
+    assert {event["cat"] for event in events} == {"api", "request", "phase"}
+    request = next(event for event in events if event["cat"] == "request")
+    phases = [event for event in events if event["cat"] == "phase"]
+    assert all(request["ts"] <= phase["ts"] for phase in phases)
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in events)
+
+
+def test_invalid_hook_point_is_refused():
+    with pytest.raises(ValueError):
+        get_tracer().add_hook("before_decode", lambda span: None)